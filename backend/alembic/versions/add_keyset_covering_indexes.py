@@ -0,0 +1,81 @@
+"""add_keyset_covering_indexes
+
+Adds covering indexes for keyset-paginated history listings:
+1. idx_predictions_user_created_id_covering - GET /api/predictions
+2. idx_uploads_user_created_id_covering - GET /api/uploads
+
+Both listings page with:
+    WHERE user_id = :uid AND (created_at, id) < (:cursor_created_at, :cursor_id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :page_size + 1
+
+The (user_id, created_at DESC, id DESC) key matches the filter and sort
+exactly, and INCLUDE carries the projected list columns, so each page is an
+index-only range scan of page_size rows (O(page), independent of how many
+uploads a user has).
+
+idx_predictions_user_created (user_id, created_at) is a strict prefix of the
+new predictions index and is dropped to avoid paying for it on every write.
+
+Revision ID: keyset_covering_idx
+Revises: b4e2bb95fcb0
+Create Date: 2026-01-12 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'keyset_covering_idx'
+down_revision = 'b4e2bb95fcb0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add covering keyset indexes (PostgreSQL 11+ for INCLUDE)
+    """
+    # Predictions list: id, upload_id, status, rows_processed, created_at, s3_output_key
+    op.create_index(
+        'idx_predictions_user_created_id_covering',
+        'predictions',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_using='btree',
+        postgresql_include=['status', 'rows_processed', 'upload_id', 's3_output_key']
+    )
+
+    # Superseded by the covering index above (same leading columns)
+    op.drop_index('idx_predictions_user_created', table_name='predictions')
+
+    # Uploads list: id, user_id, filename, s3_object_key, file_size, created_at
+    op.create_index(
+        'idx_uploads_user_created_id_covering',
+        'uploads',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_using='btree',
+        postgresql_include=['filename', 'file_size', 's3_object_key']
+    )
+
+
+def downgrade() -> None:
+    """
+    Rollback: restore the plain composite index and drop the covering indexes
+
+    IMPACT:
+    - Listings still work (keyset predicate falls back to a filter + sort)
+    - No data loss
+    """
+    op.drop_index('idx_uploads_user_created_id_covering', table_name='uploads')
+
+    op.create_index(
+        'idx_predictions_user_created',
+        'predictions',
+        ['user_id', 'created_at'],
+        unique=False,
+        postgresql_using='btree'
+    )
+    op.drop_index('idx_predictions_user_created_id_covering', table_name='predictions')
@@ -0,0 +1,67 @@
+"""add_ml_training_outcomes_index
+
+Adds a partial covering index for the experiment report
+(backend/services/experiment_analytics.py):
+
+    ix_ml_training_data_outcomes
+        ON ml_training_data (experiment_group, model_type)
+        INCLUDE (actual_churned, predicted_churn_prob, predicted_at)
+        WHERE actual_churned IS NOT NULL
+
+The report's queries filter on `actual_churned IS NOT NULL`, group by
+(experiment_group, model_type) and only read the included columns, so they
+are index-only scans over labeled rows; unlabeled predictions (most of the
+table) are never read.
+
+ix_ml_training_data_actual_churned had the same predicate on a boolean key
+and is superseded: the new index serves every query it could.
+
+Revision ID: ml_training_outcomes_idx
+Revises: add_prediction_progress
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ml_training_outcomes_idx'
+down_revision = 'add_prediction_progress'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add the partial covering index (PostgreSQL 11+ for INCLUDE)
+    """
+    op.create_index(
+        'ix_ml_training_data_outcomes',
+        'ml_training_data',
+        ['experiment_group', 'model_type'],
+        unique=False,
+        postgresql_using='btree',
+        postgresql_include=['actual_churned', 'predicted_churn_prob', 'predicted_at'],
+        postgresql_where=sa.text('actual_churned IS NOT NULL')
+    )
+
+    op.drop_index('ix_ml_training_data_actual_churned', table_name='ml_training_data')
+
+
+def downgrade() -> None:
+    """
+    Rollback: restore the boolean partial index
+
+    IMPACT:
+    - Experiment report falls back to scanning labeled rows
+    - No data loss
+    """
+    op.create_index(
+        'ix_ml_training_data_actual_churned',
+        'ml_training_data',
+        ['actual_churned'],
+        unique=False,
+        postgresql_where=sa.text('actual_churned IS NOT NULL')
+    )
+    op.drop_index('ix_ml_training_data_outcomes', table_name='ml_training_data')
@@ -0,0 +1,71 @@
+"""Add stage-level progress columns to predictions table
+
+Revision ID: add_prediction_progress
+Revises: keyset_covering_idx
+Create Date: 2026-01-13 10:00:00.000000
+
+Adds progress_stage, progress_percent, progress_rows_done and
+progress_rows_total, written by the worker's ProgressReporter (throttled to
+at most one UPDATE per second per prediction) and returned in
+PredictionDetail while a prediction is RUNNING.
+
+All columns are nullable or have a server default, so this is a
+metadata-only change on PostgreSQL 11+ (no table rewrite).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_prediction_progress'
+down_revision = 'keyset_covering_idx'
+branch_labels = None
+depends_on = None
+
+
+def _progress_columns():
+    # Fresh Column objects per call (a Column can only be attached once)
+    return [
+        sa.Column(
+            'progress_stage',
+            sa.String(20),
+            nullable=True,
+            comment='Current pipeline stage (download, parse, map, validate, predict, explain, upload)'
+        ),
+        sa.Column('progress_percent', sa.SmallInteger(), nullable=False, server_default='0'),
+        sa.Column('progress_rows_done', sa.Integer(), nullable=True),
+        sa.Column('progress_rows_total', sa.Integer(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    """Add progress columns to predictions table"""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if inspector.has_table("predictions"):
+        columns = [col['name'] for col in inspector.get_columns("predictions")]
+
+        for column in _progress_columns():
+            if column.name not in columns:
+                op.add_column('predictions', column)
+                print(f"✅ Added column: {column.name}")
+            else:
+                print(f"⏭️  Column already exists: {column.name}")
+    else:
+        print("⚠️  Table 'predictions' does not exist - skipping migration")
+
+
+def downgrade() -> None:
+    """Remove progress columns from predictions table"""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if inspector.has_table("predictions"):
+        columns = [col['name'] for col in inspector.get_columns("predictions")]
+
+        for column in reversed(_progress_columns()):
+            if column.name in columns:
+                op.drop_column('predictions', column.name)
+                print(f"✅ Dropped column: {column.name}")
+    else:
+        print("⚠️  Table 'predictions' does not exist - skipping downgrade")
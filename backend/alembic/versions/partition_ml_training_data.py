@@ -0,0 +1,237 @@
+"""partition_ml_training_data
+
+Rebuilds ml_training_data for long-term growth (see
+backend/services/training_storage.py):
+
+1. PARTITION BY RANGE (predicted_at), one partition per month
+   (ml_training_data_YYYY_MM) from the oldest existing row through three
+   months ahead, plus ml_training_data_default so an insert never fails
+   if maintenance falls behind. The primary key becomes (id, predicted_at)
+   (PostgreSQL requires the partition key in it); id becomes a BIGINT
+   identity.
+2. features_json: json -> jsonb. Existing rows keep their layout; new rows
+   use the compact encoding (short keys, no nulls).
+3. model_type / experiment_group: varchar -> smallint codes
+   (training_storage.MODEL_TYPES / EXPERIMENT_GROUPS, unknown -> 0).
+4. Indexes (created per partition):
+   - ix_ml_training_data_open_by_customer (customer_id, predicted_at)
+     WHERE actual_churned IS NULL: outcome lookups; replaces the full
+     customer_id index
+   - ix_ml_training_data_prediction_id (prediction_id)
+   - ix_ml_training_data_outcomes (experiment_group, model_type) INCLUDE
+     (...) WHERE actual_churned IS NOT NULL: experiment report
+   predicted_at and model_type indexes are dropped: partition pruning
+   covers predicted_at, and model_type is only filtered via the outcomes
+   index.
+5. ml_training_rollup for the retention job.
+
+Rows are copied in one INSERT ... SELECT; the table is small at this point.
+Create partitions ahead with `python -m backend.scripts.maintain_training_partitions`.
+
+Revision ID: partition_ml_training
+Revises: ml_training_outcomes_idx
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_ml_training'
+down_revision = 'ml_training_outcomes_idx'
+branch_labels = None
+depends_on = None
+
+# Frozen copies of training_storage's code lists at this revision
+MODEL_TYPES = (
+    'unknown', 'telecom', 'saas_baseline', 'telecom_aligned',
+    'saas_baseline_fallback', 'telecom_fallback', 'saas_baseline_v1'
+)
+EXPERIMENT_GROUPS = ('other', 'control', 'treatment', 'fallback')
+MONTHS_AHEAD = 3
+
+
+def _encode_case(column: str, values) -> str:
+    whens = " ".join(f"WHEN '{value}' THEN {code}" for code, value in enumerate(values))
+    return f"CASE {column} {whens} ELSE 0 END"
+
+
+def _decode_case(column: str, values) -> str:
+    whens = " ".join(f"WHEN {code} THEN '{value}'" for code, value in enumerate(values))
+    return f"CASE {column} {whens} END"
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes() -> None:
+    op.create_index(
+        'ix_ml_training_data_open_by_customer',
+        'ml_training_data',
+        ['customer_id', 'predicted_at'],
+        unique=False,
+        postgresql_where=sa.text('actual_churned IS NULL')
+    )
+    op.create_index('ix_ml_training_data_prediction_id', 'ml_training_data', ['prediction_id'], unique=False)
+    op.create_index(
+        'ix_ml_training_data_outcomes',
+        'ml_training_data',
+        ['experiment_group', 'model_type'],
+        unique=False,
+        postgresql_include=['actual_churned', 'predicted_churn_prob', 'predicted_at'],
+        postgresql_where=sa.text('actual_churned IS NOT NULL')
+    )
+
+
+def upgrade() -> None:
+    """
+    Replace ml_training_data with a monthly-partitioned, compact table
+    """
+    conn = op.get_bind()
+
+    # Free the names the new table needs (primary key, id sequence, indexes)
+    op.execute("ALTER TABLE ml_training_data RENAME TO ml_training_data_legacy")
+    op.execute("ALTER TABLE ml_training_data_legacy RENAME CONSTRAINT ml_training_data_pkey TO ml_training_data_legacy_pkey")
+    op.execute("ALTER SEQUENCE IF EXISTS ml_training_data_id_seq RENAME TO ml_training_data_legacy_id_seq")
+    for index in ('customer_id', 'prediction_id', 'predicted_at', 'model_type', 'outcomes'):
+        op.execute(f"DROP INDEX IF EXISTS ix_ml_training_data_{index}")
+
+    op.execute("""
+        CREATE TABLE ml_training_data (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+            customer_id VARCHAR(100) NOT NULL,
+            prediction_id VARCHAR(100),
+            features_json JSONB NOT NULL,
+            predicted_churn_prob DOUBLE PRECISION NOT NULL,
+            predicted_retention_prob DOUBLE PRECISION NOT NULL,
+            model_type SMALLINT NOT NULL,
+            experiment_group SMALLINT,
+            actual_churned BOOLEAN,
+            outcome_recorded_at TIMESTAMP WITH TIME ZONE,
+            days_to_outcome INTEGER,
+            predicted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, predicted_at)
+        ) PARTITION BY RANGE (predicted_at)
+    """)
+
+    oldest = conn.execute(sa.text("SELECT min(predicted_at) FROM ml_training_data_legacy")).scalar()
+    current = date(datetime.utcnow().year, datetime.utcnow().month, 1)
+    month = date(oldest.year, oldest.month, 1) if oldest else current
+    while month <= _add_months(current, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE ml_training_data_{month:%Y_%m} PARTITION OF ml_training_data "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE ml_training_data_default PARTITION OF ml_training_data DEFAULT")
+
+    _create_indexes()
+
+    op.execute(f"""
+        INSERT INTO ml_training_data (
+            id, customer_id, prediction_id, features_json, predicted_churn_prob,
+            predicted_retention_prob, model_type, experiment_group, actual_churned,
+            outcome_recorded_at, days_to_outcome, predicted_at, created_at, updated_at
+        )
+        SELECT
+            id, customer_id, prediction_id, features_json::jsonb, predicted_churn_prob,
+            predicted_retention_prob, {_encode_case('model_type', MODEL_TYPES)},
+            CASE WHEN experiment_group IS NULL THEN NULL
+                 ELSE {_encode_case('experiment_group', EXPERIMENT_GROUPS)} END,
+            actual_churned, outcome_recorded_at, days_to_outcome,
+            predicted_at, created_at, updated_at
+        FROM ml_training_data_legacy
+    """)
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('ml_training_data', 'id'), "
+        "coalesce((SELECT max(id) FROM ml_training_data), 0) + 1, false)"
+    )
+    op.execute("DROP TABLE ml_training_data_legacy")
+
+    op.create_table(
+        'ml_training_rollup',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('model_type', sa.SmallInteger(), nullable=False),
+        sa.Column('experiment_group', sa.SmallInteger(), nullable=False),
+        sa.Column('n_predictions', sa.Integer(), nullable=False),
+        sa.Column('n_labeled', sa.Integer(), nullable=False),
+        sa.Column('n_churned', sa.Integer(), nullable=False),
+        sa.Column('sum_predicted_churn_prob', sa.Float(), nullable=False),
+        sa.Column('rolled_up_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('month', 'model_type', 'experiment_group')
+    )
+
+
+def downgrade() -> None:
+    """
+    Rollback: back to a single (unpartitioned) table with string columns
+
+    IMPACT:
+    - Months already dropped by retention are not restored (rollups are lost)
+    - Rows written since the upgrade keep the compact feature keys
+    """
+    op.drop_table('ml_training_rollup')
+
+    op.execute("ALTER TABLE ml_training_data RENAME TO ml_training_data_partitioned")
+    op.execute("ALTER TABLE ml_training_data_partitioned RENAME CONSTRAINT ml_training_data_pkey TO ml_training_data_partitioned_pkey")
+    op.execute("ALTER SEQUENCE IF EXISTS ml_training_data_id_seq RENAME TO ml_training_data_partitioned_id_seq")
+    for index in ('open_by_customer', 'prediction_id', 'outcomes'):
+        op.execute(f"DROP INDEX IF EXISTS ix_ml_training_data_{index}")
+
+    op.create_table(
+        "ml_training_data",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True, nullable=False),
+        sa.Column("customer_id", sa.String(100), nullable=False),
+        sa.Column("prediction_id", sa.String(100), nullable=True),
+        sa.Column("features_json", sa.JSON(), nullable=False),
+        sa.Column("predicted_churn_prob", sa.Float(), nullable=False),
+        sa.Column("predicted_retention_prob", sa.Float(), nullable=False),
+        sa.Column("model_type", sa.String(50), nullable=False),
+        sa.Column("experiment_group", sa.String(20), nullable=True),
+        sa.Column("actual_churned", sa.Boolean(), nullable=True),
+        sa.Column("outcome_recorded_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("days_to_outcome", sa.Integer(), nullable=True),
+        sa.Column("predicted_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+    )
+    op.execute(f"""
+        INSERT INTO ml_training_data (
+            id, customer_id, prediction_id, features_json, predicted_churn_prob,
+            predicted_retention_prob, model_type, experiment_group, actual_churned,
+            outcome_recorded_at, days_to_outcome, predicted_at, created_at, updated_at
+        )
+        SELECT
+            id, customer_id, prediction_id, features_json::json, predicted_churn_prob,
+            predicted_retention_prob, {_decode_case('model_type', MODEL_TYPES)},
+            {_decode_case('experiment_group', EXPERIMENT_GROUPS)},
+            actual_churned, outcome_recorded_at, days_to_outcome,
+            predicted_at, created_at, updated_at
+        FROM ml_training_data_partitioned
+    """)
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('ml_training_data', 'id'), "
+        "coalesce((SELECT max(id) FROM ml_training_data), 0) + 1, false)"
+    )
+    op.execute("DROP TABLE ml_training_data_partitioned")
+
+    op.create_index("ix_ml_training_data_customer_id", "ml_training_data", ["customer_id"], unique=False)
+    op.create_index("ix_ml_training_data_prediction_id", "ml_training_data", ["prediction_id"], unique=False)
+    op.create_index("ix_ml_training_data_predicted_at", "ml_training_data", ["predicted_at"], unique=False)
+    op.create_index("ix_ml_training_data_model_type", "ml_training_data", ["model_type"], unique=False)
+    op.create_index(
+        'ix_ml_training_data_outcomes',
+        'ml_training_data',
+        ['experiment_group', 'model_type'],
+        unique=False,
+        postgresql_include=['actual_churned', 'predicted_churn_prob', 'predicted_at'],
+        postgresql_where=sa.text('actual_churned IS NOT NULL')
+    )
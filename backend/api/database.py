@@ -1,30 +1,97 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from dotenv import load_dotenv
+import logging
 import os
+import time
 
 # Load environment variables
 load_dotenv()
 
+from backend.core.config import settings  # noqa: E402  (after load_dotenv)
+
+logger = logging.getLogger(__name__)
+
 # Get database URL and replace protocol for asyncpg
 DATABASE_URL = os.getenv("DATABASE_URL", "").replace("postgresql://", "postgresql+asyncpg://")
 
-# Create async engine with conditional configuration
-if "sqlite" in DATABASE_URL.lower():
-    # SQLite configuration (for testing)
-    engine = create_async_engine(
-        DATABASE_URL,
-        echo=True,  # Set to False in production
-    )
-else:
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that reports checkout latency and saturation
+
+    Emits (per checkout, aggregated in-process by the EMF client):
+    - DBPoolCheckoutLatency: time spent waiting for a connection (ms)
+    - DBPoolCheckedOut: connections in use
+    - DBPoolSaturation: in-use connections as % of pool_size + max_overflow
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        connection = super()._do_get()
+        self._record_checkout((time.perf_counter() - start) * 1000)
+        return connection
+
+    def _record_checkout(self, wait_ms: float) -> None:
+        try:
+            from backend.monitoring.metrics import get_metrics_client, MetricUnit, MetricNamespace
+
+            metrics = get_metrics_client()
+            dimensions = {"Profile": settings.DB_POOL_PROFILE}
+            checked_out = self.checkedout()
+            capacity = max(1, self.size() + max(0, self._max_overflow))
+
+            metrics.observe(
+                "DBPoolCheckoutLatency", wait_ms, MetricUnit.MILLISECONDS,
+                MetricNamespace.DATABASE, dimensions
+            )
+            metrics.set_gauge(
+                "DBPoolCheckedOut", checked_out, MetricUnit.COUNT,
+                MetricNamespace.DATABASE, dimensions
+            )
+            metrics.set_gauge(
+                "DBPoolSaturation", min(100.0, checked_out * 100.0 / capacity), MetricUnit.PERCENT,
+                MetricNamespace.DATABASE, dimensions
+            )
+        except Exception as e:
+            # Metrics must never break a checkout
+            logger.debug(f"Pool metrics skipped: {e}")
+
+
+def build_engine_kwargs(database_url: str) -> dict:
+    """
+    Engine keyword arguments for the configured DB_POOL_PROFILE
+
+    Args:
+        database_url: SQLAlchemy async database URL
+
+    Returns:
+        dict: Keyword arguments for create_async_engine
+    """
+    if "sqlite" in database_url.lower():
+        # SQLite configuration (for testing)
+        return {"echo": settings.DB_ECHO}
+
     # PostgreSQL configuration (for production)
-    engine = create_async_engine(
-        DATABASE_URL,
-        echo=True,  # Set to False in production
-        pool_pre_ping=True,  # Enable connection pool pre-ping
-        pool_size=10,  # Maximum number of connections in the pool
-        max_overflow=20  # Maximum number of connections that can be created beyond pool_size
-    )
+    return {
+        "echo": settings.DB_ECHO,
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_pre_ping": True,  # Enable connection pool pre-ping
+        "pool_size": settings.DB_POOL_SIZE,  # Persistent connections kept in the pool
+        "max_overflow": settings.DB_MAX_OVERFLOW,  # Extra connections allowed under burst load
+        "pool_recycle": settings.DB_POOL_RECYCLE,  # Recycle before RDS/NAT idle timeouts
+        "pool_timeout": settings.DB_POOL_TIMEOUT,  # Seconds to wait for a free connection
+        "connect_args": {
+            # Client-side LRU of prepared statements per connection (asyncpg)
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {"application_name": f"retainwise-{settings.DB_POOL_PROFILE}"},
+        },
+    }
+
+
+# Create async engine with profile-based configuration
+engine = create_async_engine(DATABASE_URL, **build_engine_kwargs(DATABASE_URL))
 
 # canonical factory (lowercase snake_case)
 async_session_maker = async_sessionmaker(
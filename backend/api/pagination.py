@@ -0,0 +1,113 @@
+"""
+Keyset (cursor) pagination helpers
+
+History listings are ordered by (created_at DESC, id DESC). Instead of
+OFFSET (which scans and discards every skipped row), each page continues
+strictly after the last row of the previous page:
+
+    WHERE user_id = :uid AND (created_at, id) < (:last_created_at, :last_id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :page_size + 1
+
+With a (user_id, created_at DESC, id DESC) index this is a single index
+range scan, so every page costs O(page) no matter how deep the user pages.
+
+Cursors are opaque to clients: URL-safe base64 of {"c": created_at, "i": id}.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    """
+    Build an opaque cursor pointing at a row
+
+    Args:
+        created_at: Row creation timestamp
+        row_id: Row primary key (int or UUID)
+
+    Returns:
+        str: URL-safe cursor
+    """
+    raw = json.dumps({"c": created_at.isoformat(), "i": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, id_type: Callable[[str], Any] = str) -> Tuple[datetime, Any]:
+    """
+    Parse a cursor produced by encode_cursor
+
+    Args:
+        cursor: Opaque cursor from a previous page
+        id_type: Converter for the id component (e.g. int, uuid.UUID)
+
+    Returns:
+        tuple: (created_at, id)
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(data["c"]), id_type(data["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    """Clamp a requested page size to [1, MAX_PAGE_SIZE]"""
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def keyset_predicate(
+    created_at_column: ColumnElement,
+    id_column: ColumnElement,
+    cursor: str,
+    id_type: Callable[[str], Any] = str
+) -> ColumnElement:
+    """
+    WHERE clause selecting rows strictly after the cursor (descending order)
+
+    Args:
+        created_at_column: Timestamp sort column
+        id_column: Primary key tie-breaker column
+        cursor: Cursor from the previous page
+        id_type: Converter for the id component
+
+    Returns:
+        SQL expression `(created_at, id) < (:c, :i)`
+    """
+    created_at, row_id = decode_cursor(cursor, id_type)
+    return tuple_(created_at_column, id_column) < tuple_(created_at, row_id)
+
+
+def split_page(rows: Sequence[Any], page_size: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim a LIMIT page_size + 1 result to one page and compute the next cursor
+
+    Rows must expose `created_at` and `id` attributes.
+
+    Args:
+        rows: Rows fetched with limit page_size + 1
+        page_size: Requested page size
+
+    Returns:
+        tuple: (page rows, next cursor or None if this is the last page)
+    """
+    page = list(rows[:page_size])
+    if len(rows) <= page_size or not page:
+        return page, None
+    last = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
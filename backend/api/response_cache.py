@@ -0,0 +1,143 @@
+"""
+Response Cache with Strong ETags for Prediction Reads
+
+The dashboard polls the prediction endpoints every few seconds, and almost
+every poll returns exactly what the previous one did. Each cached response
+is keyed by:
+
+    (user_id, endpoint, params, version)
+
+where `version` is read with one small indexed query (a prediction's
+`updated_at`, or the user's latest `updated_at` and row count). Because the
+version is part of the key, any status change the worker commits produces a
+new key, even in another process; nothing stale can be served.
+
+The ETag is derived from the key alone, so a matching If-None-Match gets a
+304 after just the version query - no row loading, no S3 download, no body.
+A cache hit without a matching ETag skips the same work and returns the
+stored body.
+
+Invalidation:
+- Worker status transitions call `invalidate_user_responses()` (frees memory
+  early when API and worker share a process; the version key covers the rest)
+- Entries also expire after RESPONSE_CACHE_TTL_SECONDS
+
+Usage:
+    key = (user_id, "prediction_detail", (prediction_id,), updated_at)
+    not_modified = check_not_modified(key, if_none_match, response)
+    if not_modified:
+        return not_modified
+    cached = get_response_cache().get(key)
+"""
+import os
+import hashlib
+import logging
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from fastapi import Response
+
+from backend.core.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+# Browsers may store the response but must revalidate it on every poll
+CACHE_CONTROL = "private, no-cache"
+
+CacheKey = Tuple[str, str, Tuple[Hashable, ...], Hashable]
+
+
+class ResponseCache(TTLCache[CacheKey, Any]):
+    """
+    Bounded TTL LRU of (user_id, endpoint, params, version) -> response body
+    """
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE, ttl_seconds: int = RESPONSE_CACHE_TTL_SECONDS):
+        super().__init__(max_size, ttl_seconds)
+        self.not_modified_count = 0
+
+    def invalidate_user(self, user_id: str) -> int:
+        """
+        Drop every cached response for a user
+
+        Returns:
+            int: Number of entries removed
+        """
+        return self.discard_where(lambda key: key[0] == user_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current cache statistics"""
+        return {**super().get_stats(), "not_modified_count": self.not_modified_count}
+
+
+# Global cache instance
+_response_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get global response cache
+
+    Returns:
+        ResponseCache: Singleton cache instance
+    """
+    return _response_cache
+
+
+def invalidate_user_responses(user_id: Optional[str]) -> None:
+    """
+    Invalidate a user's cached prediction responses after a status change
+
+    Args:
+        user_id: Prediction owner (no-op if falsy)
+    """
+    if user_id:
+        removed = _response_cache.invalidate_user(str(user_id))
+        if removed:
+            logger.debug(f"Invalidated {removed} cached responses for user {user_id}")
+
+
+# ========================================
+# ETAGS
+# ========================================
+
+def make_etag(key: CacheKey) -> str:
+    """Strong ETag for a cache key (same key -> byte-identical body)"""
+    return '"' + hashlib.sha256(repr(key).encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match comparison (RFC 9110: weak comparison, '*' matches anything)
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def check_not_modified(key: CacheKey, if_none_match: Optional[str], response: Response) -> Optional[Response]:
+    """
+    Set ETag/Cache-Control on the response and short-circuit conditional GETs
+
+    Args:
+        key: Cache key of the response about to be served
+        if_none_match: Request If-None-Match header
+        response: FastAPI-injected response (receives the headers)
+
+    Returns:
+        A 304 response if the client's copy is current, else None
+    """
+    etag = make_etag(key)
+    if etag_matches(if_none_match, etag):
+        _response_cache.not_modified_count += 1
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
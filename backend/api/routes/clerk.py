@@ -15,6 +15,7 @@ from backend.api.database import get_db
 from backend.models import User
 from backend.schemas.clerk import ClerkWebhookPayload, WebhookResponse, UserCreate, UserUpdate
 from backend.auth.middleware import get_current_user
+from backend.auth.user_cache import invalidate_cached_user
 
 logger = logging.getLogger(__name__)
 
@@ -230,6 +231,7 @@ async def handle_user_created(clerk_user_data, db: AsyncSession) -> WebhookRespo
         db.add(new_user)
         await db.commit()
         await db.refresh(new_user)
+        invalidate_cached_user(user_data.clerk_id)
         
         logger.info(f"Created new user: {new_user.id} ({user_data.email})")
         
@@ -290,6 +292,7 @@ async def handle_user_updated(clerk_user_data, db: AsyncSession) -> WebhookRespo
         
         await db.commit()
         await db.refresh(existing_user)
+        invalidate_cached_user(clerk_user_data.id)
         
         logger.info(f"Updated user: {existing_user.id} ({user_data.email})")
         
@@ -372,6 +375,7 @@ async def sync_user_from_frontend(
         db.add(new_user)
         await db.commit()
         await db.refresh(new_user)
+        invalidate_cached_user(clerk_id)
         
         logger.info(f"Created new user from frontend sync: {new_user.id} ({email})")
         
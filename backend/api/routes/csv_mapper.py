@@ -14,12 +14,12 @@ Version: 2.0 (Enhanced with security fixes)
 from fastapi import APIRouter, HTTPException, UploadFile, File, Query
 from fastapi.responses import FileResponse, StreamingResponse
 from typing import Dict, Any
-import pandas as pd
 import io
 import logging
 from pathlib import Path
 
-from backend.ml.column_mapper import IntelligentColumnMapper
+# pandas and the column mapper are imported on first request, not at API
+# startup (see backend/core/startup.py)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/csv", tags=["csv-mapping"])
@@ -65,6 +65,9 @@ async def preview_column_mapping(
             "suggestions": ["✅ All required columns detected!"]
         }
     """
+    import pandas as pd
+    from backend.ml.column_mapper import IntelligentColumnMapper
+    
     try:
         # Read CSV
         content = await file.read()
@@ -230,6 +233,8 @@ async def get_supported_columns(industry: str):
             "optional": ["gender", "SeniorCitizen", ...]
         }
     """
+    from backend.ml.column_mapper import IntelligentColumnMapper
+    
     try:
         mapper = IntelligentColumnMapper(industry=industry)
         
@@ -0,0 +1,183 @@
+"""
+Churn Outcome Ingestion API
+
+Labels past predictions with actual churn outcomes, in bulk, so they become
+training data (see RealDataCollector.record_churn_outcomes):
+
+- POST /api/outcomes      JSON: {"outcomes": [{"customer_id", "churned", "date"}]}
+- POST /api/outcomes/csv  CSV upload with customer_id, churned[, date] columns
+  (e.g. a billing export; customerID is accepted for customer_id)
+
+Each outcome labels the caller's most recent unlabeled prediction for that
+customer. The response reports how many customers matched a prediction and
+which did not.
+"""
+import csv
+import io
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.database import get_db
+from backend.auth.middleware import get_current_user
+
+# data_collector (pandas) is imported on first request, not at API startup
+# (see backend/core/startup.py)
+
+logger = logging.getLogger(__name__)
+
+# One billing month for a large customer; larger files should be split
+MAX_OUTCOMES_PER_REQUEST = 50000
+# Checked before the CSV is read into memory (~200 bytes per row at most)
+MAX_OUTCOMES_CSV_BYTES = 10 * 1024 * 1024
+
+CSV_COLUMN_ALIASES = {'customerid': 'customer_id', 'churn': 'churned', 'churn_date': 'date'}
+
+router = APIRouter(tags=["outcomes"])
+
+
+class ChurnOutcome(BaseModel):
+    """One observed outcome"""
+    customer_id: str = Field(..., min_length=1, max_length=100)
+    churned: bool
+    date: Optional[datetime] = Field(None, description="Churn/renewal date or timestamp (default: now)")
+
+    @field_validator("date", mode="before")
+    @classmethod
+    def date_only(cls, value: Any) -> Any:
+        # Billing exports usually carry plain dates (YYYY-MM-DD)
+        if isinstance(value, str) and len(value) == 10:
+            return datetime.combine(date.fromisoformat(value), datetime.min.time())
+        return value
+
+
+class OutcomeBatch(BaseModel):
+    """JSON request body"""
+    outcomes: List[ChurnOutcome] = Field(..., max_length=MAX_OUTCOMES_PER_REQUEST)
+
+
+class OutcomeIngestResponse(BaseModel):
+    """Matched/unmatched counts for a batch"""
+    success: bool
+    received: int
+    customers: int
+    matched: int
+    unmatched: int
+    unmatched_customer_ids: List[str]
+
+
+def _require_user_id(current_user: Dict[str, Any]) -> str:
+    user_id = current_user.get("id")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="User ID not found in authentication token")
+    return user_id
+
+
+def parse_outcomes_csv(content: bytes) -> List[ChurnOutcome]:
+    """
+    Parse an outcomes CSV
+
+    Raises:
+        HTTPException: 400 for missing columns or invalid rows (with row number)
+    """
+    text = content.decode("utf-8-sig")
+    reader = csv.DictReader(io.StringIO(text))
+    columns = {
+        name: CSV_COLUMN_ALIASES.get(name.strip().lower(), name.strip().lower())
+        for name in reader.fieldnames or []
+    }
+    missing = {"customer_id", "churned"} - set(columns.values())
+    if missing:
+        raise HTTPException(status_code=400, detail=f"CSV is missing columns: {', '.join(sorted(missing))}")
+
+    outcomes = []
+    for line, row in enumerate(reader, start=2):
+        if len(outcomes) >= MAX_OUTCOMES_PER_REQUEST:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {MAX_OUTCOMES_PER_REQUEST} outcomes per request"
+            )
+        values = {columns[name]: value for name, value in row.items() if name in columns and value not in (None, "")}
+        try:
+            outcomes.append(ChurnOutcome(**values))
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            raise HTTPException(status_code=400, detail=f"Row {line}: {field}: {error['msg']}")
+    return outcomes
+
+
+async def _ingest(outcomes: List[ChurnOutcome], user_id: str, db: AsyncSession) -> OutcomeIngestResponse:
+    from backend.services.data_collector import get_data_collector
+
+    result = await get_data_collector().record_churn_outcomes(
+        ((o.customer_id, o.churned, o.date) for o in outcomes), user_id=user_id, db=db
+    )
+    return OutcomeIngestResponse(success=True, **result)
+
+
+@router.post("/outcomes", response_model=OutcomeIngestResponse)
+async def ingest_outcomes(
+    batch: OutcomeBatch,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Record churn outcomes for the authenticated user's predictions
+
+    Args:
+        batch: Outcomes (customer_id, churned, optional date)
+
+    Returns:
+        Matched/unmatched counts
+    """
+    user_id = _require_user_id(current_user)
+    try:
+        return await _ingest(batch.outcomes, user_id, db)
+    except Exception as e:
+        logger.error(f"Error ingesting outcomes: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to record outcomes")
+
+
+@router.post("/outcomes/csv", response_model=OutcomeIngestResponse)
+async def ingest_outcomes_csv(
+    file: UploadFile = File(...),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Record churn outcomes from a CSV (customer_id, churned[, date])
+
+    Args:
+        file: CSV upload (at most MAX_OUTCOMES_CSV_BYTES); churned accepts
+            true/false, yes/no, 1/0
+
+    Returns:
+        Matched/unmatched counts
+    """
+    user_id = _require_user_id(current_user)
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"CSV exceeds {MAX_OUTCOMES_CSV_BYTES // (1024 * 1024)}MB; split it into smaller files"
+    )
+    if file.size is not None and file.size > MAX_OUTCOMES_CSV_BYTES:
+        raise too_large
+    # Bounded read: file.size is not always known
+    content = await file.read(MAX_OUTCOMES_CSV_BYTES + 1)
+    if len(content) > MAX_OUTCOMES_CSV_BYTES:
+        raise too_large
+
+    try:
+        outcomes = parse_outcomes_csv(content)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+
+    try:
+        return await _ingest(outcomes, user_id, db)
+    except Exception as e:
+        logger.error(f"Error ingesting outcomes CSV: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to record outcomes")
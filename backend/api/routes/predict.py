@@ -1,20 +1,44 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
-import pandas as pd
 from pathlib import Path
 
 from backend.api.database import get_db
 from backend.models import Upload
 from backend.api.schemas.predict import PredictionResponse
-from backend.ml.predict import RetentionPredictor
 from backend.auth.middleware import get_current_user, require_user_ownership
 
 router = APIRouter()
 
-# Initialize the predictor
-predictor = RetentionPredictor()
+# The predictor (and pandas/xgboost/sklearn with it) is loaded on first use,
+# not at API startup
+_predictor = None
+_predictor_lock = asyncio.Lock()
+
+async def get_predictor():
+    """
+    Get the lazily constructed RetentionPredictor
+
+    The import and model load take seconds, so they run in a worker thread
+    instead of blocking the event loop; the lock keeps concurrent first
+    requests from loading the model twice.
+    """
+    global _predictor
+
+    if _predictor is not None:
+        return _predictor
+
+    async with _predictor_lock:
+        if _predictor is None:
+            _predictor = await asyncio.to_thread(_load_predictor)
+
+    return _predictor
+
+def _load_predictor():
+    from backend.ml.predict import RetentionPredictor
+    return RetentionPredictor()
 
 @router.post("/predict_retention", response_model=PredictionResponse)
 async def predict_retention(
@@ -52,6 +76,7 @@ async def predict_retention(
         
         # Load and validate data
         try:
+            import pandas as pd
             df = pd.read_csv(file_path)
             required_cols = [
                 'customerID', 'gender', 'SeniorCitizen', 'Partner', 'Dependents',
@@ -70,6 +95,7 @@ async def predict_retention(
             raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
         
         # Make predictions
+        predictor = await get_predictor()
         df_predicted = predictor.predict(df)
         
         # Save predictions
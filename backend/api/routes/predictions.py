@@ -1,21 +1,35 @@
 """
 Predictions API routes for managing ML prediction results
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, and_
+from sqlalchemy import select, desc, and_, func
 from typing import List, Optional, Dict, Any
+import json
+import asyncio
 import logging
 import uuid as uuid_lib
 
-from backend.api.database import get_db
+from backend.api.database import get_db, async_session_maker
 from backend.models import Prediction, PredictionStatus
-from backend.services.s3_service import s3_service
+from backend.services.s3_service import s3_service, async_s3_service
 from backend.core.config import settings
 from backend.auth.middleware import get_current_user
+from backend.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    keyset_predicate,
+    split_page
+)
+from backend.api.response_cache import get_response_cache, check_not_modified
+from backend.services.prediction_events import get_prediction_event_hub, build_prediction_event
 
 logger = logging.getLogger(__name__)
 
+# Comment line sent on idle streams so proxies/ALB keep the connection open
+SSE_HEARTBEAT_SECONDS = 15
+
 router = APIRouter(tags=["predictions"])
 
 # Pydantic response models
@@ -42,6 +56,10 @@ class PredictionDetail(BaseModel):
     rows_processed: int
     metrics_json: Optional[Dict[str, Any]]
     error_message: Optional[str]
+    progress_stage: Optional[str] = None
+    progress_percent: int = 0
+    progress_rows_done: Optional[int] = None
+    progress_rows_total: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
@@ -50,6 +68,7 @@ class PredictionListResponse(BaseModel):
     success: bool
     predictions: List[PredictionListItem]
     count: int
+    next_cursor: Optional[str] = None
 
 class PredictionDetailResponse(BaseModel):
     """Response schema for prediction details"""
@@ -64,14 +83,23 @@ class DownloadUrlResponse(BaseModel):
 
 @router.get("/", response_model=PredictionListResponse)
 async def list_predictions(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    if_none_match: Optional[str] = Header(None),
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get latest 20 predictions for the authenticated user
+    Get predictions for the authenticated user, newest first (keyset-paginated)
+    
+    Args:
+        limit: Page size (default 20, max 100)
+        cursor: Opaque cursor returned as `next_cursor` by the previous page
+        if_none_match: ETag from a previous response (304 if unchanged)
     
     Returns:
-        List of predictions with basic information
+        List of predictions with basic information and the cursor for the next page
     """
     try:
         # Extract user_id from JWT token (already validated by get_current_user)
@@ -82,16 +110,41 @@ async def list_predictions(
                 detail="User ID not found in authentication token"
             )
         
-        # Query latest 20 predictions for authenticated user
+        # Any insert or status change moves the newest updated_at (or the count)
+        version_result = await db.execute(
+            select(func.max(Prediction.updated_at), func.count())
+            .where(Prediction.user_id == user_id)
+        )
+        cache_key = (user_id, "list_predictions", (limit, cursor), tuple(version_result.one()))
+        not_modified = check_not_modified(cache_key, if_none_match, response)
+        if not_modified:
+            return not_modified
+        cached = get_response_cache().get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Project only list columns (skips metrics_json / error_message);
+        # served by the (user_id, created_at DESC, id DESC) covering index
         stmt = (
-            select(Prediction)
+            select(
+                Prediction.id,
+                Prediction.upload_id,
+                Prediction.status,
+                Prediction.rows_processed,
+                Prediction.created_at,
+                Prediction.s3_output_key
+            )
             .where(Prediction.user_id == user_id)
-            .order_by(desc(Prediction.created_at))
-            .limit(20)
+            .order_by(desc(Prediction.created_at), desc(Prediction.id))
+            .limit(limit + 1)
         )
+        if cursor:
+            stmt = stmt.where(
+                keyset_predicate(Prediction.created_at, Prediction.id, cursor, uuid_lib.UUID)
+            )
         
         result = await db.execute(stmt)
-        predictions = result.scalars().all()
+        predictions, next_cursor = split_page(result.all(), limit)
         
         # Convert to response format
         prediction_items = []
@@ -107,11 +160,14 @@ async def list_predictions(
         
         logger.info(f"Retrieved {len(prediction_items)} predictions for user {user_id}")
         
-        return PredictionListResponse(
+        page = PredictionListResponse(
             success=True,
             predictions=prediction_items,
-            count=len(prediction_items)
+            count=len(prediction_items),
+            next_cursor=next_cursor
         )
+        get_response_cache().set(cache_key, page)
+        return page
         
     except HTTPException:
         raise
@@ -123,9 +179,89 @@ async def list_predictions(
             detail="Unable to retrieve predictions"
         )
 
+def _format_sse(event: Dict[str, Any]) -> str:
+    return f"event: prediction\ndata: {json.dumps(event)}\n\n"
+
+@router.get("/events")
+async def stream_prediction_events(
+    request: Request,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Server-Sent Events stream of the user's prediction status changes
+    
+    Replaces polling: the stream starts with the current state of every
+    in-flight (QUEUED/RUNNING) prediction, then pushes each transition as
+    `event: prediction` with a JSON payload (status, progress, updated_at).
+    
+    EventSource cannot send an Authorization header, so clients should use a
+    fetch-based SSE reader with the usual Bearer token.
+    
+    Returns:
+        text/event-stream response (kept open until the client disconnects)
+    """
+    user_id = current_user.get("id")
+    if not user_id:
+        raise HTTPException(
+            status_code=401,
+            detail="User ID not found in authentication token"
+        )
+    
+    # Subscribe before the snapshot so no transition falls in between
+    hub = get_prediction_event_hub()
+    queue = hub.subscribe(user_id)
+    try:
+        # Short-lived session: the stream itself holds no DB connection
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(Prediction.id, Prediction.user_id, Prediction.status, Prediction.updated_at)
+                .where(
+                    and_(
+                        Prediction.user_id == user_id,
+                        Prediction.status.in_([PredictionStatus.QUEUED, PredictionStatus.RUNNING])
+                    )
+                )
+                .order_by(desc(Prediction.created_at))
+                .limit(MAX_PAGE_SIZE)
+            )
+            snapshot = [build_prediction_event(row) for row in result.all()]
+    except Exception as e:
+        hub.unsubscribe(user_id, queue)
+        logger.error(f"Error opening prediction event stream: {type(e).__name__} for user {user_id}")
+        raise HTTPException(
+            status_code=500,
+            detail="Unable to open prediction event stream"
+        )
+    
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            for event in snapshot:
+                yield _format_sse(event)
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield _format_sse(event)
+        finally:
+            hub.unsubscribe(user_id, queue)
+    
+    logger.info(f"Opened prediction event stream for user {user_id}")
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/{prediction_id}", response_model=PredictionDetailResponse)
 async def get_prediction_detail(
     prediction_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -136,6 +272,7 @@ async def get_prediction_detail(
     
     Args:
         prediction_id: UUID of the prediction
+        if_none_match: ETag from a previous response (304 if unchanged)
         current_user: Authenticated user from JWT token
         db: Database session
         
@@ -166,14 +303,28 @@ async def get_prediction_detail(
             )
         
         # SECURITY: Query with ownership check - don't reveal existence if unauthorized
-        stmt = select(Prediction).where(
-            and_(
-                Prediction.id == prediction_uuid,
-                Prediction.user_id == user_id  # Enforce ownership in query
-            )
+        ownership = and_(
+            Prediction.id == prediction_uuid,
+            Prediction.user_id == user_id  # Enforce ownership in query
         )
-        result = await db.execute(stmt)
-        prediction = result.scalar_one_or_none()
+        
+        # Every change to a prediction bumps updated_at, so it versions the response
+        version_result = await db.execute(select(Prediction.updated_at).where(ownership))
+        updated_at = version_result.scalar_one_or_none()
+        
+        if updated_at is not None:
+            cache_key = (user_id, "prediction_detail", (prediction_uuid,), updated_at)
+            not_modified = check_not_modified(cache_key, if_none_match, response)
+            if not_modified:
+                return not_modified
+            cached = get_response_cache().get(cache_key)
+            if cached is not None:
+                return cached
+            
+            result = await db.execute(select(Prediction).where(ownership))
+            prediction = result.scalar_one_or_none()
+        else:
+            prediction = None
         
         if not prediction:
             # Don't distinguish between "not found" and "not authorized"
@@ -193,16 +344,22 @@ async def get_prediction_detail(
             rows_processed=prediction.rows_processed,
             metrics_json=prediction.metrics_json,
             error_message=prediction.error_message,
+            progress_stage=prediction.progress_stage,
+            progress_percent=prediction.progress_percent or 0,
+            progress_rows_done=prediction.progress_rows_done,
+            progress_rows_total=prediction.progress_rows_total,
             created_at=prediction.created_at,
             updated_at=prediction.updated_at
         )
         
         logger.info(f"Retrieved prediction details: {prediction_id} for user {user_id}")
         
-        return PredictionDetailResponse(
+        detail = PredictionDetailResponse(
             success=True,
             prediction=prediction_detail
         )
+        get_response_cache().set(cache_key, detail)
+        return detail
         
     except HTTPException:
         raise
@@ -217,9 +374,11 @@ async def get_prediction_detail(
 
 @router.get("/dashboard/data", response_model=Dict[str, Any])
 async def get_dashboard_data(
+    response: Response,
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of predictions to return")
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of predictions to return"),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get customer-level prediction data for dashboard visualizations
@@ -233,6 +392,7 @@ async def get_dashboard_data(
         current_user: Authenticated user from JWT token
         db: Database session
         limit: Max number of customer predictions to return (default 1000)
+        if_none_match: ETag from a previous response (304 if unchanged)
         
     Returns:
         {
@@ -277,21 +437,33 @@ async def get_dashboard_data(
             )
         
         # Get the LATEST COMPLETED prediction for this user
-        stmt = (
-            select(Prediction)
-            .where(
-                and_(
-                    Prediction.user_id == user_id,
-                    Prediction.status == PredictionStatus.COMPLETED,
-                    Prediction.s3_output_key.isnot(None)
-                )
-            )
+        latest_completed = and_(
+            Prediction.user_id == user_id,
+            Prediction.status == PredictionStatus.COMPLETED,
+            Prediction.s3_output_key.isnot(None)
+        )
+        
+        # Version = (id, updated_at) of that prediction; a hit skips the S3 download and CSV parse
+        version_result = await db.execute(
+            select(Prediction.id, Prediction.updated_at)
+            .where(latest_completed)
             .order_by(desc(Prediction.created_at))
             .limit(1)
         )
-        
-        result = await db.execute(stmt)
-        latest_prediction = result.scalar_one_or_none()
+        version = version_result.one_or_none()
+        cache_key = (user_id, "dashboard_data", (limit,), tuple(version) if version else None)
+        not_modified = check_not_modified(cache_key, if_none_match, response)
+        if not_modified:
+            return not_modified
+        cached = get_response_cache().get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if version is None:
+            latest_prediction = None
+        else:
+            result = await db.execute(select(Prediction).where(Prediction.id == version.id))
+            latest_prediction = result.scalar_one_or_none()
         
         if not latest_prediction:
             # No predictions yet - return empty data (not an error for dashboard)
@@ -309,7 +481,7 @@ async def get_dashboard_data(
         
         # Download and parse the CSV from S3
         try:
-            csv_content = s3_service.download_file_to_memory(latest_prediction.s3_output_key)
+            csv_content = await async_s3_service.download_file_to_memory(latest_prediction.s3_output_key)
             df = pd.read_csv(io.StringIO(csv_content))
             
             logger.info(f"Downloaded prediction CSV: {len(df)} rows, columns: {list(df.columns)}")
@@ -381,7 +553,7 @@ async def get_dashboard_data(
         
         logger.info(f"Parsed {len(customer_predictions)} customer predictions for dashboard (user {user_id})")
         
-        return {
+        dashboard = {
             "success": True,
             "predictions": customer_predictions,
             "metadata": {
@@ -391,6 +563,8 @@ async def get_dashboard_data(
                 "rows_processed": latest_prediction.rows_processed
             }
         }
+        get_response_cache().set(cache_key, dashboard)
+        return dashboard
         
     except HTTPException:
         raise
@@ -5,18 +5,20 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, R
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import Optional, Dict, Any
 import logging
 import time
 
 from backend.api.database import get_db
-from backend.models import Upload, User, Prediction, PredictionStatus
-from backend.services.s3_service import s3_service
+from backend.models import Upload, Prediction, PredictionStatus
+from backend.services.s3_service import s3_service, async_s3_service
 from backend.services.sqs_service import publish_prediction_task
+from backend.services.sqs_publisher import record_publish_failure
+from backend.services.prediction_events import publish_prediction_event
 from backend.schemas.upload import UploadResponse, PresignedUrlResponse, UploadInfo, UserUploadsResponse
 from backend.core.config import settings
 from backend.auth.middleware import get_current_user, require_user_ownership
+from backend.auth.user_cache import CachedUser, get_current_db_user
 from backend.monitoring.metrics import get_metrics_client, MetricUnit, MetricNamespace
 
 logger = logging.getLogger(__name__)
@@ -29,7 +31,8 @@ async def upload_csv(
     file: UploadFile = File(...),
     user_id: str = Form(...),
     current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    db_user: CachedUser = Depends(get_current_db_user)
 ):
     """
     Upload a CSV file directly to S3 and store metadata in database
@@ -38,6 +41,7 @@ async def upload_csv(
         file: CSV file to upload
         user_id: ID of the user uploading the file
         db: Database session
+        db_user: Authenticated database user (404 if not synced yet)
         
     Returns:
         Upload response with success status and object key
@@ -86,22 +90,14 @@ async def upload_csv(
                 detail="File size exceeds 10MB limit"
             )
         
-        # Check if user exists (user_id from frontend is Clerk ID)
-        result = await db.execute(select(User).filter(User.clerk_id == user_id))
-        user = result.scalar_one_or_none()
-        if not user:
-            raise HTTPException(
-                status_code=404,
-                detail="User not found. Please ensure you're logged in."
-            )
-        
         # Use the database user.id for foreign key relationships
-        db_user_id = user.id
+        # (resolved by get_current_db_user; cached per process)
+        db_user_id = db_user.id
         
         # Try to upload file to S3, fallback to local storage if AWS credentials not available
         s3_upload_start = time.time()
         try:
-            upload_result = s3_service.upload_file_stream(
+            upload_result = await async_s3_service.upload_file_stream(
                 file_content=file_content,
                 user_id=user_id,  # Already a string now
                 filename=file.filename
@@ -210,6 +206,7 @@ async def upload_csv(
             
             # Flush to get prediction_id
             await db.flush()
+            await publish_prediction_event(db, prediction_record)
             
             # Commit transaction
             await db.commit()
@@ -275,7 +272,7 @@ async def upload_csv(
                 logger.info(f"upload: published sqs message - prediction_id={prediction_record.id}, message_body={{upload_id: {upload_record.id}, s3_key: {upload_result['object_key']}}}")
                 
             except Exception as e:
-                # SQS publish failed - update prediction status
+                # SQS publish failed (including a failed batch entry) - mark FAILED
                 await metrics.increment_counter(
                     "SQSMessageFailure",
                     namespace=MetricNamespace.API,
@@ -283,18 +280,9 @@ async def upload_csv(
                 )
                 logger.error(f"upload: publish failed - prediction_id={prediction_record.id}, error={str(e)}")
                 
-                try:
-                    # Start new transaction to update prediction status
-                    prediction_record.status = PredictionStatus.FAILED
-                    prediction_record.error_message = f"SQS publish failed: {str(e)}"
-                    db.add(prediction_record)
-                    await db.commit()
-                    
-                    publish_warning = True
-                    prediction_status = "FAILED"
-                    
-                except Exception as db_error:
-                    logger.error(f"Failed to update prediction status after SQS failure: {str(db_error)}")
+                await record_publish_failure(db, prediction_record.id, e, user_id=db_user_id)
+                publish_warning = True
+                prediction_status = "FAILED"
         else:
             logger.info(f"upload: SQS disabled - prediction {prediction_record.id} created but not queued for processing")
         
@@ -364,7 +352,8 @@ async def get_presigned_upload_url(
     filename: str = Form(...),
     user_id: str = Form(...),
     current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    db_user: CachedUser = Depends(get_current_db_user)
 ):
     """
     Generate a presigned URL for client-side direct upload to S3
@@ -373,6 +362,7 @@ async def get_presigned_upload_url(
         filename: Name of the file to upload
         user_id: ID of the user uploading the file
         db: Database session
+        db_user: Authenticated database user (404 if not synced yet)
         
     Returns:
         Presigned URL response for direct upload
@@ -388,14 +378,6 @@ async def get_presigned_upload_url(
                 detail="Only CSV files are allowed"
             )
         
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=404,
-                detail="User not found"
-            )
-        
         # Generate presigned URL
         presigned_result = s3_service.generate_presigned_upload_url(
             user_id=user_id,
@@ -433,7 +415,8 @@ async def confirm_upload(
     filename: str = Form(...),
     file_size: Optional[int] = Form(None),
     current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    db_user: CachedUser = Depends(get_current_db_user)
 ):
     """
     Confirm a client-side upload by storing metadata in database
@@ -447,6 +430,7 @@ async def confirm_upload(
         filename: Original filename
         file_size: Size of the file in bytes (optional)
         db: Database session
+        db_user: Authenticated database user (404 if not synced yet)
         
     Returns:
         Confirmation response
@@ -455,16 +439,8 @@ async def confirm_upload(
         # Verify user has access to confirm upload for this user_id
         require_user_ownership(user_id, current_user)
         
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=404,
-                detail="User not found"
-            )
-        
         # Verify file exists in S3
-        if not s3_service.file_exists(object_key):
+        if not await async_s3_service.file_exists(object_key):
             raise HTTPException(
                 status_code=404,
                 detail="Uploaded file not found in S3"
@@ -504,7 +480,8 @@ async def confirm_upload(
 async def get_user_uploads(
     user_id: str,
     current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    db_user: CachedUser = Depends(get_current_db_user)
 ):
     """
     Get all uploads for a specific user
@@ -512,6 +489,7 @@ async def get_user_uploads(
     Args:
         user_id: ID of the user
         db: Database session
+        db_user: Authenticated database user (404 if not synced yet)
         
     Returns:
         List of user's uploads
@@ -520,14 +498,6 @@ async def get_user_uploads(
         # Verify user has access to view uploads for this user_id
         require_user_ownership(user_id, current_user)
         
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=404,
-                detail="User not found"
-            )
-        
         # Get user's uploads
         uploads = db.query(Upload).filter(Upload.user_id == user_id).all()
         
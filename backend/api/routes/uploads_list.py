@@ -1,40 +1,62 @@
-from fastapi import APIRouter, Query, HTTPException, Depends
+from fastapi import APIRouter, Query, HTTPException, Depends, Response
 from sqlalchemy import select
 from backend.api.database import async_session_maker
+from backend.api.pagination import DEFAULT_PAGE_SIZE, clamp_page_size, keyset_predicate, split_page
 from backend.models import Upload
 from backend.auth.middleware import get_current_user, require_user_ownership
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 router = APIRouter(tags=["uploads"])
 
+# Response header carrying the cursor for the next page (body stays a plain list)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 @router.get("")
 async def list_uploads(
-    user_id: str = Query(...), 
-    limit: int = 20,
+    response: Response,
+    user_id: str = Query(...),
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = Query(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     if not user_id:
         raise HTTPException(status_code=400, detail="user_id is required")
-    
+
     # Verify user has access to this data
     require_user_ownership(user_id, current_user)
-    if limit > 100:  # simple guard
-        limit = 100
-    async with async_session_maker() as session:
-        res = await session.execute(
-            select(Upload)
-            .where(Upload.user_id == user_id)
-            .order_by(Upload.created_at.desc())
-            .limit(limit)
+    limit = clamp_page_size(limit)
+
+    # Keyset pagination on (created_at, id); only the listed columns are read
+    stmt = (
+        select(
+            Upload.id,
+            Upload.user_id,
+            Upload.filename,
+            Upload.s3_object_key,
+            Upload.file_size,
+            Upload.created_at
         )
-        rows = res.scalars().all()
-        return [
-            {
-              "id": r.id,
-              "user_id": r.user_id,
-              "filename": r.filename,
-              "s3_key": getattr(r, "s3_key", None),
-              "file_size": getattr(r, "file_size", None),
-              "created_at": (r.created_at.isoformat() if getattr(r, "created_at", None) else None),
-            } for r in rows
-        ]
+        .where(Upload.user_id == user_id)
+        .order_by(Upload.created_at.desc(), Upload.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        stmt = stmt.where(keyset_predicate(Upload.created_at, Upload.id, cursor, int))
+
+    async with async_session_maker() as session:
+        res = await session.execute(stmt)
+        rows, next_cursor = split_page(res.all(), limit)
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return [
+        {
+          "id": r.id,
+          "user_id": r.user_id,
+          "filename": r.filename,
+          "s3_key": r.s3_object_key,
+          "file_size": r.file_size,
+          "created_at": (r.created_at.isoformat() if r.created_at else None),
+        } for r in rows
+    ]
@@ -9,8 +9,16 @@ Security Features:
 - JWKS caching with 24-hour TTL
 - Async-safe locking to prevent concurrent JWKS fetches
 - Graceful degradation using stale cache on fetch failures
+- Optional background refresh (ahead of expiry and on unknown kids) over a
+  long-lived pooled HTTP client, so request-path verification never waits
+  on network I/O
 - Comprehensive claim validation (iss, exp, iat, sub)
 
+Performance Features:
+- Public keys constructed once per JWKS refresh (kid -> key map)
+- Bounded cache of verified payloads keyed by token digest, expiring at the
+  token's own `exp` claim, so repeat requests skip RS256 verification
+
 Usage:
     verifier = await get_jwt_verifier()
     payload = await verifier.verify_token(token)
@@ -19,7 +27,9 @@ import os
 import httpx
 import asyncio
 import time
-from typing import Optional, Dict
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 from jose import jwk, jwt
 from jose.exceptions import JWTError, ExpiredSignatureError, JWTClaimsError
 from fastapi import HTTPException, status
@@ -45,6 +55,8 @@ class JWTMetrics:
         self.jwks_fetch_count = 0
         self.jwks_cache_hit_count = 0
         self.jwks_stale_cache_use_count = 0
+        self.token_cache_hit_count = 0
+        self.token_cache_miss_count = 0
         self.last_reset_time = time.time()
     
     def record_verification_success(self):
@@ -72,6 +84,16 @@ class JWTMetrics:
         self.jwks_stale_cache_use_count += 1
         logger.warning(f"[METRIC] Used stale JWKS cache. Total: {self.jwks_stale_cache_use_count}")
     
+    def record_token_cache_hit(self):
+        """Increment verified-token cache hit counter"""
+        self.token_cache_hit_count += 1
+        logger.debug(f"[METRIC] Token cache hit. Total hits: {self.token_cache_hit_count}")
+    
+    def record_token_cache_miss(self):
+        """Increment verified-token cache miss counter"""
+        self.token_cache_miss_count += 1
+        logger.debug(f"[METRIC] Token cache miss. Total misses: {self.token_cache_miss_count}")
+    
     def get_stats(self) -> Dict:
         """
         Get current metrics as dictionary
@@ -94,6 +116,12 @@ class JWTMetrics:
                 max(1, self.jwks_cache_hit_count + self.jwks_fetch_count)
             ),
             "jwks_stale_cache_use_count": self.jwks_stale_cache_use_count,
+            "token_cache_hit_count": self.token_cache_hit_count,
+            "token_cache_miss_count": self.token_cache_miss_count,
+            "token_cache_hit_rate": (
+                self.token_cache_hit_count /
+                max(1, self.token_cache_hit_count + self.token_cache_miss_count)
+            ),
             "uptime_seconds": uptime
         }
     
@@ -104,6 +132,8 @@ class JWTMetrics:
         self.jwks_fetch_count = 0
         self.jwks_cache_hit_count = 0
         self.jwks_stale_cache_use_count = 0
+        self.token_cache_hit_count = 0
+        self.token_cache_miss_count = 0
         self.last_reset_time = time.time()
         logger.info("[METRIC] All JWT metrics reset")
 
@@ -127,6 +157,16 @@ class JWTVerificationError(Exception):
     pass
 
 
+# Maximum number of verified tokens kept in memory (per process)
+JWT_TOKEN_CACHE_SIZE = int(os.getenv("JWT_TOKEN_CACHE_SIZE", "10000"))
+
+# Background refresher fetches JWKS this long before the cache TTL expires
+JWKS_REFRESH_AHEAD_SECONDS = int(os.getenv("JWKS_REFRESH_AHEAD_SECONDS", "3600"))
+
+# Minimum spacing between refreshes triggered by unknown key IDs
+JWKS_FORCED_REFRESH_INTERVAL_SECONDS = int(os.getenv("JWKS_FORCED_REFRESH_INTERVAL_SECONDS", "60"))
+
+
 class ProductionJWTVerifier:
     """
     Production-grade JWT verifier for Clerk authentication
@@ -136,6 +176,8 @@ class ProductionJWTVerifier:
     - Async lock to prevent concurrent JWKS fetches (thundering herd protection)
     - Graceful degradation (uses stale cache on fetch failure)
     - Proper RS256 signature verification
+    - Public keys constructed once per JWKS refresh
+    - Bounded TTL cache of verified payloads (expires at token `exp`)
     - Comprehensive error logging and monitoring hooks
     """
     
@@ -169,6 +211,24 @@ class ProductionJWTVerifier:
         self.cache_ttl: int = 86400  # 24 hours (JWKS keys rarely change)
         self._lock = asyncio.Lock()
         
+        # Background refresh configuration
+        self.refresh_ahead: int = JWKS_REFRESH_AHEAD_SECONDS
+        self.refresh_retry_interval: int = 30
+        self.forced_refresh_interval: int = JWKS_FORCED_REFRESH_INTERVAL_SECONDS
+        self._last_forced_refresh: float = 0
+        self._refresh_event = asyncio.Event()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        
+        # Constructed public keys, rebuilt whenever the JWKS object changes
+        self._public_keys: Dict[str, Any] = {}
+        self._public_key_errors: Dict[str, str] = {}
+        self._public_keys_source: Optional[Dict] = None
+        
+        # Verified payloads: sha256(token) -> (payload, expires_at, kid)
+        self._token_cache: "OrderedDict[str, Tuple[Dict, float, str]]" = OrderedDict()
+        self.token_cache_size: int = JWT_TOKEN_CACHE_SIZE
+        
         logger.info(
             f"✅ JWT Verifier initialized for Clerk domain: {self.clerk_domain}"
         )
@@ -217,12 +277,87 @@ class ProductionJWTVerifier:
             "Then set: CLERK_FRONTEND_API=your-domain-here"
         )
     
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Get the long-lived HTTP client used for JWKS fetches
+        
+        Created lazily so connections (and TLS sessions) to Clerk are pooled
+        across refreshes instead of re-established on every fetch.
+        
+        Returns:
+            httpx.AsyncClient: Shared client
+        """
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=2, max_keepalive_connections=1)
+            )
+        return self._http_client
+    
+    async def _fetch_jwks(self) -> Optional[Dict]:
+        """
+        Fetch and validate JWKS from Clerk, updating the cache on success
+        
+        Must be called with `self._lock` held.
+        
+        Returns:
+            dict: Fresh JWKS data, or None if the fetch failed (errors are logged)
+        """
+        try:
+            client = self._get_http_client()
+            logger.info(f"Fetching JWKS from {self.jwks_url}")
+            response = await client.get(self.jwks_url)
+            response.raise_for_status()
+            jwks_data = response.json()
+            
+            # Validate JWKS structure
+            if not isinstance(jwks_data, dict):
+                raise ValueError("JWKS response is not a dictionary")
+            if 'keys' not in jwks_data:
+                raise ValueError("JWKS response missing 'keys' field")
+            if not jwks_data['keys']:
+                raise ValueError("JWKS 'keys' array is empty")
+            
+            # ✅ ENHANCED VALIDATION (from Chat DeepSeek)
+            # Validate each key has required fields
+            for key in jwks_data['keys']:
+                if not key.get('kid'):
+                    raise ValueError("JWKS key missing 'kid' (key ID) field")
+                if not key.get('kty'):
+                    raise ValueError("JWKS key missing 'kty' (key type) field")
+            
+            # Update cache
+            self.jwks_cache = jwks_data
+            self.jwks_last_fetched = time.time()
+            
+            _metrics.record_jwks_fetch()
+            logger.info(
+                f"✅ Successfully fetched JWKS with "
+                f"{len(jwks_data['keys'])} keys"
+            )
+            return jwks_data
+            
+        except httpx.TimeoutException:
+            logger.error("❌ Timeout fetching JWKS from Clerk")
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"❌ HTTP error fetching JWKS: {e.response.status_code}"
+            )
+        except ValueError as e:
+            logger.error(f"❌ Invalid JWKS structure: {str(e)}")
+        except Exception as e:
+            logger.error(f"❌ Unexpected error fetching JWKS: {str(e)}")
+        
+        return None
+    
     async def get_jwks(self) -> Dict:
         """
         Fetch JWKS from Clerk with caching and async locking
         
         This method implements:
         - Fast path: Return cached JWKS if still valid
+        - Background path: While the refresher runs, always serve the cache
+          (the refresher keeps it fresh, so requests never wait on Clerk)
         - Slow path: Fetch fresh JWKS with async locking to prevent concurrent fetches
         - Graceful degradation: Use stale cache if fetch fails
         
@@ -240,6 +375,12 @@ class ProductionJWTVerifier:
             _metrics.record_jwks_cache_hit()
             return self.jwks_cache
         
+        # Background path: refresher owns the network I/O, serve what we have
+        if self.jwks_cache and self.background_refresh_running:
+            _metrics.record_jwks_stale_cache_use()
+            self._refresh_event.set()
+            return self.jwks_cache
+        
         # Slow path: fetch fresh JWKS with locking
         async with self._lock:
             # Double-check cache after acquiring lock (another request may have fetched)
@@ -247,51 +388,9 @@ class ProductionJWTVerifier:
                 (current_time - self.jwks_last_fetched) < self.cache_ttl):
                 return self.jwks_cache
             
-            # Fetch JWKS from Clerk
-            try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    logger.info(f"Fetching JWKS from {self.jwks_url}")
-                    response = await client.get(self.jwks_url)
-                    response.raise_for_status()
-                    jwks_data = response.json()
-                    
-                    # Validate JWKS structure
-                    if not isinstance(jwks_data, dict):
-                        raise ValueError("JWKS response is not a dictionary")
-                    if 'keys' not in jwks_data:
-                        raise ValueError("JWKS response missing 'keys' field")
-                    if not jwks_data['keys']:
-                        raise ValueError("JWKS 'keys' array is empty")
-                    
-                    # ✅ ENHANCED VALIDATION (from Chat DeepSeek)
-                    # Validate each key has required fields
-                    for key in jwks_data['keys']:
-                        if not key.get('kid'):
-                            raise ValueError("JWKS key missing 'kid' (key ID) field")
-                        if not key.get('kty'):
-                            raise ValueError("JWKS key missing 'kty' (key type) field")
-                    
-                    # Update cache
-                    self.jwks_cache = jwks_data
-                    self.jwks_last_fetched = current_time
-                    
-                    _metrics.record_jwks_fetch()
-                    logger.info(
-                        f"✅ Successfully fetched JWKS with "
-                        f"{len(jwks_data['keys'])} keys"
-                    )
-                    return jwks_data
-                    
-            except httpx.TimeoutException:
-                logger.error("❌ Timeout fetching JWKS from Clerk")
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    f"❌ HTTP error fetching JWKS: {e.response.status_code}"
-                )
-            except ValueError as e:
-                logger.error(f"❌ Invalid JWKS structure: {str(e)}")
-            except Exception as e:
-                logger.error(f"❌ Unexpected error fetching JWKS: {str(e)}")
+            jwks_data = await self._fetch_jwks()
+            if jwks_data is not None:
+                return jwks_data
             
             # Graceful degradation: use stale cache if available
             if self.jwks_cache:
@@ -310,6 +409,102 @@ class ProductionJWTVerifier:
                 detail="Authentication service temporarily unavailable. Please try again."
             )
     
+    # ====================================================================
+    # BACKGROUND REFRESH
+    # ====================================================================
+    
+    @property
+    def background_refresh_running(self) -> bool:
+        """Whether the background JWKS refresher task is active"""
+        return self._refresh_task is not None and not self._refresh_task.done()
+    
+    def start_background_refresh(self) -> None:
+        """
+        Start refreshing JWKS ahead of expiry in a background task
+        
+        Must be called from a running event loop (e.g. FastAPI lifespan).
+        Safe to call more than once.
+        """
+        if self.background_refresh_running:
+            return
+        self._refresh_event = asyncio.Event()
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+        logger.info(
+            f"✅ JWKS background refresh started "
+            f"(every {self.cache_ttl - self.refresh_ahead}s)"
+        )
+    
+    def request_refresh(self, reason: str) -> bool:
+        """
+        Ask the background refresher for an early JWKS fetch
+        
+        Rate-limited to one forced refresh per `forced_refresh_interval`
+        seconds so a flood of tokens with bogus kids cannot hammer Clerk.
+        Never blocks the caller.
+        
+        Args:
+            reason: Why the refresh is requested (for logging)
+            
+        Returns:
+            bool: True if a refresh was scheduled
+        """
+        if not self.background_refresh_running:
+            return False
+        
+        current_time = time.time()
+        if current_time - self._last_forced_refresh < self.forced_refresh_interval:
+            return False
+        
+        self._last_forced_refresh = current_time
+        self._refresh_event.set()
+        logger.info(f"🔄 JWKS refresh requested: {reason}")
+        return True
+    
+    def _next_refresh_delay(self, last_fetch_failed: bool) -> float:
+        """Seconds until the refresher should fetch again"""
+        if not self.jwks_cache:
+            return 0.0 if not last_fetch_failed else self.refresh_retry_interval
+        
+        age = time.time() - self.jwks_last_fetched
+        delay = max(0.0, self.cache_ttl - self.refresh_ahead - age)
+        if last_fetch_failed:
+            delay = min(delay, self.refresh_retry_interval) or self.refresh_retry_interval
+        return delay
+    
+    async def _refresh_loop(self) -> None:
+        """Refresh JWKS ahead of expiry and whenever a refresh is requested"""
+        last_fetch_failed = False
+        while True:
+            delay = self._next_refresh_delay(last_fetch_failed)
+            try:
+                await asyncio.wait_for(self._refresh_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._refresh_event.clear()
+            
+            try:
+                async with self._lock:
+                    last_fetch_failed = await self._fetch_jwks() is None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                last_fetch_failed = True
+                logger.error(f"❌ JWKS background refresh failed: {str(e)}")
+    
+    async def aclose(self) -> None:
+        """Stop the background refresher and close the shared HTTP client"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+    
     def _find_signing_key(self, jwks: Dict, kid: str) -> Dict:
         """
         Find signing key in JWKS by key ID
@@ -334,6 +529,127 @@ class ProductionJWTVerifier:
             f"Available keys: {available_kids}"
         )
     
+    def _build_public_keys(self, jwks: Dict) -> None:
+        """
+        Construct every public key in the JWKS once
+        
+        Keys that fail to construct are remembered (not raised) so that one
+        malformed entry does not break verification for the other kids.
+        
+        Args:
+            jwks: JWKS data
+        """
+        public_keys: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        
+        for key_data in jwks.get('keys', []):
+            kid = key_data.get('kid')
+            if not kid:
+                continue
+            try:
+                public_keys[kid] = jwk.construct(key_data)
+            except Exception as e:
+                errors[kid] = str(e)
+                logger.warning(f"⚠️ Could not construct JWKS key '{kid}': {str(e)}")
+        
+        self._public_keys = public_keys
+        self._public_key_errors = errors
+        self._public_keys_source = jwks
+        
+        # Drop cached tokens signed by keys that are no longer published
+        stale = [
+            digest for digest, (_, _, kid) in self._token_cache.items()
+            if kid not in public_keys
+        ]
+        for digest in stale:
+            del self._token_cache[digest]
+    
+    def _get_public_key(self, jwks: Dict, kid: str) -> Any:
+        """
+        Get the constructed public key for a key ID
+        
+        The kid -> key map is rebuilt only when a different JWKS object is
+        passed in (i.e. once per JWKS refresh).
+        
+        Args:
+            jwks: JWKS data
+            kid: Key ID from JWT header
+            
+        Returns:
+            Constructed public key
+            
+        Raises:
+            JWTVerificationError: If key not found or cannot be constructed
+        """
+        if jwks is not self._public_keys_source:
+            self._build_public_keys(jwks)
+        
+        public_key = self._public_keys.get(kid)
+        if public_key is not None:
+            return public_key
+        
+        if kid in self._public_key_errors:
+            raise JWTVerificationError(
+                f"Failed to construct public key from JWKS: "
+                f"{self._public_key_errors[kid]}"
+            )
+        
+        # Possibly a freshly rotated key: let the refresher pick it up, fail fast now
+        self.request_refresh(f"unknown kid '{kid}'")
+        
+        # Raises with the list of available kids
+        self._find_signing_key(jwks, kid)
+        raise JWTVerificationError(f"Signing key not found for kid '{kid}'")
+    
+    @staticmethod
+    def _token_digest(token: str) -> str:
+        """SHA-256 digest used as the cache key (raw tokens are never stored)"""
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+    
+    def _get_cached_payload(self, digest: str) -> Optional[Dict]:
+        """
+        Look up a previously verified token
+        
+        Args:
+            digest: Token digest
+            
+        Returns:
+            dict: Copy of the verified payload, or None on miss/expiry
+        """
+        entry = self._token_cache.get(digest)
+        if entry is None:
+            return None
+        
+        # JWKS refreshed since the map was built: rebuild so rotated-out kids are dropped
+        if self.jwks_cache is not None and self.jwks_cache is not self._public_keys_source:
+            self._build_public_keys(self.jwks_cache)
+        
+        payload, expires_at, kid = entry
+        if time.time() >= expires_at or kid not in self._public_keys:
+            self._token_cache.pop(digest, None)
+            return None
+        
+        self._token_cache.move_to_end(digest)
+        return dict(payload)
+    
+    def _cache_payload(self, digest: str, payload: Dict, kid: str) -> None:
+        """
+        Remember a verified payload until the token's `exp`
+        
+        Args:
+            digest: Token digest
+            payload: Verified token payload
+            kid: Key ID the token was signed with
+        """
+        exp = payload.get('exp')
+        if self.token_cache_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        
+        self._token_cache[digest] = (dict(payload), float(exp), kid)
+        self._token_cache.move_to_end(digest)
+        while len(self._token_cache) > self.token_cache_size:
+            self._token_cache.popitem(last=False)
+    
     async def verify_token(self, token: str) -> Dict:
         """
         Verify JWT token signature and claims
@@ -372,6 +688,15 @@ class ProductionJWTVerifier:
                 f"Token structure invalid (expected 3 parts, got {len(parts)})"
             )
         
+        # Fast path: token already verified and not yet expired
+        digest = self._token_digest(token)
+        cached_payload = self._get_cached_payload(digest)
+        if cached_payload is not None:
+            _metrics.record_token_cache_hit()
+            _metrics.record_verification_success()
+            return cached_payload
+        _metrics.record_token_cache_miss()
+        
         try:
             # Step 1: Extract key ID from token header (without verification)
             unverified_header = jwt.get_unverified_header(token)
@@ -382,17 +707,9 @@ class ProductionJWTVerifier:
                     "Token header missing 'kid' (key ID) field"
                 )
             
-            # Step 2: Fetch JWKS and find the signing key
+            # Step 2-3: Fetch JWKS and get the pre-built public key
             jwks = await self.get_jwks()
-            key_data = self._find_signing_key(jwks, kid)
-            
-            # Step 3: Construct public key from JWK
-            try:
-                public_key = jwk.construct(key_data)
-            except Exception as e:
-                raise JWTVerificationError(
-                    f"Failed to construct public key from JWKS: {str(e)}"
-                )
+            public_key = self._get_public_key(jwks, kid)
             
             # Step 4: Verify signature and decode token
             payload = jwt.decode(
@@ -418,6 +735,8 @@ class ProductionJWTVerifier:
                     "Token payload missing 'sub' (subject/user ID) claim"
                 )
             
+            self._cache_payload(digest, payload, kid)
+            
             _metrics.record_verification_success()
             logger.info(
                 f"✅ JWT signature verified successfully for user: {payload.get('sub')}"
@@ -481,3 +800,12 @@ async def get_jwt_verifier() -> ProductionJWTVerifier:
     
     return _verifier
 
+
+async def shutdown_jwt_verifier() -> None:
+    """
+    Stop the singleton verifier's background refresh and HTTP client
+    
+    No-op if the verifier was never created (e.g. AUTH_DEV_MODE).
+    """
+    if _verifier is not None:
+        await _verifier.aclose()
@@ -0,0 +1,149 @@
+"""
+User Identity Cache (Clerk ID -> database user)
+
+Every authenticated write path needs the database user behind the JWT `sub`
+claim (a Clerk ID). That mapping never changes once the user exists, so this
+module keeps an in-process TTL LRU of lightweight user snapshots and exposes
+a FastAPI dependency that resolves the current user with zero DB round-trips
+on a hit.
+
+Invalidation:
+- Clerk webhooks (user.created / user.updated) and /sync-user call
+  `invalidate_cached_user()` after committing
+- Entries also expire after USER_CACHE_TTL_SECONDS (bounds staleness across
+  ECS tasks, since each process has its own cache)
+
+Misses (unknown users) are never cached, so a user created moments later by
+/sync-user is visible on the next request.
+
+Usage:
+    @router.post("/items")
+    async def create_item(db_user: CachedUser = Depends(get_current_db_user)):
+        ...  # db_user.id is the users.id primary key
+"""
+import os
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.database import get_db
+from backend.auth.middleware import get_current_user
+from backend.core.ttl_cache import TTLCache
+from backend.models import User
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "300"))
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    Immutable snapshot of the user columns needed on the request path
+
+    Deliberately not an ORM instance: it is shared across requests and
+    sessions, so it must not be attached to (or lazy-load through) any session.
+    """
+    id: str
+    clerk_id: str
+    email: str
+    full_name: str
+
+
+class UserIdentityCache(TTLCache[str, CachedUser]):
+    """
+    Bounded TTL LRU of Clerk ID -> CachedUser
+    """
+
+    def __init__(self, max_size: int = USER_CACHE_SIZE, ttl_seconds: int = USER_CACHE_TTL_SECONDS):
+        super().__init__(max_size, ttl_seconds)
+
+    def invalidate(self, clerk_id: str) -> None:
+        """Drop one user (e.g. after a Clerk webhook changed it)"""
+        self.discard(clerk_id)
+
+
+# Global cache instance
+_user_cache = UserIdentityCache()
+
+
+def get_user_cache() -> UserIdentityCache:
+    """
+    Get global user identity cache
+
+    Returns:
+        UserIdentityCache: Singleton cache instance
+    """
+    return _user_cache
+
+
+def invalidate_cached_user(clerk_id: Optional[str]) -> None:
+    """
+    Invalidate a user after it was created or changed
+
+    Args:
+        clerk_id: Clerk user ID (no-op if falsy)
+    """
+    if clerk_id:
+        _user_cache.invalidate(clerk_id)
+
+
+async def resolve_db_user(clerk_id: str, db: AsyncSession) -> Optional[CachedUser]:
+    """
+    Resolve a Clerk ID to the database user, using the cache when possible
+
+    Args:
+        clerk_id: Clerk user ID (JWT `sub`)
+        db: Database session (only used on a cache miss)
+
+    Returns:
+        CachedUser, or None if the user does not exist
+    """
+    cached = _user_cache.get(clerk_id)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(
+        select(User.id, User.clerk_id, User.email, User.full_name)
+        .where(User.clerk_id == clerk_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    user = CachedUser(id=row.id, clerk_id=row.clerk_id, email=row.email, full_name=row.full_name)
+    _user_cache.set(user.clerk_id, user)
+    return user
+
+
+async def get_current_db_user(
+    current_user: Dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> CachedUser:
+    """
+    FastAPI dependency: database user for the authenticated request
+
+    On a cache hit the session never checks out a connection.
+
+    Raises:
+        HTTPException: 401 if the token has no user ID, 404 if the user is not synced yet
+    """
+    clerk_id = current_user.get("id")
+    if not clerk_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User ID not found in token"
+        )
+
+    user = await resolve_db_user(clerk_id, db)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found. Please ensure you're logged in."
+        )
+    return user
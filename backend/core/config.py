@@ -5,12 +5,32 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Connection pool defaults per process type. The API serves many concurrent
+# requests; workers process one SQS message at a time and only need a few
+# connections, which keeps (api_tasks + worker_tasks) * pool within RDS limits.
+DB_POOL_PROFILES = {
+    "api": {"pool_size": 10, "max_overflow": 20},
+    "worker": {"pool_size": 2, "max_overflow": 3},
+}
+
 class Settings:
     """Application settings loaded from environment variables"""
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     
+    # Database engine profile ("api" or "worker"); individual values override the profile
+    DB_POOL_PROFILE: str = os.getenv("DB_POOL_PROFILE", "api").lower()
+    if DB_POOL_PROFILE not in DB_POOL_PROFILES:
+        logger.warning(f"Unknown DB_POOL_PROFILE '{DB_POOL_PROFILE}', using 'api'")
+        DB_POOL_PROFILE = "api"
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() in ["true", "1", "yes"]
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", DB_POOL_PROFILES[DB_POOL_PROFILE]["pool_size"]))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", DB_POOL_PROFILES[DB_POOL_PROFILE]["max_overflow"]))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+    
     # AWS Configuration
     AWS_REGION: str = os.getenv("AWS_REGION", "us-east-1")
     PREDICTIONS_QUEUE_URL: str = os.getenv("PREDICTIONS_QUEUE_URL", "")
@@ -120,6 +140,10 @@ class Settings:
         logger.info(f"S3 Bucket: {self.S3_BUCKET}")
         logger.info(f"Predictions Queue: {self.mask_queue_url()}")
         logger.info(f"Database URL: {'SET' if self.DATABASE_URL else 'NOT_SET'}")
+        logger.info(
+            f"Database Pool: profile={self.DB_POOL_PROFILE} size={self.DB_POOL_SIZE} "
+            f"overflow={self.DB_MAX_OVERFLOW} recycle={self.DB_POOL_RECYCLE}s"
+        )
         logger.info("================================")
 
 # Global settings instance
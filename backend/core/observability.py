@@ -16,7 +16,6 @@ Version: 1.0
 """
 
 import structlog
-import boto3
 import time
 import hashlib
 import psutil
@@ -26,6 +25,8 @@ from contextlib import contextmanager
 from datetime import datetime, timedelta
 import logging
 
+from backend.monitoring.metrics import get_metrics_client, MetricUnit, MetricNamespace
+
 # ========================================
 # STRUCTURED LOGGING CONFIGURATION
 # ========================================
@@ -288,11 +289,17 @@ class CloudWatchMetrics:
     - Default ECS metrics: CPU, memory (infrastructure)
     - Custom metrics: Business KPIs (user experience)
     - Alerts: When user experience degrades
+    
+    Delivery:
+    ---------
+    Metrics are aggregated in-process by the shared EMF client
+    (backend.monitoring.metrics) and written as EMF log lines by its background
+    task. Recording a metric is an in-memory update - no PutMetricData call,
+    no network I/O on the caller.
     """
     
     def __init__(self):
-        self.cloudwatch = boto3.client('cloudwatch', region_name='us-east-1')
-        self.namespace = 'RetainWise/Production'
+        self.namespace = MetricNamespace.PRODUCTION
         
         # Performance baselines (from historical data)
         self.baselines = {
@@ -306,18 +313,28 @@ class CloudWatchMetrics:
             's3_download_ms': 50
         }
     
-    def _safe_put_metric(self, **kwargs):
+    def _emit_metric(
+        self,
+        metric_name: str,
+        value: float,
+        unit: MetricUnit,
+        dimensions: Optional[Dict[str, str]] = None
+    ):
         """
-        Safely call CloudWatch put_metric_data with error handling.
+        Record a metric on the EMF client without blocking.
         Metrics should NEVER block business operations.
         """
         try:
-            self.cloudwatch.put_metric_data(**kwargs)
+            get_metrics_client().observe(
+                metric_name,
+                value,
+                unit,
+                namespace=self.namespace,
+                dimensions=dimensions
+            )
         except Exception as e:
             # Log but don't crash - metrics are nice-to-have, not critical
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.debug(f"Failed to send CloudWatch metric: {e}")
+            logging.getLogger(__name__).debug(f"Failed to record metric {metric_name}: {e}")
     
     def record_prediction_duration(
         self, 
@@ -341,20 +358,11 @@ class CloudWatchMetrics:
         - Throughput (predictions/minute)
         """
         # Record metric
-        self._safe_put_metric(
-            Namespace=self.namespace,
-            MetricData=[
-                {
-                    'MetricName': 'PredictionDuration',
-                    'Value': duration_ms,
-                    'Unit': 'Milliseconds',
-                    'Dimensions': [
-                        {'Name': 'RowCount', 'Value': self._bucket_row_count(row_count)},
-                        {'Name': 'ModelType', 'Value': model_type}
-                    ],
-                    'StorageResolution': 1  # High-resolution (1-second intervals)
-                }
-            ]
+        self._emit_metric(
+            'PredictionDuration',
+            duration_ms,
+            MetricUnit.MILLISECONDS,
+            {'RowCount': self._bucket_row_count(row_count), 'ModelType': model_type}
         )
         
         # Check for regression
@@ -384,19 +392,11 @@ class CloudWatchMetrics:
         - If error_count > 10 in 5 minutes → Alert
         - If error_rate > 5% → Alert
         """
-        self._safe_put_metric(
-            Namespace=self.namespace,
-            MetricData=[
-                {
-                    'MetricName': 'ErrorCount',
-                    'Value': 1,
-                    'Unit': 'Count',
-                    'Dimensions': [
-                        {'Name': 'ErrorType', 'Value': error_type},
-                        {'Name': 'Operation', 'Value': operation}
-                    ]
-                }
-            ]
+        self._emit_metric(
+            'ErrorCount',
+            1,
+            MetricUnit.COUNT,
+            {'ErrorType': error_type, 'Operation': operation}
         )
     
     def record_cost_estimate(self, service: str, cost_usd: float):
@@ -418,18 +418,11 @@ class CloudWatchMetrics:
         - S3 usage > 100GB (storage costs)
         - Unusual spike (10x normal)
         """
-        self._safe_put_metric(
-            Namespace=self.namespace,
-            MetricData=[
-                {
-                    'MetricName': 'EstimatedCost',
-                    'Value': cost_usd,
-                    'Unit': 'None',  # USD
-                    'Dimensions': [
-                        {'Name': 'Service', 'Value': service}
-                    ]
-                }
-            ]
+        self._emit_metric(
+            'EstimatedCost',
+            cost_usd,
+            MetricUnit.NONE,  # USD
+            {'Service': service}
         )
     
     def _bucket_row_count(self, row_count: int) -> str:
@@ -478,6 +471,7 @@ class PerformanceMonitor:
     def __init__(self):
         self.metrics = CloudWatchMetrics()
         self.logger = ProductionLogger(__name__)
+        self._process = psutil.Process(os.getpid())
     
     @contextmanager
     def measure(self, operation_name: str, **dimensions):
@@ -504,7 +498,7 @@ class PerformanceMonitor:
         }
         """
         start_time = time.time()
-        start_memory = psutil.Process(os.getpid()).memory_info().rss / 1024 / 1024  # MB
+        start_memory = self._process.memory_info().rss / 1024 / 1024  # MB
         error_occurred = False
         
         try:
@@ -527,7 +521,7 @@ class PerformanceMonitor:
             raise
         finally:
             duration_ms = (time.time() - start_time) * 1000
-            end_memory = psutil.Process(os.getpid()).memory_info().rss / 1024 / 1024
+            end_memory = self._process.memory_info().rss / 1024 / 1024
             memory_used_mb = end_memory - start_memory
             
             self.logger.logger.info(
@@ -539,20 +533,12 @@ class PerformanceMonitor:
                 severity="INFO"
             )
             
-            # Record CloudWatch metric
-            self.metrics.cloudwatch.put_metric_data(
-                Namespace='RetainWise/Production',
-                MetricData=[
-                    {
-                        'MetricName': f'{operation_name}_duration',
-                        'Value': duration_ms,
-                        'Unit': 'Milliseconds',
-                        'Dimensions': [
-                            {'Name': k, 'Value': str(v)} 
-                            for k, v in dimensions.items()
-                        ]
-                    }
-                ]
+            # Record CloudWatch metric (aggregated in-process, never blocks)
+            self.metrics._emit_metric(
+                f'{operation_name}_duration',
+                duration_ms,
+                MetricUnit.MILLISECONDS,
+                {k: str(v) for k, v in dimensions.items()}
             )
 
 # ========================================
@@ -0,0 +1,457 @@
+"""
+Sliding-Window Rate Limiting for RetainWise
+
+Implements:
+1. Sliding-window-counter algorithm (O(1) memory per key)
+2. In-process backend (lock-free under asyncio, bounded key count)
+3. Redis backend (atomic Lua script, limits shared across ECS tasks)
+4. Limit strings ("10/minute;100/hour") shared by middleware and SmartRateLimiter
+5. All-or-nothing multi-rule checks: a request is counted against its rules
+   only if every rule allows it, so blocked requests don't use up quota
+
+Sliding Window Counter:
+-----------------------
+Each key keeps two integers: the count for the current fixed window and the
+count for the previous one. The rate over the last `window` seconds is
+estimated by weighting the previous window by how much of it still overlaps:
+
+    estimate = previous * (1 - elapsed / window) + current
+
+This is within a few percent of an exact sliding log, but uses constant
+memory instead of one timestamp per request.
+
+Backend Selection:
+------------------
+RATE_LIMIT_BACKEND=memory|redis (default: redis when REDIS_URL is set).
+If Redis errors, requests fall back to the in-process backend for a short
+cool-off period instead of failing.
+
+Author: RetainWise Engineering
+Date: January 12, 2026
+Version: 1.0
+"""
+
+import os
+import math
+import time
+import logging
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ========================================
+# LIMIT DEFINITIONS
+# ========================================
+
+_PERIOD_SECONDS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """`limit` requests per `window_seconds`"""
+    limit: int
+    window_seconds: int
+
+    def __str__(self) -> str:
+        return f"{self.limit}/{self.window_seconds}s"
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of one rate limit check"""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int  # seconds; 0 when allowed
+
+
+def parse_limits(spec: str) -> List[RateLimitRule]:
+    """
+    Parse limit strings like "10/minute;100/hour"
+
+    Args:
+        spec: One or more "<count>/<second|minute|hour|day>" separated by ';'
+
+    Returns:
+        list: Parsed rules
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    rules = []
+    for part in spec.split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        count, _, period = part.partition("/")
+        period = period.strip().lower().rstrip("s")
+        if period not in _PERIOD_SECONDS:
+            raise ValueError(f"Invalid rate limit period in '{part}'")
+        rules.append(RateLimitRule(limit=int(count), window_seconds=_PERIOD_SECONDS[period]))
+    if not rules:
+        raise ValueError(f"Empty rate limit spec: '{spec}'")
+    return rules
+
+
+def _evaluate(previous: int, current: int, limit: int, window: int, elapsed: float) -> Tuple[bool, int, int]:
+    """
+    Sliding window decision shared by both backends
+
+    Args:
+        previous: Count in the previous fixed window
+        current: Count in the current fixed window (before this request)
+        limit: Allowed requests per window
+        window: Window length in seconds
+        elapsed: Seconds elapsed in the current fixed window
+
+    Returns:
+        tuple: (allowed, remaining after this request, retry_after seconds)
+    """
+    weight = 1.0 - elapsed / window
+    estimate = previous * weight + current
+
+    if estimate + 1 <= limit:
+        return True, max(0, int(limit - estimate - 1)), 0
+
+    # Blocked: wait until enough of the previous window has slid out, or
+    # until the next window if the current one alone is over the limit
+    remaining_in_window = window - elapsed
+    if current + 1 > limit or previous == 0:
+        retry_after = remaining_in_window
+    else:
+        # previous * (1 - t / window) + current + 1 <= limit
+        needed_fraction = 1.0 - (limit - current - 1) / previous
+        retry_after = max(0.0, needed_fraction * window - elapsed)
+    # round() absorbs float noise (e.g. 20.000000001s -> 20s, not 21s)
+    return False, 0, max(1, math.ceil(round(retry_after, 6)))
+
+
+# ========================================
+# IN-PROCESS BACKEND
+# ========================================
+
+class InMemorySlidingWindowBackend:
+    """
+    Per-process sliding window counters
+
+    Each key holds [window_index, current, previous]. `hit_rules` contains no
+    `await`, so under asyncio it runs atomically without a lock.
+
+    Memory is bounded: keys idle for two windows are swept, and if more than
+    `max_keys` remain the oldest-inserted keys are evicted.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100_000, sweep_interval: float = 60.0):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._counters: Dict[Tuple[str, int], List[int]] = {}
+        self._last_sweep = time.monotonic()
+
+    async def hit(self, key: str, rule: RateLimitRule, now: Optional[float] = None) -> RateLimitResult:
+        """Count one request against `key` under `rule`"""
+        return self.hit_sync(key, rule, now)
+
+    def hit_sync(self, key: str, rule: RateLimitRule, now: Optional[float] = None) -> RateLimitResult:
+        """Synchronous variant of `hit` (same semantics)"""
+        return self.hit_rules_sync(key, [rule], now)[0]
+
+    async def hit_rules(
+        self,
+        key: str,
+        rules: List[RateLimitRule],
+        now: Optional[float] = None
+    ) -> List[RateLimitResult]:
+        """
+        Count one request against `key` under every rule, or under none
+
+        Returns:
+            list: One result per rule; if any is blocked, no counter changed
+        """
+        return self.hit_rules_sync(key, rules, now)
+
+    def hit_rules_sync(
+        self,
+        key: str,
+        rules: List[RateLimitRule],
+        now: Optional[float] = None
+    ) -> List[RateLimitResult]:
+        """Synchronous variant of `hit_rules` (same semantics)"""
+        now = time.time() if now is None else now
+        states = []
+        results = []
+        for rule in rules:
+            window = rule.window_seconds
+            window_index = int(now // window)
+            elapsed = now - window_index * window
+
+            counter_key = (key, window)
+            state = self._counters.get(counter_key)
+            if state is None:
+                state = [window_index, 0, 0]
+                self._counters[counter_key] = state
+            elif state[0] != window_index:
+                # Roll forward: previous = last window's count only if it was adjacent
+                state[2] = state[1] if state[0] == window_index - 1 else 0
+                state[1] = 0
+                state[0] = window_index
+
+            allowed, remaining, retry_after = _evaluate(state[2], state[1], rule.limit, window, elapsed)
+            states.append(state)
+            results.append(RateLimitResult(allowed, rule.limit, remaining, retry_after))
+
+        if all(result.allowed for result in results):
+            for state in states:
+                state[1] += 1
+
+        if len(self._counters) > self.max_keys:
+            self._evict()
+        self._maybe_sweep(now)
+        return results
+
+    def _maybe_sweep(self, now: float) -> None:
+        monotonic_now = time.monotonic()
+        if monotonic_now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = monotonic_now
+        stale = [
+            counter_key for counter_key, state in self._counters.items()
+            if state[0] < int(now // counter_key[1]) - 1
+        ]
+        for counter_key in stale:
+            del self._counters[counter_key]
+
+    def _evict(self) -> None:
+        # Evict in batches of ~10% so a full table doesn't pay this on every new key
+        overflow = len(self._counters) - self.max_keys + max(1, self.max_keys // 10) - 1
+        for counter_key in list(islice(self._counters, overflow)):
+            del self._counters[counter_key]
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+# ========================================
+# REDIS BACKEND
+# ========================================
+
+# Per rule i (1-based):
+#   KEYS[2i-1] = current window counter, KEYS[2i] = previous window counter
+#   ARGV[3i-2] = limit, ARGV[3i-1] = window seconds, ARGV[3i] = elapsed seconds in window
+# Counters are incremented only if every rule allows the request.
+# Returns {allowed (0/1), current_1, previous_1, current_2, previous_2, ...}
+# (counts before this request)
+SLIDING_WINDOW_LUA = """
+local allowed = 1
+local result = {0}
+for i = 1, #KEYS / 2 do
+  local current = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+  local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+  local limit = tonumber(ARGV[3 * i - 2])
+  local window = tonumber(ARGV[3 * i - 1])
+  local elapsed = tonumber(ARGV[3 * i])
+  if previous * (1 - elapsed / window) + current + 1 > limit then
+    allowed = 0
+  end
+  result[2 * i] = current
+  result[2 * i + 1] = previous
+end
+if allowed == 1 then
+  for i = 1, #KEYS / 2 do
+    redis.call('INCR', KEYS[2 * i - 1])
+    if result[2 * i] == 0 then
+      redis.call('EXPIRE', KEYS[2 * i - 1], tonumber(ARGV[3 * i - 1]) * 2)
+    end
+  end
+end
+result[1] = allowed
+return result
+"""
+
+
+class RedisSlidingWindowBackend:
+    """
+    Cluster-wide sliding window counters in Redis (ElastiCache)
+
+    One EVALSHA round-trip per check (all of a request's rules in one
+    script); two small integer keys per client per rule, expiring after two
+    windows. Key names share a {hash tag} so the script is cluster-mode safe.
+
+    On Redis errors the check is answered by an in-process fallback and
+    Redis is skipped for `cooloff_seconds`, so an outage never adds a
+    timeout to every request.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        redis_url: str,
+        key_prefix: str = "rl",
+        fallback: Optional[InMemorySlidingWindowBackend] = None,
+        cooloff_seconds: float = 5.0,
+        socket_timeout: float = 0.1
+    ):
+        import redis.asyncio as redis
+
+        self.key_prefix = key_prefix
+        self.fallback = fallback or InMemorySlidingWindowBackend()
+        self.cooloff_seconds = cooloff_seconds
+        self._client = redis.from_url(
+            redis_url,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_timeout
+        )
+        self._script = self._client.register_script(SLIDING_WINDOW_LUA)
+        self._disabled_until = 0.0
+
+    async def hit(self, key: str, rule: RateLimitRule, now: Optional[float] = None) -> RateLimitResult:
+        """Count one request against `key` under `rule`"""
+        return (await self.hit_rules(key, [rule], now))[0]
+
+    async def hit_rules(
+        self,
+        key: str,
+        rules: List[RateLimitRule],
+        now: Optional[float] = None
+    ) -> List[RateLimitResult]:
+        """
+        Count one request against `key` under every rule, or under none
+
+        Returns:
+            list: One result per rule; if any is blocked, no counter changed
+        """
+        now = time.time() if now is None else now
+        if time.monotonic() < self._disabled_until:
+            return self.fallback.hit_rules_sync(key, rules, now)
+
+        keys = []
+        args = []
+        for rule in rules:
+            window = rule.window_seconds
+            window_index = int(now // window)
+            base = f"{self.key_prefix}:{{{key}}}:{window}"
+            keys += [f"{base}:{window_index}", f"{base}:{window_index - 1}"]
+            args += [rule.limit, window, now - window_index * window]
+
+        try:
+            allowed, *counts = await self._script(keys=keys, args=args)
+        except Exception as e:
+            self._disabled_until = time.monotonic() + self.cooloff_seconds
+            logger.warning(
+                f"Redis rate limiter unavailable ({type(e).__name__}); "
+                f"using in-process limits for {self.cooloff_seconds:.0f}s"
+            )
+            return self.fallback.hit_rules_sync(key, rules, now)
+
+        results = []
+        for i, rule in enumerate(rules):
+            current, previous = int(counts[2 * i]), int(counts[2 * i + 1])
+            rule_allowed, remaining, retry_after = _evaluate(
+                previous, current, rule.limit, rule.window_seconds, args[3 * i + 2]
+            )
+            if allowed:
+                results.append(RateLimitResult(True, rule.limit, remaining, 0))
+            else:
+                results.append(RateLimitResult(rule_allowed, rule.limit, remaining, retry_after))
+        return results
+
+    async def close(self) -> None:
+        """Close the Redis connection pool"""
+        await self._client.aclose()
+
+
+# ========================================
+# LIMITER
+# ========================================
+
+class RateLimiter:
+    """
+    Checks one or more rules for a key against a backend
+
+    Example:
+    --------
+    limiter = RateLimiter(get_rate_limit_backend())
+    result = await limiter.check("ip:1.2.3.4", parse_limits("60/minute"))
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def check(self, key: str, rules: List[RateLimitRule]) -> RateLimitResult:
+        """
+        Count a request against every rule, or against none if any blocks
+
+        A blocked request is not counted, so retrying while blocked doesn't
+        use up the quota of the rules that still allowed it.
+
+        Returns:
+            RateLimitResult: The blocking result with the longest Retry-After,
+            or the tightest allowed one
+        """
+        results = await self.backend.hit_rules(key, rules)
+        blocked = [result for result in results if not result.allowed]
+        if blocked:
+            return max(blocked, key=lambda result: result.retry_after)
+        return min(results, key=lambda result: result.remaining)
+
+
+_backend = None
+
+
+def get_rate_limit_backend():
+    """
+    Get the process-wide rate limit backend (created on first use)
+
+    Returns:
+        InMemorySlidingWindowBackend or RedisSlidingWindowBackend
+    """
+    global _backend
+    if _backend is None:
+        redis_url = os.getenv("REDIS_URL", "")
+        backend_name = os.getenv("RATE_LIMIT_BACKEND", "redis" if redis_url else "memory").lower()
+
+        if backend_name == "redis" and redis_url:
+            _backend = RedisSlidingWindowBackend(redis_url)
+        else:
+            if backend_name == "redis":
+                logger.warning("RATE_LIMIT_BACKEND=redis but REDIS_URL not set - using in-process limits")
+            _backend = InMemorySlidingWindowBackend()
+        logger.info(f"Rate limit backend: {_backend.name}")
+    return _backend
+
+
+async def shutdown_rate_limit_backend() -> None:
+    """
+    Close the Redis connection pool at application shutdown
+
+    No-op if the backend was never created or is the in-process one.
+    """
+    global _backend
+    backend, _backend = _backend, None
+    if isinstance(backend, RedisSlidingWindowBackend):
+        await backend.close()
+
+
+# ========================================
+# MODULE INFO
+# ========================================
+
+__all__ = [
+    'RateLimitRule',
+    'RateLimitResult',
+    'parse_limits',
+    'InMemorySlidingWindowBackend',
+    'RedisSlidingWindowBackend',
+    'RateLimiter',
+    'get_rate_limit_backend',
+    'shutdown_rate_limit_backend'
+]
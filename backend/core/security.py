@@ -23,13 +23,16 @@ from functools import wraps
 
 from fastapi import Request, HTTPException, status, UploadFile
 from fastapi.responses import JSONResponse
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 import pandas as pd
 import boto3
 
 from backend.core.observability import log_security_event
+from backend.core.rate_limiting import (
+    RateLimiter,
+    RateLimitResult,
+    get_rate_limit_backend,
+    parse_limits
+)
 
 # ========================================
 # RATE LIMITING
@@ -54,25 +57,22 @@ class SmartRateLimiter:
     
     Implementation:
     ---------------
-    - Uses SlowAPI (FastAPI rate limiting library)
+    - Sliding-window counters from backend.core.rate_limiting (same backend
+      as the global middleware)
     - Redis backend (for distributed rate limiting across ECS tasks)
     - Per-user tracking (by Clerk user_id)
     
     Example:
     --------
     @app.post("/upload")
-    @limiter.limit("10/minute")
-    async def upload_file(request: Request, ...):
+    async def upload_file(
+        request: Request,
+        _: None = Depends(rate_limiter.limit("upload"))
+    ):
         # Automatically enforced
     """
     
     def __init__(self):
-        # Initialize limiter with user ID as key
-        self.limiter = Limiter(
-            key_func=self._get_user_key,
-            default_limits=["1000/hour"]  # Global fallback
-        )
-        
         # Rate limit definitions
         self.limits = {
             'upload': "10/minute;100/hour",
@@ -80,6 +80,8 @@ class SmartRateLimiter:
             'prediction': "30/minute;300/hour",
             'api': "100/minute;1000/hour"
         }
+        self._rules = {name: parse_limits(spec) for name, spec in self.limits.items()}
+        self._limiter: Optional[RateLimiter] = None
     
     def _get_user_key(self, request: Request) -> str:
         """
@@ -96,27 +98,65 @@ class SmartRateLimiter:
             return f"user:{user_id}"
         
         # Fallback to IP address
-        return f"ip:{get_remote_address(request)}"
+        client_ip = request.client.host if request.client else "unknown"
+        return f"ip:{client_ip}"
     
-    def get_limiter(self):
-        """Get the configured limiter instance"""
-        return self.limiter
+    def get_limiter(self) -> RateLimiter:
+        """Get the configured limiter instance (shared backend, created on first use)"""
+        if self._limiter is None:
+            self._limiter = RateLimiter(get_rate_limit_backend())
+        return self._limiter
     
-    def handle_rate_limit_exceeded(self, request: Request, exc: RateLimitExceeded):
+    async def check(self, request: Request, category: str) -> RateLimitResult:
         """
-        Custom handler for rate limit exceeded
+        Count a request against a category's limits
         
-        Logs security event and returns user-friendly error
+        Args:
+            request: Incoming request
+            category: One of self.limits keys ('upload', 'download', ...)
+        
+        Returns:
+            RateLimitResult
+        """
+        key = f"{category}:{self._get_user_key(request)}"
+        return await self.get_limiter().check(key, self._rules[category])
+    
+    def limit(self, category: str):
         """
-        user_id = self._get_user_key(request)
+        FastAPI dependency enforcing a category's limits
         
-        # Log security event
+        Raises HTTP 429 (with Retry-After) when the limit is exceeded.
+        """
+        if category not in self._rules:
+            raise ValueError(f"Unknown rate limit category: {category}")
+        
+        async def dependency(request: Request) -> None:
+            result = await self.check(request, category)
+            if not result.allowed:
+                self._log_rate_limit_exceeded(request, result)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Rate limit exceeded. Please try again later.",
+                    headers={"Retry-After": str(result.retry_after)}
+                )
+        
+        return dependency
+    
+    def _log_rate_limit_exceeded(self, request: Request, result: RateLimitResult) -> None:
         log_security_event(
             event_type="rate_limit_exceeded",
-            user_id=user_id,
+            user_id=self._get_user_key(request),
             endpoint=str(request.url.path),
-            limit=str(exc.detail)
+            limit=str(result.limit)
         )
+    
+    def handle_rate_limit_exceeded(self, request: Request, result: RateLimitResult):
+        """
+        Custom handler for rate limit exceeded
+        
+        Logs security event and returns user-friendly error
+        """
+        self._log_rate_limit_exceeded(request, result)
         
         return JSONResponse(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -124,9 +164,10 @@ class SmartRateLimiter:
                 "error": {
                     "code": "ERR-SEC-1001",
                     "message": "Rate limit exceeded. Please try again later.",
-                    "retry_after_seconds": 60
+                    "retry_after_seconds": result.retry_after
                 }
-            }
+            },
+            headers={"Retry-After": str(result.retry_after)}
         )
 
 
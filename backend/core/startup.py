@@ -0,0 +1,83 @@
+"""
+Process Startup Profiles
+
+The API and the worker start very differently:
+
+- API: never runs inference, so it must not pay for the ML stack at boot.
+  Modules in API_DEFERRED_MODULES are imported on first use only (route
+  handlers import pandas/the column mapper/the predictor lazily), which
+  keeps cold start short when ECS scales out. test_startup_profile.py
+  checks this with `python -X importtime`.
+- Worker: needs the models before its first message, so it pre-warms them
+  (xgboost import, registry load, SaaS baseline) in a thread while metrics,
+  the database pool and the SQS connection are initialized concurrently.
+
+Usage:
+    timings = await run_startup_steps({
+        "models": asyncio.to_thread(prewarm_prediction_models),
+        "database": warm_database(),
+    })
+"""
+import time
+import asyncio
+import logging
+from typing import Awaitable, Dict, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Must not be imported by `import backend.main`
+API_DEFERRED_MODULES = ("xgboost", "sklearn", "scipy", "pandas", "numpy")
+
+
+def prewarm_prediction_models() -> None:
+    """
+    Load the prediction router and its models (blocking; run in a thread)
+    """
+    from backend.services.prediction_router import get_prediction_router
+
+    router = get_prediction_router()
+    model_version = router.telecom_model.model_version if router.telecom_model else None
+    logger.info(f"✅ Prediction models warm (telecom model {model_version})")
+
+
+async def warm_database() -> None:
+    """Open a pooled connection so the first job doesn't pay for connect/TLS"""
+    from backend.api.database import get_async_session
+
+    async with get_async_session() as db:
+        await db.execute(text("SELECT 1"))
+
+
+async def run_startup_steps(steps: Dict[str, Awaitable]) -> Dict[str, Optional[float]]:
+    """
+    Run independent startup steps concurrently
+
+    A failing step is logged and does not stop the others (or startup);
+    whatever it initializes is retried lazily on first use.
+
+    Args:
+        steps: Step name -> awaitable
+
+    Returns:
+        Step name -> seconds taken, or None if the step failed
+    """
+    async def timed(name: str, step: Awaitable) -> Optional[float]:
+        started = time.perf_counter()
+        try:
+            await step
+        except Exception as e:
+            logger.warning(f"Startup step '{name}' failed: {type(e).__name__}: {e}")
+            return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    durations = await asyncio.gather(*(timed(name, step) for name, step in steps.items()))
+    timings = dict(zip(steps, durations))
+
+    summary = ", ".join(
+        f"{name}={'failed' if seconds is None else f'{seconds:.2f}s'}" for name, seconds in timings.items()
+    )
+    logger.info(f"✅ Startup steps finished in {time.perf_counter() - started:.2f}s ({summary})")
+    return timings
@@ -0,0 +1,83 @@
+"""
+In-Process TTL LRU Cache
+
+Shared base for the small per-process caches on the request path (user
+identities, prediction responses). Entries expire `ttl_seconds` after they
+are set, and the least recently used entry is evicted once `max_size` is
+reached. Not thread-safe: callers use it from the event loop only.
+
+Usage:
+    class ThingCache(TTLCache):
+        def invalidate_owner(self, owner_id: str) -> int:
+            return self.discard_where(lambda key: key[0] == owner_id)
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU whose entries expire after ttl_seconds
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[K, Tuple[V, float]]" = OrderedDict()
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value, or None on miss/expiry"""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= entry[1]:
+            if entry is not None:
+                del self._entries[key]
+            self.miss_count += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hit_count += 1
+        return entry[0]
+
+    def set(self, key: K, value: V) -> None:
+        """Cache a value, evicting the least recently used entry if full"""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: K) -> None:
+        """Drop one entry if present"""
+        self._entries.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[K], bool]) -> int:
+        """
+        Drop every entry whose key matches
+
+        Returns:
+            int: Number of entries removed
+        """
+        stale = [key for key in self._entries if predicate(key)]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all entries (useful for testing)"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current cache statistics"""
+        return {
+            "size": len(self._entries),
+            "hit_count": self.hit_count,
+            "miss_count": self.miss_count,
+            "hit_rate": self.hit_count / max(1, self.hit_count + self.miss_count),
+        }
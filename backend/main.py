@@ -22,7 +22,7 @@ from backend.middleware.security_logger import security_logging_middleware
 from backend.middleware.error_handler import setup_error_handlers, error_handler_middleware
 
 # Import API routes
-from backend.api.routes import predict, upload, waitlist, clerk, uploads_list, predictions, version, auth_metrics, csv_mapper
+from backend.api.routes import predict, upload, waitlist, clerk, uploads_list, predictions, version, auth_metrics, csv_mapper, outcomes
 from backend.monitoring.health import router as monitoring_router
 
 # Configure logging
@@ -83,6 +83,26 @@ async def lifespan(app: FastAPI):
         logger.error(f"Authentication system self-test failed: {e}")
         logger.warning("Authentication may not work properly")
     
+    # Keep JWKS fresh in the background so requests never wait on Clerk
+    try:
+        from backend.auth.middleware import AUTH_DEV_MODE
+        if not AUTH_DEV_MODE:
+            from backend.auth.jwt_verifier import get_jwt_verifier
+            verifier = await get_jwt_verifier()
+            verifier.start_background_refresh()
+    except Exception as e:
+        logger.error(f"JWKS background refresh failed to start: {e}")
+        logger.warning("JWKS will be refreshed on the request path")
+    
+    # Fan out prediction status events (pg NOTIFY) to SSE streams
+    try:
+        from backend.api.database import DATABASE_URL
+        from backend.services.prediction_events import start_prediction_event_listener
+        start_prediction_event_listener(DATABASE_URL)
+    except Exception as e:
+        logger.error(f"Prediction event listener failed to start: {e}")
+        logger.warning("Clients will only see status changes on their next read")
+    
     logger.info("=== STARTUP COMPLETE ===")
     
     yield
@@ -99,6 +119,41 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Metrics client shutdown failed: {e}")
     
+    # Release the S3 I/O thread pool
+    try:
+        from backend.services.s3_service import async_s3_service
+        async_s3_service.shutdown(wait=False)
+    except Exception as e:
+        logger.error(f"S3 thread pool shutdown failed: {e}")
+    
+    # Stop JWKS refresher and close its HTTP client
+    try:
+        from backend.auth.jwt_verifier import shutdown_jwt_verifier
+        await shutdown_jwt_verifier()
+    except Exception as e:
+        logger.error(f"JWT verifier shutdown failed: {e}")
+    
+    # Close the rate limiter's Redis connection pool
+    try:
+        from backend.core.rate_limiting import shutdown_rate_limit_backend
+        await shutdown_rate_limit_backend()
+    except Exception as e:
+        logger.error(f"Rate limit backend shutdown failed: {e}")
+    
+    # Send any open SQS batches and close the publisher's client
+    try:
+        from backend.services.sqs_publisher import shutdown_sqs_publisher
+        await shutdown_sqs_publisher()
+    except Exception as e:
+        logger.error(f"SQS publisher shutdown failed: {e}")
+    
+    # Close the prediction event LISTEN connection
+    try:
+        from backend.services.prediction_events import stop_prediction_event_listener
+        await stop_prediction_event_listener()
+    except Exception as e:
+        logger.error(f"Prediction event listener shutdown failed: {e}")
+    
     logger.info("=== SHUTDOWN COMPLETE ===")
 
 # Create FastAPI application with lifespan
@@ -139,9 +194,13 @@ app.add_middleware(
         "User-Agent",
         "DNT",
         "Cache-Control",
+        "If-None-Match",     # Conditional GETs on prediction endpoints (304)
         "Referer",
     ],
-    expose_headers=["Content-Length", "Content-Type", "Content-Disposition", "X-Request-ID"],
+    expose_headers=[
+        "Content-Length", "Content-Type", "Content-Disposition", "X-Request-ID", "X-Next-Cursor",
+        "Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "ETag",
+    ],
     max_age=3600,  # Cache preflight for 1 hour
 )
 
@@ -167,6 +226,7 @@ app.include_router(auth_metrics.router, prefix="/api", tags=["auth"])
 app.include_router(version.router, tags=["version"])
 app.include_router(monitoring_router, prefix="/monitoring", tags=["monitoring"])
 app.include_router(csv_mapper.router, tags=["csv-mapping"])
+app.include_router(outcomes.router, prefix="/api", tags=["outcomes"])
 
 @app.get("/")
 async def root():
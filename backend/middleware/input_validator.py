@@ -1,8 +1,20 @@
 """
 Input validation middleware for FastAPI
+
+All SQL/XSS patterns are compiled once, at import time, into a single
+alternation so each value is scanned in one pass. Most values (IDs, numbers,
+plain words) contain none of the characters the patterns need, so a set
+check routes them to a small keyword-only regex instead.
+
+Query parameters that the matched route declares with a non-string type
+(int, bool, UUID, datetime, Enum, ...) are parsed and rejected by FastAPI
+itself, so they are not scanned. Route lookups are cached per (method, path).
 """
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from starlette.routing import Match
+from collections import OrderedDict
+from typing import Any, FrozenSet, Optional, get_args, get_origin
 import re
 import logging
 
@@ -10,70 +22,150 @@ logger = logging.getLogger(__name__)
 
 class InputValidator:
     """Input validation for security threats"""
-    
+
     # SQL injection patterns
     SQL_PATTERNS = [
-        r"\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|UNION)\b",
-        r"\b(OR|AND)\s+\d+\s*=\s*\d+",
+        r"\b(?:SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|UNION)\b",
+        r"\b(?:OR|AND)\s+\d+\s*=\s*\d+",
         r"['\"];.*--",
         r"['\"].*\bOR\b.*['\"]",
     ]
-    
-    # XSS patterns  
+
+    # XSS patterns
     XSS_PATTERNS = [
         r"<script[^>]*>.*?</script>",
         r"javascript:",
         r"on\w+\s*=",
         r"<iframe[^>]*>",
     ]
-    
+
+    # Every pattern except the SQL keyword one needs at least one of these
+    TRIGGER_CHARS = frozenset("'\"<=:")
+
+    # One pass over all patterns; the named group tells SQL from XSS for logging
+    _THREAT_RE = re.compile(
+        "|".join(
+            [f"(?P<sql{i}>{p})" for i, p in enumerate(SQL_PATTERNS)] +
+            [f"(?P<xss{i}>{p})" for i, p in enumerate(XSS_PATTERNS)]
+        ),
+        re.IGNORECASE
+    )
+
+    # Only pattern that can match a value without trigger characters
+    _KEYWORD_RE = re.compile(SQL_PATTERNS[0], re.IGNORECASE)
+
+    @classmethod
+    def find_threat(cls, value: str) -> Optional[str]:
+        """
+        Scan a value for SQL/XSS patterns
+
+        Returns:
+            "SQL injection" or "XSS" if a pattern matches, else None
+        """
+        if not value or value.isdigit():
+            return None
+
+        if cls.TRIGGER_CHARS.isdisjoint(value):
+            return "SQL injection" if cls._KEYWORD_RE.search(value) else None
+
+        match = cls._THREAT_RE.search(value)
+        if match is None:
+            return None
+        return "SQL injection" if match.lastgroup.startswith("sql") else "XSS"
+
     @classmethod
     def validate_input(cls, value: str) -> bool:
         """Validate input for security threats"""
         if not isinstance(value, str):
             return True
-        
-        # Check for SQL injection
-        for pattern in cls.SQL_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                logger.warning(f"SQL injection attempt detected: {value[:100]}")
-                return False
-        
-        # Check for XSS
-        for pattern in cls.XSS_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                logger.warning(f"XSS attempt detected: {value[:100]}")
-                return False
-        
+
+        threat = cls.find_threat(value)
+        if threat:
+            logger.warning(f"{threat} attempt detected: {value[:100]}")
+            return False
+
+        return True
+
+
+# ========================================
+# TYPED ROUTE PARAMETERS
+# ========================================
+
+_TYPED_PARAMS_CACHE_SIZE = 2048
+_typed_params_cache: "OrderedDict[tuple, FrozenSet[str]]" = OrderedDict()
+
+
+def _is_string_like(annotation: Any) -> bool:
+    """Whether a declared parameter type accepts arbitrary text"""
+    if annotation is str or annotation is Any:
         return True
+    origin = get_origin(annotation)
+    if origin is not None:
+        # Optional[X], Union[X, Y], List[X], ... are text if any member is
+        return any(_is_string_like(arg) for arg in get_args(annotation) if arg is not type(None))
+    if isinstance(annotation, type) and issubclass(annotation, str):
+        # Plain str subclasses accept anything; str Enums only accept their members
+        return not hasattr(annotation, "__members__")
+    return False
+
+
+def _typed_query_params(request: Request) -> FrozenSet[str]:
+    """
+    Names of query params the matched route declares with a non-string type
+
+    Cached per (method, path) in a bounded LRU; the route table is only
+    scanned on a cache miss.
+    """
+    cache_key = (request.method, request.url.path)
+    cached = _typed_params_cache.get(cache_key)
+    if cached is not None:
+        _typed_params_cache.move_to_end(cache_key)
+        return cached
+
+    typed: FrozenSet[str] = frozenset()
+    app = request.scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            dependant = getattr(route, "dependant", None)
+            if dependant is not None:
+                typed = frozenset(
+                    field.alias for field in dependant.query_params
+                    if not _is_string_like(field.field_info.annotation)
+                )
+            break
+
+    _typed_params_cache[cache_key] = typed
+    if len(_typed_params_cache) > _TYPED_PARAMS_CACHE_SIZE:
+        _typed_params_cache.popitem(last=False)
+    return typed
+
+
+def _bad_request() -> JSONResponse:
+    return JSONResponse(
+        status_code=400,
+        content={
+            "success": False,
+            "error": "bad_request",
+            "message": "Invalid input detected.",
+        },
+    )
+
 
 async def input_validation_middleware(request: Request, call_next):
     """Input validation middleware"""
-    # Validate query parameters
-    for key, value in request.query_params.items():
-        if not InputValidator.validate_input(str(value)):
-            logger.warning(f"SQL injection attempt detected: {value[:100]}")
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "error": "bad_request",
-                    "message": "Invalid input detected.",
-                },
-            )
-    
+    # Validate query parameters (typed ones are validated by FastAPI itself)
+    query_params = request.query_params
+    if query_params:
+        typed = _typed_query_params(request)
+        for key, value in query_params.multi_items():
+            if key not in typed and not InputValidator.validate_input(value):
+                return _bad_request()
+
     # Validate path parameters
     for key, value in request.path_params.items():
         if not InputValidator.validate_input(str(value)):
-            logger.warning(f"XSS attempt detected: {value[:100]}")
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "error": "bad_request",
-                    "message": "Invalid input detected.",
-                },
-            )
-    
+            return _bad_request()
+
     response = await call_next(request)
     return response
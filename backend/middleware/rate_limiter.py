@@ -1,53 +1,49 @@
 """
 Rate limiting middleware for FastAPI
 """
-from fastapi import Request, HTTPException, status
-import time
-import asyncio
-from collections import defaultdict, deque
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+import os
 import logging
 
+from backend.core.rate_limiting import RateLimiter, get_rate_limit_backend, parse_limits
+
 logger = logging.getLogger(__name__)
 
-class RateLimiter:
-    """Simple in-memory rate limiter"""
-    
-    def __init__(self, requests_per_minute: int = 60):
-        self.requests_per_minute = requests_per_minute
-        self.requests = defaultdict(deque)
-        self.lock = asyncio.Lock()
-    
-    async def is_allowed(self, client_ip: str) -> bool:
-        """Check if request is allowed for the given IP"""
-        async with self.lock:
-            now = time.time()
-            minute_ago = now - 60
-            
-            # Clean old requests
-            while self.requests[client_ip] and self.requests[client_ip][0] < minute_ago:
-                self.requests[client_ip].popleft()
-            
-            # Check if under limit
-            if len(self.requests[client_ip]) >= self.requests_per_minute:
-                return False
-            
-            # Add current request
-            self.requests[client_ip].append(now)
-            return True
-
-# Global rate limiter instance
-rate_limiter = RateLimiter(requests_per_minute=60)
+# Global per-client limit (sliding window, shared across tasks when Redis is configured)
+RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "60/minute")
+
+_rules = parse_limits(RATE_LIMIT_DEFAULT)
+_limiter: RateLimiter = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the middleware limiter (backend created on first request)"""
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(get_rate_limit_backend())
+    return _limiter
+
 
 async def rate_limit_middleware(request: Request, call_next):
     """Rate limiting middleware"""
-    client_ip = request.client.host
-    
-    if not await rate_limiter.is_allowed(client_ip):
+    client_ip = request.client.host if request.client else "unknown"
+
+    result = await get_rate_limiter().check(f"ip:{client_ip}", _rules)
+    if not result.allowed:
         logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-        raise HTTPException(
+        # Returned (not raised): exceptions raised in HTTP middleware become 500s
+        return JSONResponse(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Rate limit exceeded. Please try again later."
+            content={"detail": "Rate limit exceeded. Please try again later."},
+            headers={
+                "Retry-After": str(result.retry_after),
+                "X-RateLimit-Limit": str(result.limit),
+                "X-RateLimit-Remaining": "0",
+            }
         )
-    
+
     response = await call_next(request)
-    return response 
\ No newline at end of file
+    response.headers["X-RateLimit-Limit"] = str(result.limit)
+    response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+    return response
@@ -0,0 +1,200 @@
+"""
+Compiled Inference Path for the Telecom Model
+
+`RetentionPredictor.prepare_features` builds the model input with
+`pd.get_dummies`, column inserts and reindexing, and scales it as a float64
+DataFrame before `predict_proba` converts it again. For a registered model
+the feature list and scaler statistics are fixed, so all of that can be
+planned once per model:
+
+- CompiledFeatureEncoder writes features straight into one preallocated,
+  C-contiguous float32 matrix. Numeric columns are scaled column by column;
+  one-hot columns are filled from category codes. Since a one-hot feature is
+  only ever 0 or 1, its scaled "off"/"on" values are precomputed, so the
+  result is identical to the DataFrame path (values are computed in float64
+  and cast once, as XGBoost does with a float64 input).
+- XGBoost models predict with `Booster.inplace_predict` on that matrix (no
+  DMatrix construction or sklearn wrapper checks).
+- LogisticRegression folds the scaler into its weights, so prediction is a
+  single matmul on the unscaled matrix plus a sigmoid.
+
+Models without a feature list or scaler statistics (legacy pickles) are
+not compiled; RetentionPredictor keeps its DataFrame path for those.
+
+Usage:
+    compiled = CompiledModel.compile(artifact, defaults, categorical_columns)
+    X = compiled.transform(df_cleaned)
+    churn_probability = compiled.predict_proba(X)
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledFeatureEncoder:
+    """
+    Feature plan for one fixed feature list: DataFrame -> float32 matrix
+    """
+
+    def __init__(
+        self,
+        feature_names: Sequence[str],
+        defaults: Dict[str, Any],
+        categorical_columns: Sequence[str],
+        mean: Optional[np.ndarray] = None,
+        scale: Optional[np.ndarray] = None
+    ):
+        """
+        Args:
+            feature_names: Model input order (numeric names and `column_value` one-hots)
+            defaults: Value used when a source column is missing from the input
+            categorical_columns: Source columns that are one-hot encoded
+            mean: Scaler means per feature (None = unscaled output)
+            scale: Scaler scales per feature
+        """
+        self.feature_names = list(feature_names)
+        self.defaults = dict(defaults)
+        n_features = len(self.feature_names)
+
+        mean = np.zeros(n_features) if mean is None else np.asarray(mean, dtype=np.float64)
+        scale = np.ones(n_features) if scale is None else np.asarray(scale, dtype=np.float64)
+        self.mean = mean
+        self.scale = scale
+
+        # Scaled value of a feature that is 0 (template row) / 1 (hot one-hot)
+        self.off_values = ((0.0 - mean) / scale).astype(np.float32)
+        self.on_values = ((1.0 - mean) / scale).astype(np.float32)
+
+        # Longest prefix first, so e.g. "Contract_" can't shadow a longer column name
+        prefixes = sorted(categorical_columns, key=len, reverse=True)
+        self.numeric: List[Tuple[int, str]] = []
+        onehot: Dict[str, Tuple[List[str], List[int]]] = {}
+        for index, name in enumerate(self.feature_names):
+            column = next((c for c in prefixes if name.startswith(f"{c}_")), None)
+            if column is None:
+                self.numeric.append((index, name))
+            else:
+                categories, indices = onehot.setdefault(column, ([], []))
+                categories.append(name[len(column) + 1:])
+                indices.append(index)
+
+        self.onehot = {
+            column: (pd.Index(categories), np.asarray(indices, dtype=np.intp))
+            for column, (categories, indices) in onehot.items()
+        }
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Encode (and scale) a cleaned DataFrame
+
+        Matches prepare_features: missing source columns take their default,
+        values outside the trained categories (and NaN) encode as all-zero
+        one-hots, and numeric features that are missing or not numeric are 0.
+        """
+        n_rows = len(df)
+        X = np.empty((n_rows, len(self.feature_names)), dtype=np.float32)
+        X[:] = self.off_values
+
+        for index, name in self.numeric:
+            series = df.get(name, self.defaults.get(name))
+            if isinstance(series, pd.Series):
+                if not (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)):
+                    continue
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            elif series is None or isinstance(series, str):
+                continue
+            else:
+                values = float(series)
+            X[:, index] = (values - self.mean[index]) / self.scale[index]
+
+        for column, (categories, indices) in self.onehot.items():
+            if column in df.columns:
+                series = df[column]
+                if not (isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(series)
+                        or pd.api.types.is_string_dtype(series)):
+                    # get_dummies only expands categorical/string columns
+                    continue
+                codes = pd.Categorical(series, categories=categories).codes
+                rows = np.flatnonzero(codes >= 0)
+                hot = indices[codes[rows]]
+                X[rows, hot] = self.on_values[hot]
+            elif column in self.defaults:
+                position = categories.get_indexer([self.defaults[column]])[0]
+                if position >= 0:
+                    X[:, indices[position]] = self.on_values[indices[position]]
+
+        return X
+
+
+class CompiledModel:
+    """
+    Encoder plus a direct predict function for a registered model
+    """
+
+    def __init__(self, encoder: CompiledFeatureEncoder, predict_fn, kind: str):
+        self.encoder = encoder
+        self.feature_names = encoder.feature_names
+        self.kind = kind
+        self._predict_fn = predict_fn
+
+    @classmethod
+    def compile(
+        cls,
+        artifact: Any,
+        defaults: Dict[str, Any],
+        categorical_columns: Sequence[str]
+    ) -> Optional['CompiledModel']:
+        """
+        Compile a registry ModelArtifact, or return None if unsupported
+
+        Supported: binary XGBoost classifiers and binary LogisticRegression,
+        with a feature list and scaler statistics.
+        """
+        model = artifact.model
+        if not artifact.feature_names or not artifact.has_scaler:
+            return None
+        n_features = len(artifact.feature_names)
+
+        if hasattr(model, 'get_booster'):
+            booster = model.get_booster()
+            if getattr(model, 'objective', None) != 'binary:logistic' or booster.num_features() != n_features:
+                return None
+            encoder = CompiledFeatureEncoder(
+                artifact.feature_names, defaults, categorical_columns,
+                artifact.scaler_mean, artifact.scaler_scale
+            )
+            try:
+                iteration_range = (0, model.best_iteration + 1)
+            except AttributeError:
+                iteration_range = (0, 0)
+
+            def predict_fn(X: np.ndarray) -> np.ndarray:
+                return booster.inplace_predict(X, iteration_range=iteration_range, validate_features=False)
+
+            return cls(encoder, predict_fn, 'xgboost')
+
+        coef = getattr(model, 'coef_', None)
+        if coef is not None and hasattr(model, 'intercept_') and coef.shape == (1, n_features):
+            # Fold the scaler in: w.((x - mean) / scale) + b = (w / scale).x + (b - w.(mean / scale))
+            weights = coef[0] / artifact.scaler_scale
+            bias = float(model.intercept_[0] - np.dot(weights, artifact.scaler_mean))
+            weights = weights.astype(np.float32)
+            encoder = CompiledFeatureEncoder(artifact.feature_names, defaults, categorical_columns)
+
+            def predict_fn(X: np.ndarray) -> np.ndarray:
+                return 1.0 / (1.0 + np.exp(-(X @ weights + bias)))
+
+            return cls(encoder, predict_fn, 'linear')
+
+        return None
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        return self.encoder.transform(df)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Positive-class (churn) probability per row"""
+        return self._predict_fn(X)
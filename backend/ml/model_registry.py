@@ -0,0 +1,320 @@
+"""
+Model Registry - Versioned Model Artifacts
+
+Replaces "newest best_retention_model_*.pkl by mtime" with an explicit
+manifest (`models/manifest.json`) that records, per version:
+
+- format: "ubj" (XGBoost native UBJSON) or "pickle" (other estimators)
+- artifact + sha256: the model file and its content hash
+- features: the exact feature order the model was trained on
+- scaler: optional StandardScaler statistics (JSON, mean/scale per feature)
+- created_at
+
+The manifest's `active` version is what gets served; `MODEL_VERSION` pins a
+version regardless of the manifest (e.g. to roll back one service).
+
+XGBoost models are stored with `save_model` in UBJSON rather than pickled:
+loading is a parse of the model buffer (no Python object graph to rebuild),
+it does not depend on the numpy/sklearn versions the model was trained
+with, and a model loaded before the server forks its workers is shared
+copy-on-write. Scaler statistics are stored as plain JSON for the same
+reason.
+
+Registering writes the artifacts first and then replaces the manifest with
+`os.replace`, so readers see either the old or the new manifest, never a
+partial one or a version whose files are missing.
+
+When no manifest exists the registry falls back to the legacy layout
+(newest `best_retention_model_*.pkl`).
+
+Usage:
+    artifact = get_model_registry().load()          # active / pinned version
+    artifact = get_model_registry().load("20251126_191808")
+    get_model_registry().register(model, version, feature_names, scaler=scaler)
+"""
+import os
+import json
+import pickle
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = Path(__file__).parent / 'models'
+MANIFEST_NAME = 'manifest.json'
+LEGACY_MODEL_GLOB = 'best_retention_model_*.pkl'
+
+
+class ModelIntegrityError(Exception):
+    """Artifact on disk does not match the hash recorded in the manifest"""
+    pass
+
+
+@dataclass(frozen=True)
+class ModelArtifact:
+    """
+    A loaded model version.
+
+    Attributes:
+        version: Manifest version (timestamp of the training run)
+        model: Fitted estimator (XGBClassifier for "ubj" artifacts)
+        feature_names: Trained feature order, or None for legacy models
+        scaler_mean: Per-feature means of the training StandardScaler
+        scaler_scale: Per-feature scales of the training StandardScaler
+        source: Path the model was loaded from
+    """
+    version: str
+    model: Any
+    feature_names: Optional[List[str]] = None
+    scaler_mean: Optional[np.ndarray] = None
+    scaler_scale: Optional[np.ndarray] = None
+    source: Optional[str] = None
+
+    @property
+    def has_scaler(self) -> bool:
+        return self.scaler_mean is not None and self.scaler_scale is not None
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ModelRegistry:
+    """
+    Manifest-backed model store for one models directory
+    """
+
+    def __init__(self, model_dir: Optional[Path] = None):
+        self.model_dir = Path(model_dir) if model_dir else MODEL_DIR
+        self.manifest_path = self.model_dir / MANIFEST_NAME
+
+    # ========================================
+    # MANIFEST
+    # ========================================
+
+    def read_manifest(self) -> Optional[Dict[str, Any]]:
+        """Current manifest, or None if the directory has no manifest yet"""
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def manifest_signature(self) -> Optional[Tuple[int, int]]:
+        """Cheap change marker (mtime_ns, size) for polling without parsing"""
+        try:
+            stat = self.manifest_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get_entry(self, version: str) -> Optional[Dict[str, Any]]:
+        """Manifest entry for a version, or None"""
+        manifest = self.read_manifest()
+        return manifest.get('versions', {}).get(version) if manifest else None
+
+    def active_version(self) -> Optional[str]:
+        """Version to serve: MODEL_VERSION pin, else the manifest's active version"""
+        pinned = os.getenv('MODEL_VERSION')
+        if pinned:
+            return pinned
+        manifest = self.read_manifest()
+        return manifest.get('active') if manifest else None
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        tmp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    # ========================================
+    # LOADING
+    # ========================================
+
+    def _read_verified(self, name: str, expected_sha256: Optional[str]) -> bytes:
+        data = (self.model_dir / name).read_bytes()
+        if expected_sha256 and _sha256(data) != expected_sha256:
+            raise ModelIntegrityError(f"{name}: sha256 does not match the manifest")
+        return data
+
+    def load(self, version: Optional[str] = None) -> ModelArtifact:
+        """
+        Load a model version (default: the active or pinned version)
+
+        Raises:
+            FileNotFoundError: No manifest/legacy model, or unknown version
+            ModelIntegrityError: Artifact hash mismatch
+        """
+        manifest = self.read_manifest()
+        if manifest is None:
+            if version:
+                raise FileNotFoundError(f"Model version {version} not found (no {MANIFEST_NAME})")
+            return self.load_legacy()
+
+        version = version or self.active_version()
+        entry = manifest.get('versions', {}).get(version)
+        if entry is None:
+            raise FileNotFoundError(f"Model version {version} not in {self.manifest_path}")
+
+        data = self._read_verified(entry['artifact'], entry.get('sha256'))
+        if entry.get('format', 'ubj') == 'ubj':
+            import xgboost as xgb
+            model = xgb.XGBClassifier()
+            model.load_model(bytearray(data))
+        else:
+            model = pickle.loads(data)
+
+        scaler_mean = scaler_scale = None
+        if entry.get('scaler'):
+            stats = json.loads(self._read_verified(entry['scaler']['artifact'], entry['scaler'].get('sha256')))
+            scaler_mean = np.asarray(stats['mean'], dtype=np.float64)
+            scaler_scale = np.asarray(stats['scale'], dtype=np.float64)
+
+        logger.info(f"✅ Loaded model {version} ({entry['artifact']})")
+        return ModelArtifact(
+            version=version,
+            model=model,
+            feature_names=entry.get('features'),
+            scaler_mean=scaler_mean,
+            scaler_scale=scaler_scale,
+            source=str(self.model_dir / entry['artifact'])
+        )
+
+    def load_legacy(self) -> ModelArtifact:
+        """Newest best_retention_model_*.pkl by mtime (pre-manifest layout)"""
+        model_files = list(self.model_dir.glob(LEGACY_MODEL_GLOB))
+        if not model_files:
+            raise FileNotFoundError("No model files found in models directory")
+
+        latest_model = max(model_files, key=lambda x: x.stat().st_mtime)
+        logger.info(f"Loading model: {latest_model.name} (no {MANIFEST_NAME}, legacy pickle)")
+        with open(latest_model, 'rb') as f:
+            model = pickle.load(f)
+
+        version = latest_model.stem.replace('best_retention_model_', '')
+        return ModelArtifact(version=version, model=model, source=str(latest_model))
+
+    # ========================================
+    # REGISTRATION
+    # ========================================
+
+    def register(
+        self,
+        model: Any,
+        version: str,
+        feature_names: List[str],
+        scaler: Any = None,
+        activate: bool = True,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Write a model version's artifacts and add it to the manifest
+
+        Args:
+            model: Fitted estimator; XGBoost models are saved as UBJSON
+            version: Version label (training run timestamp)
+            feature_names: Trained feature order
+            scaler: Fitted StandardScaler, or a dict with 'mean' and 'scale'
+            activate: Make this the active version
+            metadata: Extra manifest fields (e.g. parent, trained_through)
+
+        Returns:
+            The manifest entry for the version
+        """
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        feature_names = [str(name) for name in feature_names]
+
+        if hasattr(model, 'save_model') and hasattr(model, 'get_booster'):
+            artifact_name = f"retention_model_{version}.ubj"
+            model.save_model(self.model_dir / artifact_name)
+            model_format = 'ubj'
+        else:
+            artifact_name = f"retention_model_{version}.pkl"
+            with open(self.model_dir / artifact_name, 'wb') as f:
+                pickle.dump(model, f)
+            model_format = 'pickle'
+
+        entry: Dict[str, Any] = {
+            'format': model_format,
+            'artifact': artifact_name,
+            'sha256': _sha256((self.model_dir / artifact_name).read_bytes()),
+            'features': feature_names,
+            'scaler': None,
+            'created_at': datetime.utcnow().isoformat(),
+            **(metadata or {})
+        }
+
+        if scaler is not None:
+            stats = self._scaler_stats(scaler, feature_names)
+            scaler_name = f"scaler_{version}.json"
+            data = json.dumps(stats).encode()
+            (self.model_dir / scaler_name).write_bytes(data)
+            entry['scaler'] = {'artifact': scaler_name, 'sha256': _sha256(data)}
+
+        manifest = self.read_manifest() or {'active': None, 'versions': {}}
+        manifest['versions'][version] = entry
+        if activate or manifest.get('active') is None:
+            manifest['active'] = version
+        self._write_manifest(manifest)
+
+        logger.info(f"✅ Registered model {version} ({model_format}, active={manifest['active']})")
+        return entry
+
+    def activate(self, version: str) -> None:
+        """Make an already registered version the active one"""
+        manifest = self.read_manifest()
+        if not manifest or version not in manifest.get('versions', {}):
+            raise FileNotFoundError(f"Model version {version} is not registered")
+        manifest['active'] = version
+        self._write_manifest(manifest)
+        logger.info(f"✅ Activated model {version}")
+
+    @staticmethod
+    def _scaler_stats(scaler: Any, feature_names: List[str]) -> Dict[str, Any]:
+        if isinstance(scaler, dict):
+            mean, scale = scaler['mean'], scaler['scale']
+            scaler_features = scaler.get('features')
+        else:
+            mean, scale = scaler.mean_, scaler.scale_
+            scaler_features = getattr(scaler, 'feature_names_in_', None)
+
+        if scaler_features is not None and [str(f) for f in scaler_features] != feature_names:
+            raise ValueError("Scaler was fitted on a different feature order than the model")
+        if len(mean) != len(feature_names) or len(scale) != len(feature_names):
+            raise ValueError("Scaler statistics do not match the feature count")
+
+        return {
+            'features': feature_names,
+            'mean': [float(v) for v in mean],
+            'scale': [float(v) for v in scale]
+        }
+
+
+# ========================================
+# SINGLETON INSTANCE
+# ========================================
+
+_registry_instance: Optional[ModelRegistry] = None
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Get singleton registry for the bundled models directory.
+
+    Returns:
+        ModelRegistry instance
+    """
+    global _registry_instance
+
+    if _registry_instance is None:
+        _registry_instance = ModelRegistry()
+
+    return _registry_instance
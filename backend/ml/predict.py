@@ -1,54 +1,84 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
-import pickle
 from datetime import datetime
 import warnings
-from sklearn.preprocessing import StandardScaler
 import logging
-import xgboost as xgb
-from sklearn.linear_model import LogisticRegression
+from typing import Optional
+
+from backend.ml.model_registry import ModelArtifact, get_model_registry
+from backend.ml.fast_inference import CompiledModel
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Telecom categorical columns (one-hot encoded for the model)
+CATEGORICAL_COLUMNS = [
+    'gender', 'Partner', 'Dependents', 'PhoneService', 'MultipleLines',
+    'InternetService', 'OnlineSecurity', 'OnlineBackup', 'DeviceProtection',
+    'TechSupport', 'StreamingTV', 'StreamingMovies', 'Contract',
+    'PaperlessBilling', 'PaymentMethod'
+]
+
+# Required Telecom features that model expects, with the defaults used when
+# the input (e.g. SaaS data) doesn't have them
+TELECOM_FEATURE_DEFAULTS = {
+    'gender': 'Male',  # Default
+    'SeniorCitizen': 0,  # Default: Not senior
+    'Partner': 'No',  # Default
+    'Dependents': 'No',  # Default
+    'PhoneService': 'Yes',  # Default: Has phone
+    'MultipleLines': 'No',  # Default
+    'InternetService': 'Fiber optic',  # Default: Premium service (SaaS assumption)
+    'OnlineSecurity': 'No',  # Default
+    'OnlineBackup': 'No',  # Default
+    'DeviceProtection': 'No',  # Default
+    'TechSupport': 'No',  # Default
+    'StreamingTV': 'No',  # Default
+    'StreamingMovies': 'No',  # Default
+    'PaperlessBilling': 'Yes',  # Default: Modern/SaaS companies use digital
+    'PaymentMethod': 'Electronic check'  # Default
+}
+
 class RetentionPredictor:
-    def __init__(self):
-        """Initialize the predictor with paths and model."""
+    def __init__(self, artifact: Optional[ModelArtifact] = None, fast_inference: bool = True):
+        """
+        Initialize the predictor with paths and model.
+        
+        Args:
+            artifact: Model version to serve; defaults to the registry's
+                active (or MODEL_VERSION-pinned) version
+            fast_inference: Use the compiled inference path when the model
+                supports it (see backend/ml/fast_inference.py)
+        """
         self.base_path = Path(__file__).parent
         self.model_dir = self.base_path / 'models'
         self.predictions_dir = self.base_path / 'predictions'
         self.predictions_dir.mkdir(exist_ok=True)
         
-        # Try to load the latest model, but don't fail if none exists
-        try:
-            self.model = self._load_latest_model()
-            self.model_available = True
-        except FileNotFoundError:
-            logger.warning("No model files found. Predictor will not be functional until a model is available.")
-            self.model = None
-            self.model_available = False
-        
-        # Initialize scaler
-        self.scaler = StandardScaler()
+        # Try to load the active model, but don't fail if none exists
+        if artifact is None:
+            try:
+                artifact = get_model_registry().load()
+            except FileNotFoundError:
+                logger.warning("No model files found. Predictor will not be functional until a model is available.")
+        
+        self.artifact = artifact
+        self.model = artifact.model if artifact else None
+        self.model_version = artifact.version if artifact else None
+        self.model_available = artifact is not None
+        
+        # Compiled encoder + direct predict for registered XGBoost/linear models
+        self.compiled = None
+        if fast_inference and artifact is not None:
+            self.compiled = CompiledModel.compile(artifact, TELECOM_FEATURE_DEFAULTS, CATEGORICAL_COLUMNS)
+            if self.compiled is None:
+                logger.info("Model not supported by the compiled inference path, using DataFrame path")
     
     def _load_latest_model(self):
-        """Load the most recent model from the models directory."""
-        try:
-            model_files = list(self.model_dir.glob('best_retention_model_*.pkl'))
-            if not model_files:
-                raise FileNotFoundError("No model files found in models directory")
-            
-            latest_model = max(model_files, key=lambda x: x.stat().st_mtime)
-            logger.info(f"Loading model: {latest_model.name}")
-            
-            with open(latest_model, 'rb') as f:
-                return pickle.load(f)
-        
-        except Exception as e:
-            logger.error(f"Error loading model: {str(e)}")
-            raise
+        """Load the most recent legacy pickle (kept for callers predating the registry)."""
+        return get_model_registry().load_legacy().model
     
     def clean_data(self, df):
         """
@@ -93,12 +123,7 @@ class RetentionPredictor:
             raise ValueError("Required column 'tenure' is missing after column mapping")
         
         # Convert categorical columns (only if present)
-        categorical_cols = [
-            'gender', 'Partner', 'Dependents', 'PhoneService', 'MultipleLines',
-            'InternetService', 'OnlineSecurity', 'OnlineBackup', 'DeviceProtection',
-            'TechSupport', 'StreamingTV', 'StreamingMovies', 'Contract',
-            'PaperlessBilling', 'PaymentMethod'
-        ]
+        categorical_cols = CATEGORICAL_COLUMNS
         
         found_categorical = 0
         for col in categorical_cols:
@@ -138,23 +163,7 @@ class RetentionPredictor:
         # We need to add/map missing Telecom features
         
         # Required Telecom categorical features that model expects
-        telecom_required_features = {
-            'gender': 'Male',  # Default
-            'SeniorCitizen': 0,  # Default: Not senior
-            'Partner': 'No',  # Default
-            'Dependents': 'No',  # Default
-            'PhoneService': 'Yes',  # Default: Has phone
-            'MultipleLines': 'No',  # Default
-            'InternetService': 'Fiber optic',  # Default: Premium service (SaaS assumption)
-            'OnlineSecurity': 'No',  # Default
-            'OnlineBackup': 'No',  # Default
-            'DeviceProtection': 'No',  # Default
-            'TechSupport': 'No',  # Default
-            'StreamingTV': 'No',  # Default
-            'StreamingMovies': 'No',  # Default
-            'PaperlessBilling': 'Yes',  # Default: Modern/SaaS companies use digital
-            'PaymentMethod': 'Electronic check'  # Default
-        }
+        telecom_required_features = TELECOM_FEATURE_DEFAULTS
         
         # Add missing Telecom features with defaults
         for feature, default_value in telecom_required_features.items():
@@ -174,7 +183,8 @@ class RetentionPredictor:
         # We need to ensure we have exactly those features
         
         # Expected features from Telecom model (45 features)
-        # This is the feature set the model was trained on
+        # Registered models carry their trained order in the manifest; the
+        # list below is only the fallback for legacy pickles
         expected_features = [
             'tenure', 'MonthlyCharges', 'TotalCharges', 'SeniorCitizen',
             'gender_Female', 'gender_Male',
@@ -194,6 +204,8 @@ class RetentionPredictor:
             'PaymentMethod_Bank transfer (automatic)', 'PaymentMethod_Credit card (automatic)',
             'PaymentMethod_Electronic check', 'PaymentMethod_Mailed check'
         ]
+        if self.artifact is not None and self.artifact.feature_names:
+            expected_features = self.artifact.feature_names
         
         # Add missing features with zeros
         for feature in expected_features:
@@ -212,8 +224,14 @@ class RetentionPredictor:
         
         logger.info(f"Final feature count: {X.shape[1]} (expected: {len(expected_features)})")
         
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        # Scale features with the training statistics when the model has them
+        if self.artifact is not None and self.artifact.has_scaler:
+            X_scaled = (X.to_numpy(dtype=np.float64) - self.artifact.scaler_mean) / self.artifact.scaler_scale
+        else:
+            # Legacy models without stats: fit on the batch (sklearn imported
+            # here so loading the predictor doesn't pull it in)
+            from sklearn.preprocessing import StandardScaler
+            X_scaled = StandardScaler().fit_transform(X)
         
         return X_scaled, X.columns
     
@@ -221,32 +239,30 @@ class RetentionPredictor:
         """Generate feature importance explanations for predictions."""
         logger.info("Generating feature importance explanations...")
         try:
-            # Get feature importances based on model type
-            if isinstance(self.model, xgb.XGBClassifier):
+            # Get feature importances based on model type (tree ensembles
+            # such as XGBoost, then linear models such as LogisticRegression)
+            if hasattr(self.model, 'feature_importances_'):
                 importances = self.model.feature_importances_
-            elif isinstance(self.model, LogisticRegression):
+            elif hasattr(self.model, 'coef_'):
                 importances = np.abs(self.model.coef_[0])
             else:
                 # For other models that might not have feature_importances_
                 return ["Feature importance not available for this model type"] * len(X_scaled)
             
-            # Get indices of top features for each prediction
-            top_features = []
-            for _ in range(len(X_scaled)):
-                # Get indices of top 3 features
-                top_indices = np.argsort(importances)[-3:][::-1]
-                
-                # Create explanation string
-                features = []
-                for idx in top_indices:
-                    feature = feature_names[idx]
-                    importance = importances[idx]
-                    impact = "increases" if importance > 0 else "decreases"
-                    features.append(f"{feature} {impact} retention by {abs(importance):.3f}")
-                
-                top_features.append("; ".join(features))
+            # Importances are global, so every prediction gets the same
+            # explanation; build it once
+            # Get indices of top 3 features
+            top_indices = np.argsort(importances)[-3:][::-1]
+            
+            # Create explanation string
+            features = []
+            for idx in top_indices:
+                feature = feature_names[idx]
+                importance = importances[idx]
+                impact = "increases" if importance > 0 else "decreases"
+                features.append(f"{feature} {impact} retention by {abs(importance):.3f}")
             
-            return top_features
+            return ["; ".join(features)] * len(X_scaled)
         
         except Exception as e:
             logger.error(f"Error generating feature importance explanations: {str(e)}")
@@ -264,12 +280,16 @@ class RetentionPredictor:
             # Clean data
             df_cleaned = self.clean_data(df)
             
-            # Prepare features
-            X_scaled, feature_names = self.prepare_features(df_cleaned)
-            
-            # Make predictions
-            logger.info("Making predictions...")
-            y_pred_proba = self.model.predict_proba(X_scaled)[:, 1]
+            # Prepare features and make predictions
+            if self.compiled is not None:
+                X_scaled = self.compiled.transform(df_cleaned)
+                feature_names = self.compiled.feature_names
+                logger.info(f"Making predictions ({self.compiled.kind} compiled path, {X_scaled.shape[1]} features)...")
+                y_pred_proba = self.compiled.predict_proba(X_scaled)
+            else:
+                X_scaled, feature_names = self.prepare_features(df_cleaned)
+                logger.info("Making predictions...")
+                y_pred_proba = self.model.predict_proba(X_scaled)[:, 1]
             # Convert churn probability to retention probability
             retention_proba = 1 - y_pred_proba
             retention_pred = (retention_proba >= 0.5).astype(int)
@@ -6,14 +6,19 @@ from pathlib import Path
 from datetime import datetime
 import pickle
 import warnings
-from sklearn.model_selection import train_test_split, StratifiedKFold
-from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LogisticRegression
-from sklearn.pipeline import Pipeline
+from imblearn.pipeline import Pipeline
 from sklearn.metrics import (classification_report, roc_curve, precision_recall_curve,
-                           auc, average_precision_score)
+                           auc)
 from imblearn.over_sampling import SMOTE
 import xgboost as xgb
+import argparse
+
+from backend.ml.model_registry import get_model_registry
+from backend.ml.training_runner import (
+    FeatureMatrixCache, closed_partitions, load_training_frame, prepare_training_data,
+    run_training_jobs
+)
 
 # Suppress warnings
 warnings.filterwarnings('ignore')
@@ -23,10 +28,35 @@ RANDOM_STATE = 42
 np.random.seed(RANDOM_STATE)
 
 class ChurnPredictor:
-    def __init__(self):
-        """Initialize paths and timestamp."""
+    def __init__(
+        self,
+        data_path=None,
+        n_jobs=-1,
+        early_stopping_rounds=20,
+        use_cache=True,
+        run_eda=True,
+        activate=False
+    ):
+        """
+        Initialize paths and timestamp.
+        
+        Args:
+            data_path: Training CSV/Parquet (default: the Telco dataset);
+                MLTrainingData exports are accepted as-is, including a
+                month-partitioned export directory (closed months)
+            n_jobs: joblib workers for (model x fold) jobs (-1 = all cores)
+            early_stopping_rounds: XGBoost early stopping (None = off)
+            use_cache: Reuse the memory-mapped feature matrix for unchanged data
+            run_eda: Clean-data CSV and EDA plots (skip for nightly retrains)
+            activate: Make the best model the registry's active version
+        """
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.base_path = Path(__file__).parent
+        self.n_jobs = n_jobs
+        self.early_stopping_rounds = early_stopping_rounds
+        self.cache = FeatureMatrixCache() if use_cache else None
+        self.run_eda = run_eda
+        self.activate = activate
         
         # Create necessary directories
         self.dirs = {
@@ -37,6 +67,8 @@ class ChurnPredictor:
         }
         for dir_path in self.dirs.values():
             dir_path.mkdir(exist_ok=True)
+        
+        self.data_path = Path(data_path) if data_path else self.dirs['data'] / "WA_Fn-UseC_-Telco-Customer-Churn.csv"
     
     def log_step(self, message):
         """Print timestamped log message."""
@@ -46,11 +78,11 @@ class ChurnPredictor:
         """Load and verify raw data."""
         self.log_step("Loading raw data...")
         
-        data_path = self.dirs['data'] / "WA_Fn-UseC_-Telco-Customer-Churn.csv"
+        data_path = self.data_path
         if not data_path.exists():
             raise FileNotFoundError(f"Data file not found at: {data_path}")
         
-        df = pd.read_csv(data_path)
+        df = load_training_frame(data_path)
         print(f"\nDataset shape: {df.shape}")
         print("\nFirst 3 rows:")
         print(df.head(3))
@@ -124,25 +156,13 @@ class ChurnPredictor:
         plt.savefig(self.dirs['plots'] / f"correlation_heatmap_{self.timestamp}.png")
         plt.close()
     
-    def prepare_features(self, df):
-        """Prepare features for modeling."""
+    def prepare_features(self):
+        """Prepare the split and scaled feature matrices (cached by content hash)."""
         self.log_step("Preparing features...")
         
-        # Drop customerID and encode categorical variables
-        X = pd.get_dummies(df.drop(['customerID', 'Churn'], axis=1))
-        y = (df['Churn'] == 'Yes').astype(int)
-        
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=RANDOM_STATE, stratify=y
+        return prepare_training_data(
+            self.data_path, cache=self.cache, test_size=0.2, random_state=RANDOM_STATE
         )
-        
-        # Scale features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-        
-        return X_train_scaled, X_test_scaled, y_train, y_test, X.columns
     
     def train_models(self, X_train, X_test, y_train, y_test, feature_names):
         """Train and evaluate multiple models."""
@@ -168,33 +188,27 @@ class ChurnPredictor:
             )
         }
         
-        # Train and evaluate models
+        # Cross-validate and fit all models, (model x fold) jobs in parallel
+        cv_scores, fitted = run_training_jobs(
+            models, X_train, y_train,
+            n_splits=5,
+            n_jobs=self.n_jobs,
+            early_stopping_rounds=self.early_stopping_rounds,
+            random_state=RANDOM_STATE
+        )
+        
+        # Evaluate models
         results = []
         best_score = 0
         best_model = None
         
-        for name, model in models.items():
-            self.log_step(f"Training {name}...")
-            
-            # Train with cross-validation
-            cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=RANDOM_STATE)
-            cv_scores = []
-            
-            for fold, (train_idx, val_idx) in enumerate(cv.split(X_train, y_train), 1):
-                X_fold_train, X_fold_val = X_train[train_idx], X_train[val_idx]
-                y_fold_train, y_fold_val = y_train[train_idx], y_train[val_idx]
-                
-                model.fit(X_fold_train, y_fold_train)
-                y_fold_pred = model.predict(X_fold_val)
-                cv_scores.append(average_precision_score(y_fold_val, y_fold_pred))
-            
+        for name, model in fitted.items():
             # Final evaluation on test set
-            model.fit(X_train, y_train)
             y_pred = model.predict(X_test)
             
             # Calculate metrics
             report = classification_report(y_test, y_pred)
-            avg_cv_score = np.mean(cv_scores)
+            avg_cv_score = np.mean(cv_scores[name])
             
             results.append({
                 'name': name,
@@ -210,7 +224,7 @@ class ChurnPredictor:
         
         return results, best_model
     
-    def save_results(self, results, best_model, feature_names):
+    def save_results(self, results, best_model, feature_names, scaler_stats=None):
         """Save model results and performance reports."""
         self.log_step("Saving results...")
         
@@ -233,23 +247,38 @@ class ChurnPredictor:
         with open(model_path, 'wb') as f:
             pickle.dump(best_model, f)
         
+        # Register (UBJSON + feature order + scaler stats) for hot-swap;
+        # partitioned exports record the last month so incremental
+        # retraining continues from the next one
+        metadata = None
+        if self.data_path.is_dir():
+            months = list(closed_partitions(self.data_path))
+            metadata = {'trained_through': months[-1]} if months else None
+        get_model_registry().register(
+            best_model, self.timestamp, list(feature_names),
+            scaler=scaler_stats, activate=self.activate, metadata=metadata
+        )
+        
         print(f"\nResults saved to: {report_path}")
         print(f"Best model saved to: {model_path}")
     
     def run_pipeline(self):
         """Run the complete modeling pipeline."""
         try:
-            # Load and process data
-            df = self.load_data()
-            df_cleaned = self.clean_data(df)
-            self.analyze_data(df_cleaned)
+            # Load and process data (EDA only; training uses the cached matrix)
+            if self.run_eda:
+                df = self.load_data()
+                df_cleaned = self.clean_data(df)
+                self.analyze_data(df_cleaned)
             
             # Prepare features and train models
-            X_train, X_test, y_train, y_test, feature_names = self.prepare_features(df_cleaned)
-            results, best_model = self.train_models(X_train, X_test, y_train, y_test, feature_names)
+            prepared = self.prepare_features()
+            results, best_model = self.train_models(
+                prepared.X_train, prepared.X_test, prepared.y_train, prepared.y_test, prepared.feature_names
+            )
             
             # Save results
-            self.save_results(results, best_model, feature_names)
+            self.save_results(results, best_model, prepared.feature_names, prepared.scaler_stats())
             
             self.log_step("Pipeline completed successfully!")
             
@@ -258,5 +287,22 @@ class ChurnPredictor:
             raise
 
 if __name__ == "__main__":
-    predictor = ChurnPredictor()
-    predictor.run_pipeline() 
+    parser = argparse.ArgumentParser(description="Train churn models and register the best one")
+    parser.add_argument("--data", type=Path, help="Training CSV/Parquet or partition directory (MLTrainingData export)")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel training jobs (-1 = all cores)")
+    parser.add_argument("--early-stopping-rounds", type=int, default=20, help="XGBoost early stopping (0 = off)")
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild the feature matrix")
+    parser.add_argument("--skip-eda", action="store_true", help="Skip cleaned CSV and plots (nightly runs)")
+    parser.add_argument("--activate", action="store_true", help="Make the best model the active version")
+    args = parser.parse_args()
+    
+    predictor = ChurnPredictor(
+        data_path=args.data,
+        n_jobs=args.n_jobs,
+        early_stopping_rounds=args.early_stopping_rounds or None,
+        use_cache=not args.no_cache,
+        run_eda=not args.skip_eda,
+        activate=args.activate
+    )
+    predictor.run_pipeline()
+
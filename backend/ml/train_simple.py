@@ -13,6 +13,8 @@ from sklearn.preprocessing import StandardScaler
 import xgboost as xgb
 import warnings
 
+from backend.ml.model_registry import get_model_registry
+
 warnings.filterwarnings('ignore')
 
 def log_step(message):
@@ -105,6 +107,9 @@ def train_model():
     with open(feature_path, 'w') as f:
         f.write('\n'.join(X.columns))
     
+    # Register (UBJSON model + JSON scaler stats) and make it the active version
+    get_model_registry().register(model, timestamp, list(X.columns), scaler=scaler)
+    
     log_step("Model training completed successfully!")
     print(f"\nModel saved to: {model_path}")
     print(f"Scaler saved to: {scaler_path}")
@@ -0,0 +1,464 @@
+"""
+Parallel Training Runner
+
+Makes ChurnPredictor retraining cheap enough to run nightly on
+MLTrainingData exports:
+
+1. Cached feature matrix: the encoded, split and scaled matrices are saved
+   as `.npy` files keyed by the source file's content hash (plus split
+   parameters), and reopened memory-mapped (`mmap_mode='r'`). Re-runs on the
+   same export skip reading, cleaning and one-hot encoding the CSV, and
+   joblib workers map the same pages instead of each receiving a copy.
+2. Parallel (model x fold) jobs: every cross-validation fold of every model
+   family, plus each model's final fit, is one joblib job, so all of them
+   share the pool instead of running model by model, fold by fold.
+3. XGBoost early stopping: XGBoost fits hold out 10% of their training rows
+   (stratified) and stop once the eval metric stops improving for
+   `early_stopping_rounds` rounds; the fitted model predicts with its best
+   iteration.
+4. Incremental training: RealDataCollector.export_training_partitions
+   writes labeled rows to one directory per outcome month
+   (`month=YYYY-MM/part-*.parquet`). continue_training updates a registered
+   model from only the months it hasn't seen (XGBoost continued boosting,
+   warm-started LogisticRegression), so cost tracks new data rather than
+   total history. Only closed months are trained on: the current month is
+   still receiving outcomes, and a partition must not change after a model
+   has consumed it.
+
+Usage:
+    prepared = prepare_training_data(Path("export.csv"))
+    cv_scores, fitted = run_training_jobs(models, prepared.X_train, prepared.y_train, n_jobs=-1)
+
+    months = closed_partitions(Path("partitions"), after=entry['trained_through'])
+    model = continue_training(artifact, load_partitions(months.values()))
+"""
+import os
+import json
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import average_precision_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.preprocessing import StandardScaler
+
+logger = logging.getLogger(__name__)
+
+TRAINING_CACHE_DIR = Path(__file__).parent / 'cache'
+TRAINING_PARTITIONS_DIR = Path(__file__).parent / 'data' / 'partitions'
+
+# Bump when encode_training_frame changes, so stale caches aren't reused
+PREP_VERSION = 2
+
+# Columns added by RealDataCollector.export_training_data that are not features
+EXPORT_METADATA_COLUMNS = ('predicted_churn_prob', 'model_type_used', 'experiment_group')
+
+# Numeric features (Telco and SaaS baseline layouts). Partition exports
+# stringify feature columns that mix types across uploads, so these are
+# parsed back before encoding instead of being one-hot encoded as categories
+NUMERIC_FEATURES = (
+    'SeniorCitizen', 'tenure', 'MonthlyCharges', 'TotalCharges',
+    'feature_usage_score', 'seats_purchased', 'seats_used', 'support_tickets',
+    'last_activity_days_ago',
+)
+
+EARLY_STOPPING_VALIDATION_FRACTION = 0.1
+
+# Month partition directories: <root>/month=YYYY-MM/part-00000.parquet
+PARTITION_PREFIX = 'month='
+PARTITION_FILE_SUFFIXES = ('.parquet', '.csv.gz')
+
+
+@dataclass
+class PreparedData:
+    """
+    Split and scaled training matrices (memory-mapped when loaded from cache)
+    """
+    X_train: np.ndarray
+    X_test: np.ndarray
+    y_train: np.ndarray
+    y_test: np.ndarray
+    feature_names: List[str]
+    scaler_mean: np.ndarray
+    scaler_scale: np.ndarray
+
+    def scaler_stats(self) -> Dict[str, Any]:
+        """Scaler statistics in the form ModelRegistry.register accepts"""
+        return {'features': self.feature_names, 'mean': self.scaler_mean, 'scale': self.scaler_scale}
+
+
+# ========================================
+# FEATURE MATRIX
+# ========================================
+
+def load_training_frame(path: Path) -> pd.DataFrame:
+    """
+    Read a training CSV (Telco layout or a MLTrainingData export), a Parquet
+    file, or a month-partitioned export directory (closed months only)
+    """
+    path = Path(path)
+    if path.is_dir():
+        return load_partitions(closed_partitions(path).values())
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def encode_training_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Clean and one-hot encode a training frame
+
+    Accepts Churn as 'Yes'/'No' (Telco CSV) or 1/0/bool (MLTrainingData
+    exports); export metadata columns are dropped so they can't leak into
+    the features. NUMERIC_FEATURES stored as strings are parsed back to
+    numbers (unparseable values become NaN).
+
+    Returns:
+        (X, y) with X one-hot encoded
+    """
+    df = df.copy()
+
+    for column in NUMERIC_FEATURES:
+        if column in df.columns and df[column].dtype == object:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+
+    if 'TotalCharges' in df.columns:
+        df['TotalCharges'] = df['TotalCharges'].replace(r'^\s*$', np.nan, regex=True)
+        df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
+        df['TotalCharges'] = df['TotalCharges'].fillna(df['TotalCharges'].median())
+
+    churn = df['Churn']
+    if churn.dtype == object:
+        y = churn.astype(str).str.strip().str.lower().isin(('yes', '1', 'true')).astype(int)
+    else:
+        y = churn.astype(int)
+
+    drop = ['Churn', 'customerID', *EXPORT_METADATA_COLUMNS]
+    X = pd.get_dummies(df.drop(columns=[c for c in drop if c in df.columns]))
+    return X, y
+
+
+def split_and_scale(
+    X: pd.DataFrame,
+    y: pd.Series,
+    test_size: float = 0.2,
+    random_state: int = 42
+) -> PreparedData:
+    """Stratified train/test split, with the scaler fitted on the train split"""
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, stratify=y
+    )
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    return PreparedData(
+        X_train=X_train_scaled,
+        X_test=X_test_scaled,
+        y_train=y_train.to_numpy(),
+        y_test=y_test.to_numpy(),
+        feature_names=[str(c) for c in X.columns],
+        scaler_mean=scaler.mean_,
+        scaler_scale=scaler.scale_
+    )
+
+
+class FeatureMatrixCache:
+    """
+    Prepared matrices on disk as .npy, reopened memory-mapped
+    """
+
+    ARRAYS = ('X_train', 'X_test', 'y_train', 'y_test', 'scaler_mean', 'scaler_scale')
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else TRAINING_CACHE_DIR
+
+    def key(self, source: Path, test_size: float, random_state: int) -> str:
+        """Content hash of the source file(s) plus everything that shapes the matrices"""
+        digest = hashlib.sha256(f"{PREP_VERSION}|{test_size}|{random_state}|".encode())
+        source = Path(source)
+        files = [source]
+        if source.is_dir():
+            files = [f for d in closed_partitions(source).values() for f in _partition_files(d)]
+        for path in files:
+            digest.update(str(path.relative_to(source) if source.is_dir() else path.name).encode())
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()[:24]
+
+    def _path(self, key: str, name: str) -> Path:
+        return self.cache_dir / key / name
+
+    def load(self, key: str) -> Optional[PreparedData]:
+        """Memory-mapped prepared data, or None on a cache miss"""
+        meta_path = self._path(key, 'meta.json')
+        if not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text())
+        arrays = {name: np.load(self._path(key, f"{name}.npy"), mmap_mode='r') for name in self.ARRAYS}
+        return PreparedData(feature_names=meta['feature_names'], **arrays)
+
+    def save(self, key: str, prepared: PreparedData) -> PreparedData:
+        """Write the arrays, then meta.json last (it marks the entry complete)"""
+        entry_dir = self.cache_dir / key
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        for name in self.ARRAYS:
+            tmp_path = entry_dir / f"{name}.tmp.npy"
+            np.save(tmp_path, np.ascontiguousarray(getattr(prepared, name)))
+            os.replace(tmp_path, entry_dir / f"{name}.npy")
+
+        tmp_meta = entry_dir / 'meta.json.tmp'
+        tmp_meta.write_text(json.dumps({'feature_names': prepared.feature_names, 'prep_version': PREP_VERSION}))
+        os.replace(tmp_meta, entry_dir / 'meta.json')
+        return self.load(key)
+
+
+def prepare_training_data(
+    source: Path,
+    cache: Optional[FeatureMatrixCache] = None,
+    test_size: float = 0.2,
+    random_state: int = 42
+) -> PreparedData:
+    """
+    Load, encode, split and scale a training file, through the cache if given
+
+    Args:
+        source: Training CSV/Parquet
+        cache: Feature matrix cache (None = always rebuild)
+        test_size: Held-out test fraction
+        random_state: Split seed
+
+    Returns:
+        PreparedData (memory-mapped arrays when cached)
+    """
+    key = cache.key(source, test_size, random_state) if cache else None
+    if cache:
+        prepared = cache.load(key)
+        if prepared is not None:
+            logger.info(f"✅ Feature matrix cache hit ({key}): {prepared.X_train.shape[0]} training rows")
+            return prepared
+
+    X, y = encode_training_frame(load_training_frame(source))
+    prepared = split_and_scale(X, y, test_size=test_size, random_state=random_state)
+
+    if cache:
+        prepared = cache.save(key, prepared)
+        logger.info(f"Feature matrix cached ({key})")
+    return prepared
+
+
+# ========================================
+# MONTH PARTITIONS
+# ========================================
+
+def current_month() -> str:
+    return datetime.utcnow().strftime('%Y-%m')
+
+
+def _partition_files(partition_dir: Path) -> List[Path]:
+    return sorted(p for p in partition_dir.iterdir() if p.name.endswith(PARTITION_FILE_SUFFIXES))
+
+
+def list_partitions(root: Path) -> Dict[str, Path]:
+    """Month ('YYYY-MM') -> partition directory, oldest first"""
+    root = Path(root)
+    if not root.exists():
+        return {}
+    months = {
+        d.name[len(PARTITION_PREFIX):]: d
+        for d in root.iterdir()
+        if d.is_dir() and d.name.startswith(PARTITION_PREFIX) and '.' not in d.name  # skip .tmp/.old swaps
+    }
+    return dict(sorted(months.items()))
+
+
+def closed_partitions(root: Path, after: Optional[str] = None) -> Dict[str, Path]:
+    """
+    Partitions for months that are over (no more outcomes will land in them)
+
+    Args:
+        root: Export directory
+        after: Only months after this one (a model's trained_through)
+    """
+    this_month = current_month()
+    return {
+        month: path for month, path in list_partitions(root).items()
+        if month < this_month and (after is None or month > after)
+    }
+
+
+def load_partitions(partition_dirs) -> pd.DataFrame:
+    """Concatenate the part files of the given partitions"""
+    frames = []
+    for partition_dir in partition_dirs:
+        for path in _partition_files(Path(partition_dir)):
+            frames.append(pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_csv(path))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+# ========================================
+# PARALLEL (MODEL x FOLD) JOBS
+# ========================================
+
+def _is_xgboost(estimator: Any) -> bool:
+    return hasattr(estimator, 'get_booster')
+
+
+def _fit(estimator: Any, X: np.ndarray, y: np.ndarray, early_stopping_rounds: Optional[int], random_state: int):
+    """Fit one estimator; XGBoost stops early on a stratified holdout of its training rows"""
+    if not (early_stopping_rounds and _is_xgboost(estimator)):
+        return estimator.fit(X, y)
+
+    X_fit, X_eval, y_fit, y_eval = train_test_split(
+        X, y, test_size=EARLY_STOPPING_VALIDATION_FRACTION, random_state=random_state, stratify=y
+    )
+    estimator.set_params(early_stopping_rounds=early_stopping_rounds)
+    return estimator.fit(X_fit, y_fit, eval_set=[(X_eval, y_eval)], verbose=False)
+
+
+def _run_job(
+    name: str,
+    fold: Optional[int],
+    estimator: Any,
+    X: np.ndarray,
+    y: np.ndarray,
+    train_idx: Optional[np.ndarray],
+    val_idx: Optional[np.ndarray],
+    early_stopping_rounds: Optional[int],
+    random_state: int
+) -> Tuple[str, Optional[int], Any]:
+    """One CV fold (returns its score) or, with fold=None, the final fit (returns the model)"""
+    if fold is None:
+        return name, None, _fit(estimator, X, y, early_stopping_rounds, random_state)
+
+    _fit(estimator, X[train_idx], y[train_idx], early_stopping_rounds, random_state)
+    y_pred = estimator.predict(X[val_idx])
+    return name, fold, average_precision_score(y[val_idx], y_pred)
+
+
+def run_training_jobs(
+    models: Dict[str, Any],
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    n_splits: int = 5,
+    n_jobs: int = -1,
+    early_stopping_rounds: Optional[int] = None,
+    random_state: int = 42
+) -> Tuple[Dict[str, List[float]], Dict[str, Any]]:
+    """
+    Cross-validate and fit every model, with all (model x fold) jobs in one pool
+
+    Estimators are cloned per job. When running in parallel, estimators with
+    their own `n_jobs` are limited to one thread to avoid oversubscription.
+
+    Args:
+        models: Name -> unfitted estimator
+        X_train: Scaled training matrix (may be a memmap)
+        y_train: Labels
+        n_splits: Stratified CV folds
+        n_jobs: joblib workers (-1 = all cores, 1 = sequential)
+        early_stopping_rounds: XGBoost early stopping (None = off)
+        random_state: CV shuffle / holdout seed
+
+    Returns:
+        (name -> per-fold scores in fold order, name -> model fitted on all of X_train)
+    """
+    y_train = np.asarray(y_train)
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    folds = list(cv.split(X_train, y_train))
+
+    def job_estimator(estimator):
+        estimator = clone(estimator)
+        if n_jobs != 1 and 'n_jobs' in estimator.get_params():
+            estimator.set_params(n_jobs=1)
+        return estimator
+
+    jobs = []
+    for name, estimator in models.items():
+        for fold, (train_idx, val_idx) in enumerate(folds, 1):
+            jobs.append((name, fold, job_estimator(estimator), train_idx, val_idx))
+        jobs.append((name, None, job_estimator(estimator), None, None))
+
+    logger.info(f"Running {len(jobs)} training jobs ({len(models)} models x {n_splits} folds + final fits)")
+    outputs = Parallel(n_jobs=n_jobs)(
+        delayed(_run_job)(name, fold, estimator, X_train, y_train, train_idx, val_idx,
+                          early_stopping_rounds, random_state)
+        for name, fold, estimator, train_idx, val_idx in jobs
+    )
+
+    cv_scores: Dict[str, List[float]] = {name: [] for name in models}
+    fitted: Dict[str, Any] = {}
+    for name, fold, output in outputs:
+        if fold is None:
+            fitted[name] = output
+        else:
+            cv_scores[name].append(output)
+    return cv_scores, fitted
+
+
+# ========================================
+# INCREMENTAL TRAINING
+# ========================================
+
+def continue_training(
+    artifact: Any,
+    df: pd.DataFrame,
+    n_estimators: int = 50,
+    max_iter: int = 100
+) -> Any:
+    """
+    Update a registered model with new labeled rows only
+
+    The new rows are encoded into the model's feature order and scaled with
+    its scaler statistics (which stay fixed, so existing trees and weights
+    keep their meaning); categories the model has never seen are dropped.
+
+    - XGBoost: `n_estimators` more boosting rounds on top of the existing
+      booster (`fit(..., xgb_model=booster)`).
+    - LogisticRegression: warm start from the current coefficients, at
+      most `max_iter` solver iterations on the new rows.
+
+    Args:
+        artifact: Registry ModelArtifact with feature names and scaler stats
+        df: New rows (export layout)
+        n_estimators: Boosting rounds to add
+        max_iter: Warm-start solver iterations
+
+    Returns:
+        The updated (new) estimator; the artifact's model is not modified
+
+    Raises:
+        ValueError: Model can't be updated incrementally (retrain fully)
+    """
+    if not artifact.feature_names or not artifact.has_scaler:
+        raise ValueError("Incremental training needs a registered model with features and scaler stats")
+
+    X, y = encode_training_frame(df)
+    X = X.reindex(columns=artifact.feature_names, fill_value=0)
+    X_scaled = (X.to_numpy(dtype=np.float64) - artifact.scaler_mean) / artifact.scaler_scale
+    model = artifact.model
+
+    if hasattr(model, 'get_booster'):
+        import xgboost as xgb
+        updated = xgb.XGBClassifier(**model.get_params())
+        updated.set_params(n_estimators=n_estimators, early_stopping_rounds=None)
+        return updated.fit(X_scaled, y, xgb_model=model.get_booster(), verbose=False)
+
+    if hasattr(model, 'coef_') and 'warm_start' in model.get_params():
+        updated = clone(model).set_params(warm_start=True, max_iter=max_iter)
+        updated.classes_ = model.classes_
+        updated.coef_ = model.coef_.copy()
+        updated.intercept_ = model.intercept_.copy()
+        return updated.fit(X_scaled, y)
+
+    raise ValueError(f"{type(model).__name__} does not support incremental training; retrain fully")
@@ -1,7 +1,7 @@
 ﻿from datetime import datetime
 import uuid
 import enum
-from sqlalchemy import String, Integer, DateTime, Index, ForeignKey, Text, Column, Boolean, Enum, JSON
+from sqlalchemy import String, Integer, SmallInteger, DateTime, Index, ForeignKey, Text, Column, Boolean, Enum, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.api.database import Base
@@ -155,6 +155,26 @@ class Prediction(Base):
         nullable=True,
         comment="When message was published to SQS"
     )
+    # Live progress while RUNNING (written by ProgressReporter, at most 1/s)
+    progress_stage: Mapped[str] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="Current pipeline stage (download, parse, map, validate, predict, explain, upload)"
+    )
+    progress_percent: Mapped[int] = mapped_column(
+        SmallInteger,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+    progress_rows_done: Mapped[int] = mapped_column(
+        Integer,
+        nullable=True
+    )
+    progress_rows_total: Mapped[int] = mapped_column(
+        Integer,
+        nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -1,17 +1,17 @@
 ﻿"""
 Production-grade CloudWatch metrics using Embedded Metric Format (EMF).
 
-ARCHITECTURE: Hybrid Async + Sync Design
-========================================
-- Async API for FastAPI handlers (non-blocking)
+ARCHITECTURE: Aggregating Async + Sync Design
+=============================================
+- In-process counters, gauges and fixed-bucket histograms (O(1) per call)
 - Sync EMF backend runs in dedicated thread pool
-- Single background task batches and flushes metrics
+- Single background task flushes one EMF document per key per interval
 - Cost-optimized with dimension cardinality control
 
 Key Benefits:
 1. Non-blocking - metrics never delay API responses
 2. Cost-efficient - EMF format is 10x cheaper than PutMetricData API
-3. High-throughput - batching reduces overhead
+3. High-throughput - aggregation keeps EMF volume flat under load
 4. Compliant - PII hashing prevents GDPR violations
 
 Author: AI Assistant (Hybrid Design - Cursor + DeepSeek)
@@ -25,12 +25,11 @@ import hashlib
 import re
 import time
 import asyncio
+from bisect import bisect_left
 from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
-from datetime import datetime, timezone
 from typing import Dict, Optional, Union, List
 from enum import Enum
-from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +43,7 @@ class MetricUnit(str, Enum):
     BYTES = "Bytes"
     KILOBYTES = "Kilobytes"
     MEGABYTES = "Megabytes"
+    MEGABYTES_PER_SECOND = "Megabytes/Second"
     PERCENT = "Percent"
     NONE = "None"
 
@@ -54,25 +54,130 @@ class MetricNamespace(str, Enum):
     API = "RetainWise/API"
     WORKER = "RetainWise/Worker"
     DATABASE = "RetainWise/Database"
+    PRODUCTION = "RetainWise/Production"
+
+
+# Aggregate kinds
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+# Fixed histogram bucket upper bounds (1-2.5-5 series), shared by every
+# histogram regardless of unit so a bucket lookup is a single bisect.
+# 26 buckets stay well under the EMF limit of 100 values per metric.
+HISTOGRAM_BUCKET_BOUNDS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0,
+    1000.0, 2500.0, 5000.0, 10000.0, 25000.0, 50000.0, 100000.0,
+    float("inf"),
+)
+
+
+class _Aggregate:
+    """
+    Running aggregate for one (kind, namespace, name, unit, dimensions) key.
+    
+    Updates are plain attribute arithmetic on preallocated slots - no
+    per-call dicts, queues or locks.
+    """
+    
+    __slots__ = (
+        'kind', 'namespace', 'metric_name', 'unit', 'dimensions',
+        'count', 'total', 'minimum', 'maximum', 'last',
+        'bucket_counts', 'bucket_sums'
+    )
+    
+    def __init__(self, kind: str, namespace: str, metric_name: str, unit: str,
+                 dimensions: Dict[str, str]):
+        self.kind = kind
+        self.namespace = namespace
+        self.metric_name = metric_name
+        self.unit = unit
+        self.dimensions = dimensions
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+        self.last = 0.0
+        if kind == HISTOGRAM:
+            self.bucket_counts = [0] * len(HISTOGRAM_BUCKET_BOUNDS)
+            self.bucket_sums = [0.0] * len(HISTOGRAM_BUCKET_BOUNDS)
+        else:
+            self.bucket_counts = None
+            self.bucket_sums = None
+    
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.last = value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        if self.bucket_counts is not None:
+            index = bisect_left(HISTOGRAM_BUCKET_BOUNDS, value)
+            self.bucket_counts[index] += 1
+            self.bucket_sums[index] += value
+    
+    def merge(self, other: "_Aggregate"):
+        """Fold another aggregate for the same sanitized key into this one."""
+        self.count += other.count
+        self.total += other.total
+        self.last = other.last
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        if self.bucket_counts is not None:
+            for i, bucket_count in enumerate(other.bucket_counts):
+                self.bucket_counts[i] += bucket_count
+                self.bucket_sums[i] += other.bucket_sums[i]
+    
+    def emf_value(self) -> Union[float, Dict]:
+        """
+        EMF metric value for this interval.
+        
+        - Counters: the interval sum (a plain number)
+        - Gauges: a statistic set (Min/Max/Sum/Count)
+        - Histograms: a statistic set plus Values/Counts, where each value is
+          the mean of the observations that fell into a non-empty bucket
+        """
+        if self.kind == COUNTER:
+            return self.total
+        
+        stats = {
+            "Max": self.maximum,
+            "Min": self.minimum,
+            "Count": self.count,
+            "Sum": self.total
+        }
+        if self.kind == HISTOGRAM:
+            values, counts = [], []
+            for bucket_count, bucket_sum in zip(self.bucket_counts, self.bucket_sums):
+                if bucket_count:
+                    values.append(bucket_sum / bucket_count)
+                    counts.append(bucket_count)
+            stats = {"Values": values, "Counts": counts, **stats}
+        return stats
 
 
 class CloudWatchMetricsEMF:
     """
-    High-performance async metrics client using CloudWatch Embedded Metric Format.
+    High-performance metrics client using CloudWatch Embedded Metric Format.
     
-    HYBRID ARCHITECTURE:
-    ===================
+    AGGREGATING ARCHITECTURE:
+    =========================
     
     ┌─────────────────────────────────────────────────────────────┐
-    │                   ASYNC API LAYER                            │
-    │  FastAPI handlers → put_metric() → asyncio.Queue (no block) │
+    │                 IN-PROCESS AGGREGATION                       │
+    │  put_metric() / increment() / set_gauge() → update the       │
+    │  running aggregate for (name, dimensions) in place. O(1),    │
+    │  no queue, no await, no lock. Callable from sync code and    │
+    │  from any thread.                                            │
     └─────────────────────────────────────────────────────────────┘
                                 │
                                 ▼
     ┌─────────────────────────────────────────────────────────────┐
     │               BACKGROUND ASYNC TASK                          │
-    │  - Batches metrics from queue                                │
-    │  - Flushes every 60s or when batch reaches 100              │
+    │  - Every flush_interval (60s) swaps out the aggregate table  │
     │  - Delegates to sync backend via ThreadPoolExecutor          │
     └─────────────────────────────────────────────────────────────┘
                                 │
@@ -81,9 +186,17 @@ class CloudWatchMetricsEMF:
     │                  SYNC EMF BACKEND                            │
     │  - Runs in dedicated thread (1 worker)                       │
     │  - Sanitizes dimensions (PII protection)                     │
+    │  - One EMF document per key per interval (statistic sets)    │
     │  - Writes EMF JSON to stdout (CloudWatch captures)           │
     └─────────────────────────────────────────────────────────────┘
     
+    EMF volume is bounded by the number of distinct keys per interval,
+    not by request volume.
+    
+    Thread safety: updates rely on the GIL rather than a lock. An update
+    that races with the flush swap may land in the retired table and be
+    dropped; that is the accepted cost of a lock-free hot path.
+    
     Usage:
         # In FastAPI lifespan:
         @asynccontextmanager
@@ -94,6 +207,9 @@ class CloudWatchMetricsEMF:
         
         # In async handlers:
         await metrics.put_metric("UploadSuccess", 1, MetricUnit.COUNT)
+        
+        # In sync code (no await needed):
+        metrics.increment("CacheHit")
     """
     
     _instance = None
@@ -109,7 +225,7 @@ class CloudWatchMetricsEMF:
         return cls._instance
     
     def __init__(self):
-        """Initialize the hybrid async/sync metrics client."""
+        """Initialize the aggregating metrics client."""
         if self._initialized:
             return
         
@@ -121,28 +237,24 @@ class CloudWatchMetricsEMF:
             self.enabled = False
             logger.info("CloudWatch EMF metrics DISABLED (test/development mode)")
         
-        # Async components
-        self._queue: Optional[asyncio.Queue] = None
+        # Aggregation state (swapped out wholesale on flush)
+        self._aggregates: Dict[tuple, _Aggregate] = {}
+        self._running = False
         self._background_task: Optional[asyncio.Task] = None
         
         # Sync backend (runs in thread pool)
         self._sync_backend = _SyncEMFBackend()
-        
-        # Thread pool (single worker - minimal overhead)
-        self._executor = ThreadPoolExecutor(
-            max_workers=1,
-            thread_name_prefix="metrics-worker"
-        )
+        self._executor: Optional[ThreadPoolExecutor] = None
         
         # Configuration
-        self.batch_size = 100  # Flush after 100 metrics
         self.flush_interval = 60.0  # Flush every 60 seconds
+        self.max_keys = 5000  # Cardinality guard per interval
         
         self._initialized = True
     
     async def start(self):
         """
-        Start the background metrics processing task.
+        Start the background flush task.
         
         Must be called during application startup (e.g., FastAPI lifespan).
         """
@@ -151,7 +263,13 @@ class CloudWatchMetricsEMF:
             return
         
         if self._background_task is None:
-            self._queue = asyncio.Queue(maxsize=1000)  # Backpressure limit
+            if self._executor is None:
+                # Thread pool (single worker - minimal overhead)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="metrics-worker"
+                )
+            self._running = True
             self._background_task = asyncio.create_task(self._process_metrics())
             logger.info("✅ CloudWatch EMF metrics client started")
     
@@ -161,8 +279,10 @@ class CloudWatchMetricsEMF:
         
         Must be called during application shutdown.
         """
+        self._running = False
+        
         if self._background_task:
-            # Cancel background task
+            # Cancel background task (it flushes on cancellation)
             self._background_task.cancel()
             try:
                 # Add timeout to prevent hanging
@@ -174,15 +294,80 @@ class CloudWatchMetricsEMF:
             
             self._background_task = None
         
-        # Shutdown thread pool (with timeout)
-        try:
-            # Use shutdown with wait=False and then wait with timeout
-            self._executor.shutdown(wait=False, cancel_futures=True)
-        except Exception as e:
-            logger.warning(f"Error shutting down thread pool: {e}")
+        # Shutdown thread pool
+        if self._executor is not None:
+            try:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            except Exception as e:
+                logger.warning(f"Error shutting down thread pool: {e}")
+            self._executor = None
         
         logger.info("✅ CloudWatch EMF metrics client stopped")
     
+    def _record(
+        self,
+        kind: str,
+        metric_name: str,
+        value: Union[int, float],
+        unit: MetricUnit,
+        namespace: MetricNamespace,
+        dimensions: Optional[Dict[str, str]]
+    ) -> bool:
+        if not self._running:
+            return False
+        
+        key = (
+            kind, namespace, metric_name, unit,
+            tuple(sorted(dimensions.items())) if dimensions else ()
+        )
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            if len(self._aggregates) >= self.max_keys:
+                logger.warning(f"Metric key limit reached, dropping: {metric_name}")
+                return False
+            aggregate = self._aggregates.setdefault(key, _Aggregate(
+                kind,
+                namespace.value,
+                metric_name,
+                unit.value,
+                # Sanitized once per key, not per call
+                self._sync_backend._sanitize_dimensions(dimensions or {})
+            ))
+        aggregate.add(float(value))
+        return True
+    
+    def observe(
+        self,
+        metric_name: str,
+        value: Union[int, float],
+        unit: MetricUnit = MetricUnit.NONE,
+        namespace: MetricNamespace = MetricNamespace.ML_PIPELINE,
+        dimensions: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """Record a value into the (name, dimensions) histogram. Never blocks."""
+        return self._record(HISTOGRAM, metric_name, value, unit, namespace, dimensions)
+    
+    def increment(
+        self,
+        metric_name: str,
+        value: Union[int, float] = 1,
+        namespace: MetricNamespace = MetricNamespace.ML_PIPELINE,
+        dimensions: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """Add to the (name, dimensions) counter. Never blocks."""
+        return self._record(COUNTER, metric_name, value, MetricUnit.COUNT, namespace, dimensions)
+    
+    def set_gauge(
+        self,
+        metric_name: str,
+        value: Union[int, float],
+        unit: MetricUnit = MetricUnit.NONE,
+        namespace: MetricNamespace = MetricNamespace.ML_PIPELINE,
+        dimensions: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """Sample a gauge; each interval reports Min/Max/Sum/Count. Never blocks."""
+        return self._record(GAUGE, metric_name, value, unit, namespace, dimensions)
+    
     async def put_metric(
         self,
         metric_name: str,
@@ -192,7 +377,7 @@ class CloudWatchMetricsEMF:
         dimensions: Optional[Dict[str, str]] = None
     ) -> bool:
         """
-        Publish a metric asynchronously (non-blocking).
+        Publish a metric (non-blocking; aggregated as a histogram).
         
         Args:
             metric_name: Name of the metric (e.g., "UploadDuration")
@@ -202,7 +387,8 @@ class CloudWatchMetricsEMF:
             dimensions: Optional key-value pairs for filtering
         
         Returns:
-            bool: True if metric queued, False if metrics disabled or queue full
+            bool: True if recorded, False if metrics disabled/stopped or
+            the key limit was hit
         
         Example:
             await metrics.put_metric(
@@ -213,85 +399,41 @@ class CloudWatchMetricsEMF:
                 dimensions={"UserBucket": "a1", "FileType": "csv"}
             )
         """
-        if not self.enabled or self._queue is None:
-            return False
-        
-        metric_data = {
-            'metric_name': metric_name,
-            'value': float(value),
-            'unit': unit.value,
-            'namespace': namespace.value,
-            'dimensions': dimensions or {},
-            'timestamp': datetime.now(timezone.utc)
-        }
-        
-        try:
-            # Non-blocking put with timeout (backpressure)
-            await asyncio.wait_for(self._queue.put(metric_data), timeout=0.1)
-            return True
-        except asyncio.TimeoutError:
-            # Queue is full - drop metric (better than blocking)
-            logger.warning(f"Metrics queue full, dropping: {metric_name}")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to queue metric {metric_name}: {e}")
-            return False
+        return self.observe(metric_name, value, unit, namespace, dimensions)
+    
+    def _take_snapshot(self) -> List[_Aggregate]:
+        snapshot, self._aggregates = self._aggregates, {}
+        return list(snapshot.values())
+    
+    async def _flush_aggregates(self):
+        aggregates = self._take_snapshot()
+        if not aggregates or self._executor is None:
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self._executor,
+            self._sync_backend.flush_aggregates,
+            aggregates
+        )
     
     async def _process_metrics(self):
         """
-        Background task that batches and flushes metrics.
+        Background task that flushes aggregates every flush_interval.
         
         Runs continuously until cancelled during shutdown.
         """
-        batch: List[Dict] = []
-        last_flush_time = time.time()
-        
         logger.info("Background metrics processor started")
         
         while True:
             try:
-                # Calculate remaining time until next scheduled flush
-                elapsed = time.time() - last_flush_time
-                timeout = max(0.1, self.flush_interval - elapsed)
-                
-                try:
-                    # Wait for metric or timeout
-                    metric = await asyncio.wait_for(
-                        self._queue.get(),
-                        timeout=timeout
-                    )
-                    batch.append(metric)
-                except asyncio.TimeoutError:
-                    # Timeout reached - time to flush
-                    pass
-                
-                # Flush if batch is full or interval elapsed
-                should_flush = (
-                    len(batch) >= self.batch_size or
-                    (batch and time.time() - last_flush_time >= self.flush_interval)
-                )
-                
-                if should_flush and batch:
-                    # Run sync flush in thread pool (non-blocking)
-                    loop = asyncio.get_event_loop()
-                    await loop.run_in_executor(
-                        self._executor,
-                        self._sync_backend.flush_batch,
-                        batch.copy()
-                    )
-                    batch.clear()
-                    last_flush_time = time.time()
+                await asyncio.sleep(self.flush_interval)
+                await self._flush_aggregates()
             
             except asyncio.CancelledError:
-                # Shutdown - flush remaining metrics
-                if batch:
-                    logger.info(f"Flushing {len(batch)} remaining metrics on shutdown")
-                    loop = asyncio.get_event_loop()
-                    await loop.run_in_executor(
-                        self._executor,
-                        self._sync_backend.flush_batch,
-                        batch
-                    )
+                # Shutdown - flush remaining aggregates
+                if self._aggregates:
+                    logger.info(f"Flushing {len(self._aggregates)} metric aggregates on shutdown")
+                    await self._flush_aggregates()
                 break
             
             except Exception as e:
@@ -300,18 +442,12 @@ class CloudWatchMetricsEMF:
     
     async def flush(self):
         """
-        Manually flush all pending metrics (useful for testing).
-        
-        Waits for background task to process current queue.
+        Manually flush the current interval (useful for testing).
         """
-        if not self.enabled or self._queue is None:
+        if not self.enabled or not self._running:
             return
         
-        # Wait for queue to drain (with timeout to prevent hanging)
-        try:
-            await asyncio.wait_for(self._queue.join(), timeout=5.0)
-        except asyncio.TimeoutError:
-            logger.warning("Queue did not drain within timeout during flush")
+        await self._flush_aggregates()
     
     # Convenience methods
     async def increment_counter(
@@ -321,7 +457,7 @@ class CloudWatchMetricsEMF:
         dimensions: Optional[Dict[str, str]] = None
     ):
         """Increment a counter by 1."""
-        await self.put_metric(metric_name, 1, MetricUnit.COUNT, namespace, dimensions)
+        self.increment(metric_name, 1, namespace, dimensions)
     
     async def record_time(
         self,
@@ -331,7 +467,7 @@ class CloudWatchMetricsEMF:
         dimensions: Optional[Dict[str, str]] = None
     ):
         """Record a duration in seconds."""
-        await self.put_metric(metric_name, duration_seconds, MetricUnit.SECONDS, namespace, dimensions)
+        self.observe(metric_name, duration_seconds, MetricUnit.SECONDS, namespace, dimensions)
 
 
 class _SyncEMFBackend:
@@ -348,44 +484,65 @@ class _SyncEMFBackend:
     def __init__(self):
         self.batch_lock = Lock()  # Thread-safe for sync operations
     
-    def flush_batch(self, batch: List[Dict]):
+    def flush_aggregates(self, aggregates: List[_Aggregate]):
         """
-        Flush a batch of metrics using EMF format.
+        Write one EMF document per aggregate key for the interval.
         
         Called from thread pool executor (sync context).
         """
-        if not batch:
+        if not aggregates:
             return
         
         with self.batch_lock:
             try:
-                # Sanitize dimensions (PII protection + cost control)
-                sanitized_batch = [
-                    self._sanitize_metric(metric) for metric in batch
-                ]
-                
-                # Group by namespace + dimensions (EMF requirement)
-                grouped = self._group_metrics(sanitized_batch)
-                
-                # Write EMF JSON to stdout
-                for emf_data in grouped:
+                for emf_data in self._build_aggregate_documents(aggregates):
                     print(json.dumps(emf_data), flush=True)
                 
-                logger.debug(f"📊 EMF: Flushed {len(batch)} metrics")
+                logger.debug(f"📊 EMF: Flushed {len(aggregates)} metric aggregates")
             
             except Exception as e:
                 logger.error(f"❌ Failed to flush EMF metrics: {e}", exc_info=True)
     
-    def _sanitize_metric(self, metric: Dict) -> Dict:
+    def _build_aggregate_documents(self, aggregates: List[_Aggregate]) -> List[Dict]:
         """
-        Sanitize metric dimensions to prevent:
-        1. PII leakage (hash user IDs)
-        2. Cost explosion (limit cardinality)
-        3. Invalid characters
+        Merge aggregates whose sanitized keys collide (e.g. two user IDs in
+        the same UserBucket) and build their EMF documents.
         """
+        merged: Dict[tuple, _Aggregate] = {}
+        for aggregate in aggregates:
+            key = (
+                aggregate.kind, aggregate.namespace, aggregate.metric_name,
+                aggregate.unit, tuple(sorted(aggregate.dimensions.items()))
+            )
+            if key in merged:
+                merged[key].merge(aggregate)
+            else:
+                merged[key] = aggregate
+        
+        timestamp = int(time.time() * 1000)
+        documents = []
+        for aggregate in merged.values():
+            emf_data = {
+                "_aws": {
+                    "Timestamp": timestamp,
+                    "CloudWatchMetrics": [{
+                        "Namespace": aggregate.namespace,
+                        "Dimensions": [list(aggregate.dimensions.keys())] if aggregate.dimensions else [],
+                        "Metrics": [{"Name": aggregate.metric_name, "Unit": aggregate.unit}]
+                    }]
+                }
+            }
+            emf_data.update(aggregate.dimensions)
+            emf_data[aggregate.metric_name] = aggregate.emf_value()
+            documents.append(emf_data)
+        
+        return documents
+    
+    def _sanitize_dimensions(self, dimensions: Dict[str, str]) -> Dict[str, str]:
+        """Apply the PII / cardinality rules to one dimension set."""
         sanitized_dimensions = {}
         
-        for key, value in metric.get('dimensions', {}).items():
+        for key, value in dimensions.items():
             # Skip ultra-high-cardinality dimensions
             if key in ("UploadId", "RequestId", "TransactionId", "CorrelationId"):
                 continue  # Would create unlimited unique metrics
@@ -413,66 +570,7 @@ class _SyncEMFBackend:
             logger.warning(f"Too many dimensions ({len(sanitized_dimensions)}), truncating")
             sanitized_dimensions = dict(list(sanitized_dimensions.items())[:10])
         
-        metric['dimensions'] = sanitized_dimensions
-        return metric
-    
-    def _group_metrics(self, batch: List[Dict]) -> List[Dict]:
-        """
-        Group metrics by namespace + dimensions for EMF format.
-        
-        EMF Format Spec:
-        {
-            "_aws": {
-                "Timestamp": 1638316800000,
-                "CloudWatchMetrics": [{
-                    "Namespace": "RetainWise/API",
-                    "Dimensions": [["UserBucket", "FileType"]],
-                    "Metrics": [{"Name": "UploadDuration", "Unit": "Seconds"}]
-                }]
-            },
-            "UploadDuration": 1.23,
-            "UserBucket": "a1",
-            "FileType": "csv"
-        }
-        """
-        grouped = defaultdict(lambda: defaultdict(list))
-        
-        for metric in batch:
-            namespace = metric['namespace']
-            dim_key = tuple(sorted(metric['dimensions'].items()))
-            grouped[namespace][dim_key].append(metric)
-        
-        emf_batches = []
-        
-        for namespace, dim_groups in grouped.items():
-            for dim_tuple, metrics in dim_groups.items():
-                dimensions = dict(dim_tuple)
-                
-                # Build EMF structure
-                emf_data = {
-                    "_aws": {
-                        "Timestamp": int(time.time() * 1000),
-                        "CloudWatchMetrics": [{
-                            "Namespace": namespace,
-                            "Dimensions": [list(dimensions.keys())] if dimensions else [],
-                            "Metrics": [
-                                {"Name": m['metric_name'], "Unit": m['unit']}
-                                for m in metrics
-                            ]
-                        }]
-                    }
-                }
-                
-                # Add dimension values
-                emf_data.update(dimensions)
-                
-                # Add metric values
-                for m in metrics:
-                    emf_data[m['metric_name']] = m['value']
-                
-                emf_batches.append(emf_data)
-        
-        return emf_batches
+        return sanitized_dimensions
 
 
 # Global singleton instance
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark Telecom model throughput: DataFrame path vs compiled inference path
+
+Reports rows/sec for the full RetentionPredictor.predict call and for the
+feature + model step alone (prepare_features + predict_proba vs the
+compiled encoder + inplace_predict), at 1K/10K/100K rows.
+
+Usage:
+    python -m backend.scripts.benchmark_fast_inference [--rows 1000 10000 100000] [--repeat 3]
+"""
+import argparse
+import logging
+import time
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+from backend.ml.model_registry import get_model_registry
+from backend.ml.predict import RetentionPredictor
+
+SAMPLE_CSV = Path(__file__).resolve().parents[1] / "ml" / "data" / "WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+
+def best_of(repeat: int, fn, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def dataframe_step(predictor: RetentionPredictor, df_cleaned: pd.DataFrame):
+    X_scaled, _ = predictor.prepare_features(df_cleaned)
+    return predictor.model.predict_proba(X_scaled)[:, 1]
+
+
+def compiled_step(predictor: RetentionPredictor, df_cleaned: pd.DataFrame):
+    return predictor.compiled.predict_proba(predictor.compiled.transform(df_cleaned))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000], help="Batch sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    warnings.filterwarnings("ignore")
+    source = pd.read_csv(SAMPLE_CSV).drop(columns=["Churn"])
+
+    artifact = get_model_registry().load()
+    legacy = RetentionPredictor(artifact, fast_inference=False)
+    compiled = RetentionPredictor(artifact)
+    if compiled.compiled is None:
+        raise SystemExit(f"Model {artifact.version} is not supported by the compiled path")
+
+    print(f"model {artifact.version} ({compiled.compiled.kind}), best of {args.repeat}")
+    print(f"{'rows':>8}  {'stage':<10} {'DataFrame rows/s':>17} {'compiled rows/s':>16} {'speedup':>8}")
+    for rows in args.rows:
+        df = pd.concat([source] * -(-rows // len(source)), ignore_index=True).head(rows)
+        df_cleaned = legacy.clean_data(df)
+
+        results = (
+            ("predict", best_of(args.repeat, legacy.predict, df), best_of(args.repeat, compiled.predict, df)),
+            ("inference", best_of(args.repeat, dataframe_step, legacy, df_cleaned),
+             best_of(args.repeat, compiled_step, compiled, df_cleaned)),
+        )
+        for stage, slow, fast in results:
+            print(f"{rows:>8}  {stage:<10} {rows / slow:>17,.0f} {rows / fast:>16,.0f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark allocations of the batch prediction path through PredictionRouter
+
+Compares the previous hand-off (route_prediction -> list of per-row dicts ->
+pd.DataFrame) with route_batch (the model's DataFrame passed through), for
+both models, using tracemalloc to count allocations and peak memory.
+
+Usage:
+    python -m backend.scripts.benchmark_prediction_router [--rows 10000]
+"""
+import argparse
+import logging
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from backend.services.prediction_router import PredictionRouter
+
+SAMPLE_CSV = Path(__file__).resolve().parents[1] / "ml" / "data" / "WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+
+def legacy_batch(router: PredictionRouter, df: pd.DataFrame, group: str) -> pd.DataFrame:
+    """Batch hand-off as it was before route_batch (records round trip)"""
+    prediction_result = router.route_prediction(df, force_group=group)
+    return pd.DataFrame(prediction_result['predictions'])
+
+
+def columnar_batch(router: PredictionRouter, df: pd.DataFrame, group: str) -> pd.DataFrame:
+    return router.route_batch(df, force_group=group).predictions
+
+
+def measure(fn, *args):
+    """Run once under tracemalloc; returns (seconds, allocations, peak bytes)"""
+    tracemalloc.start()
+    start_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    started = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - started
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename")) - start_blocks
+    del result
+    return elapsed, blocks, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per batch")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    source = pd.read_csv(SAMPLE_CSV).drop(columns=["Churn"])
+    repeats = -(-args.rows // len(source))
+    df = pd.concat([source] * repeats, ignore_index=True).head(args.rows)
+
+    router = PredictionRouter()
+    for group, label in (("control", "telecom"), ("treatment", "saas")):
+        # Warm up (model caches, lazy imports) so both paths are measured alike
+        columnar_batch(router, df.head(10), group)
+
+        legacy = measure(legacy_batch, router, df, group)
+        columnar = measure(columnar_batch, router, df, group)
+        print(f"{label:<8} rows={len(df)}")
+        for name, (seconds, blocks, peak) in (("legacy", legacy), ("columnar", columnar)):
+            print(f"  {name:<9} {seconds:7.3f}s   live blocks {blocks:>9,}   peak {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Create upcoming ml_training_data partitions and apply retention
+
+Creates monthly partitions for the current month and the next few, then
+rolls up (into ml_training_rollup) and drops partitions older than the
+retention window. Safe to run repeatedly; schedule it daily. PostgreSQL only.
+
+Usage:
+    python -m backend.scripts.maintain_training_partitions [--months-ahead 3] \\
+        [--retention-months 24] [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+
+from backend.api.database import get_async_session
+from backend.services.training_storage import (
+    ML_TRAINING_RETENTION_MONTHS, PARTITION_MONTHS_AHEAD, ensure_partitions, rollup_expired_partitions
+)
+
+
+async def maintain(months_ahead: int, retention_months: int, dry_run: bool) -> int:
+    async with get_async_session() as db:
+        if db.bind.dialect.name != "postgresql":
+            print(f"ml_training_data is only partitioned on PostgreSQL (database: {db.bind.dialect.name})")
+            return 1
+
+        if not dry_run:
+            created = await ensure_partitions(db, months_ahead)
+            print(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+
+        dropped = await rollup_expired_partitions(db, retention_months, dry_run=dry_run)
+        action = "Would roll up and drop" if dry_run else "Rolled up and dropped"
+        print(f"{action} {len(dropped)} partitions: {', '.join(dropped) or '-'}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD, help="Future months to create")
+    parser.add_argument("--retention-months", type=int, default=ML_TRAINING_RETENTION_MONTHS,
+                        help="Months of raw rows to keep")
+    parser.add_argument("--dry-run", action="store_true", help="Only list partitions past retention")
+    args = parser.parse_args()
+
+    return asyncio.run(maintain(args.months_ahead, args.retention_months, args.dry_run))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
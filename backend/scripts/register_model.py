@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Register a trained model in the model registry, or switch the active version
+
+Converts a pickled model to the registry layout (XGBoost models are saved as
+UBJSON), records its feature order and optional scaler statistics, and
+updates models/manifest.json atomically. Running servers pick up a new
+active version on their next reload check (no restart).
+
+Usage:
+    python -m backend.scripts.register_model --model best_retention_model_X.pkl \\
+        --features features_X.txt [--scaler scaler_X.pkl|scaler_X.json] [--version X] [--no-activate]
+    python -m backend.scripts.register_model --activate X
+    python -m backend.scripts.register_model --list
+"""
+import argparse
+import json
+import pickle
+import sys
+from pathlib import Path
+
+from backend.ml.model_registry import get_model_registry
+
+
+def load_scaler(path: Path):
+    """Fitted StandardScaler pickle, or JSON stats with 'mean' and 'scale'"""
+    if path.suffix == '.json':
+        return json.loads(path.read_text())
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", type=Path, help="Pickled model to register")
+    parser.add_argument("--features", type=Path, help="Feature names file (one per line)")
+    parser.add_argument("--scaler", type=Path, help="Scaler pickle or JSON stats")
+    parser.add_argument("--version", help="Version label (default: timestamp from the model filename)")
+    parser.add_argument("--no-activate", action="store_true", help="Register without activating")
+    parser.add_argument("--activate", metavar="VERSION", help="Make a registered version active")
+    parser.add_argument("--list", action="store_true", help="Show registered versions")
+    args = parser.parse_args()
+
+    registry = get_model_registry()
+
+    if args.list:
+        manifest = registry.read_manifest() or {'active': None, 'versions': {}}
+        for version, entry in sorted(manifest['versions'].items()):
+            marker = '*' if version == manifest['active'] else ' '
+            print(f"{marker} {version}  {entry['format']:<6} {entry['artifact']}  {entry['sha256'][:12]}")
+        return
+
+    if args.activate:
+        registry.activate(args.activate)
+        print(f"✅ Active model: {args.activate}")
+        return
+
+    if not args.model or not args.features:
+        parser.error("--model and --features are required to register a model")
+
+    with open(args.model, 'rb') as f:
+        model = pickle.load(f)
+    feature_names = [line.strip() for line in args.features.read_text().splitlines() if line.strip()]
+    scaler = load_scaler(args.scaler) if args.scaler else None
+    version = args.version or args.model.stem.replace('best_retention_model_', '')
+
+    entry = registry.register(model, version, feature_names, scaler=scaler, activate=not args.no_activate)
+    print(f"✅ Registered {version}: {entry['artifact']} ({entry['format']}, {len(feature_names)} features)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
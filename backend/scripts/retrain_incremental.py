@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Update the active model from new MLTrainingData months only
+
+Reads the month partitions written by RealDataCollector.export_training_partitions,
+picks the closed months after the active model's `trained_through`, and
+continues training from it (XGBoost: more boosting rounds on the existing
+booster; LogisticRegression: warm start). The result is registered as a new
+version with `parent` and `trained_through` recorded in the manifest, so the
+next run starts after it.
+
+Usage:
+    python -m backend.scripts.retrain_incremental [--export] [--partitions DIR] \\
+        [--rounds 50] [--max-iter 100] [--min-rows 100] [--activate]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from backend.ml.model_registry import get_model_registry
+from backend.ml.training_runner import (
+    TRAINING_PARTITIONS_DIR, closed_partitions, continue_training, load_partitions
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--partitions", type=Path, default=TRAINING_PARTITIONS_DIR, help="Month partition root")
+    parser.add_argument("--export", action="store_true", help="Export new outcomes from the database first")
+    parser.add_argument("--rounds", type=int, default=50, help="Boosting rounds to add (XGBoost)")
+    parser.add_argument("--max-iter", type=int, default=100, help="Warm-start iterations (LogisticRegression)")
+    parser.add_argument("--min-rows", type=int, default=100, help="Skip the update below this many new rows")
+    parser.add_argument("--activate", action="store_true", help="Make the updated model the active version")
+    args = parser.parse_args()
+
+    if args.export:
+        from backend.services.data_collector import get_data_collector
+        written = asyncio.run(get_data_collector().export_training_partitions(args.partitions))
+        print(f"Exported {len(written)} partitions to {args.partitions}")
+
+    registry = get_model_registry()
+    artifact = registry.load()
+    trained_through = (registry.get_entry(artifact.version) or {}).get('trained_through')
+
+    months = closed_partitions(args.partitions, after=trained_through)
+    if not months:
+        print(f"No closed months after {trained_through or 'the start'}; {artifact.version} is up to date")
+        return 0
+
+    df = load_partitions(months.values())
+    if len(df) < args.min_rows:
+        print(f"Only {len(df)} new rows in {', '.join(months)} (need {args.min_rows}); skipping")
+        return 0
+
+    model = continue_training(artifact, df, n_estimators=args.rounds, max_iter=args.max_iter)
+
+    version = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    last_month = list(months)[-1]
+    entry = registry.register(
+        model, version, artifact.feature_names,
+        scaler={'mean': artifact.scaler_mean, 'scale': artifact.scaler_scale},
+        activate=args.activate,
+        metadata={'parent': artifact.version, 'trained_through': last_month, 'incremental_rows': len(df)}
+    )
+    print(f"✅ Registered {version} from {artifact.version} + {len(df)} rows "
+          f"({', '.join(months)}): {entry['artifact']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
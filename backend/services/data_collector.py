@@ -16,24 +16,46 @@ Data Flow:
 3. After 100+ outcomes → Have real labeled training data
 4. Train ML model on REAL data → Better than any synthetic approach
 
+Exports stream labeled rows with a server-side cursor (only the needed
+columns, `TRAINING_EXPORT_CHUNK_ROWS` at a time) instead of loading every
+row as an ORM object. `export_training_partitions` writes them to one
+directory per outcome month (`month=YYYY-MM/part-00000.parquet`, or
+`.csv.gz` when pyarrow is not installed) for incremental retraining
+(see backend/ml/training_runner.py and scripts/retrain_incremental.py).
+
 Author: RetainWise ML Team
 Date: December 7, 2025
 Version: 1.0
 """
 
+import shutil
 import logging
 import pandas as pd
-from typing import Dict, Any, Optional
-from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, func, cast, delete
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 
 from backend.api.database import Base, get_async_session
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, JSON
+from backend.models import Prediction
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Boolean, DateTime, Index, MetaData, Table, text
+from backend.services.training_storage import CompactFeatures, CodedString, EXPERIMENT_GROUPS, MODEL_TYPES
 
 logger = logging.getLogger(__name__)
 
+# Rows per server-side cursor fetch / part file when exporting
+TRAINING_EXPORT_CHUNK_ROWS = 5000
+
+# Rows per INSERT executemany when recording a batch of predictions
+PREDICTION_INSERT_BATCH_ROWS = 1000
+
+# Unmatched customer IDs echoed back by bulk outcome ingestion
+UNMATCHED_SAMPLE_SIZE = 100
+
 
 # ========================================
 # DATABASE MODEL
@@ -44,24 +66,30 @@ class MLTrainingData(Base):
     Stores predictions and actual outcomes for ML training.
     
     This table builds our REAL labeled dataset over time.
+    
+    On PostgreSQL it is range-partitioned by month on predicted_at, so the
+    database primary key is (id, predicted_at). The ORM identity is the same
+    pair, so ORM updates filter on predicted_at and touch one partition; the
+    table DDL keeps id as the sole key so it autoincrements on SQLite. See
+    training_storage for the compact column types and partition maintenance.
     """
     __tablename__ = "ml_training_data"
     
     # Primary key
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True, autoincrement=True)
     
     # Customer info
-    customer_id = Column(String(100), nullable=False, index=True)
+    customer_id = Column(String(100), nullable=False)
     prediction_id = Column(String(100), nullable=True, index=True)
     
-    # Features (at time of prediction)
-    features_json = Column(JSON, nullable=False)
+    # Features (at time of prediction), compact JSONB
+    features_json = Column(CompactFeatures, nullable=False)
     
     # Prediction results
     predicted_churn_prob = Column(Float, nullable=False)
     predicted_retention_prob = Column(Float, nullable=False)
-    model_type = Column(String(50), nullable=False)  # 'telecom', 'saas_baseline', etc.
-    experiment_group = Column(String(20), nullable=True)  # 'control', 'treatment'
+    model_type = Column(CodedString(MODEL_TYPES), nullable=False)  # 'telecom', 'saas_baseline', etc.
+    experiment_group = Column(CodedString(EXPERIMENT_GROUPS), nullable=True)  # 'control', 'treatment'
     
     # Actual outcome (filled in later)
     actual_churned = Column(Boolean, nullable=True)  # True = churned, False = retained
@@ -72,6 +100,59 @@ class MLTrainingData(Base):
     predicted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        # Open (unlabeled) predictions only; outcome lookups by customer,
+        # newest first. Rows drop out of the index once labeled.
+        Index(
+            'ix_ml_training_data_open_by_customer',
+            'customer_id', 'predicted_at',
+            postgresql_where=text('actual_churned IS NULL')
+        ),
+        # Labeled rows only; covers the experiment report's GROUP BY
+        # (index-only scan), see experiment_analytics
+        Index(
+            'ix_ml_training_data_outcomes',
+            'experiment_group', 'model_type',
+            postgresql_include=['actual_churned', 'predicted_churn_prob', 'predicted_at'],
+            postgresql_where=text('actual_churned IS NOT NULL')
+        ),
+    )
+    
+    # Identity matches the partitioned table's (id, predicted_at) key
+    __mapper_args__ = {'primary_key': [id, predicted_at]}
+
+
+# Session-local staging table for bulk outcome ingestion (dropped on
+# commit on PostgreSQL; cleared before each use elsewhere)
+incoming_outcomes = Table(
+    'churn_outcomes_incoming',
+    MetaData(),
+    Column('customer_id', String(100), primary_key=True),
+    Column('churned', Boolean, nullable=False),
+    Column('outcome_at', DateTime, nullable=False),
+    prefixes=['TEMPORARY'],
+    postgresql_on_commit='DROP'
+)
+
+
+class days_between(FunctionElement):
+    """Whole days from `start` to `end` (timestamps)"""
+    type = Integer()
+    name = 'days_between'
+    inherit_cache = True
+
+
+@compiles(days_between)
+def _compile_days_between(element, compiler, **kw):
+    end, start = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"CAST(floor(extract(epoch FROM ({end} - {start})) / 86400) AS INTEGER)"
+
+
+@compiles(days_between, 'sqlite')
+def _compile_days_between_sqlite(element, compiler, **kw):
+    end, start = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"CAST(julianday({end}) - julianday({start}) AS INTEGER)"
 
 
 # ========================================
@@ -91,8 +172,14 @@ class RealDataCollector:
         # When customer churns (detected by system)
         await collector.record_churn_outcome(customer_id, churned=True)
         
+        # Or label a whole billing export at once
+        await collector.record_churn_outcomes([(customer_id, True, churn_date), ...])
+        
         # Export for training (after 100+ outcomes)
         training_data = await collector.export_training_data()
+        
+        # Or stream to month partitions for incremental retraining
+        await collector.export_training_partitions(Path("training_partitions"))
     """
     
     async def record_prediction(
@@ -140,6 +227,75 @@ class RealDataCollector:
             logger.error(f"Failed to record prediction: {e}")
             # Don't fail prediction if logging fails
     
+    async def record_predictions(
+        self,
+        customers: List[Dict[str, Any]],
+        predictions: List[Dict[str, Any]],
+        prediction_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Record a whole batch of predictions (one upload) for future training.
+        
+        Rows are inserted PREDICTION_INSERT_BATCH_ROWS at a time in a single
+        transaction instead of one session and commit per customer.
+        
+        Args:
+            customers: Customer feature dicts (one per row)
+            predictions: Model output dicts, aligned with customers
+            prediction_id: Optional prediction ID from database
+            metadata: Batch-level fields (experiment_group, model_used) used
+                where a prediction row doesn't carry them
+            
+        Returns:
+            Number of rows recorded (0 if recording failed)
+        """
+        metadata = metadata or {}
+        now = datetime.utcnow()
+        rows = []
+        for index, customer_data in enumerate(customers):
+            result = predictions[index] if index < len(predictions) else {}
+            retention_prob = result.get('retention_probability')
+            churn_prob = result.get('churn_probability')
+            if churn_prob is None:
+                churn_prob = 1.0 - retention_prob if retention_prob is not None else 0.0
+            rows.append({
+                'customer_id': str(customer_data.get('customerID', 'unknown')),
+                'prediction_id': prediction_id,
+                'features_json': customer_data,
+                'predicted_churn_prob': churn_prob,
+                'predicted_retention_prob': retention_prob if retention_prob is not None else 1.0 - churn_prob,
+                'model_type': result.get('model_type') or metadata.get('model_used', 'unknown'),
+                'experiment_group': result.get('experiment_group') or metadata.get('experiment_group'),
+                'predicted_at': now,
+                'created_at': now,
+                'updated_at': now
+            })
+        
+        try:
+            async with get_async_session() as db:
+                for start in range(0, len(rows), PREDICTION_INSERT_BATCH_ROWS):
+                    await db.execute(
+                        MLTrainingData.__table__.insert(),
+                        rows[start:start + PREDICTION_INSERT_BATCH_ROWS]
+                    )
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Failed to record predictions: {e}")
+            # Don't fail prediction if logging fails
+            return 0
+        
+        logger.info(
+            f"Recorded {len(rows)} predictions for training",
+            extra={
+                'event': 'predictions_recorded',
+                'prediction_id': prediction_id,
+                'n_rows': len(rows),
+                'experiment_group': metadata.get('experiment_group')
+            }
+        )
+        return len(rows)
+    
     async def record_churn_outcome(
         self,
         customer_id: str,
@@ -197,6 +353,187 @@ class RealDataCollector:
         except Exception as e:
             logger.error(f"Failed to record churn outcome: {e}")
     
+    @staticmethod
+    def _latest_open_predictions(dialect_name: str, user_id: Optional[str]):
+        """
+        Most recent unlabeled prediction per incoming customer
+        
+        PostgreSQL: DISTINCT ON (customer_id) over the join with the staging
+        table; other databases rank with row_number().
+        """
+        ml = MLTrainingData
+        conditions = [ml.actual_churned.is_(None)]
+        if user_id:
+            conditions.append(ml.prediction_id.in_(
+                select(cast(Prediction.id, String)).where(Prediction.user_id == user_id)
+            ))
+        newest_first = (ml.predicted_at.desc(), ml.id.desc())
+        
+        if dialect_name == 'postgresql':
+            return (
+                select(ml.id, ml.customer_id, ml.predicted_at)
+                .join(incoming_outcomes, incoming_outcomes.c.customer_id == ml.customer_id)
+                .where(*conditions)
+                .distinct(ml.customer_id)
+                .order_by(ml.customer_id, *newest_first)
+                .subquery('latest')
+            )
+        
+        ranked = (
+            select(
+                ml.id, ml.customer_id, ml.predicted_at,
+                func.row_number().over(partition_by=ml.customer_id, order_by=newest_first).label('rank')
+            )
+            .join(incoming_outcomes, incoming_outcomes.c.customer_id == ml.customer_id)
+            .where(*conditions)
+            .subquery('ranked')
+        )
+        return (
+            select(ranked.c.id, ranked.c.customer_id, ranked.c.predicted_at)
+            .where(ranked.c.rank == 1)
+            .subquery('latest')
+        )
+    
+    async def _apply_churn_outcomes(
+        self,
+        db: AsyncSession,
+        latest_outcome: Dict[str, Tuple[bool, datetime]],
+        user_id: Optional[str],
+        now: datetime
+    ) -> set:
+        """Stage outcomes and label matching predictions; returns matched customer IDs"""
+        await db.run_sync(lambda session: incoming_outcomes.create(session.connection(), checkfirst=True))
+        await db.execute(delete(incoming_outcomes))
+        await db.execute(incoming_outcomes.insert(), [
+            {'customer_id': customer_id, 'churned': churned, 'outcome_at': outcome_at}
+            for customer_id, (churned, outcome_at) in latest_outcome.items()
+        ])
+        
+        stmt = self._label_outcomes_statement(db.bind.dialect.name, user_id, now)
+        matched = set((await db.execute(stmt)).scalars())
+        await db.commit()
+        return matched
+    
+    @classmethod
+    def _label_outcomes_statement(cls, dialect_name: str, user_id: Optional[str], now: datetime):
+        """UPDATE ... FROM labeling each staged customer's latest open prediction"""
+        latest = cls._latest_open_predictions(dialect_name, user_id)
+        return (
+            update(MLTrainingData)
+            .where(MLTrainingData.id == latest.c.id)
+            .where(MLTrainingData.predicted_at == latest.c.predicted_at)  # one partition per row
+            .where(incoming_outcomes.c.customer_id == latest.c.customer_id)
+            .values(
+                actual_churned=incoming_outcomes.c.churned,
+                outcome_recorded_at=now,
+                days_to_outcome=days_between(incoming_outcomes.c.outcome_at, latest.c.predicted_at),
+                updated_at=now
+            )
+            .returning(MLTrainingData.customer_id)
+            .execution_options(synchronize_session=False)
+        )
+    
+    async def record_churn_outcomes(
+        self,
+        outcomes: Iterable[Tuple[str, bool, Optional[datetime]]],
+        user_id: Optional[str] = None,
+        db: Optional[AsyncSession] = None
+    ) -> Dict[str, Any]:
+        """
+        Record many churn outcomes in a fixed number of statements.
+        
+        Outcomes are loaded into a temporary staging table, the latest
+        unlabeled prediction per customer is resolved with one query, and
+        all of them are labeled with a single UPDATE ... FROM. Same
+        semantics as record_churn_outcome per customer; if a customer
+        appears more than once, the latest outcome date wins.
+        
+        Args:
+            outcomes: (customer_id, churned, churn_date) tuples; churn_date
+                may be None (now)
+            user_id: Only label predictions made by this user
+            db: Session to use (default: a new session)
+            
+        Returns:
+            Dict with received, customers, matched, unmatched and a sample
+            of unmatched_customer_ids
+        """
+        now = datetime.utcnow()
+        latest_outcome: Dict[str, Tuple[bool, datetime]] = {}
+        received = 0
+        for customer_id, churned, churn_date in outcomes:
+            received += 1
+            outcome_at = churn_date or now
+            if outcome_at.tzinfo is not None:
+                outcome_at = outcome_at.astimezone(timezone.utc).replace(tzinfo=None)
+            previous = latest_outcome.get(customer_id)
+            if previous is None or outcome_at >= previous[1]:
+                latest_outcome[customer_id] = (churned, outcome_at)
+        
+        summary: Dict[str, Any] = {
+            'received': received,
+            'customers': len(latest_outcome),
+            'matched': 0,
+            'unmatched': len(latest_outcome),
+            'unmatched_customer_ids': sorted(latest_outcome)[:UNMATCHED_SAMPLE_SIZE]
+        }
+        if not latest_outcome:
+            return summary
+        
+        if db is None:
+            async with get_async_session() as session:
+                matched = await self._apply_churn_outcomes(session, latest_outcome, user_id, now)
+        else:
+            matched = await self._apply_churn_outcomes(db, latest_outcome, user_id, now)
+        
+        unmatched = sorted(set(latest_outcome) - matched)
+        summary.update(
+            matched=len(matched),
+            unmatched=len(unmatched),
+            unmatched_customer_ids=unmatched[:UNMATCHED_SAMPLE_SIZE]
+        )
+        
+        logger.info(
+            f"Recorded {len(matched)} churn outcomes ({len(unmatched)} unmatched)",
+            extra={
+                'event': 'outcomes_recorded',
+                'received': received,
+                'matched': len(matched),
+                'unmatched': len(unmatched),
+                'user_id': user_id
+            }
+        )
+        return summary
+    
+    @staticmethod
+    def _labeled_rows_query():
+        """Columns needed for training, for rows with a known outcome"""
+        partition_at = func.coalesce(
+            MLTrainingData.outcome_recorded_at, MLTrainingData.predicted_at
+        ).label('partition_at')
+        stmt = select(
+            MLTrainingData.features_json,
+            MLTrainingData.actual_churned,
+            MLTrainingData.predicted_churn_prob,
+            MLTrainingData.model_type,
+            MLTrainingData.experiment_group,
+            partition_at
+        ).where(MLTrainingData.actual_churned != None)
+        return stmt, partition_at
+
+    @staticmethod
+    def _rows_to_frame(rows: Iterable[Any]) -> pd.DataFrame:
+        """Training layout: features + Churn (1/0) + prediction metadata"""
+        data = []
+        for row in rows:
+            record = dict(row.features_json)
+            record['Churn'] = 1 if row.actual_churned else 0
+            record['predicted_churn_prob'] = row.predicted_churn_prob
+            record['model_type_used'] = row.model_type
+            record['experiment_group'] = row.experiment_group
+            data.append(record)
+        return pd.DataFrame(data)
+
     async def export_training_data(
         self,
         min_outcomes: int = 100
@@ -214,32 +551,32 @@ class RealDataCollector:
         """
         try:
             async with get_async_session() as db:
-                # Get all records with actual outcomes
-                stmt = select(MLTrainingData).where(
-                    MLTrainingData.actual_churned != None
-                )
-                
-                result = await db.execute(stmt)
-                records = result.scalars().all()
+                count_stmt = select(
+                    func.count(MLTrainingData.id),
+                    func.min(MLTrainingData.predicted_at),
+                    func.max(MLTrainingData.predicted_at)
+                ).where(MLTrainingData.actual_churned != None)
+                n_outcomes, first_predicted, last_predicted = (await db.execute(count_stmt)).one()
                 
-                if len(records) < min_outcomes:
+                if n_outcomes < min_outcomes:
                     logger.warning(
-                        f"Insufficient training data: {len(records)} outcomes "
+                        f"Insufficient training data: {n_outcomes} outcomes "
                         f"(need {min_outcomes} minimum)"
                     )
                     return None
                 
-                # Convert to DataFrame
-                data = []
-                for record in records:
-                    row = record.features_json.copy()
-                    row['Churn'] = 1 if record.actual_churned else 0
-                    row['predicted_churn_prob'] = record.predicted_churn_prob
-                    row['model_type_used'] = record.model_type
-                    row['experiment_group'] = record.experiment_group
-                    data.append(row)
+                stmt, _ = self._labeled_rows_query()
+                stmt = stmt.order_by(MLTrainingData.id).execution_options(
+                    yield_per=TRAINING_EXPORT_CHUNK_ROWS
+                )
+                
+                # Stream in chunks; only one chunk of row tuples is held at a time
+                frames = []
+                result = await db.stream(stmt)
+                async for rows in result.partitions(TRAINING_EXPORT_CHUNK_ROWS):
+                    frames.append(self._rows_to_frame(rows))
                 
-                df = pd.DataFrame(data)
+                df = pd.concat(frames, ignore_index=True)
                 
                 logger.info(
                     f"Exported {len(df)} real labeled samples for training",
@@ -247,9 +584,7 @@ class RealDataCollector:
                         'event': 'training_data_exported',
                         'n_samples': len(df),
                         'churn_rate': df['Churn'].mean(),
-                        'date_range_days': (
-                            records[-1].predicted_at - records[0].predicted_at
-                        ).days
+                        'date_range_days': (last_predicted - first_predicted).days
                     }
                 )
                 
@@ -259,63 +594,100 @@ class RealDataCollector:
             logger.error(f"Failed to export training data: {e}")
             return None
     
+    async def export_training_partitions(
+        self,
+        output_dir: Path,
+        since_month: Optional[str] = None,
+        chunk_rows: int = TRAINING_EXPORT_CHUNK_ROWS
+    ) -> List[Path]:
+        """
+        Stream labeled data to month partitions for incremental training.
+        
+        Rows are partitioned by the month their outcome was recorded (the
+        month they became training data), so each export only rewrites
+        months that can still change. A month is written to
+        `month=YYYY-MM.tmp/` and then swapped in, so readers never see a
+        half-written partition.
+        
+        Args:
+            output_dir: Export root (holds the month=YYYY-MM directories)
+            since_month: First month to (re)export ('YYYY-MM'); defaults to
+                the newest existing partition, which may have been exported
+                before that month was over
+            chunk_rows: Rows per cursor fetch and per part file
+            
+        Returns:
+            Partition directories written, oldest first
+        """
+        from backend.ml.training_runner import PARTITION_PREFIX, list_partitions
+        
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if since_month is None:
+            existing = list(list_partitions(output_dir))
+            since_month = existing[-1] if existing else None
+        
+        stmt, partition_at = self._labeled_rows_query()
+        if since_month:
+            stmt = stmt.where(partition_at >= datetime.strptime(since_month, '%Y-%m'))
+        stmt = stmt.order_by(partition_at, MLTrainingData.id).execution_options(yield_per=chunk_rows)
+        
+        written: List[Path] = []
+        writer = _PartitionWriter(output_dir, PARTITION_PREFIX)
+        n_rows = 0
+        
+        async with get_async_session() as db:
+            result = await db.stream(stmt)
+            async for rows in result.partitions(chunk_rows):
+                # Rows arrive ordered by month; a chunk can straddle a boundary
+                df = self._rows_to_frame(rows)
+                months = pd.Series([row.partition_at.strftime('%Y-%m') for row in rows])
+                for month, index in months.groupby(months, sort=False).groups.items():
+                    finished = writer.write(month, df.loc[index])
+                    if finished:
+                        written.append(finished)
+                n_rows += len(rows)
+        
+        finished = writer.close()
+        if finished:
+            written.append(finished)
+        
+        logger.info(
+            f"Exported {n_rows} labeled samples to {len(written)} month partitions",
+            extra={
+                'event': 'training_partitions_exported',
+                'n_samples': n_rows,
+                'months': [path.name for path in written],
+                'format': writer.suffix
+            }
+        )
+        return written
+    
     async def get_experiment_statistics(self) -> Dict[str, Any]:
         """
         Get A/B test statistics for analysis.
         
+        Aggregated in the database (see experiment_analytics): per experiment
+        group, model type and (group, model type) segment, with accuracy,
+        AUC and calibration buckets.
+        
         Returns:
             Dict with experiment metrics
         """
+        from backend.services.experiment_analytics import build_experiment_report
+        
         try:
             async with get_async_session() as db:
-                # Get all records with outcomes
-                stmt = select(MLTrainingData).where(
-                    MLTrainingData.actual_churned != None
-                )
-                
-                result = await db.execute(stmt)
-                records = result.scalars().all()
-                
-                if not records:
-                    return {'status': 'no_data', 'n_outcomes': 0}
-                
-                # Split by experiment group
-                control = [r for r in records if r.experiment_group == 'control']
-                treatment = [r for r in records if r.experiment_group == 'treatment']
+                stats = await build_experiment_report(db)
                 
-                # Calculate metrics for each group
-                def calculate_metrics(group):
-                    if not group:
-                        return None
-                    
-                    actual_churn_rate = sum(1 for r in group if r.actual_churned) / len(group)
-                    avg_predicted_prob = sum(r.predicted_churn_prob for r in group) / len(group)
-                    
-                    # Calculate prediction accuracy
-                    correct = sum(
-                        1 for r in group 
-                        if (r.predicted_churn_prob > 0.5 and r.actual_churned) or
-                           (r.predicted_churn_prob <= 0.5 and not r.actual_churned)
-                    )
-                    accuracy = correct / len(group)
-                    
-                    return {
-                        'n_predictions': len(group),
-                        'actual_churn_rate': actual_churn_rate,
-                        'avg_predicted_churn_prob': avg_predicted_prob,
-                        'accuracy': accuracy
+                logger.info(
+                    f"Experiment statistics: {stats.get('total_outcomes', 0)} outcomes",
+                    extra={
+                        'event': 'experiment_statistics',
+                        'n_outcomes': stats.get('total_outcomes', 0),
+                        'n_segments': len(stats.get('segments', []))
                     }
-                
-                stats = {
-                    'total_outcomes': len(records),
-                    'control_group': calculate_metrics(control),
-                    'treatment_group': calculate_metrics(treatment),
-                    'data_collection_days': (
-                        records[-1].predicted_at - records[0].predicted_at
-                    ).days if len(records) > 1 else 0
-                }
-                
-                logger.info(f"Experiment statistics: {stats}")
+                )
                 
                 return stats
                 
@@ -324,6 +696,86 @@ class RealDataCollector:
             return {'status': 'error', 'error': str(e)}
 
 
+# ========================================
+# PARTITION WRITER
+# ========================================
+
+class _PartitionWriter:
+    """
+    Writes chunks for one month at a time into a temporary directory and
+    swaps it in over the previous export of that month when the month ends
+    """
+    
+    def __init__(self, output_dir: Path, prefix: str):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.suffix = '.parquet' if _parquet_available() else '.csv.gz'
+        self.month: Optional[str] = None
+        self.part = 0
+    
+    def _tmp_dir(self) -> Path:
+        return self.output_dir / f"{self.prefix}{self.month}.tmp"
+    
+    def write(self, month: str, df: pd.DataFrame) -> Optional[Path]:
+        """Append a chunk; returns the previous partition if it just finished"""
+        finished = None
+        if month != self.month:
+            finished = self.close()
+            self.month, self.part = month, 0
+            shutil.rmtree(self._tmp_dir(), ignore_errors=True)
+            self._tmp_dir().mkdir(parents=True)
+        
+        path = self._tmp_dir() / f"part-{self.part:05d}{self.suffix}"
+        if self.suffix == '.parquet':
+            _with_uniform_object_columns(df).to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False, compression='gzip')
+        self.part += 1
+        return finished
+    
+    def close(self) -> Optional[Path]:
+        """Swap the current month's temporary directory into place"""
+        if self.month is None:
+            return None
+        final_dir = self.output_dir / f"{self.prefix}{self.month}"
+        old_dir = self.output_dir / f"{self.prefix}{self.month}.old"
+        if final_dir.exists():
+            final_dir.rename(old_dir)
+        self._tmp_dir().rename(final_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        self.month = None
+        return final_dir
+
+
+def _with_uniform_object_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast object columns holding mixed Python types to strings (nulls kept)
+    
+    Features come from many uploads, so one column can hold e.g. a string
+    TotalCharges from one upload and a float from another; Arrow needs one
+    type per column. encode_training_frame parses NUMERIC_FEATURES back to
+    numbers; other columns are categorical anyway.
+    """
+    mixed = [
+        column for column in df.columns
+        if df[column].dtype == object and df[column].dropna().map(type).nunique() > 1
+    ]
+    if not mixed:
+        return df
+    df = df.copy()
+    for column in mixed:
+        df[column] = df[column].map(lambda value: value if value is None or value != value else str(value))
+    return df
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
 # ========================================
 # SINGLETON INSTANCE
 # ========================================
@@ -0,0 +1,238 @@
+"""
+Experiment Analytics - SQL-side aggregation over MLTrainingData
+
+Computes the A/B experiment report in the database instead of loading every
+labeled row into Python. Two grouped queries over the rows with a known
+outcome, each returning a handful of rows however large the table is:
+
+1. Segment metrics, one row per (experiment_group, model_type):
+
+       SELECT experiment_group, model_type,
+              count(*),
+              count(*) FILTER (WHERE actual_churned IS true),
+              count(*) FILTER (WHERE <prediction was correct>),
+              sum(predicted_churn_prob), min(predicted_at), max(predicted_at)
+       FROM ml_training_data
+       WHERE actual_churned IS NOT NULL
+       GROUP BY experiment_group, model_type
+
+2. Calibration, one row per (experiment_group, model_type, bucket) with
+   `width_bucket(predicted_churn_prob, 0, 1, CALIBRATION_BUCKETS)`.
+
+Both are answered from the partial covering index
+ix_ml_training_data_outcomes (see the add_ml_training_outcomes_index
+migration). Rollups per experiment group / model type and AUC are derived
+in Python from these few rows: AUC is the Mann-Whitney statistic over the
+bucketed scores (exact for the bucket resolution).
+
+Usage:
+    async with get_async_session() as db:
+        report = await build_experiment_report(db)
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from backend.services.data_collector import MLTrainingData
+
+CALIBRATION_BUCKETS = 10
+CHURN_THRESHOLD = 0.5
+
+SegmentKey = Tuple[Optional[str], Optional[str]]
+
+
+# ========================================
+# width_bucket (PostgreSQL, emulated elsewhere)
+# ========================================
+
+class width_bucket(FunctionElement):
+    """width_bucket(operand, low, high, count): 0 below low, count + 1 at/above high"""
+    type = Integer()
+    name = 'width_bucket'
+    inherit_cache = True
+
+
+@compiles(width_bucket)
+def _compile_width_bucket(element, compiler, **kw):
+    return f"width_bucket({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(width_bucket, 'sqlite')
+def _compile_width_bucket_sqlite(element, compiler, **kw):
+    operand, low, high, count = (compiler.process(arg, **kw) for arg in element.clauses)
+    return (
+        f"CASE WHEN {operand} < {low} THEN 0 "
+        f"WHEN {operand} >= {high} THEN {count} + 1 "
+        f"ELSE CAST(({operand} - {low}) * {count} / ({high} - {low}) AS INTEGER) + 1 END"
+    )
+
+
+# ========================================
+# QUERIES
+# ========================================
+
+def _labeled():
+    return MLTrainingData.actual_churned.isnot(None)
+
+
+def segment_metrics_query():
+    """Counts and sums per (experiment_group, model_type) in one GROUP BY"""
+    churned = MLTrainingData.actual_churned.is_(True)
+    predicted_churn = MLTrainingData.predicted_churn_prob > CHURN_THRESHOLD
+    correct = or_(
+        and_(predicted_churn, churned),
+        and_(~predicted_churn, MLTrainingData.actual_churned.is_(False))
+    )
+    return (
+        select(
+            MLTrainingData.experiment_group,
+            MLTrainingData.model_type,
+            func.count().label('n'),
+            func.count().filter(churned).label('n_churned'),
+            func.count().filter(correct).label('n_correct'),
+            func.sum(MLTrainingData.predicted_churn_prob).label('sum_predicted'),
+            func.min(MLTrainingData.predicted_at).label('first_predicted_at'),
+            func.max(MLTrainingData.predicted_at).label('last_predicted_at')
+        )
+        .where(_labeled())
+        .group_by(MLTrainingData.experiment_group, MLTrainingData.model_type)
+    )
+
+
+def calibration_query(buckets: int = CALIBRATION_BUCKETS):
+    """Outcomes per predicted-probability bucket per (experiment_group, model_type)"""
+    bucket = width_bucket(MLTrainingData.predicted_churn_prob, 0.0, 1.0, buckets).label('bucket')
+    return (
+        select(
+            MLTrainingData.experiment_group,
+            MLTrainingData.model_type,
+            bucket,
+            func.count().label('n'),
+            func.count().filter(MLTrainingData.actual_churned.is_(True)).label('n_churned'),
+            func.sum(MLTrainingData.predicted_churn_prob).label('sum_predicted')
+        )
+        .where(_labeled())
+        .group_by(MLTrainingData.experiment_group, MLTrainingData.model_type, bucket)
+    )
+
+
+# ========================================
+# ROLLUPS
+# ========================================
+
+def _empty_totals() -> Dict[str, Any]:
+    return {'n': 0, 'n_churned': 0, 'n_correct': 0, 'sum_predicted': 0.0, 'buckets': defaultdict(lambda: [0, 0, 0.0])}
+
+
+def _add(totals: Dict[str, Any], row: Any) -> None:
+    totals['n'] += row.n
+    totals['n_churned'] += row.n_churned
+    totals['n_correct'] += row.n_correct
+    totals['sum_predicted'] += row.sum_predicted or 0.0
+
+
+def auc_from_buckets(buckets: Iterable[Tuple[int, int]]) -> Optional[float]:
+    """
+    ROC AUC from (n, n_churned) per bucket, in ascending bucket order
+
+    Probability that a churned customer scored in a higher bucket than a
+    retained one, counting same-bucket pairs as half. None without both
+    outcomes.
+    """
+    buckets = list(buckets)
+    positives = sum(n_churned for _, n_churned in buckets)
+    negatives = sum(n - n_churned for n, n_churned in buckets)
+    if not positives or not negatives:
+        return None
+
+    area = 0.0
+    negatives_below = 0
+    for n, n_churned in buckets:
+        n_retained = n - n_churned
+        area += n_churned * (negatives_below + 0.5 * n_retained)
+        negatives_below += n_retained
+    return area / (positives * negatives)
+
+
+def _metrics(totals: Dict[str, Any], n_buckets: int) -> Dict[str, Any]:
+    n = totals['n']
+    ordered = sorted(totals['buckets'].items())
+    return {
+        'n_predictions': n,
+        'actual_churn_rate': totals['n_churned'] / n,
+        'avg_predicted_churn_prob': totals['sum_predicted'] / n,
+        'accuracy': totals['n_correct'] / n,
+        'auc': auc_from_buckets((b_n, b_churned) for _, (b_n, b_churned, _) in ordered),
+        'calibration': [
+            {
+                'bucket': bucket,
+                'range': [(bucket - 1) / n_buckets, bucket / n_buckets],
+                'n': b_n,
+                'avg_predicted_churn_prob': b_sum / b_n,
+                'actual_churn_rate': b_churned / b_n
+            }
+            for bucket, (b_n, b_churned, b_sum) in ordered
+        ]
+    }
+
+
+async def build_experiment_report(
+    db: AsyncSession,
+    buckets: int = CALIBRATION_BUCKETS
+) -> Dict[str, Any]:
+    """
+    Experiment statistics from two aggregated queries
+
+    Args:
+        db: Database session
+        buckets: Calibration buckets over [0, 1]
+
+    Returns:
+        Dict with total_outcomes, control_group / treatment_group,
+        by_model_type, segments and data_collection_days; group metrics
+        include accuracy, AUC and calibration buckets
+    """
+    segment_rows = (await db.execute(segment_metrics_query())).all()
+    if not segment_rows:
+        return {'status': 'no_data', 'n_outcomes': 0}
+    bucket_rows = (await db.execute(calibration_query(buckets))).all()
+
+    segments: Dict[SegmentKey, Dict[str, Any]] = defaultdict(_empty_totals)
+    by_group: Dict[Optional[str], Dict[str, Any]] = defaultdict(_empty_totals)
+    by_model: Dict[Optional[str], Dict[str, Any]] = defaultdict(_empty_totals)
+
+    for row in segment_rows:
+        for totals in (segments[(row.experiment_group, row.model_type)],
+                       by_group[row.experiment_group], by_model[row.model_type]):
+            _add(totals, row)
+
+    for row in bucket_rows:
+        # width_bucket puts probability 1.0 in bucket count + 1
+        bucket = min(max(row.bucket, 1), buckets)
+        for totals in (segments[(row.experiment_group, row.model_type)],
+                       by_group[row.experiment_group], by_model[row.model_type]):
+            counts = totals['buckets'][bucket]
+            counts[0] += row.n
+            counts[1] += row.n_churned
+            counts[2] += row.sum_predicted or 0.0
+
+    first_predicted = min(row.first_predicted_at for row in segment_rows)
+    last_predicted = max(row.last_predicted_at for row in segment_rows)
+
+    segment_reports: List[Dict[str, Any]] = [
+        {'experiment_group': group, 'model_type': model_type, **_metrics(totals, buckets)}
+        for (group, model_type), totals in sorted(segments.items(), key=lambda item: tuple(map(str, item[0])))
+    ]
+
+    return {
+        'total_outcomes': sum(row.n for row in segment_rows),
+        'control_group': _metrics(by_group['control'], buckets) if 'control' in by_group else None,
+        'treatment_group': _metrics(by_group['treatment'], buckets) if 'treatment' in by_group else None,
+        'by_model_type': {model_type: _metrics(totals, buckets) for model_type, totals in by_model.items()},
+        'segments': segment_reports,
+        'data_collection_days': (last_predicted - first_predicted).days
+    }
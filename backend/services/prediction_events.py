@@ -0,0 +1,253 @@
+"""
+Prediction Status Events (PostgreSQL LISTEN/NOTIFY -> Server-Sent Events)
+
+Replaces dashboard polling with push: whenever a prediction changes status,
+the writer publishes a small JSON event and every API task fans it out to
+the SSE streams of the prediction's owner.
+
+Transport:
+- PostgreSQL: `publish_prediction_event()` runs `pg_notify()` inside the
+  writer's transaction, so the event is delivered exactly when the status
+  change commits (and never if it rolls back). Each API task keeps one
+  dedicated asyncpg connection LISTENing on the channel.
+- Other databases (SQLite in tests/dev): events are dispatched directly to
+  the in-process hub, which works when API and worker share a process.
+
+Payload (also the SSE `data:` field):
+    {"prediction_id": "...", "user_id": "...", "status": "RUNNING",
+     "progress": 0, "updated_at": "2026-01-12T10:00:00"}
+
+Slow consumers never block publishers: each subscriber has a bounded queue
+and the oldest events are dropped when it is full (the client still sees
+the latest state).
+"""
+import json
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Prediction, PredictionStatus
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel shared by worker and API
+PREDICTION_EVENTS_CHANNEL = "prediction_events"
+
+# Coarse progress per status (stage-level progress is reported separately)
+STATUS_PROGRESS = {
+    PredictionStatus.QUEUED: 0,
+    PredictionStatus.RUNNING: 0,
+    PredictionStatus.COMPLETED: 100,
+    PredictionStatus.FAILED: 100,
+}
+
+SUBSCRIBER_QUEUE_SIZE = 100
+LISTENER_RECONNECT_SECONDS = 5.0
+
+
+def build_prediction_event(prediction: Prediction, **extra: Any) -> Dict[str, Any]:
+    """
+    Build the event payload for a prediction's current state
+
+    Args:
+        prediction: Prediction row (after the status change)
+        **extra: Additional fields (e.g. progress, stage)
+
+    Returns:
+        dict: JSON-serializable event
+    """
+    event = {
+        "prediction_id": str(prediction.id),
+        "user_id": str(prediction.user_id),
+        "status": prediction.status.value,
+        "progress": STATUS_PROGRESS.get(prediction.status, 0),
+        "updated_at": prediction.updated_at.isoformat() if prediction.updated_at else None,
+    }
+    event.update(extra)
+    return event
+
+
+# ========================================
+# IN-PROCESS FAN-OUT
+# ========================================
+
+class PredictionEventHub:
+    """
+    Per-user fan-out of prediction events to connected SSE streams
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self.dispatched_count = 0
+        self.dropped_count = 0
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        """Register a stream for a user's events"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        """Remove a stream (on client disconnect)"""
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def dispatch(self, event: Dict[str, Any]) -> None:
+        """Deliver an event to every stream of its owner (never blocks)"""
+        for queue in self._subscribers.get(event.get("user_id"), ()):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped_count += 1
+            queue.put_nowait(event)
+            self.dispatched_count += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current hub statistics"""
+        return {
+            "users": len(self._subscribers),
+            "streams": sum(len(queues) for queues in self._subscribers.values()),
+            "dispatched_count": self.dispatched_count,
+            "dropped_count": self.dropped_count,
+        }
+
+
+# Global hub instance
+_hub = PredictionEventHub()
+
+
+def get_prediction_event_hub() -> PredictionEventHub:
+    """
+    Get global prediction event hub
+
+    Returns:
+        PredictionEventHub: Singleton hub instance
+    """
+    return _hub
+
+
+# ========================================
+# PUBLISHING
+# ========================================
+
+async def publish_prediction_event(db: AsyncSession, prediction: Prediction, **extra: Any) -> None:
+    """
+    Publish a prediction's current state to subscribed clients
+
+    Call *before* committing the status change: on PostgreSQL the NOTIFY is
+    part of the transaction and is delivered on commit.
+
+    Args:
+        db: Session holding the status change
+        prediction: Prediction row
+        **extra: Additional event fields (e.g. progress, stage)
+    """
+    event = build_prediction_event(prediction, **extra)
+    try:
+        if db.bind.dialect.name == "postgresql":
+            # Savepoint: a failed NOTIFY must not abort the caller's transaction
+            async with db.begin_nested():
+                await db.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": PREDICTION_EVENTS_CHANNEL, "payload": json.dumps(event)}
+                )
+        else:
+            _hub.dispatch(event)
+    except Exception as e:
+        # Push is best-effort; clients still converge on the next read
+        logger.warning(f"Failed to publish prediction event: {type(e).__name__}")
+
+
+# ========================================
+# POSTGRES LISTENER (API PROCESS)
+# ========================================
+
+class PredictionEventListener:
+    """
+    Dedicated asyncpg connection LISTENing for prediction events
+
+    Held outside the SQLAlchemy pool (a LISTEN connection is never
+    returned), and reconnected in the background if it drops.
+    """
+
+    def __init__(self, dsn: str, hub: Optional[PredictionEventHub] = None):
+        self.dsn = dsn
+        self.hub = hub or _hub
+        self._connection = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self.hub.dispatch(json.loads(payload))
+        except ValueError:
+            logger.warning("Discarding malformed prediction event")
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        while True:
+            try:
+                self._connection = await asyncpg.connect(self.dsn)
+                await self._connection.add_listener(PREDICTION_EVENTS_CHANNEL, self._on_notify)
+                logger.info(f"📡 Listening for prediction events on '{PREDICTION_EVENTS_CHANNEL}'")
+                while not self._connection.is_closed():
+                    await asyncio.sleep(LISTENER_RECONNECT_SECONDS)
+                logger.warning("Prediction event listener connection closed - reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Prediction event listener error: {type(e).__name__}: {e}")
+            await asyncio.sleep(LISTENER_RECONNECT_SECONDS)
+
+    def start(self) -> None:
+        """Start listening in the background (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+
+_listener: Optional[PredictionEventListener] = None
+
+
+def start_prediction_event_listener(database_url: str) -> None:
+    """
+    Start the LISTEN connection for this API process (PostgreSQL only)
+
+    Args:
+        database_url: SQLAlchemy database URL
+    """
+    global _listener
+    if not database_url.startswith("postgresql"):
+        logger.info("Prediction events: non-PostgreSQL database, using in-process delivery only")
+        return
+    if _listener is None:
+        dsn = database_url.replace("postgresql+asyncpg://", "postgresql://")
+        _listener = PredictionEventListener(dsn)
+    _listener.start()
+
+
+async def stop_prediction_event_listener() -> None:
+    """Stop the LISTEN connection (application shutdown)"""
+    global _listener
+    if _listener is not None:
+        await _listener.stop()
+        _listener = None
@@ -20,16 +20,59 @@ Version: 1.0
 
 import pandas as pd
 import numpy as np
+import os
+import time
 import hashlib
 import logging
+import threading
+from dataclasses import dataclass
 from typing import Dict, Any, Optional
 from datetime import datetime
 
 from backend.ml.predict import RetentionPredictor
+from backend.ml.model_registry import get_model_registry
 from backend.ml.saas_baseline import SaaSChurnBaseline
 
 logger = logging.getLogger(__name__)
 
+ROUTER_VERSION = '1.0'
+
+# How often maybe_reload_model() looks at the registry manifest
+MODEL_RELOAD_INTERVAL_SECONDS = float(os.getenv('MODEL_RELOAD_INTERVAL_SECONDS', '30'))
+
+
+@dataclass
+class PredictionBatchResult:
+    """
+    Columnar result of a routed batch prediction.
+    
+    The model's output DataFrame is passed through as-is (no per-row dicts),
+    with the experiment metadata kept alongside rather than in every row.
+    
+    Attributes:
+        predictions: One row per input customer, as returned by the model
+        experiment_group: 'control', 'treatment' or 'fallback'
+        model_used: Model that produced the predictions
+        router_version: Router version for experiment analysis
+        model_version: Registry version of the Telecom model, if it was used
+    """
+    predictions: pd.DataFrame
+    experiment_group: str
+    model_used: str
+    router_version: str = ROUTER_VERSION
+    model_version: Optional[str] = None
+    
+    def __len__(self) -> int:
+        return len(self.predictions)
+    
+    def metadata(self) -> Dict[str, str]:
+        """Experiment metadata (same keys route_prediction adds to its dicts)"""
+        return {
+            'experiment_group': self.experiment_group,
+            'model_used': self.model_used,
+            'router_version': self.router_version
+        }
+
 
 class PredictionRouter:
     """
@@ -41,11 +84,20 @@ class PredictionRouter:
     - Comprehensive logging
     - Graceful fallbacks
     - Compatible with existing prediction service
+    - Hot-swap of the Telecom model when the registry's active version changes
     
     Usage:
         router = PredictionRouter()
         prediction = router.route_prediction(customer_data)
         # Automatically handles A/B assignment and logging
+        
+        batch = router.route_batch(customers_df)
+        batch.predictions  # DataFrame, no per-row dict round trip
+    
+    Hot-swap:
+        A new model is loaded fully before being published by a single
+        attribute assignment. Each batch takes a reference to the model once,
+        so in-flight batches finish on the model they started with.
     """
     
     def __init__(
@@ -62,11 +114,14 @@ class PredictionRouter:
         """
         self.treatment_percentage = treatment_percentage
         self.enable_logging = enable_logging
+        self._reload_lock = threading.Lock()
+        self._last_reload_check = time.monotonic()
+        self._manifest_signature = get_model_registry().manifest_signature()
         
         # Initialize models
         try:
             self.telecom_model = RetentionPredictor()  # No model_type parameter!
-            logger.info("✅ Loaded Telecom model (control group)")
+            logger.info(f"✅ Loaded Telecom model {self.telecom_model.model_version} (control group)")
         except Exception as e:
             logger.error(f"Failed to load Telecom model: {e}")
             self.telecom_model = None
@@ -112,6 +167,9 @@ class PredictionRouter:
         """
         Route prediction to appropriate model based on A/B assignment.
         
+        Dict interface for single-row API calls; batch jobs should use
+        route_batch() to keep the results columnar.
+        
         Args:
             customer_data: DataFrame with customer features (single row or batch)
             force_group: Force specific group ('control', 'treatment', or None for A/B)
@@ -119,6 +177,32 @@ class PredictionRouter:
         Returns:
             Dict with prediction results and metadata
         """
+        batch = self.route_batch(customer_data, force_group=force_group)
+        
+        # Convert to dict format (for single row)
+        if len(batch) == 1:
+            prediction = batch.predictions.iloc[0].to_dict()
+        else:
+            prediction = {'predictions': batch.predictions.to_dict('records')}
+        
+        prediction.update(batch.metadata())
+        return prediction
+    
+    def route_batch(
+        self,
+        customer_data: pd.DataFrame,
+        force_group: Optional[str] = None
+    ) -> PredictionBatchResult:
+        """
+        Route a batch to the appropriate model and keep the output columnar.
+        
+        Args:
+            customer_data: DataFrame with customer features (single row or batch)
+            force_group: Force specific group ('control', 'treatment', or None for A/B)
+            
+        Returns:
+            PredictionBatchResult with the model's predictions DataFrame
+        """
         # Handle single row vs batch
         is_single = len(customer_data) == 1
         
@@ -135,27 +219,28 @@ class PredictionRouter:
         
         logger.info(f"Routing prediction: customer={customer_id}, group={experiment_group}")
         
+        # One reference for the whole batch, so a hot-swap mid-batch can't
+        # mix models
+        telecom_model = self.telecom_model
+        model_version = None
+        
         # Route to appropriate model
         try:
             if experiment_group == 'treatment' and self.saas_baseline:
-                prediction = self._predict_with_saas_baseline(customer_data)
+                predictions_df = self._predict_with_saas_baseline(customer_data)
                 model_used = 'saas_baseline'
-            elif self.telecom_model:
-                prediction = self._predict_with_telecom(customer_data)
+            elif telecom_model:
+                predictions_df = self._predict_with_telecom(customer_data, telecom_model)
                 model_used = 'telecom_aligned'
+                model_version = telecom_model.model_version
             elif self.saas_baseline:
                 # Fallback to treatment if control unavailable
-                prediction = self._predict_with_saas_baseline(customer_data)
+                predictions_df = self._predict_with_saas_baseline(customer_data)
                 model_used = 'saas_baseline_fallback'
             else:
                 raise RuntimeError("No models available")
             
-            # Add experiment metadata
-            prediction['experiment_group'] = experiment_group
-            prediction['model_used'] = model_used
-            prediction['router_version'] = '1.0'
-            
-            return prediction
+            return PredictionBatchResult(predictions_df, experiment_group, model_used, model_version=model_version)
             
         except Exception as e:
             logger.error(f"Prediction routing failed: {e}")
@@ -163,20 +248,19 @@ class PredictionRouter:
             # Fallback strategy
             if self.saas_baseline:
                 logger.warning("Falling back to SaaS baseline")
-                prediction = self._predict_with_saas_baseline(customer_data)
-                prediction['experiment_group'] = 'fallback'
-                prediction['model_used'] = 'saas_baseline_fallback'
-            elif self.telecom_model:
+                predictions_df = self._predict_with_saas_baseline(customer_data)
+                model_used = 'saas_baseline_fallback'
+            elif telecom_model:
                 logger.warning("Falling back to Telecom model")
-                prediction = self._predict_with_telecom(customer_data)
-                prediction['experiment_group'] = 'fallback'
-                prediction['model_used'] = 'telecom_fallback'
+                predictions_df = self._predict_with_telecom(customer_data, telecom_model)
+                model_used = 'telecom_fallback'
+                model_version = telecom_model.model_version
             else:
                 raise
             
-            return prediction
+            return PredictionBatchResult(predictions_df, 'fallback', model_used, model_version=model_version)
     
-    def _predict_with_saas_baseline(self, customer_data: pd.DataFrame) -> Dict[str, Any]:
+    def _predict_with_saas_baseline(self, customer_data: pd.DataFrame) -> pd.DataFrame:
         """
         Get prediction from SaaS baseline model.
         
@@ -184,35 +268,89 @@ class PredictionRouter:
             customer_data: DataFrame with customer features
             
         Returns:
-            Dict with prediction results
+            DataFrame with prediction results
         """
-        # SaaS baseline returns DataFrame with predictions
-        predictions_df = self.saas_baseline.predict(customer_data)
-        
-        # Convert to dict format (for single row)
-        if len(predictions_df) == 1:
-            return predictions_df.iloc[0].to_dict()
-        else:
-            return {'predictions': predictions_df.to_dict('records')}
+        return self.saas_baseline.predict(customer_data)
     
-    def _predict_with_telecom(self, customer_data: pd.DataFrame) -> Dict[str, Any]:
+    def _predict_with_telecom(
+        self,
+        customer_data: pd.DataFrame,
+        telecom_model: Optional[RetentionPredictor] = None
+    ) -> pd.DataFrame:
         """
         Get prediction from Telecom model (with feature alignment).
         
         Args:
             customer_data: DataFrame with customer features
+            telecom_model: Model snapshot to use (default: the current one)
             
         Returns:
-            Dict with prediction results
+            DataFrame with prediction results
         """
-        # Telecom model uses existing predict method
-        predictions_df = self.telecom_model.predict(customer_data)
+        predictions_df = (telecom_model or self.telecom_model).predict(customer_data)
         
-        # Convert to dict format
-        if len(predictions_df) == 1:
-            return predictions_df.iloc[0].to_dict()
-        else:
-            return {'predictions': predictions_df.to_dict('records')}
+        # customerID comes back twice (original + cleaned features); keep the
+        # last one, as the records round trip used to
+        if not predictions_df.columns.is_unique:
+            predictions_df = predictions_df.loc[:, ~predictions_df.columns.duplicated(keep='last')]
+        return predictions_df
+    
+    # ========================================
+    # MODEL HOT-SWAP
+    # ========================================
+    
+    def reload_telecom_model(self, version: Optional[str] = None) -> bool:
+        """
+        Load a registry version and swap it in for the Telecom model.
+        
+        Blocking (reads and parses the artifact); call from a thread when on
+        the event loop. The current model keeps serving until the new one
+        is fully loaded, and stays if loading fails.
+        
+        Args:
+            version: Version to load (default: the active/pinned version)
+            
+        Returns:
+            True if the served model changed
+        """
+        with self._reload_lock:
+            self._manifest_signature = get_model_registry().manifest_signature()
+            try:
+                artifact = get_model_registry().load(version)
+            except Exception as e:
+                logger.error(f"Failed to load model {version or 'active'}, keeping current model: {e}")
+                return False
+            
+            current = self.telecom_model
+            if current is not None and current.model_version == artifact.version:
+                return False
+            
+            self.telecom_model = RetentionPredictor(artifact)
+            logger.info(
+                f"✅ Swapped Telecom model: "
+                f"{current.model_version if current else None} -> {artifact.version}"
+            )
+            return True
+    
+    def maybe_reload_model(self) -> bool:
+        """
+        Reload the Telecom model if the registry's active version changed.
+        
+        Cheap to call often: looks at the manifest at most once per
+        MODEL_RELOAD_INTERVAL_SECONDS and only parses it when its mtime/size
+        changed.
+        
+        Returns:
+            True if the served model changed
+        """
+        now = time.monotonic()
+        if now - self._last_reload_check < MODEL_RELOAD_INTERVAL_SECONDS:
+            return False
+        self._last_reload_check = now
+        
+        if get_model_registry().manifest_signature() == self._manifest_signature:
+            return False
+        return self.reload_telecom_model()
 
 
 # ========================================
@@ -3,8 +3,6 @@ Prediction processing service
 """
 import asyncio
 import logging
-import tempfile
-import os
 import uuid
 import time
 import ast
@@ -20,12 +18,15 @@ from sqlalchemy import select
 
 from backend.core.config import settings
 from backend.api.database import get_async_session
+from backend.api.response_cache import invalidate_user_responses
+from backend.services.prediction_events import publish_prediction_event
+from backend.services.progress_reporter import ProgressReporter
 from backend.models import Prediction, Upload, PredictionStatus
 from backend.ml.predict import RetentionPredictor
 from backend.ml.column_mapper import IntelligentColumnMapper
 from backend.ml.feature_validator import SaaSFeatureValidator, ValidationLevel
 from backend.ml.simple_explainer import get_simple_explainer
-from backend.services.s3_service import s3_service
+from backend.services.s3_service import async_s3_service, S3_MULTIPART_THRESHOLD
 from backend.services.prediction_router import get_prediction_router
 from backend.services.data_collector import get_data_collector
 from backend.monitoring.metrics import get_metrics_client, MetricUnit, MetricNamespace
@@ -94,9 +95,9 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
         }
     )
     
-    temp_input_file = None
-    temp_output_file = None
+    input_stream = None
     overall_start_time = time.time()
+    progress = ProgressReporter(prediction_id)
     
     try:
         async with get_async_session() as db:
@@ -129,6 +130,7 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
                 raise ValueError(f"Upload {upload_id} not found")
         
         # Step 1: Download input CSV from S3
+        await progress.stage("download")
         s3_download_start = time.time()
         logger.info(
             "Downloading input file from S3",
@@ -139,23 +141,24 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
             }
         )
         
-        temp_input_file = tempfile.NamedTemporaryFile(
-            mode='wb', 
-            suffix='.csv', 
-            delete=False
-        )
-        temp_input_file.close()
-        
-        # Download file from S3
-        download_result = s3_service.download_file(s3_key, temp_input_file.name)
-        if not download_result.get('success', False):
+        # Large inputs are fetched with parallel ranged GETs into one
+        # preallocated buffer; smaller ones are streamed straight into the
+        # CSV parser. Neither path touches local disk.
+        parallel_download = bool(upload.file_size and upload.file_size >= S3_MULTIPART_THRESHOLD)
+        try:
+            if parallel_download:
+                input_stream = await async_s3_service.open_parallel_read_stream(s3_key)
+            else:
+                input_stream = await async_s3_service.open_read_stream(s3_key)
+        except Exception as e:
             await metrics.increment_counter(
                 "S3DownloadFailure",
                 namespace=MetricNamespace.WORKER
             )
-            raise Exception(f"Failed to download file from S3: {download_result.get('error')}")
+            raise Exception(f"Failed to download file from S3: {str(e)}")
         
-        # Track S3 download duration
+        # Track S3 download duration (full transfer for parallel downloads,
+        # time to first byte for streams consumed by the CSV parser below)
         s3_download_duration = time.time() - s3_download_start
         await metrics.record_time(
             "S3DownloadDuration",
@@ -164,11 +167,12 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
         )
         
         logger.info(
-            f"Successfully downloaded input file in {s3_download_duration:.2f}s",
+            f"Opened input stream in {s3_download_duration:.2f}s",
             extra={
                 "event": "s3_download_completed",
                 "prediction_id": str(prediction_id),
-                "local_path": temp_input_file.name,
+                "content_length": input_stream.raw.content_length,
+                "parallel_download": parallel_download,
                 "duration": s3_download_duration
             }
         )
@@ -206,11 +210,25 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
             raise
         
         # Load input data (CSV parsing)
+        await progress.stage("parse")
         csv_parse_start = time.time()
-        input_df = pd.read_csv(temp_input_file.name)
+        with input_stream:
+            input_df = await async_s3_service.run_blocking(pd.read_csv, input_stream)
         original_row_count = len(input_df)
         csv_parse_duration = time.time() - csv_parse_start
         
+        # Streamed bodies are transferred while parsing, so their transfer
+        # window runs until the parser has consumed the last byte
+        transfer_seconds = s3_download_duration if parallel_download else (
+            s3_download_duration + csv_parse_duration
+        )
+        await metrics.put_metric(
+            "S3DownloadThroughput",
+            _throughput_mb_per_second(input_stream.raw.bytes_read, transfer_seconds),
+            MetricUnit.MEGABYTES_PER_SECOND,
+            namespace=MetricNamespace.WORKER
+        )
+        
         await metrics.record_time(
             "CSVParseDuration",
             csv_parse_duration,
@@ -245,6 +263,7 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
         )
         
         # Apply intelligent column mapping (SaaS-only)
+        await progress.stage("map")
         column_mapping_start = time.time()
         try:
             # SaaS-only mapper (handles ALL SaaS CSV variations)
@@ -340,6 +359,7 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
         # This catches data quality issues early with actionable feedback
         
         # STEP 1: Auto-transform data (clean common issues)
+        await progress.stage("validate")
         transform_start = time.time()
         try:
             mapped_df, transform_log = _auto_transform_data(mapped_df)
@@ -478,31 +498,25 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
             raise ValueError(f"Feature validation failed: {str(e)}")
         
         # Run predictions (ML inference) with mapped DataFrame via A/B router
+        await progress.stage("predict")
         ml_prediction_start = time.time()
         
-        # Route prediction to appropriate model (A/B test: Telecom vs SaaS baseline)
-        prediction_result = router.route_prediction(mapped_df)
-        
-        # Handle batch vs single prediction
-        if 'predictions' in prediction_result:
-            # Batch prediction
-            predictions_df = pd.DataFrame(prediction_result['predictions'])
-        else:
-            # Single prediction - convert to DataFrame
-            predictions_df = pd.DataFrame([prediction_result])
+        # Route prediction to appropriate model (A/B test: Telecom vs SaaS baseline);
+        # the batch result keeps the model's DataFrame (no per-row dict round trip)
+        batch_result = router.route_batch(mapped_df)
+        predictions_df = batch_result.predictions
         
         ml_prediction_duration = time.time() - ml_prediction_start
         
-        # Log prediction for future model training (collect real data!)
+        # Log predictions for future model training (collect real data!),
+        # batched: one transaction for the whole upload
         try:
-            for idx, row in mapped_df.iterrows():
-                customer_data = row.to_dict()
-                pred_data = predictions_df.iloc[idx].to_dict() if idx < len(predictions_df) else prediction_result
-                await data_collector.record_prediction(
-                    customer_data=customer_data,
-                    prediction_result=pred_data,
-                    prediction_id=str(prediction_id)
-                )
+            await data_collector.record_predictions(
+                customers=mapped_df.to_dict('records'),
+                predictions=predictions_df.to_dict('records'),
+                prediction_id=str(prediction_id),
+                metadata=batch_result.metadata()
+            )
         except Exception as e:
             logger.warning(f"Failed to log prediction for training: {e}")
             # Don't fail prediction if logging fails
@@ -576,6 +590,7 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
         # SHAP deferred until 100+ customers and validated demand
         # Updated: Now handles both SaaS baseline and Telecom models
         
+        await progress.stage("explain", rows_total=len(predictions_df))
         explanation_start = time.time()
         try:
             logger.info("🎯 EXPLANATION GENERATION START - Code version: 2024-12-13-v4")
@@ -689,6 +704,8 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
                             'protective_factors': []
                         }
                         explanations.append(json.dumps(fallback_explanation, ensure_ascii=False))
+                    
+                    await progress.advance(len(explanations))
                 
                 predictions_df['explanation'] = explanations
                 method_used = "saas_baseline_factors"
@@ -896,25 +913,9 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
             logger.error(f"❌ Failed to create Excel-friendly columns: {e}", exc_info=True)
             # Don't fail prediction if formatting fails
         
-        # Step 3: Save predictions to temporary file
-        temp_output_file = tempfile.NamedTemporaryFile(
-            mode='w', 
-            suffix='.csv', 
-            delete=False,
-            encoding='utf-8'
-        )
-        temp_output_file.close()
-        
-        # Write CSV with proper escaping for JSON fields
-        predictions_df.to_csv(
-            temp_output_file.name, 
-            index=False,
-            escapechar='\\',
-            doublequote=True
-        )
-        
-        # Step 4: Upload output to S3
-        output_s3_key = f"predictions/{user_id}/{prediction_id}.csv"
+        # Step 3: Stream predictions CSV to S3
+        await progress.stage("upload")
+        output_s3_key = async_s3_service.build_object_key(user_id, f"{prediction_id}.csv")
         
         s3_upload_start = time.time()
         logger.info(
@@ -926,25 +927,30 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
             }
         )
         
-        # Read the output file and upload
-        with open(temp_output_file.name, 'rb') as f:
-            file_content = f.read()
-        
-        upload_result = s3_service.upload_file_stream(
-            file_content=file_content,
-            user_id=user_id,
-            filename=f"{prediction_id}.csv"
-        )
+        def _write_results() -> int:
+            # Write CSV with proper escaping for JSON fields; parts are
+            # uploaded concurrently as they fill, so the full file is never
+            # held in memory
+            with async_s3_service.open_multipart_writer(output_s3_key) as output_stream:
+                predictions_df.to_csv(
+                    output_stream,
+                    index=False,
+                    escapechar='\\',
+                    doublequote=True
+                )
+            return output_stream.bytes_written
         
-        if not upload_result.get('success', False):
+        try:
+            output_bytes = await async_s3_service.run_blocking(_write_results)
+        except Exception as e:
             await metrics.increment_counter(
                 "S3UploadFailure",
                 namespace=MetricNamespace.WORKER,
                 dimensions={"FileType": "results"}
             )
-            raise Exception(f"Failed to upload results to S3: {upload_result.get('error')}")
+            raise Exception(f"Failed to upload results to S3: {str(e)}")
         
-        actual_s3_key = upload_result.get('object_key', output_s3_key)
+        actual_s3_key = output_s3_key
         
         # Track S3 upload duration
         s3_upload_duration = time.time() - s3_upload_start
@@ -954,6 +960,13 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
             namespace=MetricNamespace.WORKER,
             dimensions={"FileType": "results"}
         )
+        await metrics.put_metric(
+            "S3UploadThroughput",
+            _throughput_mb_per_second(output_bytes, s3_upload_duration),
+            MetricUnit.MEGABYTES_PER_SECOND,
+            namespace=MetricNamespace.WORKER,
+            dimensions={"FileType": "results"}
+        )
         
         logger.info(
             f"Successfully uploaded prediction results in {s3_upload_duration:.2f}s",
@@ -961,11 +974,13 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
                 "event": "s3_upload_completed",
                 "prediction_id": str(prediction_id),
                 "s3_key": actual_s3_key,
+                "bytes": output_bytes,
                 "duration": s3_upload_duration
             }
         )
         
-        # Step 5: Update database records
+        # Step 5: Update database records (pending progress is superseded)
+        await progress.close()
         db_write_start = time.time()
         async with get_async_session() as db:
             # Update prediction record
@@ -980,7 +995,10 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
                 prediction.rows_processed = pred_metrics["rows_processed"]
                 prediction.metrics_json = pred_metrics
                 prediction.error_message = None
+                prediction.progress_stage = None
+                prediction.progress_percent = 100
                 prediction.updated_at = datetime.utcnow()
+                await publish_prediction_event(db, prediction)
             
             # Update upload record
             upload_result = await db.execute(
@@ -993,6 +1011,7 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
                 upload.updated_at = datetime.utcnow()
             
             await db.commit()
+            invalidate_user_responses(prediction.user_id if prediction else user_id)
         
         # Track database write duration
         db_write_duration = time.time() - db_write_start
@@ -1081,20 +1100,9 @@ async def process_prediction(prediction_id: Union[str, uuid.UUID], upload_id: st
         raise
     
     finally:
-        # Clean up temporary files
-        if temp_input_file and os.path.exists(temp_input_file.name):
-            try:
-                os.unlink(temp_input_file.name)
-                logger.debug(f"Cleaned up temp input file: {temp_input_file.name}")
-            except Exception as e:
-                logger.warning(f"Failed to clean up temp input file: {e}")
-        
-        if temp_output_file and os.path.exists(temp_output_file.name):
-            try:
-                os.unlink(temp_output_file.name)
-                logger.debug(f"Cleaned up temp output file: {temp_output_file.name}")
-            except Exception as e:
-                logger.warning(f"Failed to clean up temp output file: {e}")
+        await progress.close()
+        if input_stream is not None and not input_stream.closed:
+            input_stream.close()
 
 
 def _normalize_factor_list(value: Any) -> list:
@@ -1365,6 +1373,13 @@ def _generate_summary_from_factors(risk_factors: list, protective_factors: list,
     return " ".join(summary_parts)
 
 
+def _throughput_mb_per_second(num_bytes: int, seconds: float) -> float:
+    """Transfer rate in MB/s (0 when the duration is too small to measure)"""
+    if seconds <= 0:
+        return 0.0
+    return round(num_bytes / (1024 * 1024) / seconds, 3)
+
+
 def _get_row_bucket(row_count: int) -> str:
     """
     Bucket row counts for dimension cardinality control.
@@ -0,0 +1,161 @@
+"""
+Stage-Level Progress Reporting for Prediction Jobs
+
+`process_prediction` runs for tens of seconds on large files; without
+progress a RUNNING prediction looks frozen. The reporter records the
+current stage and, for row-by-row stages, rows done, and maps them onto a
+single 0-100 percentage using fixed stage weights.
+
+Writes are throttled and coalesced: at most one UPDATE per
+`min_interval_seconds` (default 1s) per prediction. Calls in between only
+update in-memory state, and the latest state is flushed when the interval
+has passed (on the next call, or by a deferred flush if the job goes
+quiet). Each write also publishes a prediction event, so SSE clients see
+progress without polling.
+
+Progress writes are best-effort: a failed write is logged and never fails
+the prediction.
+
+Usage:
+    reporter = ProgressReporter(prediction_id)
+    await reporter.stage("parse")
+    await reporter.stage("explain", rows_total=len(df))
+    for i, row in enumerate(rows):
+        ...
+        await reporter.advance(i + 1)
+    await reporter.close()
+"""
+import time
+import asyncio
+import logging
+import uuid
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import update
+
+from backend.api.database import get_async_session
+from backend.models import Prediction
+from backend.services.prediction_events import publish_prediction_event
+
+logger = logging.getLogger(__name__)
+
+# Stage -> (start %, end %); weights reflect typical wall time per stage
+STAGE_PROGRESS: Dict[str, Tuple[int, int]] = {
+    "download": (0, 5),
+    "parse": (5, 10),
+    "map": (10, 15),
+    "validate": (15, 25),
+    "predict": (25, 60),
+    "explain": (60, 85),
+    "upload": (85, 100),
+}
+
+PROGRESS_MIN_INTERVAL_SECONDS = 1.0
+
+
+class ProgressReporter:
+    """
+    Throttled, coalesced progress writer for one prediction
+    """
+
+    def __init__(self, prediction_id: uuid.UUID, min_interval_seconds: float = PROGRESS_MIN_INTERVAL_SECONDS):
+        self.prediction_id = prediction_id
+        self.min_interval_seconds = min_interval_seconds
+        self.stage_name: Optional[str] = None
+        self.rows_done: Optional[int] = None
+        self.rows_total: Optional[int] = None
+        self.write_count = 0
+        self._last_write = float("-inf")
+        self._written_state: Optional[Tuple] = None
+        self._deferred: Optional[asyncio.Task] = None
+
+    @property
+    def percent(self) -> int:
+        """Overall progress (0-100) for the current stage and rows"""
+        if self.stage_name is None:
+            return 0
+        start, end = STAGE_PROGRESS[self.stage_name]
+        if self.rows_total and self.rows_done is not None:
+            fraction = min(1.0, self.rows_done / self.rows_total)
+            return int(start + (end - start) * fraction)
+        return start
+
+    def _state(self) -> Tuple:
+        return (self.stage_name, self.percent, self.rows_done, self.rows_total)
+
+    async def stage(self, name: str, rows_total: Optional[int] = None) -> None:
+        """
+        Enter a pipeline stage
+
+        Args:
+            name: One of STAGE_PROGRESS
+            rows_total: Rows this stage will process (for row-level progress)
+        """
+        if name not in STAGE_PROGRESS:
+            raise ValueError(f"Unknown progress stage: {name}")
+        self.stage_name = name
+        self.rows_total = rows_total
+        self.rows_done = 0 if rows_total is not None else None
+        await self._maybe_write()
+
+    async def advance(self, rows_done: int) -> None:
+        """Record rows done in the current stage (cheap; writes at most 1/s)"""
+        self.rows_done = rows_done
+        await self._maybe_write()
+
+    async def _maybe_write(self) -> None:
+        if self._state() == self._written_state:
+            return
+        wait = self._last_write + self.min_interval_seconds - time.monotonic()
+        if wait <= 0:
+            await self._write()
+        elif self._deferred is None:
+            # Coalesce: whatever the state is when the interval ends gets written
+            self._deferred = asyncio.create_task(self._deferred_write(wait))
+
+    async def _deferred_write(self, wait: float) -> None:
+        await asyncio.sleep(wait)
+        self._deferred = None
+        if self._state() != self._written_state:
+            await self._write()
+
+    async def _write(self) -> None:
+        state = self._state()
+        self._last_write = time.monotonic()
+        self._written_state = state
+        stage_name, percent, rows_done, rows_total = state
+        try:
+            async with get_async_session() as db:
+                # Goes through the ORM column defaults, so updated_at is bumped
+                # and cached detail responses get a new ETag
+                result = await db.execute(
+                    update(Prediction)
+                    .where(Prediction.id == self.prediction_id)
+                    .values(
+                        progress_stage=stage_name,
+                        progress_percent=percent,
+                        progress_rows_done=rows_done,
+                        progress_rows_total=rows_total
+                    )
+                    .returning(Prediction.id, Prediction.user_id, Prediction.status, Prediction.updated_at)
+                )
+                row = result.one_or_none()
+                if row is not None:
+                    await publish_prediction_event(
+                        db, row, progress=percent, stage=stage_name,
+                        rows_done=rows_done, rows_total=rows_total
+                    )
+                await db.commit()
+            self.write_count += 1
+        except Exception as e:
+            logger.warning(f"Failed to record prediction progress: {type(e).__name__}: {e}")
+
+    async def close(self) -> None:
+        """Drop any pending deferred write (the final status write supersedes it)"""
+        if self._deferred is not None:
+            self._deferred.cancel()
+            try:
+                await self._deferred
+            except asyncio.CancelledError:
+                pass
+            self._deferred = None
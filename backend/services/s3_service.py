@@ -1,28 +1,272 @@
 """
 S3 Service for handling file uploads and operations
 """
+import asyncio
 import boto3
+import functools
+import io
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, Future
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 import logging
 
 logger = logging.getLogger(__name__)
 
+# S3 rejects multipart parts smaller than 5 MiB (except the final part)
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_MULTIPART_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_READ_BUFFER_SIZE = 1024 * 1024
+
+# Connection pool shared by all threads using the client. The async
+# wrapper sizes its thread pool to match so no thread waits on a socket.
+S3_MAX_POOL_CONNECTIONS = int(os.getenv('S3_MAX_POOL_CONNECTIONS', '20'))
+
+# Transfer tuning: objects at or above the threshold are split into
+# chunk-sized ranged GETs / multipart parts, up to max_concurrency at a time.
+S3_MULTIPART_THRESHOLD = int(os.getenv('S3_MULTIPART_THRESHOLD_MB', '8')) * 1024 * 1024
+S3_MULTIPART_CHUNKSIZE = int(os.getenv('S3_MULTIPART_CHUNKSIZE_MB', '8')) * 1024 * 1024
+S3_MAX_CONCURRENCY = int(os.getenv('S3_MAX_CONCURRENCY', '8'))
+
+
+def build_transfer_config(
+    multipart_threshold: int = S3_MULTIPART_THRESHOLD,
+    multipart_chunksize: int = S3_MULTIPART_CHUNKSIZE,
+    max_concurrency: int = S3_MAX_CONCURRENCY
+) -> TransferConfig:
+    """Build the boto3 TransferConfig used for managed transfers"""
+    return TransferConfig(
+        multipart_threshold=multipart_threshold,
+        multipart_chunksize=max(multipart_chunksize, MIN_MULTIPART_PART_SIZE),
+        max_concurrency=max_concurrency,
+        use_threads=max_concurrency > 1
+    )
+
+
+class _MemoryBody:
+    """GetObject-body lookalike over an in-memory buffer (zero-copy reads)"""
+    
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._position = 0
+    
+    def read(self, size: int = -1) -> memoryview:
+        end = len(self._view) if size is None or size < 0 else self._position + size
+        chunk = self._view[self._position:end]
+        self._position += len(chunk)
+        return chunk
+    
+    def close(self) -> None:
+        self._view = memoryview(b"")
+
+
+class S3ReadStream(io.RawIOBase):
+    """
+    Read-only file object over an S3 GetObject response body.
+    
+    Reads are pulled from the HTTP response on demand, so pandas/pyarrow can
+    parse an object without it ever touching local disk. Only the caller's
+    read buffer is held in memory at any time.
+    """
+    
+    def __init__(self, body, object_key: str, content_length: Optional[int] = None):
+        super().__init__()
+        self._body = body
+        self.object_key = object_key
+        self.content_length = content_length
+        self.bytes_read = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        data = self._body.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self.bytes_read += size
+        return size
+    
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self._body.close()
+            finally:
+                super().close()
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    Write-only file object that uploads to S3 in fixed-size multipart parts.
+    
+    With max_concurrency=1 at most one part is buffered in memory; higher
+    values upload up to that many parts in parallel, bounding memory to
+    (max_concurrency + 1) * part_size. Objects smaller than a single part
+    are sent with one PutObject on close. Use it as a context manager: a clean
+    exit completes the upload, an exception aborts it so no orphaned parts are
+    left behind in the bucket.
+    """
+    
+    def __init__(self, s3_client, bucket_name: str, object_key: str,
+                 content_type: str = 'text/csv',
+                 part_size: int = DEFAULT_MULTIPART_PART_SIZE,
+                 max_concurrency: int = 1):
+        super().__init__()
+        self._s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.object_key = object_key
+        self.content_type = content_type
+        self.part_size = max(part_size, MIN_MULTIPART_PART_SIZE)
+        self.bytes_written = 0
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Dict[str, Any]] = []
+        self._max_concurrency = max(1, max_concurrency)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        self._next_part_number = 1
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed S3 writer")
+        self._buffer += data
+        size = len(data)
+        self.bytes_written += size
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[:self.part_size])
+            del self._buffer[:self.part_size]
+            self._upload_part(part)
+        return size
+    
+    def _upload_part(self, data: bytes) -> None:
+        if self._upload_id is None:
+            response = self._s3_client.create_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.object_key,
+                ContentType=self.content_type
+            )
+            self._upload_id = response['UploadId']
+        
+        part_number = self._next_part_number
+        self._next_part_number += 1
+        
+        if self._max_concurrency == 1:
+            self._parts.append(self._send_part(part_number, data))
+            return
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_concurrency,
+                thread_name_prefix="s3-part"
+            )
+        # Backpressure: never hold more than max_concurrency parts in flight
+        while len(self._pending) >= self._max_concurrency:
+            self._parts.append(self._pending.pop(0).result())
+        self._pending.append(self._executor.submit(self._send_part, part_number, data))
+    
+    def _send_part(self, part_number: int, data: bytes) -> Dict[str, Any]:
+        response = self._s3_client.upload_part(
+            Bucket=self.bucket_name,
+            Key=self.object_key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data
+        )
+        return {'ETag': response['ETag'], 'PartNumber': part_number}
+    
+    def _drain(self) -> None:
+        while self._pending:
+            self._parts.append(self._pending.pop(0).result())
+    
+    def _shutdown_executor(self) -> None:
+        if self._executor is not None:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._pending = []
+    
+    def close(self) -> None:
+        """Flush the remaining buffer and complete the upload."""
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self._s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=self.object_key,
+                    Body=bytes(self._buffer),
+                    ContentType=self.content_type
+                )
+            else:
+                if self._buffer:
+                    self._upload_part(bytes(self._buffer))
+                self._drain()
+                self._s3_client.complete_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=self.object_key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={
+                        'Parts': sorted(self._parts, key=lambda part: part['PartNumber'])
+                    }
+                )
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._buffer = bytearray()
+            self._shutdown_executor()
+            super().close()
+    
+    def abort(self) -> None:
+        """Discard buffered data and abort any in-progress multipart upload."""
+        self._buffer = bytearray()
+        self._shutdown_executor()
+        if self._upload_id is not None:
+            upload_id, self._upload_id = self._upload_id, None
+            try:
+                self._s3_client.abort_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=self.object_key,
+                    UploadId=upload_id
+                )
+            except Exception as e:
+                logger.warning(f"Failed to abort multipart upload for {self.object_key}: {str(e)}")
+        if not self.closed:
+            super().close()
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+        return False
+
+
 class S3Service:
     """Service class for S3 operations"""
     
-    def __init__(self):
+    def __init__(self, max_pool_connections: int = S3_MAX_POOL_CONNECTIONS):
         """Initialize S3 client with configuration from environment"""
         self.s3_client = boto3.client(
             's3',
             region_name=os.getenv('AWS_REGION', 'us-east-1'),
             aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
+            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=True,
+                retries={'max_attempts': 3, 'mode': 'standard'}
+            )
         )
         self.bucket_name = os.getenv('S3_BUCKET')
+        self.transfer_config = build_transfer_config()
         
         # Don't raise error if S3_BUCKET is not set - will use local fallback
         if not self.bucket_name:
@@ -73,6 +317,22 @@ class S3Service:
         
         return sanitized
     
+    def build_object_key(self, user_id: str, filename: str) -> str:
+        """
+        Build the timestamped object key used for user files
+        
+        Args:
+            user_id: User ID for organizing uploads
+            filename: Original filename
+            
+        Returns:
+            Object key of the form uploads/{user_id}/{timestamp}-{filename}
+        """
+        # Sanitize filename to prevent issues with spaces, parentheses, etc.
+        sanitized_filename = self._sanitize_filename(filename)
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        return f"uploads/{user_id}/{timestamp}-{sanitized_filename}"
+    
     def upload_file_stream(self, file_content: bytes, user_id: str, filename: str) -> Dict[str, Any]:
         """
         Upload file content directly to S3 without saving to local disk
@@ -86,19 +346,16 @@ class S3Service:
             Dict containing upload result with object_key and success status
         """
         try:
-            # Sanitize filename to prevent issues with spaces, parentheses, etc.
-            sanitized_filename = self._sanitize_filename(filename)
+            object_key = self.build_object_key(user_id, filename)
             
-            # Generate S3 object key with timestamp
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            object_key = f"uploads/{user_id}/{timestamp}-{sanitized_filename}"
-            
-            # Upload file content directly to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=object_key,
-                Body=file_content,
-                ContentType='text/csv'  # Assuming CSV files
+            # Upload file content directly to S3 (multipart above the
+            # transfer threshold, single PUT below it)
+            self.s3_client.upload_fileobj(
+                io.BytesIO(file_content),
+                self.bucket_name,
+                object_key,
+                ExtraArgs={'ContentType': 'text/csv'},  # Assuming CSV files
+                Config=self.transfer_config
             )
             
             logger.info(f"Successfully uploaded file to S3: {object_key}")
@@ -276,7 +533,9 @@ class S3Service:
             Dict containing success status and error info
         """
         try:
-            self.s3_client.download_file(self.bucket_name, object_key, local_path)
+            self.s3_client.download_file(
+                self.bucket_name, object_key, local_path, Config=self.transfer_config
+            )
             logger.info(f"Successfully downloaded {object_key} to {local_path}")
             return {
                 "success": True,
@@ -328,6 +587,144 @@ class S3Service:
         except Exception as e:
             raise Exception(f"Failed to download file to memory: {str(e)}")
     
+    def open_read_stream(self, object_key: str,
+                         buffer_size: int = DEFAULT_READ_BUFFER_SIZE) -> io.BufferedReader:
+        """
+        Open an S3 object as a buffered binary file object
+        
+        The object is streamed from S3 as it is read, so it can be passed
+        straight to pd.read_csv() without a temp file or a full in-memory copy.
+        The underlying S3ReadStream is available as `.raw` (e.g. for bytes_read).
+        
+        Args:
+            object_key: S3 object key
+            buffer_size: Read buffer size in bytes
+            
+        Returns:
+            Buffered binary reader; close it when done
+            
+        Raises:
+            FileNotFoundError: If the object does not exist
+            ClientError: For other S3 errors
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=object_key)
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                raise FileNotFoundError(f"File not found in S3: {object_key}")
+            raise
+        
+        raw = S3ReadStream(response['Body'], object_key, response.get('ContentLength'))
+        return io.BufferedReader(raw, buffer_size=buffer_size)
+    
+    def _get_range(self, object_key: str, start: int, end: int) -> Dict[str, Any]:
+        return self.s3_client.get_object(
+            Bucket=self.bucket_name,
+            Key=object_key,
+            Range=f"bytes={start}-{end}"
+        )
+    
+    def download_to_buffer(self, object_key: str) -> memoryview:
+        """
+        Download an object into a single preallocated buffer
+        
+        The first chunk-sized ranged GET also returns the object size. If more
+        remains, the other ranges are fetched in parallel (up to the transfer
+        max_concurrency) and written straight into their slice of the buffer.
+        
+        Args:
+            object_key: S3 object key
+            
+        Returns:
+            memoryview over the object bytes
+            
+        Raises:
+            FileNotFoundError: If the object does not exist
+            ClientError: For other S3 errors
+        """
+        chunk_size = self.transfer_config.multipart_chunksize
+        try:
+            first = self._get_range(object_key, 0, chunk_size - 1)
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code in ('NoSuchKey', '404'):
+                raise FileNotFoundError(f"File not found in S3: {object_key}")
+            if error_code == 'InvalidRange':
+                # Zero-byte object
+                return memoryview(bytearray())
+            raise
+        
+        # ContentRange: "bytes 0-8388607/52428800"
+        content_range = first.get('ContentRange')
+        total_size = int(content_range.rsplit('/', 1)[1]) if content_range else first['ContentLength']
+        
+        buffer = bytearray(total_size)
+        view = memoryview(buffer)
+        head = first['Body'].read()
+        view[:len(head)] = head
+        
+        ranges = [
+            (start, min(start + chunk_size, total_size) - 1)
+            for start in range(len(head), total_size, chunk_size)
+        ]
+        if ranges:
+            def fetch(byte_range):
+                start, end = byte_range
+                data = self._get_range(object_key, start, end)['Body'].read()
+                view[start:start + len(data)] = data
+            
+            workers = min(self.transfer_config.max_concurrency, len(ranges))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-range") as pool:
+                # list() re-raises the first failed range
+                list(pool.map(fetch, ranges))
+        
+        logger.info(f"Downloaded {object_key} into memory ({total_size} bytes, {len(ranges) + 1} ranges)")
+        return view
+    
+    def open_parallel_read_stream(self, object_key: str,
+                                  buffer_size: int = DEFAULT_READ_BUFFER_SIZE) -> io.BufferedReader:
+        """
+        Like open_read_stream(), but downloads the object up front with
+        parallel ranged GETs. Prefer it for objects above the multipart
+        threshold, where it is limited by bandwidth rather than one connection.
+        """
+        view = self.download_to_buffer(object_key)
+        raw = S3ReadStream(_MemoryBody(view), object_key, len(view))
+        return io.BufferedReader(raw, buffer_size=buffer_size)
+    
+    def open_multipart_writer(self, object_key: str, content_type: str = 'text/csv',
+                              part_size: Optional[int] = None,
+                              max_concurrency: Optional[int] = None) -> S3MultipartWriter:
+        """
+        Open a binary file object that writes to S3 via multipart upload
+        
+        Memory use is bounded by part_size * (max_concurrency + 1)
+        regardless of the object size.
+        Use as a context manager so failures abort the upload:
+        
+            with s3_service.open_multipart_writer(key) as writer:
+                df.to_csv(writer, index=False)
+        
+        Args:
+            object_key: Destination S3 object key
+            content_type: Content-Type stored on the object
+            part_size: Multipart part size in bytes (minimum 5 MiB);
+                defaults to the transfer chunk size
+            max_concurrency: Parts uploaded in parallel; defaults to the
+                transfer max_concurrency
+            
+        Returns:
+            S3MultipartWriter
+        """
+        return S3MultipartWriter(
+            self.s3_client,
+            self.bucket_name,
+            object_key,
+            content_type=content_type,
+            part_size=part_size or self.transfer_config.multipart_chunksize,
+            max_concurrency=max_concurrency or self.transfer_config.max_concurrency
+        )
+    
     def file_exists(self, object_key: str) -> bool:
         """
         Check if a file exists in S3
@@ -348,5 +745,97 @@ class S3Service:
         except Exception:
             return False
 
-# Global S3 service instance
-s3_service = S3Service() 
+
+class AsyncS3Service:
+    """
+    Awaitable counterpart of S3Service for async routes and the worker.
+    
+    Blocking boto3 calls run on a bounded thread pool sized to the client's
+    connection pool, so the event loop never waits on an S3 round-trip.
+    Presigned URL generation is local signing only and runs inline.
+    The wrapped S3Service (and its thread-safe boto3 client) is shared.
+    """
+    
+    def __init__(self, service: Optional[S3Service] = None,
+                 max_workers: int = S3_MAX_POOL_CONNECTIONS):
+        self.service = service or S3Service(max_pool_connections=max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="s3-io"
+        )
+    
+    @property
+    def bucket_name(self) -> str:
+        return self.service.bucket_name
+    
+    async def run_blocking(self, func: Callable, *args, **kwargs):
+        """Run a blocking callable on the S3 thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+    
+    def build_object_key(self, user_id: str, filename: str) -> str:
+        return self.service.build_object_key(user_id, filename)
+    
+    async def upload_file_stream(self, file_content: bytes, user_id: str, filename: str) -> Dict[str, Any]:
+        return await self.run_blocking(
+            self.service.upload_file_stream, file_content, user_id, filename
+        )
+    
+    async def generate_presigned_upload_url(self, user_id: str, filename: str,
+                                            expiration: int = 3600) -> Dict[str, Any]:
+        return self.service.generate_presigned_upload_url(user_id, filename, expiration)
+    
+    async def get_file_url(self, object_key: str, expiration: int = 3600) -> Optional[str]:
+        return self.service.get_file_url(object_key, expiration)
+    
+    async def generate_presigned_download_url(self, object_key: str, expires_in: int = 3600,
+                                              http_method: str = 'GET',
+                                              content_disposition: str = None) -> str:
+        return self.service.generate_presigned_download_url(
+            object_key, expires_in, http_method, content_disposition
+        )
+    
+    async def delete_file(self, object_key: str) -> bool:
+        return await self.run_blocking(self.service.delete_file, object_key)
+    
+    async def download_file(self, object_key: str, local_path: str) -> Dict[str, Any]:
+        return await self.run_blocking(self.service.download_file, object_key, local_path)
+    
+    async def download_file_to_memory(self, object_key: str) -> str:
+        return await self.run_blocking(self.service.download_file_to_memory, object_key)
+    
+    async def open_read_stream(self, object_key: str,
+                               buffer_size: int = DEFAULT_READ_BUFFER_SIZE) -> io.BufferedReader:
+        """Issue the GetObject off-loop; reads on the returned stream are blocking"""
+        return await self.run_blocking(self.service.open_read_stream, object_key, buffer_size)
+    
+    async def download_to_buffer(self, object_key: str) -> memoryview:
+        return await self.run_blocking(self.service.download_to_buffer, object_key)
+    
+    async def open_parallel_read_stream(self, object_key: str,
+                                        buffer_size: int = DEFAULT_READ_BUFFER_SIZE) -> io.BufferedReader:
+        return await self.run_blocking(
+            self.service.open_parallel_read_stream, object_key, buffer_size
+        )
+    
+    def open_multipart_writer(self, object_key: str, content_type: str = 'text/csv',
+                              part_size: Optional[int] = None,
+                              max_concurrency: Optional[int] = None) -> S3MultipartWriter:
+        """Writes are blocking; drive the writer from run_blocking()"""
+        return self.service.open_multipart_writer(
+            object_key, content_type, part_size, max_concurrency
+        )
+    
+    async def file_exists(self, object_key: str) -> bool:
+        return await self.run_blocking(self.service.file_exists, object_key)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the thread pool (call on application shutdown)"""
+        self._executor.shutdown(wait=wait)
+
+
+# Global S3 service instances (share one boto3 client and connection pool)
+s3_service = S3Service()
+async_s3_service = AsyncS3Service(s3_service)
@@ -9,12 +9,25 @@ Features:
 - User-friendly error messages
 - Retry tracking
 - Structured logging
+- Batched sends (SQSBatchPublisher)
+
+Publishing:
+    Every publish goes through one long-lived SQSBatchPublisher. Publishes
+    that arrive within a short window (SQS_BATCH_WINDOW_SECONDS) are sent
+    together as one SendMessageBatch call (up to 10 messages, the SQS limit)
+    on a thread, so a burst of uploads costs a few round trips instead of
+    one blocking send_message per upload, and the event loop is never
+    blocked. Each caller still gets its own result: a failed entry raises a
+    ClientError with the entry's code, which publish_prediction_to_sqs turns
+    into _mark_for_retry like any other SQS error.
 """
 
+import os
 import json
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Tuple, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Set, Tuple, Optional
 from uuid import UUID
 
 import boto3
@@ -24,10 +37,173 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.config import settings
 from backend.schemas.sqs_messages import PredictionSQSMessage
-from backend.models import Prediction
+from backend.models import Prediction, PredictionStatus
 
 logger = logging.getLogger(__name__)
 
+SQS_MAX_BATCH_SIZE = 10  # SendMessageBatch limit
+SQS_BATCH_WINDOW_SECONDS = float(os.getenv('SQS_BATCH_WINDOW_SECONDS', '0.01'))
+
+
+# =====================================================
+# BATCH PUBLISHER
+# =====================================================
+
+class SQSBatchPublisher:
+    """
+    Coalesces concurrent publishes into SendMessageBatch calls
+
+    The first message for a queue opens a batch; the batch is sent when it
+    reaches SQS_MAX_BATCH_SIZE or when the window elapses, whichever comes
+    first. A single publish therefore waits at most one window.
+
+    The boto3 client is created once (settings.get_boto3_sqs) and reused;
+    callers may pass their own client, which gets its own batches.
+    """
+
+    def __init__(
+        self,
+        client: Optional[Any] = None,
+        max_batch_size: int = SQS_MAX_BATCH_SIZE,
+        window_seconds: float = SQS_BATCH_WINDOW_SECONDS
+    ):
+        self._client = client
+        self.max_batch_size = min(max_batch_size, SQS_MAX_BATCH_SIZE)
+        self.window_seconds = window_seconds
+        # (client, queue_url) -> pending (entry, future) pairs and flush timer
+        self._pending: Dict[Tuple[Any, str], List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[Any, str], asyncio.TimerHandle] = {}
+        self._sends: Set[asyncio.Task] = set()
+
+    @property
+    def client(self):
+        """Long-lived boto3 SQS client (created on first use)"""
+        if self._client is None:
+            self._client = settings.get_boto3_sqs()
+        return self._client
+
+    async def publish(
+        self,
+        queue_url: str,
+        message_body: str,
+        message_attributes: Optional[Dict[str, Any]] = None,
+        client: Optional[Any] = None
+    ) -> str:
+        """
+        Queue one message for the next batch and wait for its result
+
+        Returns:
+            SQS MessageId
+
+        Raises:
+            ClientError: The entry failed (code/message from the batch
+                response) or the whole SendMessageBatch call failed
+            BotoCoreError: Network/transport error for the batch
+        """
+        key = (client or self.client, queue_url)
+        future = asyncio.get_running_loop().create_future()
+        entry = {'MessageBody': message_body}
+        if message_attributes:
+            entry['MessageAttributes'] = message_attributes
+
+        batch = self._pending.setdefault(key, [])
+        batch.append((entry, future))
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = asyncio.get_running_loop().call_later(
+                self.window_seconds, self._flush, key
+            )
+        return await future
+
+    def _flush(self, key: Tuple[Any, str]) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._send(key, batch))
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+
+    async def _send(
+        self,
+        key: Tuple[Any, str],
+        batch: List[Tuple[Dict[str, Any], asyncio.Future]]
+    ) -> None:
+        client, queue_url = key
+        entries = [dict(entry, Id=str(index)) for index, (entry, _) in enumerate(batch)]
+        try:
+            response = await asyncio.to_thread(
+                client.send_message_batch, QueueUrl=queue_url, Entries=entries
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        successful = {item['Id']: item['MessageId'] for item in response.get('Successful', [])}
+        failed = {item['Id']: item for item in response.get('Failed', [])}
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            entry_id = str(index)
+            if entry_id in successful:
+                future.set_result(successful[entry_id])
+                continue
+            error = failed.get(entry_id, {
+                'Code': 'MissingBatchResult',
+                'Message': 'Entry not in SendMessageBatch response'
+            })
+            future.set_exception(ClientError(
+                {'Error': {'Code': error.get('Code', 'InternalError'), 'Message': error.get('Message', '')},
+                 'SenderFault': error.get('SenderFault', False)},
+                'SendMessageBatch'
+            ))
+
+        if failed:
+            logger.warning(f"⚠️ SQS batch: {len(failed)}/{len(batch)} entries failed")
+
+    async def aclose(self) -> None:
+        """Send any open batches and wait for in-flight sends"""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._sends:
+            await asyncio.gather(*self._sends, return_exceptions=True)
+
+
+_publisher: Optional[SQSBatchPublisher] = None
+
+
+def get_sqs_publisher() -> SQSBatchPublisher:
+    """
+    Get the singleton batch publisher
+
+    Returns:
+        SQSBatchPublisher shared by all publishes in this process
+    """
+    global _publisher
+    if _publisher is None:
+        _publisher = SQSBatchPublisher()
+    return _publisher
+
+
+async def shutdown_sqs_publisher() -> None:
+    """
+    Flush pending publishes and close the publisher's client
+
+    No-op if nothing was ever published.
+    """
+    global _publisher
+    if _publisher is None:
+        return
+    publisher, _publisher = _publisher, None
+    await publisher.aclose()
+    if publisher._client is not None:
+        publisher._client.close()
+
 
 async def publish_prediction_to_sqs(
     prediction_id: UUID,
@@ -45,7 +221,7 @@ async def publish_prediction_to_sqs(
         user_id: Clerk user ID
         upload_id: UUID of upload record
         s3_file_path: S3 path to CSV file
-        sqs_client: boto3 SQS client (injected)
+        sqs_client: boto3 SQS client (injected); sent through the batch publisher
         db: Database session
     
     Returns:
@@ -74,11 +250,11 @@ async def publish_prediction_to_sqs(
             priority='normal'
         )
         
-        # Publish to SQS
-        response = sqs_client.send_message(
-            QueueUrl=settings.PREDICTIONS_QUEUE_URL,
-            MessageBody=message.json(),
-            MessageAttributes={
+        # Publish to SQS (batched with concurrent publishes)
+        message_id = await get_sqs_publisher().publish(
+            settings.PREDICTIONS_QUEUE_URL,
+            message.json(),
+            {
                 'user_id': {
                     'StringValue': user_id,
                     'DataType': 'String'
@@ -91,11 +267,10 @@ async def publish_prediction_to_sqs(
                     'StringValue': str(upload_id),
                     'DataType': 'String'
                 }
-            }
+            },
+            client=sqs_client
         )
         
-        message_id = response['MessageId']
-        
         # Update prediction record with SQS metadata
         await _update_prediction_metadata(
             db,
@@ -128,85 +303,69 @@ async def publish_prediction_to_sqs(
         )
         return False, "Invalid prediction data - please contact support"
         
-    except ClientError as e:
-        error_code = e.response['Error']['Code']
-        error_message = e.response['Error']['Message']
-        
-        # Map AWS errors to user-friendly messages
-        user_messages = {
-            'QueueDoesNotExist': "Processing service temporarily unavailable",
-            'AccessDenied': "System configuration error - please contact support",
-            'RequestThrottled': "High demand - your request has been saved",
-            'InvalidMessageContents': "Invalid prediction data",
-        }
-        
-        user_msg = user_messages.get(
-            error_code,
-            "Processing delayed - we'll retry automatically"
+    except Exception as e:
+        return False, await record_publish_failure(db, prediction_id, e, user_id=user_id)
+
+
+# Map AWS errors to user-friendly messages
+PUBLISH_ERROR_MESSAGES = {
+    'QueueDoesNotExist': "Processing service temporarily unavailable",
+    'AccessDenied': "System configuration error - please contact support",
+    'RequestThrottled': "High demand - please upload the file again shortly",
+    'InvalidMessageContents': "Invalid prediction data",
+}
+
+
+async def record_publish_failure(
+    db: AsyncSession,
+    prediction_id: UUID,
+    error: Exception,
+    user_id: Optional[str] = None
+) -> str:
+    """
+    Log a failed publish and mark the prediction FAILED
+    
+    Used for errors from a single publish or from one entry of a
+    SendMessageBatch (raised as ClientError by SQSBatchPublisher).
+    
+    Returns:
+        User-friendly message for the error
+    """
+    log_extra = {'prediction_id': str(prediction_id), 'user_id': user_id}
+    
+    if isinstance(error, ClientError):
+        error_code = error.response['Error']['Code']
+        error_message = error.response['Error']['Message']
+        logger.error(
+            f"❌ SQS ClientError",
+            extra={**log_extra, 'error_code': error_code, 'error_message': error_message}
         )
-        
-        # Mark prediction for retry
-        await _mark_for_retry(
+        await _mark_publish_failed(
             db,
             prediction_id,
             error_type='SQS_CLIENT_ERROR',
             error_code=error_code,
             error_message=error_message
         )
-        
-        logger.error(
-            f"❌ SQS ClientError",
-            extra={
-                'prediction_id': str(prediction_id),
-                'user_id': user_id,
-                'error_code': error_code,
-                'error_message': error_message
-            }
+        return PUBLISH_ERROR_MESSAGES.get(
+            error_code,
+            "Processing could not be started - please upload the file again"
         )
-        
-        return False, user_msg
-        
-    except BotoCoreError as e:
+    
+    if isinstance(error, BotoCoreError):
         # Low-level boto3 errors (network, etc.)
-        logger.error(
-            f"❌ SQS BotoCoreError",
-            extra={
-                'prediction_id': str(prediction_id),
-                'user_id': user_id,
-                'error': str(e)
-            },
-            exc_info=True
-        )
-        
-        await _mark_for_retry(
-            db,
-            prediction_id,
-            error_type='SQS_NETWORK_ERROR',
-            error_message=str(e)
-        )
-        
-        return False, "Network error - your prediction will be retried"
-        
-    except Exception as e:
-        # Unexpected errors
-        logger.error(
-            f"❌ Unexpected error publishing to SQS",
-            extra={
-                'prediction_id': str(prediction_id),
-                'user_id': user_id,
-                'error': str(e)
-            },
-            exc_info=True
-        )
-        
-        await _mark_for_retry(
-            db,
-            prediction_id,
-            error_type='UNKNOWN_ERROR',
-            error_message=str(e)
-        )
-        
-        return False, "System error - your prediction has been saved for processing"
+        logger.error(f"❌ SQS BotoCoreError", extra={**log_extra, 'error': str(error)}, exc_info=error)
+        await _mark_publish_failed(db, prediction_id, error_type='SQS_NETWORK_ERROR', error_message=str(error))
+        return "Network error - please upload the file again"
+    
+    # Unexpected errors
+    logger.error(
+        f"❌ Unexpected error publishing to SQS",
+        extra={**log_extra, 'error': str(error)},
+        exc_info=error
+    )
+    await _mark_publish_failed(db, prediction_id, error_type='UNKNOWN_ERROR', error_message=str(error))
+    return "System error - please upload the file again"
 
 
 # =====================================================
@@ -231,26 +390,29 @@ async def _update_prediction_metadata(
         logger.error(f"Failed to update prediction metadata: {str(e)}")
 
 
-async def _mark_for_retry(
+async def _mark_publish_failed(
     db: AsyncSession,
     prediction_id: UUID,
     error_type: str,
     error_code: str = None,
     error_message: str = None
 ):
-    """Mark prediction for automatic retry"""
+    """
+    Mark prediction FAILED with the publish error
+
+    Nothing re-publishes predictions, so leaving them QUEUED would have
+    clients polling forever.
+    """
     try:
-        async with db.begin():
-            prediction = await db.get(Prediction, prediction_id)
-            if prediction:
-                prediction.status = 'RETRY_PENDING'
-                prediction.retry_count = (prediction.retry_count or 0) + 1
-                prediction.last_error_type = error_type
-                prediction.last_error_code = error_code
-                prediction.last_error_message = error_message[:500] if error_message else None
-                prediction.next_retry_at = datetime.utcnow() + timedelta(minutes=5)
+        prediction = await db.get(Prediction, prediction_id)
+        if prediction:
+            detail = ": ".join(part for part in (error_type, error_code, error_message) if part)
+            prediction.status = PredictionStatus.FAILED
+            prediction.error_message = f"SQS publish failed: {detail}"[:500]
+            await db.commit()
     except Exception as e:
-        logger.error(f"Failed to mark prediction for retry: {str(e)}")
+        await db.rollback()
+        logger.error(f"Failed to update prediction status after SQS failure: {str(e)}")
 
 
 async def _mark_for_manual_processing(
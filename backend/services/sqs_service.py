@@ -1,11 +1,16 @@
 """
 SQS Service for publishing prediction tasks
+
+Messages are sent through the shared SQSBatchPublisher (see
+backend/services/sqs_publisher.py), which reuses one boto3 client and
+coalesces concurrent uploads into SendMessageBatch calls.
 """
 import json
 import logging
 import datetime
 from typing import Dict, Any
 from backend.core.config import settings
+from backend.services.sqs_publisher import get_sqs_publisher
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +38,6 @@ async def publish_prediction_task(
         Exception: If SQS publish fails
     """
     try:
-        sqs_client = settings.get_boto3_sqs()
-        
         # Convert S3 key to full S3 path for Pydantic validation
         s3_file_path = f"s3://{settings.S3_BUCKET}/{s3_key}"
         
@@ -48,11 +51,11 @@ async def publish_prediction_task(
             "priority": "normal"
         }
         
-        # Send message to SQS
-        response = sqs_client.send_message(
-            QueueUrl=queue_url,
-            MessageBody=json.dumps(message_body),
-            MessageAttributes={
+        # Send message to SQS (batched with concurrent uploads)
+        message_id = await get_sqs_publisher().publish(
+            queue_url,
+            json.dumps(message_body),
+            {
                 'task_type': {
                     'StringValue': 'ml_prediction',
                     'DataType': 'String'
@@ -64,7 +67,6 @@ async def publish_prediction_task(
             }
         )
         
-        message_id = response['MessageId']
         logger.info(f"Published prediction task to SQS: message_id={message_id}, prediction_id={prediction_id}")
         
         return {
@@ -0,0 +1,307 @@
+"""
+Training Data Storage - compact columns and partition maintenance
+
+ml_training_data gains a row for every customer of every upload, so its
+storage is designed for hundreds of millions of rows:
+
+1. Compact features (CompactFeatures): JSONB on PostgreSQL, with the
+   standard Telecom/SaaS feature names replaced by short codes and null/NaN
+   values dropped. JSONB stores keys in every row, so this is most of the
+   per-row size. Rows are tagged {"_v": 1, ...}; untagged rows (written
+   before the compact encoding) are read as-is.
+2. Small codes (CodedString): model_type / experiment_group are smallint
+   codes instead of strings (2 bytes vs. ~10-25), decoded transparently, so
+   queries and callers keep using the strings.
+3. Monthly range partitions on predicted_at (see the
+   partition_ml_training_data migration): inserts go to the current month's
+   partition, outcome lookups use the per-partition partial index on open
+   (unlabeled) predictions, and old months are dropped as whole tables
+   instead of DELETEd row by row.
+4. Retention (rollup_expired_partitions): partitions older than
+   ML_TRAINING_RETENTION_MONTHS are aggregated into ml_training_rollup
+   (per month / model type / experiment group) and dropped. Export labeled
+   rows first (RealDataCollector.export_training_partitions) if they are
+   still needed for training.
+
+Run `python -m backend.scripts.maintain_training_partitions` daily to create
+upcoming partitions and apply retention.
+
+Code lists are append-only: codes are stored in the database.
+"""
+import os
+import re
+import math
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Column, Date, DateTime, Float, Integer, SmallInteger, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import JSON, TypeDecorator
+
+from backend.api.database import Base
+
+logger = logging.getLogger(__name__)
+
+TRAINING_TABLE = 'ml_training_data'
+PARTITION_NAME_PATTERN = re.compile(rf'^{TRAINING_TABLE}_(\d{{4}})_(\d{{2}})$')
+
+PARTITION_MONTHS_AHEAD = 3
+ML_TRAINING_RETENTION_MONTHS = int(os.getenv('ML_TRAINING_RETENTION_MONTHS', '24'))
+
+
+# ========================================
+# CODE LISTS (append-only)
+# ========================================
+
+# Code 0 is the catch-all for values not in the list
+MODEL_TYPES = (
+    'unknown', 'telecom', 'saas_baseline', 'telecom_aligned',
+    'saas_baseline_fallback', 'telecom_fallback', 'saas_baseline_v1'
+)
+EXPERIMENT_GROUPS = ('other', 'control', 'treatment', 'fallback')
+
+COMPACT_FEATURES_VERSION = 1
+FEATURE_KEY_CODES = {
+    # Telco layout
+    'customerID': 'id', 'gender': 'g', 'SeniorCitizen': 'sc', 'Partner': 'pa',
+    'Dependents': 'de', 'tenure': 't', 'PhoneService': 'ps', 'MultipleLines': 'ml',
+    'InternetService': 'is', 'OnlineSecurity': 'os', 'OnlineBackup': 'ob',
+    'DeviceProtection': 'dp', 'TechSupport': 'ts', 'StreamingTV': 'tv',
+    'StreamingMovies': 'sm', 'Contract': 'c', 'PaperlessBilling': 'pb',
+    'PaymentMethod': 'pm', 'MonthlyCharges': 'mc', 'TotalCharges': 'tc',
+    # SaaS baseline
+    'feature_usage_score': 'fu', 'seats_purchased': 'sp', 'seats_used': 'su',
+    'support_tickets': 'st', 'last_activity_days_ago': 'la', 'has_integration': 'hi',
+    'company_size': 'cs', 'industry': 'in',
+}
+FEATURE_KEY_NAMES = {code: name for name, code in FEATURE_KEY_CODES.items()}
+
+
+# ========================================
+# COLUMN TYPES
+# ========================================
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def encode_features(features: Dict[str, Any]) -> Dict[str, Any]:
+    """Short keys, no null/NaN values (NaN is not valid JSON anyway)"""
+    encoded: Dict[str, Any] = {'_v': COMPACT_FEATURES_VERSION}
+    for name, value in features.items():
+        if _is_missing(value):
+            continue
+        name = str(name)
+        key = FEATURE_KEY_CODES.get(name)
+        if key is None:
+            # Other names are kept, escaped if they could be read as a code
+            key = f'~{name}' if name in FEATURE_KEY_NAMES or name.startswith('~') or name == '_v' else name
+        encoded[key] = value
+    return encoded
+
+
+def decode_features(stored: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of encode_features; untagged (legacy) rows are returned unchanged"""
+    if stored.get('_v') != COMPACT_FEATURES_VERSION:
+        return stored
+    decoded = {}
+    for key, value in stored.items():
+        if key == '_v':
+            continue
+        if key in FEATURE_KEY_NAMES:
+            key = FEATURE_KEY_NAMES[key]
+        elif key.startswith('~'):
+            key = key[1:]
+        decoded[key] = value
+    return decoded
+
+
+class CompactFeatures(TypeDecorator):
+    """Feature dict stored with encode_features (JSONB on PostgreSQL)"""
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(JSON())
+
+    def process_bind_param(self, value, dialect):
+        return encode_features(value) if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        return decode_features(value) if value is not None else None
+
+
+class CodedString(TypeDecorator):
+    """String from a fixed, append-only list stored as its smallint index"""
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, values: Sequence[str]):
+        super().__init__()
+        self.values = tuple(values)
+        self._codes = {value: code for code, value in enumerate(self.values)}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        code = self._codes.get(value)
+        if code is None:
+            logger.warning(f"Unknown value {value!r}, stored as {self.values[0]!r}")
+            return 0
+        return code
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.values[value] if 0 <= value < len(self.values) else self.values[0]
+
+
+# ========================================
+# ROLLUP TABLE
+# ========================================
+
+class MLTrainingRollup(Base):
+    """
+    Monthly aggregates of dropped ml_training_data partitions.
+
+    experiment_group NULL is stored as 'other' (part of the primary key).
+    """
+    __tablename__ = "ml_training_rollup"
+
+    month = Column(Date, primary_key=True)
+    model_type = Column(CodedString(MODEL_TYPES), primary_key=True)
+    experiment_group = Column(CodedString(EXPERIMENT_GROUPS), primary_key=True)
+
+    n_predictions = Column(Integer, nullable=False)
+    n_labeled = Column(Integer, nullable=False)
+    n_churned = Column(Integer, nullable=False)
+    sum_predicted_churn_prob = Column(Float, nullable=False)
+    rolled_up_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# ========================================
+# PARTITIONS (PostgreSQL)
+# ========================================
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TRAINING_TABLE}_{month:%Y_%m}"
+
+
+def partition_ddl(month: date) -> str:
+    """CREATE TABLE for one month's partition (UTC bounds)"""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {TRAINING_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+    )
+
+
+def rollup_sql(partition: str) -> str:
+    """Aggregate one partition into ml_training_rollup (idempotent)"""
+    return f"""
+        INSERT INTO ml_training_rollup (
+            month, model_type, experiment_group, n_predictions, n_labeled,
+            n_churned, sum_predicted_churn_prob, rolled_up_at
+        )
+        SELECT
+            :month, model_type, coalesce(experiment_group, 0), count(*),
+            count(*) FILTER (WHERE actual_churned IS NOT NULL),
+            count(*) FILTER (WHERE actual_churned),
+            coalesce(sum(predicted_churn_prob), 0), now()
+        FROM {partition}
+        GROUP BY model_type, coalesce(experiment_group, 0)
+        ON CONFLICT (month, model_type, experiment_group) DO UPDATE SET
+            n_predictions = excluded.n_predictions,
+            n_labeled = excluded.n_labeled,
+            n_churned = excluded.n_churned,
+            sum_predicted_churn_prob = excluded.sum_predicted_churn_prob,
+            rolled_up_at = excluded.rolled_up_at
+    """
+
+
+async def list_partitions(db: AsyncSession) -> Dict[date, str]:
+    """Month -> partition table name, oldest first (the default partition excluded)"""
+    result = await db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table"
+    ), {'table': TRAINING_TABLE})
+    partitions = {}
+    for (name,) in result:
+        match = PARTITION_NAME_PATTERN.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return dict(sorted(partitions.items()))
+
+
+async def ensure_partitions(
+    db: AsyncSession,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+    today: Optional[date] = None
+) -> List[str]:
+    """
+    Create partitions for the current month and the next `months_ahead`
+
+    Keeping them ahead of time means rows never land in the default
+    partition (which would block creating that month's partition later).
+
+    Returns:
+        Names of the partitions created
+    """
+    current = month_start(today or datetime.utcnow().date())
+    existing = await list_partitions(db)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            await db.execute(text(partition_ddl(month)))
+            created.append(partition_name(month))
+    await db.commit()
+
+    if created:
+        logger.info(f"✅ Created ml_training_data partitions: {', '.join(created)}")
+    return created
+
+
+async def rollup_expired_partitions(
+    db: AsyncSession,
+    retention_months: int = ML_TRAINING_RETENTION_MONTHS,
+    today: Optional[date] = None,
+    dry_run: bool = False
+) -> List[str]:
+    """
+    Roll up and drop partitions older than the retention window
+
+    Each month is aggregated into ml_training_rollup, detached and dropped in
+    one transaction, so a failure leaves the partition in place.
+
+    Returns:
+        Names of the partitions dropped (or that would be, with dry_run)
+    """
+    cutoff = add_months(month_start(today or datetime.utcnow().date()), -retention_months)
+    expired = {month: name for month, name in (await list_partitions(db)).items() if month < cutoff}
+    if dry_run:
+        return list(expired.values())
+
+    for month, name in expired.items():
+        await db.execute(text(rollup_sql(name)), {'month': month})
+        await db.execute(text(f"ALTER TABLE {TRAINING_TABLE} DETACH PARTITION {name}"))
+        await db.execute(text(f"DROP TABLE {name}"))
+        await db.commit()
+        logger.info(f"✅ Rolled up and dropped {name}")
+
+    return list(expired.values())
@@ -1,8 +1,87 @@
-﻿import pytest_asyncio
+﻿import pytest
+import pytest_asyncio
+from contextlib import ExitStack
+from unittest.mock import patch
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.compiler import compiles
+
 from backend.main import app
+from backend.models import User, Upload, Prediction
 
 @pytest_asyncio.fixture
 async def async_client():
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
+
+
+# =====================================================
+# TEMPORARY SQLITE DATABASE
+# =====================================================
+# session_maker gives a test its own SQLite file with the tables in
+# db_models, seeded with db_seed, and points the get_async_session names in
+# db_session_patches at it. Modules override those three fixtures (or a test
+# parametrizes them, e.g. @pytest.mark.parametrize("db_seed", [[]])).
+# sql_statements records the SQL a test sends after seeding.
+
+@compiles(UUID, "sqlite")
+def _uuid_on_sqlite(type_, compiler, **kw):
+    # predictions.id is a PostgreSQL UUID; SQLAlchemy stores it as hex on SQLite
+    return "CHAR(32)"
+
+
+@pytest.fixture
+def db_models():
+    """Models whose tables are created"""
+    return (User, Upload, Prediction)
+
+
+@pytest.fixture
+def db_seed():
+    """Rows inserted before the test (one commit, in order)"""
+    return []
+
+
+@pytest.fixture
+def db_session_patches():
+    """Module-level get_async_session names patched to the test's sessions"""
+    return ()
+
+
+@pytest_asyncio.fixture
+async def sqlite_engine(tmp_path, db_models):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    async with engine.begin() as conn:
+        for model in db_models:
+            await conn.run_sync(model.__table__.create)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session_maker(sqlite_engine, db_seed, db_session_patches):
+    maker = async_sessionmaker(sqlite_engine, class_=AsyncSession, expire_on_commit=False)
+    if db_seed:
+        async with maker() as session:
+            session.add_all(db_seed)
+            await session.commit()
+
+    with ExitStack() as patches:
+        for target in db_session_patches:
+            patches.enter_context(patch(target, maker))
+        yield maker
+
+
+@pytest.fixture
+def sql_statements(session_maker, sqlite_engine):
+    """SQL strings executed against the test database after seeding"""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(sqlite_engine.sync_engine, "before_cursor_execute", record)
@@ -19,6 +19,7 @@ Last Updated: 2025-12-02
 
 import pytest
 import time
+import asyncio
 import json
 from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from fastapi import HTTPException
@@ -26,7 +27,12 @@ from jose import jwt as jose_jwt, jwk
 from jose.exceptions import JWTError, ExpiredSignatureError, JWTClaimsError
 
 # Import modules to test
-from backend.auth.jwt_verifier import ProductionJWTVerifier, get_jwt_verifier, JWTVerificationError
+from backend.auth.jwt_verifier import (
+    ProductionJWTVerifier,
+    get_jwt_verifier,
+    get_jwt_metrics,
+    JWTVerificationError
+)
 from backend.auth.middleware import (
     get_current_user,
     _authenticate_dev_mode,
@@ -672,6 +678,180 @@ class TestPerformance:
                 
                 # Should only fetch once (rest from cache)
                 assert fetch_count[0] == 1
+    
+    @pytest.mark.asyncio
+    async def test_repeat_token_served_from_cache(self, valid_jwks_response, valid_jwt_payload):
+        """Test that a verified token skips header parsing and RS256 on repeat."""
+        with patch.dict('os.environ', {'CLERK_FRONTEND_API': 'clerk.example.com'}):
+            verifier = ProductionJWTVerifier()
+            verifier.jwks_cache = valid_jwks_response
+            verifier.jwks_last_fetched = time.time()
+            metrics = get_jwt_metrics()
+            metrics.reset()
+            
+            with patch('jose.jwt.get_unverified_header', return_value={"kid": "ins_2abc123"}) as header, \
+                 patch('jose.jwk.construct', return_value=Mock()) as construct, \
+                 patch('jose.jwt.decode', return_value=valid_jwt_payload) as decode:
+                for _ in range(5):
+                    result = await verifier.verify_token("valid.jwt.token")
+                    assert result['sub'] == valid_jwt_payload['sub']
+                
+                assert header.call_count == 1
+                assert decode.call_count == 1
+                # One construct per JWKS key, not per request
+                assert construct.call_count == len(valid_jwks_response['keys'])
+            
+            stats = metrics.get_stats()
+            assert stats['token_cache_hit_count'] == 4
+            assert stats['token_cache_miss_count'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_public_keys_rebuilt_on_jwks_refresh(self, valid_jwks_response, valid_jwt_payload):
+        """Test that the kid -> key map is rebuilt only when the JWKS changes."""
+        with patch.dict('os.environ', {'CLERK_FRONTEND_API': 'clerk.example.com'}):
+            verifier = ProductionJWTVerifier()
+            verifier.jwks_cache = valid_jwks_response
+            verifier.jwks_last_fetched = time.time()
+            
+            with patch('jose.jwt.get_unverified_header', return_value={"kid": "ins_2xyz789"}), \
+                 patch('jose.jwk.construct', return_value=Mock()) as construct, \
+                 patch('jose.jwt.decode', return_value=valid_jwt_payload):
+                await verifier.verify_token("first.jwt.token")
+                await verifier.verify_token("second.jwt.token")
+                assert construct.call_count == 2
+                
+                # Rotation: only the new key remains, cached tokens for old kids are dropped
+                verifier.jwks_cache = {"keys": [dict(valid_jwks_response['keys'][0], kid="ins_new")]}
+                with pytest.raises(JWTVerificationError, match="Signing key not found"):
+                    await verifier.verify_token("first.jwt.token")
+                assert construct.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_expired_token_not_served_from_cache(self, valid_jwks_response, valid_jwt_payload):
+        """Test that cache entries expire at the token's own exp claim."""
+        with patch.dict('os.environ', {'CLERK_FRONTEND_API': 'clerk.example.com'}):
+            verifier = ProductionJWTVerifier()
+            verifier.jwks_cache = valid_jwks_response
+            verifier.jwks_last_fetched = time.time()
+            payload = dict(valid_jwt_payload, exp=int(time.time()) - 1)
+            
+            with patch('jose.jwt.get_unverified_header', return_value={"kid": "ins_2abc123"}), \
+                 patch('jose.jwk.construct', return_value=Mock()), \
+                 patch('jose.jwt.decode', return_value=payload) as decode:
+                await verifier.verify_token("valid.jwt.token")
+                await verifier.verify_token("valid.jwt.token")
+                
+                assert decode.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_token_cache_is_bounded(self, valid_jwks_response, valid_jwt_payload):
+        """Test that the verified-token cache evicts least recently used entries."""
+        with patch.dict('os.environ', {'CLERK_FRONTEND_API': 'clerk.example.com'}):
+            verifier = ProductionJWTVerifier()
+            verifier.jwks_cache = valid_jwks_response
+            verifier.jwks_last_fetched = time.time()
+            verifier.token_cache_size = 2
+            
+            with patch('jose.jwt.get_unverified_header', return_value={"kid": "ins_2abc123"}), \
+                 patch('jose.jwk.construct', return_value=Mock()), \
+                 patch('jose.jwt.decode', return_value=valid_jwt_payload):
+                for token in ("a.jwt.token", "b.jwt.token", "c.jwt.token"):
+                    await verifier.verify_token(token)
+            
+            assert len(verifier._token_cache) == 2
+            assert verifier._token_digest("a.jwt.token") not in verifier._token_cache
+
+
+class TestBackgroundRefresh:
+    """Test background JWKS refresh and the shared HTTP client."""
+    
+    @staticmethod
+    def _http_client(jwks, fetches):
+        async def mock_get(*args, **kwargs):
+            fetches.append(time.time())
+            mock_resp = Mock()
+            mock_resp.json = Mock(return_value=jwks)
+            mock_resp.raise_for_status = Mock()
+            return mock_resp
+        
+        client = AsyncMock()
+        client.get = mock_get
+        return client
+    
+    @pytest.mark.asyncio
+    async def test_refreshes_ahead_of_expiry_with_shared_client(self, valid_jwks_response):
+        """Test that the refresher fetches before TTL expiry, reusing one client."""
+        with patch.dict('os.environ', {'CLERK_FRONTEND_API': 'clerk.example.com'}):
+            verifier = ProductionJWTVerifier()
+            verifier.jwks_cache = valid_jwks_response
+            verifier.jwks_last_fetched = time.time() - (verifier.cache_ttl - verifier.refresh_ahead)
+            fetches = []
+            client = self._http_client(valid_jwks_response, fetches)
+            
+            with patch('httpx.AsyncClient', return_value=client) as client_cls:
+                verifier.start_background_refresh()
+                await asyncio.sleep(0.05)
+                verifier._refresh_event.set()
+                await asyncio.sleep(0.05)
+                await verifier.aclose()
+            
+            assert len(fetches) == 2
+            assert client_cls.call_count == 1
+            client.aclose.assert_awaited_once()
+            assert time.time() - verifier.jwks_last_fetched < verifier.cache_ttl
+    
+    @pytest.mark.asyncio
+    async def test_expired_cache_served_without_waiting(self, valid_jwks_response):
+        """Test that request path never blocks on Clerk while the refresher runs."""
+        with patch.dict('os.environ', {'CLERK_FRONTEND_API': 'clerk.example.com'}):
+            verifier = ProductionJWTVerifier()
+            verifier.jwks_cache = valid_jwks_response
+            verifier.jwks_last_fetched = time.time() - verifier.cache_ttl - 1
+            
+            hang = asyncio.Event()
+            
+            async def slow_get(*args, **kwargs):
+                await hang.wait()
+            
+            client = AsyncMock()
+            client.get = slow_get
+            
+            with patch('httpx.AsyncClient', return_value=client):
+                verifier.start_background_refresh()
+                await asyncio.sleep(0)
+                jwks = await asyncio.wait_for(verifier.get_jwks(), timeout=0.5)
+                await verifier.aclose()
+            
+            assert jwks is valid_jwks_response
+    
+    @pytest.mark.asyncio
+    async def test_unknown_kid_requests_rate_limited_refresh(self, valid_jwks_response):
+        """Test that unknown kids fail fast and nudge the refresher at most once per interval."""
+        with patch.dict('os.environ', {'CLERK_FRONTEND_API': 'clerk.example.com'}):
+            verifier = ProductionJWTVerifier()
+            verifier.jwks_cache = valid_jwks_response
+            verifier.jwks_last_fetched = time.time()
+            fetches = []
+            
+            with patch('httpx.AsyncClient', return_value=self._http_client(valid_jwks_response, fetches)), \
+                 patch('jose.jwt.get_unverified_header', return_value={"kid": "ins_rotated"}), \
+                 patch('jose.jwk.construct', return_value=Mock()):
+                verifier.start_background_refresh()
+                for token in ("a.jwt.token", "b.jwt.token", "c.jwt.token"):
+                    with pytest.raises(JWTVerificationError, match="Signing key not found"):
+                        await verifier.verify_token(token)
+                await asyncio.sleep(0.05)
+                await verifier.aclose()
+            
+            assert len(fetches) == 1
+    
+    @pytest.mark.asyncio
+    async def test_request_refresh_without_refresher_is_noop(self):
+        """Test that scripts/tests without a running refresher never schedule fetches."""
+        with patch.dict('os.environ', {'CLERK_FRONTEND_API': 'clerk.example.com'}):
+            verifier = ProductionJWTVerifier()
+            assert verifier.request_refresh("test") is False
+            await verifier.aclose()
 
 
 # ========================================================================
@@ -0,0 +1,80 @@
+"""
+Unit tests for the async database engine configuration.
+
+Tests Cover:
+1. Engine profile (echo off, pool sizing, statement cache) for PostgreSQL
+2. Minimal configuration for SQLite (tests)
+3. Pool checkout latency and saturation metrics
+"""
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.api.database import build_engine_kwargs, InstrumentedAsyncQueuePool
+from backend.core.config import settings, DB_POOL_PROFILES
+from backend.monitoring.metrics import CloudWatchMetricsEMF
+
+
+class TestEngineProfile:
+    """Test engine keyword arguments."""
+
+    def test_postgres_profile(self):
+        kwargs = build_engine_kwargs("postgresql+asyncpg://u:p@db/retainwise")
+
+        assert kwargs["echo"] is False
+        assert kwargs["poolclass"] is InstrumentedAsyncQueuePool
+        assert kwargs["pool_size"] == settings.DB_POOL_SIZE
+        assert kwargs["max_overflow"] == settings.DB_MAX_OVERFLOW
+        assert kwargs["pool_recycle"] == settings.DB_POOL_RECYCLE
+        assert kwargs["connect_args"]["prepared_statement_cache_size"] == settings.DB_STATEMENT_CACHE_SIZE
+
+    def test_sqlite_has_no_pool_tuning(self):
+        kwargs = build_engine_kwargs("sqlite+aiosqlite:///./test.db")
+
+        assert kwargs == {"echo": False}
+
+    def test_worker_profile_is_smaller(self):
+        api, worker = DB_POOL_PROFILES["api"], DB_POOL_PROFILES["worker"]
+
+        assert worker["pool_size"] + worker["max_overflow"] < api["pool_size"] + api["max_overflow"]
+
+
+class TestPoolMetrics:
+    """Test pool checkout instrumentation."""
+
+    @pytest.fixture
+    def emf_client(self, monkeypatch):
+        CloudWatchMetricsEMF._instance = None
+        monkeypatch.setenv("FORCE_CLOUDWATCH", "true")
+        monkeypatch.setenv("CLOUDWATCH_METRICS_ENABLED", "true")
+
+        client = CloudWatchMetricsEMF()
+        with patch("backend.monitoring.metrics.get_metrics_client", return_value=client):
+            yield client
+
+        CloudWatchMetricsEMF._instance = None
+
+    @pytest.mark.asyncio
+    async def test_checkout_emits_latency_and_saturation(self, emf_client, tmp_path):
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path}/pool.db",
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=2,
+            max_overflow=2
+        )
+        await emf_client.start()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+            aggregates = {a.metric_name: a for a in emf_client._take_snapshot()}
+        finally:
+            await emf_client.stop()
+            await engine.dispose()
+
+        assert set(aggregates) == {"DBPoolCheckoutLatency", "DBPoolCheckedOut", "DBPoolSaturation"}
+        assert aggregates["DBPoolCheckedOut"].maximum == 1
+        assert aggregates["DBPoolSaturation"].maximum == 25.0
+        assert aggregates["DBPoolSaturation"].dimensions == {"Profile": settings.DB_POOL_PROFILE}
@@ -0,0 +1,164 @@
+"""
+Unit tests for SQL-side experiment statistics.
+
+Tests Cover:
+1. Segment / group / model type metrics match a row-by-row computation
+2. Calibration buckets (width_bucket) and bucketed AUC
+3. PostgreSQL SQL uses FILTER and width_bucket; the report is two queries
+4. RealDataCollector.get_experiment_statistics keeps its response shape
+"""
+
+import random
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime, timedelta
+from sklearn.metrics import roc_auc_score
+from sqlalchemy.dialects import postgresql
+
+from backend.services.data_collector import MLTrainingData, RealDataCollector
+from backend.services.experiment_analytics import (
+    auc_from_buckets, build_experiment_report, calibration_query, segment_metrics_query
+)
+
+
+def _rows(n=300, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        prob = rng.choice([0.0, 1.0, 0.5]) if i % 50 == 0 else rng.random()
+        rows.append({
+            "customer_id": f"c{i}",
+            "experiment_group": rng.choice(["control", "treatment", None]),
+            "model_type": rng.choice(["telecom", "saas_baseline"]),
+            "predicted_churn_prob": prob,
+            "actual_churned": None if i % 7 == 0 else rng.random() < prob,
+            "predicted_at": datetime(2025, 1, 1) + timedelta(days=i % 90),
+        })
+    return rows
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return _rows()
+
+
+@pytest.fixture
+def db_models():
+    return (MLTrainingData,)
+
+
+@pytest.fixture
+def db_seed(rows):
+    return [
+        MLTrainingData(features_json={}, predicted_retention_prob=1 - row["predicted_churn_prob"], **row)
+        for row in rows
+    ]
+
+
+@pytest.fixture
+def db_session_patches():
+    return ("backend.services.data_collector.get_async_session",)
+
+
+def _reference(df):
+    """Row-by-row metrics, as computed before the SQL aggregation"""
+    churned = df["actual_churned"].astype(bool)
+    correct = ((df["predicted_churn_prob"] > 0.5) & churned) | ((df["predicted_churn_prob"] <= 0.5) & ~churned)
+    return {
+        "n_predictions": len(df),
+        "actual_churn_rate": churned.mean(),
+        "avg_predicted_churn_prob": df["predicted_churn_prob"].mean(),
+        "accuracy": correct.mean(),
+    }
+
+
+def _assert_metrics(actual, expected):
+    assert actual["n_predictions"] == expected["n_predictions"]
+    for key in ("actual_churn_rate", "avg_predicted_churn_prob", "accuracy"):
+        assert actual[key] == pytest.approx(expected[key])
+
+
+class TestExperimentReport:
+    """Test the aggregated report against row-by-row metrics."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_match_rows(self, session_maker, rows):
+        labeled = pd.DataFrame([row for row in rows if row["actual_churned"] is not None])
+
+        async with session_maker() as db:
+            report = await build_experiment_report(db)
+
+        assert report["total_outcomes"] == len(labeled)
+        _assert_metrics(report["control_group"], _reference(labeled[labeled["experiment_group"] == "control"]))
+        _assert_metrics(report["by_model_type"]["telecom"], _reference(labeled[labeled["model_type"] == "telecom"]))
+        segment = next(
+            s for s in report["segments"]
+            if s["experiment_group"] == "treatment" and s["model_type"] == "saas_baseline"
+        )
+        _assert_metrics(segment, _reference(labeled[
+            (labeled["experiment_group"] == "treatment") & (labeled["model_type"] == "saas_baseline")
+        ]))
+        assert report["data_collection_days"] == (labeled["predicted_at"].max() - labeled["predicted_at"].min()).days
+
+    @pytest.mark.asyncio
+    async def test_calibration_and_auc(self, session_maker, rows):
+        labeled = pd.DataFrame([row for row in rows if row["actual_churned"] is not None])
+        buckets = np.clip(np.floor(labeled["predicted_churn_prob"] * 10).astype(int) + 1, 1, 10)
+
+        async with session_maker() as db:
+            report = await build_experiment_report(db)
+
+        overall = report["by_model_type"]
+        calibration = [b for metrics in overall.values() for b in metrics["calibration"]]
+        assert sum(b["n"] for b in calibration) == len(labeled)
+        assert all(b["range"][0] <= b["avg_predicted_churn_prob"] <= b["range"][1] for b in calibration)
+
+        telecom = labeled["model_type"] == "telecom"
+        assert overall["telecom"]["auc"] == pytest.approx(
+            roc_auc_score(labeled.loc[telecom, "actual_churned"].astype(int), buckets[telecom])
+        )
+
+    @pytest.mark.asyncio
+    async def test_two_queries(self, session_maker, sql_statements):
+        async with session_maker() as db:
+            await build_experiment_report(db)
+
+        assert len(sql_statements) == 2
+
+    def test_postgresql_sql(self):
+        segment_sql = str(segment_metrics_query().compile(dialect=postgresql.dialect()))
+        calibration_sql = str(calibration_query().compile(dialect=postgresql.dialect()))
+
+        assert "FILTER (WHERE" in segment_sql and "GROUP BY" in segment_sql
+        assert "actual_churned IS NOT NULL" in segment_sql
+        assert "width_bucket(ml_training_data.predicted_churn_prob" in calibration_sql
+
+
+class TestAucFromBuckets:
+    """Test bucketed AUC edge cases."""
+
+    def test_perfect_and_single_class(self):
+        assert auc_from_buckets([(5, 0), (5, 5)]) == 1.0
+        assert auc_from_buckets([(10, 5)]) == 0.5
+        assert auc_from_buckets([(5, 0), (3, 0)]) is None
+
+
+class TestDataCollectorStatistics:
+    """Test the collector entry point."""
+
+    @pytest.mark.asyncio
+    async def test_response_shape(self, session_maker):
+        stats = await RealDataCollector().get_experiment_statistics()
+
+        assert {"total_outcomes", "control_group", "treatment_group", "data_collection_days"} <= set(stats)
+        assert {"n_predictions", "actual_churn_rate", "avg_predicted_churn_prob", "accuracy"} <= set(
+            stats["control_group"]
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("db_seed", [[]])
+    async def test_no_data(self, session_maker):
+        stats = await RealDataCollector().get_experiment_statistics()
+
+        assert stats == {"status": "no_data", "n_outcomes": 0}
@@ -0,0 +1,99 @@
+"""
+Unit tests for the compiled Telecom inference path.
+
+Tests Cover:
+1. Compiled XGBoost predictions are identical to the DataFrame path
+2. Missing columns, unseen categories, NaN and extra columns encode the same way
+3. LogisticRegression runs as one fused matmul with the scaler folded in
+4. Models without a feature list / scaler stats keep the DataFrame path
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from dataclasses import replace
+from pathlib import Path
+from sklearn.linear_model import LogisticRegression
+
+from backend.ml.model_registry import ModelRegistry
+from backend.ml.predict import RetentionPredictor
+
+SAMPLE_DATA = Path(__file__).resolve().parents[1] / "static" / "sample_data"
+
+
+@pytest.fixture(scope="module")
+def artifact():
+    return ModelRegistry().load()
+
+
+@pytest.fixture(scope="module")
+def telecom_df():
+    return pd.read_csv(SAMPLE_DATA / "sample_telecom.csv")
+
+
+def _predict_both(artifact, df):
+    compiled = RetentionPredictor(artifact).predict(df)
+    dataframe = RetentionPredictor(artifact, fast_inference=False).predict(df)
+    return compiled, dataframe
+
+
+class TestCompiledXGBoost:
+    """Test the encoder + inplace_predict path against prepare_features."""
+
+    def test_identical_results(self, artifact, telecom_df):
+        predictor = RetentionPredictor(artifact)
+        compiled, dataframe = _predict_both(artifact, telecom_df)
+
+        assert predictor.compiled.kind == "xgboost"
+        pd.testing.assert_frame_equal(compiled, dataframe)
+
+    def test_encoder_matches_prepare_features(self, artifact, telecom_df):
+        predictor = RetentionPredictor(artifact)
+        df_cleaned = predictor.clean_data(telecom_df)
+
+        X = predictor.compiled.transform(df_cleaned)
+        X_reference, _ = predictor.prepare_features(df_cleaned)
+
+        assert X.dtype == np.float32 and X.flags["C_CONTIGUOUS"]
+        np.testing.assert_array_equal(X, X_reference.astype(np.float32))
+
+    def test_messy_input(self, artifact):
+        df = pd.DataFrame({
+            "customerID": ["a", "b", "c"],
+            "tenure": [1, 24, 60],
+            "MonthlyCharges": [29.5, np.nan, 99.0],
+            "Contract": ["Month-to-month", "Two year", "Lifetime"],
+            "gender": ["Female", None, "Other"],
+            "company_size": ["small", "large", "mid"],
+        })
+        compiled, dataframe = _predict_both(artifact, df)
+
+        pd.testing.assert_frame_equal(compiled, dataframe)
+
+
+class TestCompiledLinear:
+    """Test the fused matmul path for LogisticRegression."""
+
+    def test_matches_predict_proba(self, artifact, telecom_df):
+        reference = RetentionPredictor(artifact, fast_inference=False)
+        X_scaled, _ = reference.prepare_features(reference.clean_data(telecom_df))
+        labels = (telecom_df["tenure"] < 12).astype(int)
+        linear_artifact = replace(artifact, model=LogisticRegression(max_iter=1000).fit(X_scaled, labels))
+
+        compiled, dataframe = _predict_both(linear_artifact, telecom_df)
+
+        assert RetentionPredictor(linear_artifact).compiled.kind == "linear"
+        np.testing.assert_allclose(
+            compiled["retention_probability"], dataframe["retention_probability"], atol=1e-5
+        )
+
+
+class TestUnsupported:
+    """Test the DataFrame fallback."""
+
+    def test_legacy_artifact_not_compiled(self, artifact, telecom_df):
+        legacy = replace(artifact, feature_names=None, scaler_mean=None, scaler_scale=None)
+        predictor = RetentionPredictor(legacy)
+
+        assert predictor.compiled is None
+        assert len(predictor.predict(telecom_df)) == len(telecom_df)
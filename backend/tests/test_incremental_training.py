@@ -0,0 +1,204 @@
+"""
+Unit tests for streaming exports and incremental retraining.
+
+Tests Cover:
+1. Labeled MLTrainingData rows stream to one partition per outcome month
+2. Re-exporting rewrites only the newest month; unlabeled rows are skipped
+3. Parquet parts (mixed-type feature columns) and the .csv.gz fallback
+4. Only closed months after trained_through are picked up
+5. XGBoost continued boosting and LogisticRegression warm start
+6. Mixed-type numeric features stay numeric through export and retraining
+"""
+
+import os
+import pandas as pd
+import pytest
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from backend.ml.model_registry import ModelRegistry
+from backend.ml.training_runner import (
+    closed_partitions, continue_training, current_month, encode_training_frame, list_partitions,
+    load_partitions
+)
+from backend.services.data_collector import MLTrainingData, RealDataCollector
+
+TELCO_CSV = Path(__file__).resolve().parents[1] / "ml" / "data" / "WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+
+def _record(customer_id, outcome_at, churned):
+    return MLTrainingData(
+        customer_id=customer_id, features_json={"customerID": customer_id, "tenure": 3},
+        predicted_churn_prob=0.7, predicted_retention_prob=0.3, model_type="telecom",
+        experiment_group="control", actual_churned=churned, outcome_recorded_at=outcome_at,
+        predicted_at=datetime(2025, 1, 1)
+    )
+
+
+@pytest.fixture
+def db_models():
+    return (MLTrainingData,)
+
+
+@pytest.fixture
+def db_seed():
+    return [
+        _record("a", datetime(2025, 1, 10), True),
+        _record("b", datetime(2025, 1, 20), False),
+        _record("c", datetime(2025, 1, 31, 23, 59), False),
+        _record("d", datetime(2025, 2, 3), True),
+        _record("e", None, None),
+    ]
+
+
+@pytest.fixture
+def db_session_patches():
+    return ("backend.services.data_collector.get_async_session",)
+
+
+@pytest.fixture(scope="module")
+def telco_export():
+    df = pd.read_csv(TELCO_CSV).head(400)
+    return df.assign(Churn=(df["Churn"] == "Yes").astype(int), model_type_used="telecom")
+
+
+class TestPartitionedExport:
+    """Test the streaming month-partitioned export."""
+
+    @pytest.mark.asyncio
+    async def test_rows_partitioned_by_outcome_month(self, session_maker, tmp_path):
+        written = await RealDataCollector().export_training_partitions(tmp_path / "parts", chunk_rows=2)
+
+        assert [path.name for path in written] == ["month=2025-01", "month=2025-02"]
+        january = load_partitions([written[0]])
+        assert sorted(january["customerID"]) == ["a", "b", "c"]
+        assert sorted(january["Churn"]) == [0, 0, 1]
+        assert len(list(written[0].iterdir())) == 2  # 3 rows, 2 per part
+        assert not list((tmp_path / "parts").glob("*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_reexport_rewrites_latest_month_only(self, session_maker, tmp_path):
+        collector = RealDataCollector()
+        await collector.export_training_partitions(tmp_path / "parts")
+        january_part = next((tmp_path / "parts" / "month=2025-01").iterdir())
+        os.utime(january_part, (0, 0))
+
+        async with session_maker() as session:
+            session.add(_record("f", datetime(2025, 2, 20), False))
+            await session.commit()
+        written = await collector.export_training_partitions(tmp_path / "parts")
+
+        assert [path.name for path in written] == ["month=2025-02"]
+        assert january_part.stat().st_mtime == 0
+        assert sorted(load_partitions(written)["customerID"]) == ["d", "f"]
+
+    @pytest.mark.asyncio
+    async def test_parquet_parts_with_mixed_feature_types(self, session_maker, tmp_path):
+        async with session_maker() as session:
+            for customer_id, total_charges in (("g", "29.85"), ("h", 1889.5), ("i", None)):
+                record = _record(customer_id, datetime(2025, 3, 5), False)
+                record.features_json = {"customerID": customer_id, "TotalCharges": total_charges}
+                session.add(record)
+            await session.commit()
+
+        written = await RealDataCollector().export_training_partitions(tmp_path / "parts", since_month="2025-03")
+
+        parts = list(written[0].iterdir())
+        assert [part.suffix for part in parts] == [".parquet"]
+        march = load_partitions(written).sort_values("customerID")
+        assert march["TotalCharges"].tolist()[:2] == ["29.85", "1889.5"]
+        assert march["TotalCharges"].isna().tolist() == [False, False, True]
+
+    @pytest.mark.asyncio
+    async def test_csv_fallback_without_pyarrow(self, session_maker, tmp_path):
+        with patch("backend.services.data_collector._parquet_available", return_value=False):
+            written = await RealDataCollector().export_training_partitions(tmp_path / "parts")
+
+        assert {part.name for part in written[0].iterdir()} == {"part-00000.csv.gz"}
+        assert sorted(load_partitions(written[:1])["customerID"]) == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_export_training_data_streams(self, session_maker):
+        df = await RealDataCollector().export_training_data(min_outcomes=4)
+
+        assert len(df) == 4
+        assert set(df.columns) >= {"Churn", "predicted_churn_prob", "model_type_used", "experiment_group"}
+        assert await RealDataCollector().export_training_data(min_outcomes=5) is None
+
+
+class TestClosedPartitions:
+    """Test which months incremental training picks up."""
+
+    def test_open_month_and_trained_months_skipped(self, tmp_path):
+        for month in ("2025-01", "2025-02", current_month()):
+            (tmp_path / f"month={month}").mkdir()
+        (tmp_path / "month=2025-03.tmp").mkdir()
+
+        assert list(closed_partitions(tmp_path)) == ["2025-01", "2025-02"]
+        assert list(closed_partitions(tmp_path, after="2025-01")) == ["2025-02"]
+        assert current_month() in list_partitions(tmp_path)
+
+
+class TestContinueTraining:
+    """Test incremental model updates."""
+
+    @pytest.fixture(scope="class")
+    def artifact(self):
+        return ModelRegistry().load()
+
+    def test_xgboost_adds_rounds(self, artifact, telco_export):
+        rounds_before = artifact.model.get_booster().num_boosted_rounds()
+
+        updated = continue_training(artifact, telco_export, n_estimators=10)
+
+        assert updated.get_booster().num_boosted_rounds() == rounds_before + 10
+        assert artifact.model.get_booster().num_boosted_rounds() == rounds_before
+
+    def test_logistic_warm_start(self, artifact, telco_export):
+        X, y = encode_training_frame(telco_export)
+        X = X.reindex(columns=artifact.feature_names, fill_value=0).to_numpy(dtype=float)
+        base = LogisticRegression(max_iter=1000).fit((X - artifact.scaler_mean) / artifact.scaler_scale, y)
+        coef_before = base.coef_.copy()
+
+        updated = continue_training(replace(artifact, model=base), telco_export.tail(100), max_iter=5)
+
+        assert updated is not base
+        assert updated.n_iter_[0] <= 5
+        assert (base.coef_ == coef_before).all()
+        assert not (updated.coef_ == coef_before).all()
+
+    def test_unsupported_model(self, artifact, telco_export):
+        forest = replace(artifact, model=RandomForestClassifier())
+
+        with pytest.raises(ValueError, match="retrain fully"):
+            continue_training(forest, telco_export)
+
+    @pytest.mark.asyncio
+    async def test_mixed_type_numeric_feature_round_trip(self, artifact, telco_export, session_maker, tmp_path):
+        rows = telco_export.head(40).drop(columns=["Churn", "model_type_used"]).to_dict("records")
+        async with session_maker() as session:
+            for i, features in enumerate(rows):
+                # Half the uploads sent tenure as a string
+                features["tenure"] = str(features["tenure"]) if i % 2 else int(features["tenure"])
+                record = _record(features["customerID"], datetime(2025, 3, 5), i % 3 == 0)
+                record.features_json = features
+                session.add(record)
+            await session.commit()
+
+        written = await RealDataCollector().export_training_partitions(tmp_path / "parts", since_month="2025-03")
+        march = load_partitions(written).set_index("customerID").loc[[row["customerID"] for row in rows]]
+        X, _ = encode_training_frame(march.reset_index())
+
+        assert X["tenure"].tolist() == [int(row["tenure"]) for row in rows]
+        assert not [column for column in X.columns if column.startswith("tenure_")]
+
+        X_model = X.reindex(columns=artifact.feature_names, fill_value=0).to_numpy(dtype=float)
+        base = LogisticRegression(max_iter=1000).fit(
+            (X_model - artifact.scaler_mean) / artifact.scaler_scale, [i % 3 == 0 for i in range(40)]
+        )
+        updated = continue_training(replace(artifact, model=base), march.reset_index(), max_iter=5)
+        assert updated.coef_.shape == base.coef_.shape
@@ -0,0 +1,88 @@
+"""
+Unit tests for request input validation.
+
+Tests Cover:
+1. Combined regex flags the same values as the individual patterns
+2. Threat classification (SQL injection vs XSS)
+3. Typed query parameters are left to FastAPI; string ones are still scanned
+"""
+
+import re
+import uuid
+import pytest
+from enum import Enum
+from typing import List, Optional
+from fastapi import FastAPI, Query
+from httpx import AsyncClient
+
+from backend.middleware import input_validator as validator_module
+from backend.middleware.input_validator import InputValidator, input_validation_middleware
+
+SAMPLES = [
+    "", "42", "created_at", "user_2abcDEF123", "a=b", "it's fine",
+    "SELECT", "selected", "x OR 1=1", "1' OR '1'='1", "'; --", "a'; drop--",
+    "<script>alert(1)</script>", "<SCRIPT src=x>", "javascript:void(0)",
+    "img onerror = x", "<iframe src=x>", "union all", "mailto:a@b.c",
+]
+
+
+class Mode(str, Enum):
+    fast = "fast"
+    slow = "slow"
+
+
+class TestInputValidator:
+    """Test the precompiled validator."""
+
+    @pytest.mark.parametrize("value", SAMPLES)
+    def test_matches_individual_patterns(self, value):
+        expected = not any(
+            re.search(p, value, re.IGNORECASE)
+            for p in InputValidator.SQL_PATTERNS + InputValidator.XSS_PATTERNS
+        )
+        assert InputValidator.validate_input(value) is expected
+
+    def test_threat_classification(self):
+        assert InputValidator.find_threat("1 UNION 2") == "SQL injection"
+        assert InputValidator.find_threat("1' OR '1'='1") == "SQL injection"
+        assert InputValidator.find_threat("<iframe src=x>") == "XSS"
+        assert InputValidator.find_threat("plain text") is None
+
+
+@pytest.fixture
+def app():
+    validator_module._typed_params_cache.clear()
+    app = FastAPI()
+    app.middleware("http")(input_validation_middleware)
+
+    @app.get("/typed")
+    async def typed(limit: int = 10, ids: Optional[List[uuid.UUID]] = Query(None), mode: Mode = Mode.fast):
+        return {"ok": True}
+
+    @app.get("/text")
+    async def text(q: Optional[str] = None):
+        return {"ok": True}
+
+    return app
+
+
+class TestMiddleware:
+    """Test the validation middleware."""
+
+    @pytest.mark.asyncio
+    async def test_string_params_scanned(self, app):
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/text", params={"q": "1 UNION SELECT"})
+            undeclared = await client.get("/typed", params={"extra": "<script>x</script>"})
+
+        assert response.status_code == 400
+        assert undeclared.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_typed_params_left_to_fastapi(self, app):
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/typed", params={"limit": "1 OR 1=1", "mode": "DROP"})
+
+        # FastAPI rejects the values as the wrong type rather than as an attack
+        assert response.status_code == 422
+        assert validator_module._typed_params_cache[("GET", "/typed")] == {"limit", "ids", "mode"}
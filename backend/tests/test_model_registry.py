@@ -0,0 +1,140 @@
+"""
+Unit tests for the model registry and model hot-swap.
+
+Tests Cover:
+1. Register/load round trip (UBJSON model, feature order, scaler stats)
+2. Hash verification, MODEL_VERSION pinning and the legacy pickle fallback
+3. The bundled manifest serves the same model as the legacy pickle
+4. PredictionRouter swaps models atomically and keeps the old one on failure
+"""
+
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from pathlib import Path
+from sklearn.preprocessing import StandardScaler
+
+from backend.ml import model_registry
+from backend.ml.model_registry import ModelRegistry, ModelIntegrityError
+from backend.services import prediction_router
+from backend.services.prediction_router import PredictionRouter
+
+FEATURES = ["tenure", "MonthlyCharges", "TotalCharges"]
+SAMPLE_DATA = Path(__file__).resolve().parents[1] / "static" / "sample_data"
+
+
+def _train(seed: int):
+    rng = np.random.RandomState(seed)
+    X = pd.DataFrame(rng.rand(200, len(FEATURES)) * [72, 120, 8000], columns=FEATURES)
+    y = (X["tenure"] < 20).astype(int)
+    scaler = StandardScaler().fit(X)
+    model = xgb.XGBClassifier(n_estimators=5, max_depth=2, random_state=seed)
+    model.fit(scaler.transform(X), y)
+    return model, scaler, X
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.delenv("MODEL_VERSION", raising=False)
+    registry = ModelRegistry(tmp_path)
+    monkeypatch.setattr(model_registry, "_registry_instance", registry)
+    return registry
+
+
+class TestRegistry:
+    """Test manifest registration and loading."""
+
+    def test_round_trip(self, registry):
+        model, scaler, X = _train(0)
+        entry = registry.register(model, "v1", FEATURES, scaler=scaler)
+
+        artifact = registry.load()
+        assert entry["format"] == "ubj"
+        assert artifact.version == "v1"
+        assert artifact.feature_names == FEATURES
+        np.testing.assert_allclose(artifact.scaler_mean, scaler.mean_)
+        np.testing.assert_allclose(
+            artifact.model.predict_proba(scaler.transform(X)),
+            model.predict_proba(scaler.transform(X)),
+            rtol=1e-6
+        )
+
+    def test_activate_and_pin(self, registry, monkeypatch):
+        registry.register(_train(0)[0], "v1", FEATURES)
+        registry.register(_train(1)[0], "v2", FEATURES, activate=False)
+        assert registry.load().version == "v1"
+
+        registry.activate("v2")
+        assert registry.load().version == "v2"
+
+        monkeypatch.setenv("MODEL_VERSION", "v1")
+        assert registry.load().version == "v1"
+
+        with pytest.raises(FileNotFoundError):
+            registry.activate("v3")
+
+    def test_hash_mismatch(self, registry):
+        entry = registry.register(_train(0)[0], "v1", FEATURES)
+        (registry.model_dir / entry["artifact"]).write_bytes(b"{}")
+
+        with pytest.raises(ModelIntegrityError):
+            registry.load()
+
+    def test_scaler_feature_order_checked(self, registry):
+        model, scaler, _ = _train(0)
+        with pytest.raises(ValueError):
+            registry.register(model, "v1", list(reversed(FEATURES)), scaler=scaler)
+
+    def test_legacy_fallback(self, registry):
+        model, _, _ = _train(0)
+        with open(registry.model_dir / "best_retention_model_20250101_000000.pkl", "wb") as f:
+            pickle.dump(model, f)
+
+        artifact = registry.load()
+        assert artifact.version == "20250101_000000"
+        assert artifact.feature_names is None
+
+
+class TestBundledModel:
+    """Test the manifest shipped in backend/ml/models."""
+
+    def test_matches_legacy_pickle(self):
+        registry = ModelRegistry()
+        artifact = registry.load()
+        legacy = registry.load_legacy()
+
+        X = np.random.RandomState(0).randn(50, len(artifact.feature_names))
+        assert len(artifact.feature_names) == 45
+        assert artifact.has_scaler
+        np.testing.assert_allclose(artifact.model.predict_proba(X), legacy.model.predict_proba(X), rtol=1e-6)
+
+
+class TestHotSwap:
+    """Test PredictionRouter model reloads."""
+
+    @pytest.fixture
+    def router(self, registry, monkeypatch):
+        monkeypatch.setattr(prediction_router, "MODEL_RELOAD_INTERVAL_SECONDS", 0)
+        registry.register(_train(0)[0], "v1", FEATURES)
+        return PredictionRouter()
+
+    def test_swaps_on_manifest_change(self, router, registry):
+        df = pd.read_csv(SAMPLE_DATA / "sample_telecom.csv").head(5)
+        in_flight = router.telecom_model
+
+        assert router.maybe_reload_model() is False
+        registry.register(_train(1)[0], "v2", FEATURES)
+        assert router.maybe_reload_model() is True
+
+        assert in_flight.model_version == "v1"
+        assert router.telecom_model.model_version == "v2"
+        assert router.route_batch(df, force_group="control").model_version == "v2"
+
+    def test_failed_load_keeps_current(self, router, registry):
+        entry = registry.register(_train(1)[0], "v2", FEATURES)
+        (registry.model_dir / entry["artifact"]).write_bytes(b"{}")
+
+        assert router.maybe_reload_model() is False
+        assert router.telecom_model.model_version == "v1"
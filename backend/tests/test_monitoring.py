@@ -3,6 +3,7 @@ Unit tests for CloudWatch metrics client.
 
 Tests Cover:
 1. Async wrapper (non-blocking behavior)
+   and in-process aggregation (counters, gauges, histograms)
 2. EMF format generation
 3. PII hashing and sanitization
 4. Dimension cardinality control
@@ -22,6 +23,8 @@ from backend.monitoring.metrics import (
     get_metrics_client,
     MetricUnit,
     MetricNamespace,
+    COUNTER,
+    _Aggregate,
     _SyncEMFBackend
 )
 
@@ -80,7 +83,7 @@ class TestCloudWatchMetricsEMF:
         
         # Start client
         await client.start()
-        assert client._queue is not None
+        assert client._running is True
         assert client._background_task is not None
         
         # Stop client (with timeout to prevent hanging)
@@ -94,8 +97,8 @@ class TestCloudWatchMetricsEMF:
         assert result is False
     
     @pytest.mark.asyncio
-    async def test_put_metric_queues_when_enabled(self, monkeypatch):
-        """put_metric should queue metrics when enabled."""
+    async def test_put_metric_records_when_enabled(self, monkeypatch):
+        """put_metric should record metrics when enabled."""
         CloudWatchMetricsEMF._instance = None
         monkeypatch.setenv("ENVIRONMENT", "test")
         monkeypatch.setenv("FORCE_CLOUDWATCH", "true")
@@ -109,15 +112,13 @@ class TestCloudWatchMetricsEMF:
             result = await client.put_metric("TestMetric", 42, MetricUnit.COUNT)
             
             assert result is True
-            # Note: Background task may consume metric, so we just verify it was queued
-            # The fact that put_metric returned True means it was successfully queued
         
         finally:
             await asyncio.wait_for(client.stop(), timeout=3.0)
     
     @pytest.mark.asyncio
-    async def test_backpressure_when_queue_full(self, monkeypatch):
-        """Should drop metrics when queue is full (backpressure)."""
+    async def test_repeated_metric_aggregates_to_one_key(self, monkeypatch):
+        """Repeated submissions for one key update a single aggregate."""
         CloudWatchMetricsEMF._instance = None
         monkeypatch.setenv("ENVIRONMENT", "test")
         monkeypatch.setenv("FORCE_CLOUDWATCH", "true")
@@ -127,25 +128,59 @@ class TestCloudWatchMetricsEMF:
         await client.start()
         
         try:
-            # Stop background task to prevent it from consuming metrics
-            if client._background_task:
-                client._background_task.cancel()
-                try:
-                    await client._background_task
-                except asyncio.CancelledError:
-                    pass
-            
-            # Fill queue to max capacity (1000)
             for i in range(1000):
-                await asyncio.wait_for(client._queue.put({'metric': i}), timeout=0.1)
+                await client.put_metric("TestMetric", i, MetricUnit.COUNT)
             
-            # Queue is full - next put_metric should return False
-            result = await asyncio.wait_for(
-                client.put_metric("TestMetric", 999, MetricUnit.COUNT),
-                timeout=1.0
-            )
+            assert len(client._aggregates) == 1
+            aggregate = next(iter(client._aggregates.values()))
+            assert aggregate.count == 1000
+            assert aggregate.total == sum(range(1000))
+            assert aggregate.minimum == 0
+            assert aggregate.maximum == 999
+            assert sum(aggregate.bucket_counts) == 1000
+        
+        finally:
+            await asyncio.wait_for(client.stop(), timeout=3.0)
+    
+    @pytest.mark.asyncio
+    async def test_key_limit_drops_new_keys(self, monkeypatch):
+        """New keys beyond max_keys are dropped (cardinality guard)."""
+        CloudWatchMetricsEMF._instance = None
+        monkeypatch.setenv("ENVIRONMENT", "test")
+        monkeypatch.setenv("FORCE_CLOUDWATCH", "true")
+        monkeypatch.setenv("CLOUDWATCH_METRICS_ENABLED", "true")
+        
+        client = CloudWatchMetricsEMF()
+        client.max_keys = 2
+        await client.start()
+        
+        try:
+            assert client.increment("A") is True
+            assert client.increment("B") is True
+            assert client.increment("C") is False
+            # Existing keys still update
+            assert client.increment("A") is True
+        
+        finally:
+            await asyncio.wait_for(client.stop(), timeout=3.0)
+    
+    @pytest.mark.asyncio
+    async def test_gauge_reports_statistic_set(self, monkeypatch):
+        """Gauges aggregate to Min/Max/Sum/Count."""
+        CloudWatchMetricsEMF._instance = None
+        monkeypatch.setenv("ENVIRONMENT", "test")
+        monkeypatch.setenv("FORCE_CLOUDWATCH", "true")
+        monkeypatch.setenv("CLOUDWATCH_METRICS_ENABLED", "true")
+        
+        client = CloudWatchMetricsEMF()
+        await client.start()
+        
+        try:
+            for value in (2, 8, 5):
+                client.set_gauge("PoolCheckedOut", value, namespace=MetricNamespace.DATABASE)
             
-            assert result is False  # Dropped due to backpressure
+            aggregate = next(iter(client._aggregates.values()))
+            assert aggregate.emf_value() == {"Max": 8.0, "Min": 2.0, "Count": 3, "Sum": 15.0}
         
         finally:
             await asyncio.wait_for(client.stop(), timeout=3.0)
@@ -162,25 +197,14 @@ class TestCloudWatchMetricsEMF:
         await client.start()
         
         try:
-            # Stop background task to prevent it from consuming metrics
-            if client._background_task:
-                client._background_task.cancel()
-                try:
-                    await client._background_task
-                except asyncio.CancelledError:
-                    pass
-            
-            result = await asyncio.wait_for(
-                client.increment_counter("PageView"),
-                timeout=1.0
-            )
+            await asyncio.wait_for(client.increment_counter("PageView"), timeout=1.0)
+            await asyncio.wait_for(client.increment_counter("PageView"), timeout=1.0)
             
-            # Verify metric was queued (background task stopped, so it should still be there)
-            assert client._queue.qsize() > 0
-            metric = await asyncio.wait_for(client._queue.get(), timeout=1.0)
-            assert metric['metric_name'] == "PageView"
-            assert metric['value'] == 1.0
-            assert metric['unit'] == MetricUnit.COUNT.value
+            aggregate = next(iter(client._aggregates.values()))
+            assert aggregate.metric_name == "PageView"
+            assert aggregate.unit == MetricUnit.COUNT.value
+            # Counters emit the interval sum as a plain number
+            assert aggregate.emf_value() == 2.0
         
         finally:
             await asyncio.wait_for(client.stop(), timeout=3.0)
@@ -197,25 +221,21 @@ class TestCloudWatchMetricsEMF:
         await client.start()
         
         try:
-            # Stop background task to prevent it from consuming metrics
-            if client._background_task:
-                client._background_task.cancel()
-                try:
-                    await client._background_task
-                except asyncio.CancelledError:
-                    pass
+            await asyncio.wait_for(client.record_time("APILatency", 1.25), timeout=1.0)
+            await asyncio.wait_for(client.record_time("APILatency", 0.75), timeout=1.0)
             
-            result = await asyncio.wait_for(
-                client.record_time("APILatency", 1.25),
-                timeout=1.0
-            )
+            aggregate = next(iter(client._aggregates.values()))
+            assert aggregate.metric_name == "APILatency"
+            assert aggregate.unit == MetricUnit.SECONDS.value
             
-            # Verify metric was queued (background task stopped, so it should still be there)
-            assert client._queue.qsize() > 0
-            metric = await asyncio.wait_for(client._queue.get(), timeout=1.0)
-            assert metric['metric_name'] == "APILatency"
-            assert metric['value'] == 1.25
-            assert metric['unit'] == MetricUnit.SECONDS.value
+            # Histograms emit a statistic set plus bucketed values
+            value = aggregate.emf_value()
+            assert value["Count"] == 2
+            assert value["Sum"] == 2.0
+            assert value["Min"] == 0.75
+            assert value["Max"] == 1.25
+            assert value["Values"] == [0.75, 1.25]
+            assert value["Counts"] == [1, 1]
         
         finally:
             await asyncio.wait_for(client.stop(), timeout=3.0)
@@ -231,124 +251,54 @@ class TestSyncEMFBackend:
     
     def test_sanitize_user_id_to_bucket(self, backend):
         """User IDs should be hashed to 256 buckets (00-FF)."""
-        metric = {
-            'metric_name': 'TestMetric',
-            'value': 1.0,
-            'dimensions': {'UserId': 'user_12345'}
-        }
-        
-        sanitized = backend._sanitize_metric(metric)
+        sanitized = backend._sanitize_dimensions({'UserId': 'user_12345'})
         
         # UserBucket should be 2-char hex (00-FF)
-        assert 'UserBucket' in sanitized['dimensions']
-        assert 'UserId' not in sanitized['dimensions']  # Original removed
-        assert len(sanitized['dimensions']['UserBucket']) == 2
-        assert all(c in '0123456789abcdef' for c in sanitized['dimensions']['UserBucket'])
+        assert 'UserBucket' in sanitized
+        assert 'UserId' not in sanitized  # Original removed
+        assert len(sanitized['UserBucket']) == 2
+        assert all(c in '0123456789abcdef' for c in sanitized['UserBucket'])
     
     def test_remove_high_cardinality_dimensions(self, backend):
         """High-cardinality dimensions should be excluded."""
-        metric = {
-            'metric_name': 'TestMetric',
-            'value': 1.0,
-            'dimensions': {
-                'UploadId': 'upload_12345',  # Should be removed
-                'RequestId': 'req_67890',    # Should be removed
-                'ValidDimension': 'keep_me'
-            }
-        }
-        
-        sanitized = backend._sanitize_metric(metric)
-        
-        assert 'UploadId' not in sanitized['dimensions']
-        assert 'RequestId' not in sanitized['dimensions']
-        assert 'ValidDimension' in sanitized['dimensions']
+        sanitized = backend._sanitize_dimensions({
+            'UploadId': 'upload_12345',  # Should be removed
+            'RequestId': 'req_67890',    # Should be removed
+            'ValidDimension': 'keep_me'
+        })
+        
+        assert 'UploadId' not in sanitized
+        assert 'RequestId' not in sanitized
+        assert 'ValidDimension' in sanitized
     
     def test_sanitize_file_name_to_extension(self, backend):
         """File names should be reduced to extension only (PII protection)."""
-        metric = {
-            'metric_name': 'TestMetric',
-            'value': 1.0,
-            'dimensions': {
-                'FileName': 'sensitive_customer_data_2025.csv'
-            }
-        }
-        
-        sanitized = backend._sanitize_metric(metric)
-        
-        assert 'FileName' not in sanitized['dimensions']
-        assert 'FileType' in sanitized['dimensions']
-        assert sanitized['dimensions']['FileType'] == 'csv'
+        sanitized = backend._sanitize_dimensions({'FileName': 'sensitive_customer_data_2025.csv'})
+        
+        assert 'FileName' not in sanitized
+        assert 'FileType' in sanitized
+        assert sanitized['FileType'] == 'csv'
     
     def test_limit_dimensions_to_10(self, backend):
         """Should truncate to max 10 dimensions (CloudWatch limit)."""
-        metric = {
-            'metric_name': 'TestMetric',
-            'value': 1.0,
-            'dimensions': {f'dim{i}': f'value{i}' for i in range(15)}
-        }
-        
-        sanitized = backend._sanitize_metric(metric)
+        sanitized = backend._sanitize_dimensions({f'dim{i}': f'value{i}' for i in range(15)})
         
-        assert len(sanitized['dimensions']) <= 10
+        assert len(sanitized) <= 10
     
     def test_sanitize_special_characters(self, backend):
         """Special characters should be removed from dimension values, but hyphens preserved."""
-        metric = {
-            'metric_name': 'TestMetric',
-            'value': 1.0,
-            'dimensions': {
-                'Environment': 'prod@us-east-1#123'
-            }
-        }
-        
-        sanitized = backend._sanitize_metric(metric)
+        sanitized = backend._sanitize_dimensions({'Environment': 'prod@us-east-1#123'})
         
         # Only alphanumeric, underscores, hyphens, dots allowed
         # Hyphens are preserved (safe and commonly used in identifiers like "us-east-1")
-        assert sanitized['dimensions']['Environment'] == 'produs-east-1123'
-    
-    def test_group_metrics_by_namespace_and_dimensions(self, backend):
-        """Metrics should be grouped by namespace and dimensions for EMF."""
-        batch = [
-            {
-                'metric_name': 'Metric1',
-                'value': 1.0,
-                'unit': 'Count',
-                'namespace': 'Test',
-                'dimensions': {'env': 'prod'}
-            },
-            {
-                'metric_name': 'Metric2',
-                'value': 2.0,
-                'unit': 'Count',
-                'namespace': 'Test',
-                'dimensions': {'env': 'prod'}
-            }
-        ]
-        
-        emf_batches = backend._group_metrics(batch)
-        
-        # Should be grouped into single EMF structure
-        assert len(emf_batches) == 1
-        assert '_aws' in emf_batches[0]
-        assert 'Metric1' in emf_batches[0]
-        assert 'Metric2' in emf_batches[0]
-        assert emf_batches[0]['env'] == 'prod'
+        assert sanitized['Environment'] == 'produs-east-1123'
     
     def test_emf_format_structure(self, backend):
         """EMF format should match CloudWatch specification."""
-        batch = [
-            {
-                'metric_name': 'TestMetric',
-                'value': 42.0,
-                'unit': 'Count',
-                'namespace': 'RetainWise/Test',
-                'dimensions': {'env': 'test'}
-            }
-        ]
-        
-        emf_batches = backend._group_metrics(batch)
-        emf_data = emf_batches[0]
+        aggregate = _Aggregate(COUNTER, 'RetainWise/Test', 'TestMetric', 'Count', {'env': 'test'})
+        aggregate.add(42.0)
+        
+        emf_data = backend._build_aggregate_documents([aggregate])[0]
         
         # Verify EMF structure
         assert '_aws' in emf_data
@@ -367,19 +317,12 @@ class TestSyncEMFBackend:
         assert emf_data['env'] == 'test'
     
     @patch('builtins.print')
-    def test_flush_batch_prints_emf_json(self, mock_print, backend):
-        """flush_batch should print EMF JSON to stdout."""
-        batch = [
-            {
-                'metric_name': 'TestMetric',
-                'value': 1.0,
-                'unit': 'Count',
-                'namespace': 'Test',
-                'dimensions': {}
-            }
-        ]
-        
-        backend.flush_batch(batch)
+    def test_flush_aggregates_prints_emf_json(self, mock_print, backend):
+        """flush_aggregates should print EMF JSON to stdout."""
+        aggregate = _Aggregate(COUNTER, 'Test', 'TestMetric', 'Count', {})
+        aggregate.add(1.0)
+        
+        backend.flush_aggregates([aggregate])
         
         # Verify print was called
         mock_print.assert_called_once()
@@ -393,7 +336,7 @@ class TestSyncEMFBackend:
     
     def test_flush_empty_batch_does_nothing(self, backend):
         """Flushing an empty batch should be a no-op."""
-        backend.flush_batch([])  # Should not raise exception
+        backend.flush_aggregates([])  # Should not raise exception
 
 
 class TestIntegration:
@@ -408,30 +351,36 @@ class TestIntegration:
         monkeypatch.setenv("CLOUDWATCH_METRICS_ENABLED", "true")
         
         client = CloudWatchMetricsEMF()
-        client.batch_size = 1  # Flush immediately for testing
         
         await client.start()
         
         try:
             # Submit metric
-            result = await asyncio.wait_for(
-                client.put_metric(
-                    "TestMetric",
-                    42,
-                    MetricUnit.COUNT,
-                    namespace=MetricNamespace.ML_PIPELINE,
-                    dimensions={"env": "test"}
-                ),
-                timeout=1.0
-            )
-            
-            assert result is True
+            for _ in range(3):
+                result = await asyncio.wait_for(
+                    client.put_metric(
+                        "TestMetric",
+                        42,
+                        MetricUnit.COUNT,
+                        namespace=MetricNamespace.ML_PIPELINE,
+                        dimensions={"env": "test"}
+                    ),
+                    timeout=1.0
+                )
+                assert result is True
             
-            # Wait briefly for background task to process (with timeout)
-            await asyncio.wait_for(asyncio.sleep(0.2), timeout=1.0)
+            await asyncio.wait_for(client.flush(), timeout=1.0)
         
         finally:
             await asyncio.wait_for(client.stop(), timeout=2.0)
+        
+        # One EMF document for the key, carrying a statistic set
+        lines = [line for line in capsys.readouterr().out.splitlines() if '"_aws"' in line]
+        assert len(lines) == 1
+        document = json.loads(lines[0])
+        assert document["env"] == "test"
+        assert document["TestMetric"]["Count"] == 3
+        assert document["TestMetric"]["Sum"] == 126.0
     
     @pytest.mark.asyncio
     async def test_concurrent_metric_submissions(self, monkeypatch):
@@ -445,14 +394,6 @@ class TestIntegration:
         await client.start()
         
         try:
-            # Stop background task to prevent it from consuming metrics
-            if client._background_task:
-                client._background_task.cancel()
-                try:
-                    await client._background_task
-                except asyncio.CancelledError:
-                    pass
-            
             # Submit 100 metrics concurrently (with timeout)
             tasks = [
                 asyncio.wait_for(
@@ -466,8 +407,8 @@ class TestIntegration:
             
             # All should succeed (no race conditions)
             assert all(results)
-            # Background task stopped, so all metrics should still be in queue
-            assert client._queue.qsize() == 100
+            # One aggregate per distinct metric name
+            assert len(client._aggregates) == 100
         
         finally:
             await asyncio.wait_for(client.stop(), timeout=2.0)
@@ -483,13 +424,8 @@ class TestCostOptimizations:
         # Hash 1000 different user IDs
         buckets = set()
         for i in range(1000):
-            metric = {
-                'metric_name': 'Test',
-                'value': 1.0,
-                'dimensions': {'UserId': f'user_{i}'}
-            }
-            sanitized = backend._sanitize_metric(metric)
-            buckets.add(sanitized['dimensions']['UserBucket'])
+            sanitized = backend._sanitize_dimensions({'UserId': f'user_{i}'})
+            buckets.add(sanitized['UserBucket'])
         
         # Should be limited to 256 buckets (00-FF in hex)
         assert len(buckets) <= 256
@@ -501,13 +437,8 @@ class TestCostOptimizations:
         # 1000 different file names with same extension
         extensions = set()
         for i in range(1000):
-            metric = {
-                'metric_name': 'Test',
-                'value': 1.0,
-                'dimensions': {'FileName': f'unique_file_name_{i}.csv'}
-            }
-            sanitized = backend._sanitize_metric(metric)
-            extensions.add(sanitized['dimensions']['FileType'])
+            sanitized = backend._sanitize_dimensions({'FileName': f'unique_file_name_{i}.csv'})
+            extensions.add(sanitized['FileType'])
         
         # All should map to single extension
         assert len(extensions) == 1
@@ -0,0 +1,102 @@
+"""
+Unit tests for the production observability helpers.
+
+Tests Cover:
+1. CloudWatchMetrics / PerformanceMonitor / CostTracker route through the EMF client
+2. Zero network calls on the hot path (no boto3 client, no HTTP requests)
+3. Metrics are dropped (not raised) when the EMF client is not running
+"""
+
+import pytest
+from unittest.mock import patch
+
+from backend.monitoring.metrics import CloudWatchMetricsEMF, MetricNamespace
+from backend.core.observability import (
+    CloudWatchMetrics,
+    PerformanceMonitor,
+    CostTracker
+)
+
+
+@pytest.fixture
+def emf_client(monkeypatch):
+    """Fresh, enabled EMF client (singleton reset per test)."""
+    CloudWatchMetricsEMF._instance = None
+    monkeypatch.setenv("FORCE_CLOUDWATCH", "true")
+    monkeypatch.setenv("CLOUDWATCH_METRICS_ENABLED", "true")
+
+    client = CloudWatchMetricsEMF()
+    with patch("backend.core.observability.get_metrics_client", return_value=client):
+        yield client
+
+    CloudWatchMetricsEMF._instance = None
+
+
+def _drain(client):
+    """Aggregates recorded so far, in first-recorded order."""
+    return [
+        {'metric_name': a.metric_name, 'namespace': a.namespace, 'dimensions': a.dimensions}
+        for a in client._take_snapshot()
+    ]
+
+
+class TestHotPathHasNoNetworkIO:
+    """Business code must never wait on CloudWatch."""
+
+    @pytest.mark.asyncio
+    async def test_zero_network_calls(self, emf_client):
+        await emf_client.start()
+        try:
+            with patch("botocore.endpoint.Endpoint.make_request") as make_request, \
+                 patch("boto3.client", side_effect=AssertionError("boto3 client created")):
+                metrics = CloudWatchMetrics()
+                monitor = PerformanceMonitor()
+                costs = CostTracker()
+
+                metrics.record_prediction_duration(duration_ms=900, row_count=150)
+                metrics.record_error(error_type="ValueError", operation="process_prediction")
+                costs.estimate_prediction_cost(row_count=150, duration_ms=900)
+                costs.estimate_s3_upload_cost(file_size_bytes=1024)
+                with monitor.measure("ml_prediction", rows=150):
+                    pass
+
+                make_request.assert_not_called()
+
+            queued = _drain(emf_client)
+        finally:
+            await emf_client.stop()
+
+        names = [m['metric_name'] for m in queued]
+        assert names == [
+            'PredictionDuration',
+            'ErrorCount',
+            'EstimatedCost',
+            'EstimatedCost',
+            'ml_prediction_duration'
+        ]
+        assert all(m['namespace'] == MetricNamespace.PRODUCTION.value for m in queued)
+        assert queued[0]['dimensions'] == {'RowCount': '100-1K', 'ModelType': 'saas_baseline'}
+        assert queued[4]['dimensions'] == {'rows': '150'}
+
+    @pytest.mark.asyncio
+    async def test_errors_inside_measure_are_recorded(self, emf_client):
+        await emf_client.start()
+        try:
+            monitor = PerformanceMonitor()
+            with pytest.raises(RuntimeError):
+                with monitor.measure("ml_prediction"):
+                    raise RuntimeError("model failed")
+
+            queued = _drain(emf_client)
+        finally:
+            await emf_client.stop()
+
+        assert [m['metric_name'] for m in queued] == ['ErrorCount', 'ml_prediction_duration']
+        assert queued[0]['dimensions']['ErrorType'] == 'RuntimeError'
+
+    def test_not_started_drops_silently(self, emf_client):
+        # No running client (e.g. scripts, tests): recording is a no-op
+        metrics = CloudWatchMetrics()
+        metrics.record_error(error_type="ValueError", operation="op")
+
+        assert emf_client._aggregates == {}
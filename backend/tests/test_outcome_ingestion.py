@@ -0,0 +1,184 @@
+"""
+Unit tests for bulk churn outcome ingestion.
+
+Tests Cover:
+1. Each outcome labels the customer's most recent unlabeled prediction
+2. Only the caller's predictions are labeled; matched/unmatched counts
+3. Duplicate customers (latest date wins), days_to_outcome
+4. CSV parsing (aliases, yes/no, BOM, row errors), size limit and the routes
+5. PostgreSQL SQL uses DISTINCT ON and UPDATE ... FROM
+"""
+
+import io
+import uuid
+import pytest
+from unittest.mock import patch
+from datetime import datetime
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from backend.models import User, Upload, Prediction, PredictionStatus
+from backend.services.data_collector import MLTrainingData, RealDataCollector
+from backend.api.routes.outcomes import (
+    ChurnOutcome, OutcomeBatch, ingest_outcomes, ingest_outcomes_csv, parse_outcomes_csv
+)
+
+USER = {"id": "user_abc"}
+OWN_PREDICTION = uuid.UUID("5d0e8f2a-9b1c-4d3e-8f7a-6b5c4d3e2f1a")
+OTHER_PREDICTION = uuid.UUID("6e1f9a3b-0c2d-4e5f-9a8b-7c6d5e4f3a2b")
+
+
+def _prediction_ref(prediction_id):
+    # ml_training_data.prediction_id holds str(id); on SQLite the id is stored as hex
+    return prediction_id.hex
+
+
+def _row(customer_id, prediction_id, predicted_at, churned=None):
+    return MLTrainingData(
+        customer_id=customer_id, prediction_id=_prediction_ref(prediction_id), features_json={},
+        predicted_churn_prob=0.4, predicted_retention_prob=0.6, model_type="telecom",
+        actual_churned=churned, predicted_at=predicted_at
+    )
+
+
+@pytest.fixture
+def db_models():
+    return (User, Upload, Prediction, MLTrainingData)
+
+
+@pytest.fixture
+def db_seed():
+    rows = []
+    for user_id, upload_id, prediction_id in (("user_abc", 1, OWN_PREDICTION), ("user_xyz", 2, OTHER_PREDICTION)):
+        rows += [
+            User(id=user_id, clerk_id=user_id, email=f"{user_id}@example.com", full_name=user_id),
+            Upload(id=upload_id, filename="f.csv", s3_object_key="k", file_size=1, user_id=user_id),
+            Prediction(
+                id=prediction_id, upload_id=upload_id, user_id=user_id, status=PredictionStatus.COMPLETED,
+                created_at=datetime(2026, 1, 1), updated_at=datetime(2026, 1, 1)
+            ),
+        ]
+    return rows + [
+        _row("a", OWN_PREDICTION, datetime(2026, 1, 1)),
+        _row("a", OWN_PREDICTION, datetime(2026, 2, 1)),
+        _row("b", OWN_PREDICTION, datetime(2026, 2, 1), churned=False),
+        _row("b", OWN_PREDICTION, datetime(2026, 1, 1)),
+        _row("c", OTHER_PREDICTION, datetime(2026, 1, 1)),
+    ]
+
+
+async def _labels(maker):
+    async with maker() as session:
+        rows = (await session.execute(select(MLTrainingData).order_by(MLTrainingData.id))).scalars().all()
+    return [(r.customer_id, r.predicted_at.month, r.actual_churned, r.days_to_outcome) for r in rows]
+
+
+class TestRecordChurnOutcomes:
+    """Test the staged bulk update."""
+
+    @pytest.mark.asyncio
+    async def test_latest_open_prediction_per_customer(self, session_maker):
+        async with session_maker() as db:
+            result = await RealDataCollector().record_churn_outcomes([
+                ("a", True, datetime(2026, 3, 3)),
+                ("b", True, datetime(2026, 1, 11)),
+                ("c", True, None),
+                ("d", False, None),
+            ], user_id="user_abc", db=db)
+
+        assert result["matched"] == 2 and result["unmatched"] == 2
+        assert result["unmatched_customer_ids"] == ["c", "d"]
+        assert await _labels(session_maker) == [
+            ("a", 1, None, None),
+            ("a", 2, True, 30),
+            ("b", 2, False, None),
+            ("b", 1, True, 10),
+            ("c", 1, None, None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_duplicates_latest_date_wins(self, session_maker):
+        async with session_maker() as db:
+            result = await RealDataCollector().record_churn_outcomes([
+                ("a", False, datetime(2026, 3, 1)),
+                ("a", True, datetime(2026, 4, 1)),
+                ("a", False, datetime(2026, 2, 15)),
+            ], user_id="user_abc", db=db)
+            repeat = await RealDataCollector().record_churn_outcomes(
+                [("a", False, datetime(2026, 5, 1))], user_id="user_abc", db=db
+            )
+
+        assert result["received"] == 3 and result["customers"] == 1
+        labels = await _labels(session_maker)
+        assert labels[1] == ("a", 2, True, 59)
+        # the next outcome labels the next most recent open prediction
+        assert repeat["matched"] == 1 and labels[0] == ("a", 1, False, 120)
+
+    def test_postgresql_sql(self):
+        stmt = RealDataCollector._label_outcomes_statement("postgresql", "user_abc", datetime(2026, 3, 1))
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "DISTINCT ON (ml_training_data.customer_id)" in sql
+        assert "FROM (SELECT DISTINCT ON" in sql and "churn_outcomes_incoming" in sql
+        assert "extract(epoch FROM" in sql
+        # the partition key is in the WHERE, so each row is looked up in one partition
+        assert "ml_training_data.predicted_at = latest.predicted_at" in sql
+
+
+class TestOutcomesCsv:
+    """Test CSV parsing."""
+
+    def test_aliases_and_boolean_spellings(self):
+        content = "﻿customerID,Churn,churn_date\nA-1,Yes,2026-03-01\nB-2,no,\nC-3,1,2026-03-02T10:00:00Z\n"
+
+        outcomes = parse_outcomes_csv(content.encode("utf-8"))
+
+        assert [(o.customer_id, o.churned) for o in outcomes] == [("A-1", True), ("B-2", False), ("C-3", True)]
+        assert outcomes[1].date is None
+
+    def test_errors(self):
+        with pytest.raises(HTTPException) as missing:
+            parse_outcomes_csv(b"customer_id,date\nA,2026-01-01\n")
+        with pytest.raises(HTTPException) as invalid:
+            parse_outcomes_csv(b"customer_id,churned\nA,yes\nB,maybe\n")
+
+        assert missing.value.status_code == 400 and "churned" in missing.value.detail
+        assert invalid.value.detail.startswith("Row 3: churned")
+
+
+class TestRoutes:
+    """Test the JSON and CSV endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_json(self, session_maker):
+        batch = OutcomeBatch(outcomes=[ChurnOutcome(customer_id="a", churned=True)])
+
+        async with session_maker() as db:
+            response = await ingest_outcomes(batch, USER, db)
+
+        assert response.success and response.matched == 1
+
+    @pytest.mark.asyncio
+    async def test_csv(self, session_maker):
+        upload = UploadFile(file=io.BytesIO(b"customer_id,churned,date\na,true,2026-03-03\nc,false,\n"))
+
+        async with session_maker() as db:
+            response = await ingest_outcomes_csv(upload, USER, db)
+
+        assert (response.matched, response.unmatched_customer_ids) == (1, ["c"])
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("size", [None, 90])
+    async def test_csv_too_large_rejected_before_parsing(self, size):
+        # size=None exercises the bounded read when the client sends no length
+        content = b"customer_id,churned\n" + b"a,true\n" * 10
+        upload = UploadFile(file=io.BytesIO(content), size=size)
+
+        with patch("backend.api.routes.outcomes.MAX_OUTCOMES_CSV_BYTES", 32), \
+                patch("backend.api.routes.outcomes.parse_outcomes_csv") as parse:
+            with pytest.raises(HTTPException) as exc:
+                await ingest_outcomes_csv(upload, USER, db=None)
+
+        assert exc.value.status_code == 413
+        parse.assert_not_called()
@@ -0,0 +1,91 @@
+"""
+Unit tests for keyset-paginated history listings.
+
+Tests Cover:
+1. Opaque cursor round-trip and malformed cursor rejection
+2. Predictions listing pages through every row exactly once (ties on created_at)
+3. Uploads listing keeps a plain list body and returns the cursor in a header
+"""
+
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from fastapi import HTTPException, Response
+
+from backend.models import User, Upload, Prediction, PredictionStatus
+from backend.api.pagination import encode_cursor, decode_cursor
+from backend.api.routes.predictions import list_predictions
+from backend.api.routes.uploads_list import list_uploads, NEXT_CURSOR_HEADER
+
+USER = {"id": "user_abc"}
+
+
+@pytest.fixture
+def db_seed():
+    base = datetime(2026, 1, 1)
+    rows = [User(id="user_abc", clerk_id="user_abc", email="a@example.com", full_name="A")]
+    for i in range(7):
+        # Pairs of rows share a timestamp to exercise the id tie-breaker
+        created_at = base + timedelta(minutes=i // 2)
+        rows.append(Upload(
+            id=i + 1, filename=f"f{i}.csv", s3_object_key=f"uploads/user_abc/f{i}.csv",
+            file_size=100 + i, user_id="user_abc", created_at=created_at
+        ))
+        rows.append(Prediction(
+            id=uuid.uuid4(), upload_id=i + 1, user_id="user_abc",
+            status=PredictionStatus.COMPLETED, rows_processed=i,
+            s3_output_key=f"predictions/{i}.csv", created_at=created_at
+        ))
+    return rows
+
+
+class TestCursor:
+    """Test cursor encoding."""
+
+    def test_round_trip(self):
+        created_at = datetime(2026, 1, 2, 3, 4, 5)
+        row_id = uuid.uuid4()
+
+        assert decode_cursor(encode_cursor(created_at, row_id), uuid.UUID) == (created_at, row_id)
+
+    def test_malformed_cursor_rejected(self):
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor("not-a-cursor", int)
+        assert exc.value.status_code == 400
+
+
+class TestHistoryListings:
+    """Test keyset pagination on the listing endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_predictions_pages_cover_all_rows(self, session_maker):
+        seen, cursor = [], None
+        async with session_maker() as db:
+            while True:
+                page = await list_predictions(
+                    Response(), limit=3, cursor=cursor, if_none_match=None, current_user=USER, db=db
+                )
+                seen.extend((p.created_at, uuid.UUID(p.id)) for p in page.predictions)
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+
+        # Every row exactly once, in (created_at DESC, id DESC) order
+        assert len(seen) == 7
+        assert seen == sorted(set(seen), reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_uploads_cursor_in_header(self, session_maker):
+        with patch("backend.api.routes.uploads_list.async_session_maker", session_maker):
+            first_response = Response()
+            first = await list_uploads(first_response, user_id="user_abc", limit=4, cursor=None, current_user=USER)
+
+            cursor = first_response.headers[NEXT_CURSOR_HEADER]
+            second_response = Response()
+            second = await list_uploads(second_response, user_id="user_abc", limit=4, cursor=cursor, current_user=USER)
+
+        assert [u["id"] for u in first] == [7, 6, 5, 4]
+        assert [u["id"] for u in second] == [3, 2, 1]
+        assert first[0]["s3_key"] == "uploads/user_abc/f6.csv"
+        assert NEXT_CURSOR_HEADER not in second_response.headers
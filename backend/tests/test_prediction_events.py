@@ -0,0 +1,152 @@
+"""
+Unit tests for pushed prediction status events.
+
+Tests Cover:
+1. Per-user fan-out and bounded subscriber queues
+2. Publishing without PostgreSQL dispatches in-process
+3. LISTEN callback parses NOTIFY payloads; a failed NOTIFY only rolls back
+   its savepoint
+4. SSE stream: in-flight snapshot, pushed transitions, unsubscribe on close
+"""
+
+import json
+import uuid
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from fastapi import Request
+
+from backend.models import User, Upload, Prediction, PredictionStatus
+from backend.services.prediction_events import (
+    PredictionEventHub,
+    PredictionEventListener,
+    get_prediction_event_hub,
+    publish_prediction_event
+)
+from backend.api.routes.predictions import stream_prediction_events
+
+USER = {"id": "user_abc"}
+QUEUED_ID = uuid.UUID("0b6f9a3e-1c2d-4e5f-8a9b-0c1d2e3f4a5b")
+
+
+@pytest.fixture
+def db_seed():
+    return [
+        User(id="user_abc", clerk_id="user_abc", email="a@example.com", full_name="A"),
+        Upload(id=1, filename="f.csv", s3_object_key="uploads/f.csv", file_size=1, user_id="user_abc"),
+        Prediction(
+            id=QUEUED_ID, upload_id=1, user_id="user_abc", status=PredictionStatus.QUEUED,
+            created_at=datetime(2026, 1, 1), updated_at=datetime(2026, 1, 1)
+        ),
+        Prediction(
+            id=uuid.uuid4(), upload_id=1, user_id="user_abc", status=PredictionStatus.COMPLETED,
+            created_at=datetime(2026, 1, 1), updated_at=datetime(2026, 1, 1)
+        ),
+    ]
+
+
+class _PostgresSession:
+    """Stand-in PostgreSQL session whose pg_notify fails"""
+
+    def __init__(self):
+        self.bind = type("Bind", (), {"dialect": type("Dialect", (), {"name": "postgresql"})()})()
+        self.savepoint_errors = []
+
+    def begin_nested(self):
+        session = self
+
+        class _Savepoint:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, exc_type, exc, tb):
+                session.savepoint_errors.append(exc_type)
+                return False
+
+        return _Savepoint()
+
+    async def execute(self, statement, params=None):
+        raise RuntimeError("notify failed")
+
+
+def _parse_sse(chunk: str) -> dict:
+    lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    assert lines["event"] == "prediction"
+    return json.loads(lines["data"])
+
+
+class TestPredictionEventHub:
+    """Test in-process fan-out."""
+
+    def test_events_reach_only_the_owner(self):
+        hub = PredictionEventHub()
+        mine = hub.subscribe("user_a")
+        theirs = hub.subscribe("user_b")
+
+        hub.dispatch({"user_id": "user_a", "status": "RUNNING"})
+
+        assert mine.get_nowait()["status"] == "RUNNING"
+        assert theirs.empty()
+
+    def test_full_queue_drops_oldest(self):
+        hub = PredictionEventHub(queue_size=2)
+        queue = hub.subscribe("user_a")
+        for progress in (10, 20, 30):
+            hub.dispatch({"user_id": "user_a", "progress": progress})
+
+        assert [queue.get_nowait()["progress"] for _ in range(2)] == [20, 30]
+        assert hub.get_stats()["dropped_count"] == 1
+
+        hub.unsubscribe("user_a", queue)
+        assert hub.get_stats()["streams"] == 0
+
+    def test_listener_dispatches_notify_payload(self):
+        hub = PredictionEventHub()
+        queue = hub.subscribe("user_a")
+        listener = PredictionEventListener("postgresql://unused", hub=hub)
+
+        listener._on_notify(None, 1, "prediction_events", '{"user_id": "user_a", "status": "FAILED"}')
+        listener._on_notify(None, 1, "prediction_events", "not json")
+
+        assert queue.get_nowait()["status"] == "FAILED"
+        assert queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_failed_notify_rolls_back_savepoint_only(self):
+        db = _PostgresSession()
+        prediction = Prediction(id=QUEUED_ID, upload_id=1, user_id="user_abc", status=PredictionStatus.QUEUED)
+
+        await publish_prediction_event(db, prediction)
+
+        assert db.savepoint_errors == [RuntimeError]
+
+
+class TestEventStream:
+    """Test publishing and the SSE endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_stream_snapshot_then_pushed_transition(self, session_maker):
+        hub = get_prediction_event_hub()
+        request = Request({"type": "http", "method": "GET", "path": "/api/predictions/events", "headers": []})
+
+        with patch("backend.api.routes.predictions.async_session_maker", session_maker):
+            response = await stream_prediction_events(request, USER)
+        stream = response.body_iterator
+
+        assert (await stream.__anext__()).startswith("retry:")
+        snapshot = _parse_sse(await stream.__anext__())
+        assert snapshot["prediction_id"] == str(QUEUED_ID)
+        assert snapshot["status"] == "QUEUED"
+
+        async with session_maker() as db:
+            prediction = await db.get(Prediction, QUEUED_ID)
+            prediction.status = PredictionStatus.COMPLETED
+            await publish_prediction_event(db, prediction)
+            await db.commit()
+
+        pushed = _parse_sse(await stream.__anext__())
+        assert pushed["status"] == "COMPLETED"
+        assert pushed["progress"] == 100
+
+        await stream.aclose()
+        assert hub.get_stats()["streams"] == 0
@@ -0,0 +1,57 @@
+"""
+Unit tests for PredictionRouter batch results.
+
+Tests Cover:
+1. route_batch returns the same predictions as the records round trip
+2. Experiment metadata travels alongside the DataFrame
+3. route_prediction keeps its dict interface for single rows
+"""
+
+import pandas as pd
+import pytest
+from pathlib import Path
+
+from backend.services.prediction_router import PredictionRouter, PredictionBatchResult
+
+SAMPLE_DATA = Path(__file__).resolve().parents[1] / "static" / "sample_data"
+
+
+@pytest.fixture(scope="module")
+def router():
+    return PredictionRouter()
+
+
+@pytest.fixture(scope="module")
+def telecom_df():
+    return pd.read_csv(SAMPLE_DATA / "sample_telecom.csv")
+
+
+class TestRouteBatch:
+    """Test the columnar batch path."""
+
+    @pytest.mark.parametrize("group", ["control", "treatment"])
+    def test_matches_records_round_trip(self, router, telecom_df, group):
+        batch = router.route_batch(telecom_df, force_group=group)
+        legacy = pd.DataFrame(router.route_prediction(telecom_df, force_group=group)["predictions"])
+
+        assert isinstance(batch, PredictionBatchResult)
+        assert batch.predictions.columns.is_unique
+        assert list(batch.predictions.columns) == list(legacy.columns)
+        assert batch.predictions["customerID"].tolist() == legacy["customerID"].tolist()
+
+    def test_metadata(self, router, telecom_df):
+        batch = router.route_batch(telecom_df, force_group="treatment")
+
+        assert len(batch) == len(telecom_df)
+        assert batch.metadata() == {
+            "experiment_group": "treatment",
+            "model_used": "saas_baseline",
+            "router_version": "1.0"
+        }
+
+    def test_single_row_dict(self, router, telecom_df):
+        prediction = router.route_prediction(telecom_df.head(1), force_group="treatment")
+
+        assert prediction["customerID"] == telecom_df["customerID"].iloc[0]
+        assert prediction["model_used"] == "saas_baseline"
+        assert 0.0 <= prediction["churn_probability"] <= 1.0
@@ -0,0 +1,110 @@
+"""
+Unit tests for stage-level prediction progress.
+
+Tests Cover:
+1. Stage/row progress maps onto one 0-100 percentage
+2. Writes are throttled and coalesced (latest state wins)
+3. Progress is published as an event and exposed in PredictionDetail
+"""
+
+import asyncio
+import uuid
+import pytest
+from datetime import datetime
+from fastapi import Response
+
+from backend.models import User, Upload, Prediction, PredictionStatus
+from backend.services.progress_reporter import ProgressReporter
+from backend.services.prediction_events import get_prediction_event_hub
+from backend.api.response_cache import get_response_cache
+from backend.api.routes.predictions import get_prediction_detail
+
+USER = {"id": "user_abc"}
+PREDICTION_ID = uuid.UUID("5d0e8f2a-9b1c-4d3e-8f7a-6b5c4d3e2f1a")
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    get_response_cache().clear()
+
+
+@pytest.fixture
+def db_seed():
+    return [
+        User(id="user_abc", clerk_id="user_abc", email="a@example.com", full_name="A"),
+        Upload(id=1, filename="f.csv", s3_object_key="uploads/f.csv", file_size=1, user_id="user_abc"),
+        Prediction(
+            id=PREDICTION_ID, upload_id=1, user_id="user_abc", status=PredictionStatus.RUNNING,
+            created_at=datetime(2026, 1, 1), updated_at=datetime(2026, 1, 1)
+        ),
+    ]
+
+
+@pytest.fixture
+def db_session_patches():
+    return ("backend.services.progress_reporter.get_async_session",)
+
+
+async def _no_write():
+    pass
+
+
+class TestProgressPercent:
+    """Test stage weighting."""
+
+    @pytest.mark.asyncio
+    async def test_stage_and_rows(self):
+        reporter = ProgressReporter(PREDICTION_ID, min_interval_seconds=3600)
+        reporter._write = _no_write
+
+        assert reporter.percent == 0
+        await reporter.stage("predict")
+        assert reporter.percent == 25
+        await reporter.stage("explain", rows_total=100)
+        await reporter.advance(50)
+        assert reporter.percent == 72
+
+        with pytest.raises(ValueError):
+            await reporter.stage("train")
+        await reporter.close()
+
+
+class TestProgressWrites:
+    """Test throttled writes against the database."""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_coalesced(self, session_maker):
+        reporter = ProgressReporter(PREDICTION_ID, min_interval_seconds=0.05)
+
+        await reporter.stage("explain", rows_total=1000)
+        for done in range(1, 1001):
+            await reporter.advance(done)
+        assert reporter.write_count == 1
+
+        # The deferred flush writes only the latest state
+        await asyncio.sleep(0.1)
+        assert reporter.write_count == 2
+        await reporter.close()
+
+        async with session_maker() as db:
+            prediction = await db.get(Prediction, PREDICTION_ID)
+        assert (prediction.progress_stage, prediction.progress_rows_done) == ("explain", 1000)
+        assert prediction.progress_percent == 85
+
+    @pytest.mark.asyncio
+    async def test_progress_published_and_in_detail(self, session_maker):
+        queue = get_prediction_event_hub().subscribe("user_abc")
+        try:
+            reporter = ProgressReporter(PREDICTION_ID)
+            await reporter.stage("validate")
+            await reporter.close()
+            event = queue.get_nowait()
+        finally:
+            get_prediction_event_hub().unsubscribe("user_abc", queue)
+
+        async with session_maker() as db:
+            detail = await get_prediction_detail(str(PREDICTION_ID), Response(), None, USER, db)
+
+        assert (event["stage"], event["progress"]) == ("validate", 15)
+        assert detail.prediction.progress_stage == "validate"
+        assert detail.prediction.progress_percent == 15
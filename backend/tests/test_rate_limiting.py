@@ -0,0 +1,235 @@
+"""
+Unit tests for sliding-window rate limiting.
+
+Tests Cover:
+1. Limit string parsing
+2. Sliding window counter decisions and Retry-After
+3. Bounded per-key memory in the in-process backend
+4. Redis backend key layout, fallback when Redis is unavailable, shutdown
+5. Blocked requests use no quota on the rules that allowed them
+6. Middleware returns 429 (not 500) with Retry-After
+7. SmartRateLimiter dependency shares the same backend
+"""
+
+import warnings
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi import FastAPI, HTTPException, Request
+from httpx import AsyncClient
+
+from backend.core.rate_limiting import (
+    RateLimitRule,
+    RateLimiter,
+    InMemorySlidingWindowBackend,
+    RedisSlidingWindowBackend,
+    parse_limits,
+    shutdown_rate_limit_backend
+)
+from backend.core import rate_limiting
+from backend.core.security import SmartRateLimiter
+from backend.middleware import rate_limiter as rate_limit_module
+
+MINUTE = RateLimitRule(limit=3, window_seconds=60)
+HOUR = RateLimitRule(limit=2, window_seconds=3600)
+
+
+class TestParseLimits:
+    """Test limit string parsing."""
+
+    def test_multiple_rules(self):
+        assert parse_limits("10/minute;100/hour") == [
+            RateLimitRule(10, 60), RateLimitRule(100, 3600)
+        ]
+
+    def test_invalid_period(self):
+        with pytest.raises(ValueError):
+            parse_limits("10/fortnight")
+
+
+class TestInMemoryBackend:
+    """Test the in-process sliding window counter."""
+
+    @pytest.mark.asyncio
+    async def test_blocks_after_limit_with_retry_after(self):
+        backend = InMemorySlidingWindowBackend()
+        results = [await backend.hit("ip:1", MINUTE, now=600.0 + i) for i in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert results[3].retry_after == 57
+
+    @pytest.mark.asyncio
+    async def test_previous_window_weighted(self):
+        backend = InMemorySlidingWindowBackend()
+        for i in range(3):
+            await backend.hit("ip:1", MINUTE, now=650.0 + i)
+
+        # 15s into the next window, 75% of the previous 3 requests still count
+        blocked = await backend.hit("ip:1", MINUTE, now=675.0)
+        assert not blocked.allowed
+        assert blocked.retry_after == 5
+
+        # 45s in, only 25% remain: 0.75 + 1 <= 3
+        assert (await backend.hit("ip:1", MINUTE, now=705.0)).allowed
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self):
+        backend = InMemorySlidingWindowBackend()
+        for _ in range(3):
+            await backend.hit("ip:1", MINUTE, now=600.0)
+
+        assert (await backend.hit("ip:2", MINUTE, now=600.0)).allowed
+
+    def test_memory_is_bounded(self):
+        backend = InMemorySlidingWindowBackend(max_keys=100)
+        for i in range(1000):
+            backend.hit_sync(f"ip:{i}", MINUTE, now=600.0)
+
+        assert 90 <= len(backend) <= 100
+        assert backend.hit_sync("ip:999", MINUTE, now=600.0).remaining == 1
+
+    def test_idle_keys_swept(self):
+        backend = InMemorySlidingWindowBackend(sweep_interval=0)
+        backend.hit_sync("ip:old", MINUTE, now=600.0)
+        backend.hit_sync("ip:new", MINUTE, now=800.0)
+
+        assert len(backend) == 1
+
+
+class TestRedisBackend:
+    """Test the Redis backend without a Redis server."""
+
+    @pytest.mark.asyncio
+    async def test_script_keys_and_result(self):
+        backend = RedisSlidingWindowBackend("redis://localhost:6379")
+        calls = []
+
+        async def fake_script(keys, args):
+            calls.append((keys, args))
+            return [0, 3, 0]
+
+        backend._script = fake_script
+        result = await backend.hit("ip:1", MINUTE, now=630.0)
+
+        assert calls == [(["rl:{ip:1}:60:10", "rl:{ip:1}:60:9"], [3, 60, 30.0])]
+        assert not result.allowed
+        assert result.retry_after == 30
+
+    @pytest.mark.asyncio
+    async def test_all_rules_in_one_script_call(self):
+        backend = RedisSlidingWindowBackend("redis://localhost:6379")
+        calls = []
+
+        async def fake_script(keys, args):
+            calls.append((keys, args))
+            return [0, 1, 0, 2, 0]
+
+        backend._script = fake_script
+        minute, hour = await backend.hit_rules("ip:1", [MINUTE, HOUR], now=3630.0)
+
+        assert calls == [(
+            ["rl:{ip:1}:60:60", "rl:{ip:1}:60:59", "rl:{ip:1}:3600:1", "rl:{ip:1}:3600:0"],
+            [3, 60, 30.0, 2, 3600, 30.0]
+        )]
+        assert minute.allowed and not hour.allowed
+        assert hour.retry_after == 3570
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_unavailable(self):
+        backend = RedisSlidingWindowBackend("redis://127.0.0.1:1", cooloff_seconds=60)
+
+        result = await backend.hit("ip:1", MINUTE)
+
+        assert result.allowed
+        assert len(backend.fallback) == 1
+
+        async def must_not_call(keys, args):
+            raise AssertionError("Redis called during cool-off")
+
+        backend._script = must_not_call
+        assert (await backend.hit("ip:1", MINUTE)).allowed
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_closes_pool(self):
+        backend = RedisSlidingWindowBackend("redis://127.0.0.1:1")
+        aclose = AsyncMock(wraps=backend._client.aclose)
+
+        with patch.object(backend._client, "aclose", aclose), \
+                patch("backend.core.rate_limiting._backend", backend), warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            await shutdown_rate_limit_backend()
+            assert rate_limiting._backend is None
+
+        aclose.assert_awaited_once()
+
+
+class TestMultipleRules:
+    """Test that a request is counted under all of its rules or none."""
+
+    def test_blocked_request_uses_no_quota(self):
+        backend = InMemorySlidingWindowBackend()
+        results = [backend.hit_rules_sync("ip:1", [MINUTE, HOUR], now=600.0 + i) for i in range(4)]
+
+        assert [all(r.allowed for r in rules) for rules in results] == [True, True, False, False]
+        # Only the two allowed requests count against the minute window
+        assert backend.hit_sync("ip:1", MINUTE, now=605.0).remaining == 0
+        assert not backend.hit_sync("ip:1", MINUTE, now=606.0).allowed
+
+    @pytest.mark.asyncio
+    async def test_check_returns_longest_retry_after(self):
+        limiter = RateLimiter(InMemorySlidingWindowBackend())
+        for _ in range(2):
+            assert (await limiter.check("ip:1", [MINUTE, HOUR])).allowed
+
+        blocked = await limiter.check("ip:1", [MINUTE, HOUR])
+
+        assert not blocked.allowed
+        assert blocked.limit == HOUR.limit and blocked.retry_after > 60
+
+
+class TestMiddleware:
+    """Test the global rate limit middleware."""
+
+    @pytest.mark.asyncio
+    async def test_returns_429_with_retry_after(self, monkeypatch):
+        monkeypatch.setattr(rate_limit_module, "_rules", parse_limits("2/minute"))
+        monkeypatch.setattr(rate_limit_module, "_limiter", RateLimiter(InMemorySlidingWindowBackend()))
+
+        app = FastAPI()
+        app.middleware("http")(rate_limit_module.rate_limit_middleware)
+
+        @app.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            responses = [await client.get("/ping") for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert responses[0].headers["X-RateLimit-Remaining"] == "1"
+        assert int(responses[2].headers["Retry-After"]) >= 1
+
+
+class TestSmartRateLimiter:
+    """Test per-category limits on the shared backend."""
+
+    @pytest.mark.asyncio
+    async def test_upload_limit_dependency(self):
+        limiter = SmartRateLimiter()
+        limiter._limiter = RateLimiter(InMemorySlidingWindowBackend())
+        dependency = limiter.limit("upload")
+
+        request = Request({"type": "http", "path": "/upload", "headers": [],
+                           "client": ("1.2.3.4", 1234), "state": {"user_id": "user_abc"}})
+        for _ in range(10):
+            await dependency(request)
+
+        with pytest.raises(HTTPException) as exc:
+            await dependency(request)
+        assert exc.value.status_code == 429
+        assert "Retry-After" in exc.value.headers
+
+    def test_unknown_category(self):
+        with pytest.raises(ValueError):
+            SmartRateLimiter().limit("nope")
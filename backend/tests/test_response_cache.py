@@ -0,0 +1,128 @@
+"""
+Unit tests for the prediction response cache.
+
+Tests Cover:
+1. TTL LRU behaviour and per-user invalidation
+2. If-None-Match parsing
+3. Detail endpoint: 304 on a matching ETag, new ETag after a status change
+4. Dashboard endpoint: S3 is read once across repeated polls
+"""
+
+import time
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from fastapi import Response
+
+from backend.models import User, Upload, Prediction, PredictionStatus
+from backend.api.response_cache import (
+    ResponseCache,
+    get_response_cache,
+    invalidate_user_responses,
+    etag_matches,
+    make_etag
+)
+from backend.api.routes.predictions import get_prediction_detail, get_dashboard_data
+
+USER = {"id": "user_abc"}
+PREDICTION_ID = uuid.UUID("6f1c2d8e-3a4b-4c5d-8e9f-0a1b2c3d4e5f")
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    get_response_cache().clear()
+
+
+@pytest.fixture
+def db_seed():
+    return [
+        User(id="user_abc", clerk_id="user_abc", email="a@example.com", full_name="A"),
+        Upload(id=1, filename="f.csv", s3_object_key="uploads/f.csv", file_size=1, user_id="user_abc"),
+        Prediction(
+            id=PREDICTION_ID, upload_id=1, user_id="user_abc", status=PredictionStatus.COMPLETED,
+            rows_processed=2, s3_output_key="predictions/out.csv", created_at=datetime(2026, 1, 1),
+            updated_at=datetime(2026, 1, 1)
+        ),
+    ]
+
+
+class TestResponseCache:
+    """Test the cache container and ETag helpers."""
+
+    def test_expiry_and_lru(self):
+        cache = ResponseCache(max_size=2, ttl_seconds=60)
+        cache.set(("u1", "a", (), 1), "A")
+        cache.set(("u1", "b", (), 1), "B")
+        cache.get(("u1", "a", (), 1))
+        cache.set(("u1", "c", (), 1), "C")
+
+        assert cache.get(("u1", "b", (), 1)) is None
+        assert cache.get(("u1", "a", (), 1)) == "A"
+
+        with patch("backend.core.ttl_cache.time.monotonic", return_value=time.monotonic() + 61):
+            assert cache.get(("u1", "a", (), 1)) is None
+
+    def test_invalidate_user(self):
+        cache = ResponseCache()
+        cache.set(("u1", "a", (), 1), "A")
+        cache.set(("u2", "a", (), 1), "B")
+
+        assert cache.invalidate_user("u1") == 1
+        assert cache.get(("u2", "a", (), 1)) == "B"
+
+    def test_etag_matching(self):
+        etag = make_etag(("u1", "a", (), 1))
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(None, etag)
+        assert etag != make_etag(("u2", "a", (), 1))
+
+
+class TestCachedEndpoints:
+    """Test conditional GETs on the prediction endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_detail_not_modified_until_status_changes(self, session_maker):
+        async with session_maker() as db:
+            first_response = Response()
+            first = await get_prediction_detail(str(PREDICTION_ID), first_response, None, USER, db)
+            etag = first_response.headers["ETag"]
+
+            repeat = await get_prediction_detail(str(PREDICTION_ID), Response(), etag, USER, db)
+
+            prediction = await db.get(Prediction, PREDICTION_ID)
+            prediction.status = PredictionStatus.FAILED
+            prediction.updated_at = datetime(2026, 1, 1) + timedelta(minutes=1)
+            await db.commit()
+            invalidate_user_responses("user_abc")
+
+            changed_response = Response()
+            changed = await get_prediction_detail(str(PREDICTION_ID), changed_response, etag, USER, db)
+
+        assert first.prediction.status == PredictionStatus.COMPLETED.value
+        assert repeat.status_code == 304
+        assert repeat.headers["ETag"] == etag
+        assert changed.prediction.status == PredictionStatus.FAILED.value
+        assert changed_response.headers["ETag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_dashboard_reads_s3_once(self, session_maker):
+        csv_content = "customer_id,churn_probability\nC1,0.9\nC2,0.1\n"
+        download = AsyncMock(return_value=csv_content)
+
+        with patch("backend.api.routes.predictions.async_s3_service.download_file_to_memory", download):
+            async with session_maker() as db:
+                first_response = Response()
+                first = await get_dashboard_data(first_response, USER, db, 1000, None)
+                second = await get_dashboard_data(Response(), USER, db, 1000, None)
+                conditional = await get_dashboard_data(
+                    Response(), USER, db, 1000, first_response.headers["ETag"]
+                )
+
+        assert download.await_count == 1
+        assert second == first
+        assert [p["risk_level"] for p in first["predictions"]] == ["high", "low"]
+        assert conditional.status_code == 304
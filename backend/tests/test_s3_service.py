@@ -0,0 +1,257 @@
+"""
+Unit tests for S3 streaming helpers.
+
+Tests Cover:
+1. Streaming reads into pandas without temp files
+2. Single PutObject for small outputs
+3. Multipart upload with bounded part buffers
+4. Abort on failure (no orphaned multipart uploads)
+5. Async wrapper (off-loop execution against the same client)
+6. Parallel ranged downloads and concurrent multipart uploads
+
+Uses an in-memory stand-in for the boto3 S3 client.
+"""
+
+import io
+import threading
+import pytest
+import pandas as pd
+from botocore.exceptions import ClientError
+
+from backend.services.s3_service import (
+    S3Service,
+    AsyncS3Service,
+    S3MultipartWriter,
+    MIN_MULTIPART_PART_SIZE,
+    build_transfer_config
+)
+
+
+class FakeS3Client:
+    """Minimal in-memory S3 client covering the calls S3Service makes."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.aborted = []
+        self.calls = []
+        self.part_threads = set()
+
+    def get_object(self, Bucket, Key, Range=None, **kwargs):
+        self.calls.append('get_object')
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': 'NoSuchKey'}}, 'GetObject')
+        data = self.objects[Key]
+        if Range is None:
+            return {'Body': io.BytesIO(data), 'ContentLength': len(data)}
+        if not data:
+            raise ClientError({'Error': {'Code': 'InvalidRange'}}, 'GetObject')
+        start, end = (int(x) for x in Range[len('bytes='):].split('-'))
+        end = min(end, len(data) - 1)
+        return {
+            'Body': io.BytesIO(data[start:end + 1]),
+            'ContentLength': end - start + 1,
+            'ContentRange': f"bytes {start}-{end}/{len(data)}"
+        }
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Config=None):
+        self.calls.append('upload_fileobj')
+        self.objects[Key] = Fileobj.read()
+
+    def head_object(self, Bucket, Key):
+        self.calls.append('head_object')
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': '404'}}, 'HeadObject')
+        return {'ContentLength': len(self.objects[Key])}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.calls.append('put_object')
+        self.objects[Key] = bytes(Body)
+        return {}
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.calls.append('create_multipart_upload')
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {}
+        return {'UploadId': upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls.append('upload_part')
+        self.part_threads.add(threading.get_ident())
+        self.uploads[UploadId][PartNumber] = bytes(Body)
+        return {'ETag': f'"etag-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append('complete_multipart_upload')
+        parts = self.uploads.pop(UploadId)
+        numbers = [p['PartNumber'] for p in MultipartUpload['Parts']]
+        self.objects[Key] = b''.join(parts[n] for n in numbers)
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append('abort_multipart_upload')
+        self.uploads.pop(UploadId, None)
+        self.aborted.append(UploadId)
+        return {}
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("S3_BUCKET", "test-bucket")
+    service = S3Service()
+    service.s3_client = FakeS3Client()
+    return service
+
+
+class TestReadStream:
+    """Test streaming reads."""
+
+    def test_read_csv_from_stream(self, s3):
+        s3.s3_client.objects['uploads/u1/data.csv'] = b"customerID,tenure\nC1,12\nC2,3\n"
+
+        with s3.open_read_stream('uploads/u1/data.csv') as stream:
+            df = pd.read_csv(stream)
+
+        assert list(df['customerID']) == ['C1', 'C2']
+        assert stream.raw.bytes_read == stream.raw.content_length
+
+    def test_missing_object_raises_file_not_found(self, s3):
+        with pytest.raises(FileNotFoundError):
+            s3.open_read_stream('uploads/u1/missing.csv')
+
+
+class TestMultipartWriter:
+    """Test streaming multipart writes."""
+
+    def test_small_object_uses_single_put(self, s3):
+        df = pd.DataFrame({'customerID': ['C1', 'C2'], 'churn_probability': [0.1, 0.9]})
+
+        with s3.open_multipart_writer('predictions/out.csv') as writer:
+            df.to_csv(writer, index=False)
+
+        assert s3.s3_client.calls == ['put_object']
+        assert s3.s3_client.objects['predictions/out.csv'].startswith(b'customerID,churn_probability')
+
+    def test_large_object_uses_bounded_parts(self, s3):
+        payload = b'x' * (MIN_MULTIPART_PART_SIZE * 2 + 123)
+
+        writer = s3.open_multipart_writer(
+            'big.bin', part_size=MIN_MULTIPART_PART_SIZE, max_concurrency=1
+        )
+        with writer:
+            for offset in range(0, len(payload), 1024 * 1024):
+                writer.write(payload[offset:offset + 1024 * 1024])
+                assert len(writer._buffer) < MIN_MULTIPART_PART_SIZE
+
+        assert s3.s3_client.calls.count('upload_part') == 3
+        assert s3.s3_client.objects['big.bin'] == payload
+
+    def test_part_size_clamped_to_s3_minimum(self, s3):
+        writer = s3.open_multipart_writer('key', part_size=1024)
+        assert isinstance(writer, S3MultipartWriter)
+        assert writer.part_size == MIN_MULTIPART_PART_SIZE
+
+    def test_exception_aborts_upload(self, s3):
+        with pytest.raises(RuntimeError):
+            with s3.open_multipart_writer('big.bin', part_size=MIN_MULTIPART_PART_SIZE,
+                                          max_concurrency=1) as writer:
+                writer.write(b'x' * (MIN_MULTIPART_PART_SIZE + 1))
+                raise RuntimeError("serialization failed")
+
+        assert s3.s3_client.aborted == ['upload-1']
+        assert 'big.bin' not in s3.s3_client.objects
+        assert 'put_object' not in s3.s3_client.calls
+
+
+class TestAsyncS3Service:
+    """Test the awaitable wrapper."""
+
+    @pytest.fixture
+    def async_s3(self, s3):
+        service = AsyncS3Service(s3, max_workers=2)
+        yield service
+        service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_upload_and_download_round_trip(self, async_s3):
+        result = await async_s3.upload_file_stream(b"a,b\n1,2\n", "user_1", "data (1).csv")
+
+        assert result["success"] is True
+        assert result["object_key"].startswith("uploads/user_1/")
+        assert result["object_key"].endswith("-data_1.csv")
+
+        content = await async_s3.download_file_to_memory(result["object_key"])
+        assert content == "a,b\n1,2\n"
+
+    @pytest.mark.asyncio
+    async def test_file_exists(self, async_s3):
+        async_s3.service.s3_client.objects['uploads/u1/present.csv'] = b"x"
+
+        assert await async_s3.file_exists('uploads/u1/present.csv') is True
+        assert await async_s3.file_exists('uploads/u1/absent.csv') is False
+
+    @pytest.mark.asyncio
+    async def test_blocking_calls_run_off_loop(self, async_s3):
+        import threading
+
+        loop_thread = threading.get_ident()
+        worker_thread = await async_s3.run_blocking(threading.get_ident)
+
+        assert worker_thread != loop_thread
+
+
+class TestTransferManager:
+    """Test parallel ranged GETs and concurrent multipart uploads."""
+
+    @pytest.fixture
+    def small_chunks(self, s3):
+        # Note: chunk size is clamped to the 5 MiB S3 minimum
+        s3.transfer_config = build_transfer_config(
+            multipart_threshold=MIN_MULTIPART_PART_SIZE,
+            multipart_chunksize=MIN_MULTIPART_PART_SIZE,
+            max_concurrency=4
+        )
+        return s3
+
+    def test_download_to_buffer_uses_ranged_gets(self, small_chunks):
+        payload = bytes(range(256)) * (MIN_MULTIPART_PART_SIZE * 3 // 256 + 7)
+        small_chunks.s3_client.objects['big.csv'] = payload
+
+        view = small_chunks.download_to_buffer('big.csv')
+
+        assert bytes(view) == payload
+        assert small_chunks.s3_client.calls.count('get_object') == 4
+
+    def test_small_object_single_request(self, small_chunks):
+        small_chunks.s3_client.objects['small.csv'] = b"a,b\n1,2\n"
+
+        view = small_chunks.download_to_buffer('small.csv')
+
+        assert bytes(view) == b"a,b\n1,2\n"
+        assert small_chunks.s3_client.calls == ['get_object']
+
+    def test_empty_object(self, small_chunks):
+        small_chunks.s3_client.objects['empty.csv'] = b""
+        assert bytes(small_chunks.download_to_buffer('empty.csv')) == b""
+
+    def test_parallel_read_stream_feeds_pandas(self, small_chunks):
+        rows = "".join(f"C{i},{i % 72}\n" for i in range(600000))
+        small_chunks.s3_client.objects['big.csv'] = ("customerID,tenure\n" + rows).encode()
+
+        with small_chunks.open_parallel_read_stream('big.csv') as stream:
+            df = pd.read_csv(stream)
+
+        assert len(df) == 600000
+        assert stream.raw.bytes_read == len(small_chunks.s3_client.objects['big.csv'])
+
+    def test_concurrent_multipart_upload(self, small_chunks):
+        payload = b''.join(
+            bytes([i]) * MIN_MULTIPART_PART_SIZE for i in range(5)
+        ) + b'tail'
+
+        with small_chunks.open_multipart_writer('out.bin') as writer:
+            writer.write(payload)
+
+        assert small_chunks.s3_client.objects['out.bin'] == payload
+        assert small_chunks.s3_client.calls.count('upload_part') == 6
+        assert threading.get_ident() not in small_chunks.s3_client.part_threads
@@ -0,0 +1,185 @@
+"""
+Unit tests for batched SQS publishing.
+
+Tests Cover:
+1. Concurrent publishes coalesce into SendMessageBatch calls of up to 10
+2. A lone publish is sent after the batching window
+3. Per-entry failures raise ClientError for that caller only
+4. publish_prediction_to_sqs and the upload route send failed entries to
+   _mark_publish_failed (prediction FAILED with the error recorded)
+5. The publisher reuses one client
+"""
+
+import asyncio
+import io
+import threading
+import uuid
+import pytest
+from unittest.mock import AsyncMock, patch
+from botocore.exceptions import ClientError
+from fastapi import UploadFile
+from sqlalchemy import select
+
+from backend.api.routes.upload import upload_csv
+from backend.auth.user_cache import get_current_db_user, get_user_cache
+from backend.models import User, Prediction, PredictionStatus
+from backend.services import sqs_publisher
+from backend.services.sqs_publisher import SQSBatchPublisher, publish_prediction_to_sqs
+
+QUEUE_URL = "https://sqs.us-east-1.amazonaws.com/123456789012/predictions"
+
+
+class _FakeSQS:
+    """Records SendMessageBatch calls; fails entries matched by fail_entry"""
+
+    def __init__(self, fail_entry=lambda entry: False, fail_code="InvalidMessageContents", error=None):
+        self.fail_entry = fail_entry
+        self.fail_code = fail_code
+        self.error = error
+        self.batches = []
+        self.threads = set()
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.batches.append((QueueUrl, Entries))
+        self.threads.add(threading.get_ident())
+        if self.error:
+            raise self.error
+        return {
+            "Successful": [
+                {"Id": e["Id"], "MessageId": f"msg-{e['MessageBody']}"}
+                for e in Entries if not self.fail_entry(e)
+            ],
+            "Failed": [
+                {"Id": e["Id"], "Code": self.fail_code, "Message": "rejected", "SenderFault": True}
+                for e in Entries if self.fail_entry(e)
+            ],
+        }
+
+
+class TestSQSBatchPublisher:
+    """Test batching and per-entry results."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_publishes_share_batches(self):
+        client = _FakeSQS()
+        publisher = SQSBatchPublisher(client, window_seconds=0.05)
+
+        message_ids = await asyncio.gather(*(publisher.publish(QUEUE_URL, str(i)) for i in range(12)))
+
+        assert message_ids == [f"msg-{i}" for i in range(12)]
+        assert [len(entries) for _, entries in client.batches] == [10, 2]
+        assert threading.get_ident() not in client.threads
+
+    @pytest.mark.asyncio
+    async def test_single_publish_sent_after_window(self):
+        client = _FakeSQS()
+        publisher = SQSBatchPublisher(client, window_seconds=0.001)
+
+        attributes = {"user_id": {"StringValue": "u", "DataType": "String"}}
+
+        message_id = await publisher.publish(QUEUE_URL, "only", attributes)
+
+        assert message_id == "msg-only"
+        assert client.batches[0][1] == [{
+            "MessageBody": "only",
+            "MessageAttributes": attributes,
+            "Id": "0",
+        }]
+
+    @pytest.mark.asyncio
+    async def test_failed_entry_raises_for_its_caller(self):
+        publisher = SQSBatchPublisher(_FakeSQS(fail_entry=lambda e: e["MessageBody"] == "b"))
+
+        results = await asyncio.gather(
+            publisher.publish(QUEUE_URL, "a"), publisher.publish(QUEUE_URL, "b"),
+            return_exceptions=True
+        )
+
+        assert results[0] == "msg-a"
+        assert isinstance(results[1], ClientError)
+        assert results[1].response["Error"]["Code"] == "InvalidMessageContents"
+        assert publisher._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_batch_call_error_raises_for_all(self):
+        client = _FakeSQS(error=ClientError(
+            {"Error": {"Code": "RequestThrottled", "Message": "slow down"}}, "SendMessageBatch"
+        ))
+        publisher = SQSBatchPublisher(client)
+
+        results = await asyncio.gather(
+            publisher.publish(QUEUE_URL, "a"), publisher.publish(QUEUE_URL, "b"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, ClientError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_client_created_once(self):
+        client = _FakeSQS()
+        with patch.object(sqs_publisher.settings, "get_boto3_sqs", return_value=client) as factory:
+            publisher = SQSBatchPublisher()
+            await publisher.publish(QUEUE_URL, "a")
+            await publisher.publish(QUEUE_URL, "b")
+
+        assert factory.call_count == 1 and len(client.batches) == 2
+
+
+class TestPublishPredictionToSQS:
+    """Test the prediction publish path on top of the batch publisher."""
+
+    @pytest.mark.asyncio
+    async def test_failed_entry_marks_prediction_failed(self):
+        client = _FakeSQS(fail_entry=lambda e: True, fail_code="RequestThrottled")
+        prediction_id = uuid.uuid4()
+
+        with patch.object(sqs_publisher, "_publisher", SQSBatchPublisher(window_seconds=0.001)), \
+                patch.object(type(sqs_publisher.settings), "is_sqs_enabled", True), \
+                patch.object(sqs_publisher.settings, "PREDICTIONS_QUEUE_URL", QUEUE_URL), \
+                patch.object(sqs_publisher, "_mark_publish_failed", AsyncMock()) as mark_failed:
+            success, message = await publish_prediction_to_sqs(
+                prediction_id, "user_2abcdef1234567890abcdef", "15", "s3://retainwise-uploads/user_abc/file.csv", client, db=None
+            )
+
+        assert not success and message == "High demand - please upload the file again shortly"
+        mark_failed.assert_awaited_once_with(
+            None, prediction_id, error_type="SQS_CLIENT_ERROR",
+            error_code="RequestThrottled", error_message="rejected"
+        )
+
+
+@pytest.fixture
+def db_seed():
+    return [User(id="user_abc", clerk_id="user_abc", email="a@example.com", full_name="A")]
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    get_user_cache().clear()
+    yield
+    get_user_cache().clear()
+
+
+class TestUploadPublishFailure:
+    """Test the upload route when its batch entry fails."""
+
+    @pytest.mark.asyncio
+    async def test_failed_entry_marks_prediction_failed(self, session_maker):
+        client = _FakeSQS(fail_entry=lambda e: True, fail_code="RequestThrottled")
+        upload = UploadFile(file=io.BytesIO(b"customerID,tenure\nc1,3\n"), filename="customers.csv")
+        stored = {"success": True, "object_key": "uploads/user_abc/customers.csv", "size": 22}
+
+        with patch.object(sqs_publisher, "_publisher", SQSBatchPublisher(client, window_seconds=0.001)), \
+                patch("backend.api.routes.upload.settings.PREDICTIONS_QUEUE_URL", QUEUE_URL), \
+                patch("backend.api.routes.upload.async_s3_service.upload_file_stream", AsyncMock(return_value=stored)):
+            async with session_maker() as db:
+                db_user = await get_current_db_user({"id": "user_abc"}, db)
+                response = await upload_csv(upload, "user_abc", {"id": "user_abc"}, db, db_user)
+
+        async with session_maker() as db:
+            prediction = (await db.execute(select(Prediction))).scalar_one()
+
+        assert len(client.batches) == 1
+        assert response["prediction_status"] == "FAILED" and response["publish_warning"]
+        assert prediction.status == PredictionStatus.FAILED
+        assert prediction.error_message == "SQS publish failed: SQS_CLIENT_ERROR: RequestThrottled: rejected"
@@ -0,0 +1,119 @@
+"""
+Unit tests for process startup profiles.
+
+Tests Cover:
+1. API cold start does not import the ML stack (python -X importtime)
+2. API cold start stays within its module count and import time budgets
+3. Startup steps run concurrently and a failing step doesn't stop the rest
+4. The lazy predictor loads once, off the event loop
+"""
+
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.api.routes import predict as predict_routes
+from backend.core.startup import API_DEFERRED_MODULES, run_startup_steps
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Deterministic for a given requirements lock: `import backend.main` loads
+# ~1,070 modules, and the ML stack alone adds ~1,400 more
+API_IMPORT_MODULE_BUDGET = int(os.getenv("API_IMPORT_MODULE_BUDGET", "1400"))
+# Wall-clock backstop, ~4x a local cold start so a loaded CI runner passes
+API_IMPORT_BUDGET_MS = float(os.getenv("API_IMPORT_BUDGET_MS", "10000"))
+
+
+@pytest.fixture(scope="module")
+def api_importtime():
+    """Module -> cumulative import time (us) for `import backend.main`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        cwd=REPO_ROOT, env={**os.environ, "PYTHONPATH": str(REPO_ROOT)},
+        capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)", line)
+        if match:
+            timings[match.group(2)] = int(match.group(1))
+    return timings
+
+
+class TestApiColdStart:
+    """Test what the API process imports at boot."""
+
+    def test_ml_stack_deferred(self, api_importtime):
+        imported = {name.split(".")[0] for name in api_importtime}
+        assert "backend.main" in api_importtime
+        assert imported.isdisjoint(API_DEFERRED_MODULES), imported & set(API_DEFERRED_MODULES)
+
+    def test_import_budget(self, api_importtime):
+        assert len(api_importtime) < API_IMPORT_MODULE_BUDGET
+        assert api_importtime["backend.main"] / 1000 < API_IMPORT_BUDGET_MS
+
+
+class TestStartupSteps:
+    """Test concurrent worker startup."""
+
+    @pytest.mark.asyncio
+    async def test_steps_run_concurrently(self):
+        started = time.perf_counter()
+        timings = await run_startup_steps({
+            "a": asyncio.sleep(0.2),
+            "b": asyncio.to_thread(time.sleep, 0.2),
+            "c": asyncio.sleep(0.2),
+        })
+
+        assert time.perf_counter() - started < 0.5
+        assert all(seconds is not None for seconds in timings.values())
+
+    @pytest.mark.asyncio
+    async def test_failed_step_is_isolated(self):
+        async def broken():
+            raise ConnectionError("database unavailable")
+
+        timings = await run_startup_steps({"database": broken(), "models": asyncio.sleep(0.01)})
+
+        assert timings["database"] is None
+        assert timings["models"] is not None
+
+
+class TestLazyPredictor:
+    """Test the predict route's lazily loaded model."""
+
+    @pytest.mark.asyncio
+    async def test_loads_once_in_worker_thread(self, monkeypatch):
+        monkeypatch.setattr(predict_routes, "_predictor", None)
+        loads = []
+
+        def slow_load():
+            time.sleep(0.2)
+            loads.append(object())
+            return loads[-1]
+
+        with patch.object(predict_routes, "_load_predictor", slow_load):
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while not loads:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            first, second, _ = await asyncio.gather(
+                predict_routes.get_predictor(), predict_routes.get_predictor(), ticker()
+            )
+
+        assert len(loads) == 1
+        assert first is second is loads[0]
+        # The event loop kept running while the model loaded
+        assert ticks > 5
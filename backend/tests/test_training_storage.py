@@ -0,0 +1,175 @@
+"""
+Unit tests for ml_training_data storage.
+
+Tests Cover:
+1. Compact feature encoding round trip (short keys, no nulls, legacy rows)
+2. model_type / experiment_group stored as smallint codes
+3. Batched prediction recording (one transaction, chunked executemany)
+   and ORM updates keyed by (id, predicted_at), the partition key
+4. Monthly partition DDL, creation ahead of time, rollup + drop retention
+"""
+
+import math
+import pytest
+from datetime import date
+from unittest.mock import patch
+from sqlalchemy import select, text
+
+from backend.services.data_collector import MLTrainingData, RealDataCollector
+from backend.services.training_storage import (
+    add_months, decode_features, encode_features, ensure_partitions, partition_ddl,
+    rollup_expired_partitions
+)
+
+
+@pytest.fixture
+def db_models():
+    return (MLTrainingData,)
+
+
+@pytest.fixture
+def db_session_patches():
+    return ("backend.services.data_collector.get_async_session",)
+
+
+class TestCompactFeatures:
+    """Test the feature encoding."""
+
+    def test_round_trip(self):
+        features = {"customerID": "c1", "tenure": 12, "MonthlyCharges": 70.5, "Contract": "One year",
+                    "TotalCharges": None, "gender": math.nan, "c": "custom", "plan": "pro"}
+
+        encoded = encode_features(features)
+
+        assert encoded == {"_v": 1, "id": "c1", "t": 12, "mc": 70.5, "c": "One year", "~c": "custom", "plan": "pro"}
+        assert decode_features(encoded) == {k: v for k, v in features.items()
+                                            if k not in ("TotalCharges", "gender")}
+
+    def test_legacy_rows_unchanged(self):
+        legacy = {"customerID": "c1", "tenure": 12, "TotalCharges": None}
+
+        assert decode_features(legacy) == legacy
+
+
+class TestStoredColumns:
+    """Test what actually lands in the table."""
+
+    @pytest.mark.asyncio
+    async def test_codes_and_compact_json(self, session_maker):
+        async with session_maker() as session:
+            session.add(MLTrainingData(
+                customer_id="c1", features_json={"tenure": 3, "Contract": "Month-to-month"},
+                predicted_churn_prob=0.8, predicted_retention_prob=0.2,
+                model_type="telecom_aligned", experiment_group="treatment"
+            ))
+            session.add(MLTrainingData(
+                customer_id="c2", features_json={}, predicted_churn_prob=0.1,
+                predicted_retention_prob=0.9, model_type="gradient_boosting_v9"
+            ))
+            await session.commit()
+
+            raw = (await session.execute(text(
+                "SELECT model_type, experiment_group, features_json FROM ml_training_data ORDER BY id"
+            ))).all()
+            decoded = (await session.execute(
+                select(MLTrainingData.model_type, MLTrainingData.experiment_group, MLTrainingData.features_json)
+                .order_by(MLTrainingData.id)
+            )).all()
+
+        assert raw[0][:2] == (3, 2) and raw[1][:2] == (0, None)
+        assert raw[0][2] == '{"_v": 1, "t": 3, "c": "Month-to-month"}'
+        assert decoded[0] == ("telecom_aligned", "treatment", {"tenure": 3, "Contract": "Month-to-month"})
+        assert decoded[1][0] == "unknown"
+
+
+class TestRecordPredictions:
+    """Test batched prediction recording."""
+
+    @pytest.mark.asyncio
+    async def test_batched_insert(self, session_maker, sql_statements):
+        customers = [{"customerID": f"c{i}", "tenure": i} for i in range(7)]
+        predictions = [{"retention_probability": 0.25}] * 6
+
+        with patch("backend.services.data_collector.PREDICTION_INSERT_BATCH_ROWS", 3):
+            recorded = await RealDataCollector().record_predictions(
+                customers, predictions, prediction_id="p1",
+                metadata={"experiment_group": "control", "model_used": "telecom_aligned"}
+            )
+        inserts = [sql for sql in sql_statements if sql.startswith("INSERT")]
+
+        async with session_maker() as session:
+            rows = (await session.execute(select(MLTrainingData).order_by(MLTrainingData.id))).scalars().all()
+
+        assert recorded == 7 and len(inserts) == 3
+        assert rows[0].predicted_churn_prob == pytest.approx(0.75)
+        assert (rows[0].model_type, rows[0].experiment_group) == ("telecom_aligned", "control")
+        assert rows[6].predicted_churn_prob == 0.0 and rows[6].features_json == customers[6]
+
+    @pytest.mark.asyncio
+    async def test_orm_update_filters_on_partition_key(self, session_maker, sql_statements):
+        async with session_maker() as session:
+            session.add(MLTrainingData(
+                customer_id="c1", features_json={}, predicted_churn_prob=0.5,
+                predicted_retention_prob=0.5, model_type="telecom"
+            ))
+            await session.commit()
+
+        await RealDataCollector().record_churn_outcome("c1", churned=True)
+        updates = [sql for sql in sql_statements if sql.startswith("UPDATE")]
+
+        assert len(updates) == 1
+        assert "WHERE ml_training_data.id = ? AND ml_training_data.predicted_at = ?" in updates[0]
+
+
+class _PartitionCatalog:
+    """Stand-in PostgreSQL session: a pg_inherits listing plus executed SQL"""
+
+    def __init__(self, partitions):
+        self.partitions = list(partitions)
+        self.executed = []
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        if "pg_inherits" in sql:
+            return [(name,) for name in self.partitions]
+        self.executed.append((sql, params))
+        return None
+
+    async def commit(self):
+        pass
+
+
+class TestPartitions:
+    """Test partition creation and retention."""
+
+    def test_ddl(self):
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert partition_ddl(date(2026, 12, 1)) == (
+            "CREATE TABLE IF NOT EXISTS ml_training_data_2026_12 PARTITION OF ml_training_data "
+            "FOR VALUES FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')"
+        )
+
+    @pytest.mark.asyncio
+    async def test_ensure_partitions_ahead(self):
+        db = _PartitionCatalog(["ml_training_data_2026_10", "ml_training_data_default"])
+
+        created = await ensure_partitions(db, months_ahead=2, today=date(2026, 10, 18))
+
+        assert created == ["ml_training_data_2026_11", "ml_training_data_2026_12"]
+        assert len(db.executed) == 2
+
+    @pytest.mark.asyncio
+    async def test_rollup_then_drop_expired(self):
+        db = _PartitionCatalog([
+            "ml_training_data_2024_09", "ml_training_data_2024_10", "ml_training_data_2024_11",
+            "ml_training_data_default"
+        ])
+
+        dropped = await rollup_expired_partitions(db, retention_months=24, today=date(2026, 11, 2))
+
+        assert dropped == ["ml_training_data_2024_09", "ml_training_data_2024_10"]
+        statements = [sql.split()[0] for sql, _ in db.executed]
+        assert statements == ["INSERT", "ALTER", "DROP"] * 2
+        assert "FROM ml_training_data_2024_09" in db.executed[0][0]
+        assert db.executed[0][1] == {"month": date(2024, 9, 1)}
+        assert await rollup_expired_partitions(db, 24, today=date(2026, 11, 2), dry_run=True) == dropped
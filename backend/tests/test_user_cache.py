@@ -0,0 +1,121 @@
+"""
+Unit tests for the Clerk ID -> database user cache.
+
+Tests Cover:
+1. Zero DB round-trips on a cache hit
+2. Misses for unknown users are not cached
+3. TTL expiry, LRU bound and explicit invalidation
+4. FastAPI dependency errors (401 / 404)
+"""
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from backend.models import User
+from backend.auth.user_cache import (
+    CachedUser,
+    UserIdentityCache,
+    get_user_cache,
+    invalidate_cached_user,
+    resolve_db_user,
+    get_current_db_user
+)
+
+
+@pytest.fixture
+def db_models():
+    return (User,)
+
+
+@pytest.fixture
+def db_seed():
+    return [User(id="db_1", clerk_id="user_abc", email="a@example.com", full_name="A User")]
+
+
+@pytest_asyncio.fixture
+async def db(session_maker, sql_statements):
+    async with session_maker() as session:
+        session.statements = sql_statements
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    get_user_cache().clear()
+    yield
+    get_user_cache().clear()
+
+
+class TestResolveDbUser:
+    """Test cached user resolution."""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_database(self, db):
+        first = await resolve_db_user("user_abc", db)
+        second = await resolve_db_user("user_abc", db)
+
+        assert first == second == CachedUser(
+            id="db_1", clerk_id="user_abc", email="a@example.com", full_name="A User"
+        )
+        assert len(db.statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_not_cached(self, db):
+        assert await resolve_db_user("user_new", db) is None
+
+        db.add(User(id="db_2", clerk_id="user_new", email="n@example.com", full_name="New"))
+        await db.commit()
+
+        user = await resolve_db_user("user_new", db)
+        assert user is not None and user.id == "db_2"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_reload(self, db):
+        await resolve_db_user("user_abc", db)
+        invalidate_cached_user("user_abc")
+        await resolve_db_user("user_abc", db)
+
+        assert len(db.statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_dependency_returns_cached_user(self, db):
+        await resolve_db_user("user_abc", db)
+        user = await get_current_db_user(current_user={"id": "user_abc"}, db=db)
+
+        assert user.id == "db_1"
+        assert len(db.statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_dependency_errors(self, db):
+        with pytest.raises(HTTPException) as exc:
+            await get_current_db_user(current_user={}, db=db)
+        assert exc.value.status_code == 401
+
+        with pytest.raises(HTTPException) as exc:
+            await get_current_db_user(current_user={"id": "user_missing"}, db=db)
+        assert exc.value.status_code == 404
+
+
+class TestUserIdentityCache:
+    """Test TTL and LRU behaviour."""
+
+    def _user(self, clerk_id):
+        return CachedUser(id=f"db_{clerk_id}", clerk_id=clerk_id, email=f"{clerk_id}@x.com", full_name=clerk_id)
+
+    def test_entries_expire(self):
+        cache = UserIdentityCache(max_size=10, ttl_seconds=0)
+        cache.set("a", self._user("a"))
+
+        assert cache.get("a") is None
+
+    def test_lru_eviction(self):
+        cache = UserIdentityCache(max_size=2, ttl_seconds=60)
+        cache.set("a", self._user("a"))
+        cache.set("b", self._user("b"))
+        cache.get("a")
+        cache.set("c", self._user("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get_stats()["size"] == 2
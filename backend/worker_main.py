@@ -3,8 +3,13 @@ Worker main entry point
 """
 import asyncio
 import logging
+import os
 import sys
 
+# Workers use the small connection pool profile (must be set before the
+# database engine is created on import)
+os.environ.setdefault("DB_POOL_PROFILE", "worker")
+
 from backend.workers.prediction_worker import PredictionWorker
 
 # Configure logging
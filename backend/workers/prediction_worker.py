@@ -28,9 +28,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from backend.core.config import settings
+from backend.core.startup import run_startup_steps, prewarm_prediction_models, warm_database
 from backend.api.database import get_async_session
+from backend.api.response_cache import invalidate_user_responses
+from backend.services.prediction_events import publish_prediction_event
 from backend.models import Prediction, PredictionStatus
 from backend.services.prediction_service import process_prediction
+from backend.services.prediction_router import get_prediction_router
 from backend.schemas.sqs_messages import PredictionSQSMessage
 from backend.monitoring.metrics import get_metrics_client, MetricUnit, MetricNamespace
 
@@ -79,15 +83,6 @@ class PredictionWorker:
         logger.info(f"SQS Enabled: {settings.is_sqs_enabled}")
         logger.info("=" * 60)
         
-        # Initialize metrics client
-        try:
-            await metrics.start()
-            self.metrics_initialized = True
-            logger.info("✅ CloudWatch metrics client started")
-        except Exception as e:
-            logger.warning(f"Failed to start metrics client: {e}")
-            logger.info("Worker will continue without metrics")
-        
         if not self.queue_url:
             logger.error("❌ PREDICTIONS_QUEUE_URL not configured")
             logger.error("Worker cannot start without queue URL")
@@ -98,6 +93,19 @@ class PredictionWorker:
             logger.error("Worker cannot start when SQS is disabled")
             return
         
+        # Independent, mostly I/O-bound init runs concurrently; model loading
+        # (CPU/disk) runs in a thread alongside it
+        await run_startup_steps({
+            "metrics": self._start_metrics(),
+            "models": asyncio.to_thread(prewarm_prediction_models),
+            "database": warm_database(),
+            "sqs": asyncio.to_thread(
+                self.sqs_client.get_queue_attributes,
+                QueueUrl=self.queue_url,
+                AttributeNames=['ApproximateNumberOfMessages']
+            ),
+        })
+        
         self.running = True
         start_time = datetime.utcnow()
         
@@ -106,6 +114,7 @@ class PredictionWorker:
         while self.running:
             try:
                 await self._poll_and_process()
+                await self._check_model_reload()
             except Exception as e:
                 logger.error(
                     f"❌ Error in worker loop: {str(e)}",
@@ -137,6 +146,23 @@ class PredictionWorker:
         logger.info(f"Success Rate: {self._calculate_success_rate():.1f}%")
         logger.info("=" * 60)
     
+    async def _start_metrics(self):
+        """Start the CloudWatch metrics client (worker continues without it)"""
+        try:
+            await metrics.start()
+            self.metrics_initialized = True
+            logger.info("✅ CloudWatch metrics client started")
+        except Exception as e:
+            logger.warning(f"Failed to start metrics client: {e}")
+            logger.info("Worker will continue without metrics")
+    
+    async def _check_model_reload(self):
+        """Pick up a new active model version between messages (no restart)"""
+        try:
+            await asyncio.to_thread(get_prediction_router().maybe_reload_model)
+        except Exception as e:
+            logger.warning(f"Model reload check failed: {e}")
+    
     async def _poll_and_process(self):
         """Poll SQS for messages and process them"""
         try:
@@ -303,7 +329,9 @@ class PredictionWorker:
                 # Update status to RUNNING
                 prediction.status = PredictionStatus.RUNNING
                 prediction.updated_at = datetime.utcnow()
+                await publish_prediction_event(db, prediction)
                 await db.commit()
+                invalidate_user_responses(prediction.user_id)
                 
                 logger.info(
                     "Prediction status updated to RUNNING",
@@ -373,7 +401,9 @@ class PredictionWorker:
                             prediction.status = PredictionStatus.FAILED
                             prediction.error_message = str(e)
                             prediction.updated_at = datetime.utcnow()
+                            await publish_prediction_event(db, prediction)
                             await db.commit()
+                            invalidate_user_responses(prediction.user_id)
                             
                             logger.error(
                                 "Prediction status updated to FAILED",
@@ -125,6 +125,10 @@ resource "aws_ecs_task_definition" "retainwise_worker" {
           name  = "ENABLE_SQS"
           value = "true"
         },
+        {
+          name  = "DB_POOL_PROFILE"
+          value = "worker"
+        },
         {
           name  = "S3_BUCKET"
           value = aws_s3_bucket.uploads.bucket